@@ -1,5 +1,5 @@
 from fastapi import APIRouter
-from . import auth, bank_accounts, non_bank_accounts, non_bank_transactions, payment_gateway_accounts, payment_gateway_transactions, telco_mobile_accounts, telco_internet_accounts, suspects, criminal_cases, post_arrests, documents, case_types, courts, pdf_parser, police_stations, user_registration, admin_users, cfr_upload, master_data, emails, email_tracking, profile
+from . import auth, bank_accounts, non_bank_accounts, non_bank_transactions, payment_gateway_accounts, payment_gateway_transactions, telco_mobile_accounts, telco_internet_accounts, suspects, criminal_cases, post_arrests, documents, case_types, courts, pdf_parser, police_stations, user_registration, admin_users, cfr_upload, cfr_graph, linkage, master_data, emails, email_tracking, profile, exports
 from .endpoints import banks, non_banks, payment_gateways, telco_mobile, telco_internet, exchanges, organizations, charges, line_integration
 
 api_router = APIRouter()
@@ -28,10 +28,13 @@ api_router.include_router(suspects.router, prefix="/suspects", tags=["suspects"]
 api_router.include_router(criminal_cases.router, prefix="/criminal-cases", tags=["criminal-cases"])
 api_router.include_router(post_arrests.router, prefix="/post-arrests", tags=["post-arrests"])
 api_router.include_router(documents.router, prefix="/documents", tags=["documents"])
+api_router.include_router(exports.router, prefix="/exports", tags=["exports"])
 api_router.include_router(case_types.router, tags=["case-types"])
 api_router.include_router(pdf_parser.router, tags=["pdf-parser"])
 api_router.include_router(police_stations.router, prefix="/police-stations", tags=["police-stations"])
 api_router.include_router(cfr_upload.router, prefix="/cfr", tags=["cfr"])
+api_router.include_router(cfr_graph.router, prefix="/cfr", tags=["cfr"])
+api_router.include_router(linkage.router, prefix="/linkage", tags=["linkage"])
 api_router.include_router(master_data.router, prefix="/master-data", tags=["master-data"])
 api_router.include_router(emails.router, prefix="/emails", tags=["emails"])
 api_router.include_router(email_tracking.router, prefix="/email-tracking", tags=["email-tracking"])
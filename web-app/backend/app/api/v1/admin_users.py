@@ -7,6 +7,8 @@ from app.models import User, PoliceRank, UserRole, UserRoleMapping
 from app.schemas.user_registration import UserRegistrationResponse, PoliceRankResponse, UserRoleResponse
 from app.api.v1.auth import get_current_user
 from app.core.security import verify_password
+from app.core.principal_cache import invalidate_principal
+from app.services.organization_tree import invalidate_organization_tree
 
 router = APIRouter()
 
@@ -112,6 +114,8 @@ def approve_user(
     user.approved_by = admin_user.id
     
     db.commit()
+    invalidate_principal(user.username)
+    invalidate_organization_tree()
     
     return {"message": "อนุมัติผู้ใช้เรียบร้อยแล้ว"}
 
@@ -136,8 +140,11 @@ def reject_user(
         )
     
     # Delete user (reject)
+    username = user.username
     db.delete(user)
     db.commit()
+    invalidate_principal(username)
+    invalidate_organization_tree()
     
     return {"message": "ปฏิเสธการสมัครสมาชิกเรียบร้อยแล้ว"}
 
@@ -174,6 +181,7 @@ def unlock_user(
     user.locked_until = None
     
     db.commit()
+    invalidate_principal(user.username)
     
     return {"message": "ปลดล็อคผู้ใช้เรียบร้อยแล้ว"}
 
@@ -201,6 +209,7 @@ def deactivate_user(
     user.is_active = False
     
     db.commit()
+    invalidate_principal(user.username)
     
     return {"message": "ปิดใช้งานผู้ใช้เรียบร้อยแล้ว"}
 
@@ -222,5 +231,6 @@ def activate_user(
     user.is_active = True
     
     db.commit()
+    invalidate_principal(user.username)
     
     return {"message": "เปิดใช้งานผู้ใช้เรียบร้อยแล้ว"}
@@ -2,9 +2,12 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
 from sqlalchemy.orm import Session, joinedload
 from datetime import timedelta, datetime
-from app.core import get_db, verify_password, get_password_hash, create_access_token, settings
+from app.core import get_db, get_password_hash, create_access_token, settings
+from app.core.security import verify_password_async
+from app.core.executors import run_in_io
 from app.models import User
 from app.schemas import Token, UserCreate, UserResponse
+from app.core.principal_cache import get_principal_cache, restore_principal, snapshot_principal
 
 router = APIRouter()
 
@@ -27,16 +30,25 @@ def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(
     if username is None:
         raise credentials_exception
 
-    user = db.query(User).options(
-        joinedload(User.rank),
-        joinedload(User.role),
-        joinedload(User.bureau),
-        joinedload(User.division),
-        joinedload(User.supervision)
-    ).filter(User.username == username).first()
-    
-    if user is None:
-        raise credentials_exception
+    # ใช้ข้อมูลผู้ใช้จาก cache (ถ้ามี) แทนการ query ทุก request
+    cache = get_principal_cache()
+    snapshot = cache.get(username)
+    if snapshot is not None:
+        user = restore_principal(db, snapshot)
+    else:
+        loaded_epoch = cache.epoch()
+        user = db.query(User).options(
+            joinedload(User.rank),
+            joinedload(User.role),
+            joinedload(User.bureau),
+            joinedload(User.division),
+            joinedload(User.supervision)
+        ).filter(User.username == username).first()
+
+        if user is None:
+            raise credentials_exception
+
+        cache.set(username, snapshot_principal(user), loaded_epoch)
     
     # Check if user is active and approved
     if not user.is_active:
@@ -105,14 +117,34 @@ def register(user: UserCreate, db: Session = Depends(get_db)):
     db.refresh(db_user)
     return db_user
 
-@router.post("/login", response_model=Token)
-def login(form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(get_db)):
-    # Load user with organization data
-    user = db.query(User).options(
+def _load_login_user(db: Session, username: str):
+    # Load user with role and organization data
+    return db.query(User).options(
+        joinedload(User.role),
         joinedload(User.bureau),
         joinedload(User.division),
         joinedload(User.supervision)
-    ).filter(User.username == form_data.username).first()
+    ).filter(User.username == username).first()
+
+def _record_login_attempt(db: Session, user: User, success: bool) -> None:
+    if success:
+        # Reset failed login attempts on successful login
+        user.failed_login_attempts = 0
+        user.locked_until = None
+    else:
+        # Increment failed login attempts
+        user.failed_login_attempts += 1
+
+        # Lock account after 5 failed attempts
+        if user.failed_login_attempts >= 5:
+            user.locked_until = datetime.utcnow() + timedelta(hours=1)  # Lock for 1 hour
+
+    db.commit()
+
+@router.post("/login", response_model=Token)
+async def login(form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(get_db)):
+    # DB และ bcrypt รันใน executor เพื่อไม่ให้ login จำนวนมาก block request อื่น
+    user = await run_in_io(_load_login_user, db, form_data.username)
     
     if not user:
         raise HTTPException(
@@ -143,10 +175,7 @@ def login(form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depend
         )
     
     # ตรวจสอบสิทธิ์หน่วยงาน (ยกเว้น Admin)
-    # Load user role to check if admin
-    user_with_role = db.query(User).options(joinedload(User.role)).filter(User.id == user.id).first()
-    
-    if user_with_role and user_with_role.role and user_with_role.role.role_name != 'admin':
+    if user.role and user.role.role_name != 'admin':
         if user.supervision and not user.supervision.is_active:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
@@ -166,30 +195,21 @@ def login(form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depend
             )
     
     # Verify password
-    if not verify_password(form_data.password, user.hashed_password):
-        # Increment failed login attempts
-        user.failed_login_attempts += 1
-        
-        # Lock account after 5 failed attempts
-        if user.failed_login_attempts >= 5:
-            user.locked_until = datetime.utcnow() + timedelta(hours=1)  # Lock for 1 hour
-        
-        db.commit()
-        
+    password_ok = await verify_password_async(form_data.password, user.hashed_password)
+    # อ่านก่อน commit: หลัง commit user ถูก expire และการอ่าน attribute จะ query บน event loop
+    username = user.username
+    await run_in_io(_record_login_attempt, db, user, password_ok)
+
+    if not password_ok:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="ชื่อผู้ใช้หรือรหัสผ่านไม่ถูกต้อง",
             headers={"WWW-Authenticate": "Bearer"},
         )
-    
-    # Reset failed login attempts on successful login
-    user.failed_login_attempts = 0
-    user.locked_until = None
-    db.commit()
 
     access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     access_token = create_access_token(
-        data={"sub": user.username}, expires_delta=access_token_expires
+        data={"sub": username}, expires_delta=access_token_expires
     )
     return {"access_token": access_token, "token_type": "bearer"}
 
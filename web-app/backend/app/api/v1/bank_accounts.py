@@ -1,23 +1,21 @@
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session, joinedload
 from typing import List
-from datetime import datetime
 from app.core import get_db
-from app.models import BankAccount, User, Bank, CriminalCase
+from app.models import BankAccount, User, CriminalCase
 from app.schemas import BankAccountCreate, BankAccountUpdate, BankAccountResponse, BankAccountPaginationResponse
 from app.api.v1.auth import get_current_user
+from app.schemas.bulk import BulkCreateRequest, BulkCreateResponse, BulkPasteRequest
+from app.services.bulk_create import BANK_ACCOUNT_BULK, BulkCreateError, bulk_create_response, parse_pasted_rows
 from app.utils.thai_date_utils import format_date_to_thai_buddhist_era
 from app.services.line_service import LineService
-import asyncio
+from app.services.master_data_cache import resolve_bank_id
+from app.services.number_sequence import BANK_ACCOUNT_DOCUMENT_PREFIX, next_document_number
 
 router = APIRouter()
 
 def generate_document_number(db: Session) -> str:
-    current_year = datetime.now().year + 543
-    count = db.query(BankAccount).filter(
-        BankAccount.document_number.like(f"BA-{current_year}-%")
-    ).count()
-    return f"BA-{current_year}-{count + 1:04d}"
+    return next_document_number(db, BANK_ACCOUNT_DOCUMENT_PREFIX)
 
 @router.post("/", response_model=BankAccountResponse)
 def create_bank_account(
@@ -32,22 +30,11 @@ def create_bank_account(
     # ให้ผู้ใช้กรอกเอง หรือเว้นว่างไว้
 
     # Auto-lookup bank_id from bank_name
+    # (ดัชนีชื่อใน master-data cache: ตัด "ธนาคาร"/"จำกัด (มหาชน)", รองรับชื่อย่อ เช่น KBANK, กสิกร)
     if bank_data.get('bank_name'):
-        # ลองหาแบบตรงทั้งหมดก่อน
-        bank = db.query(Bank).filter(Bank.bank_name == bank_data['bank_name']).first()
-        
-        # ถ้าไม่เจอ ลองตัดคำว่า "ธนาคาร" ออก
-        if not bank:
-            bank_name_without_prefix = bank_data['bank_name'].replace('ธนาคาร', '').strip()
-            bank = db.query(Bank).filter(Bank.bank_name == bank_name_without_prefix).first()
-        
-        # ถ้ายังไม่เจอ ลองหาแบบ LIKE
-        if not bank:
-            bank_name_search = f"%{bank_data['bank_name'].replace('ธนาคาร', '').strip()}%"
-            bank = db.query(Bank).filter(Bank.bank_name.like(bank_name_search)).first()
-        
-        if bank:
-            bank_data['bank_id'] = bank.id
+        bank_id = resolve_bank_id(db, bank_data['bank_name'])
+        if bank_id:
+            bank_data['bank_id'] = bank_id
 
 
     # เพิ่ม created_by
@@ -60,6 +47,33 @@ def create_bank_account(
     db.refresh(db_bank_account)
     return db_bank_account
 
+@router.post("/bulk", response_model=BulkCreateResponse, status_code=201)
+def bulk_create_bank_accounts(
+    bulk: BulkCreateRequest,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """สร้างบัญชีธนาคารหลายรายการ (ตรวจทุกแถวก่อน บันทึกทั้งหมดหรือไม่บันทึกเลย, 422 = มีแถวผิด)"""
+    try:
+        return bulk_create_response(db, BANK_ACCOUNT_BULK, bulk.rows, bulk.criminal_case_id, current_user.id, bulk.dry_run)
+    except BulkCreateError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.post("/bulk/paste", response_model=BulkCreateResponse, status_code=201)
+def paste_bank_accounts(
+    paste: BulkPasteRequest,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """สร้างบัญชีธนาคารจากข้อความที่คัดลอกจาก Excel (บรรทัดแรกเป็นหัวคอลัมน์)"""
+    try:
+        rows, ignored = parse_pasted_rows(BANK_ACCOUNT_BULK, paste.text)
+        return bulk_create_response(
+            db, BANK_ACCOUNT_BULK, rows, paste.criminal_case_id, current_user.id, paste.dry_run, ignored
+        )
+    except BulkCreateError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
 @router.get("/", response_model=BankAccountPaginationResponse)
 def read_bank_accounts(
     page: int = 1,
@@ -114,7 +128,7 @@ def read_bank_account(
     return bank_account
 
 @router.put("/{bank_account_id}", response_model=BankAccountResponse)
-async def update_bank_account(
+def update_bank_account(
     bank_account_id: int,
     bank_account: BankAccountUpdate,
     db: Session = Depends(get_db),
@@ -131,21 +145,9 @@ async def update_bank_account(
 
     # Auto-lookup bank_id from bank_name if bank_name is being updated
     if 'bank_name' in update_data and update_data['bank_name']:
-        # ลองหาแบบตรงทั้งหมดก่อน
-        bank = db.query(Bank).filter(Bank.bank_name == update_data['bank_name']).first()
-
-        # ถ้าไม่เจอ ลองตัดคำว่า "ธนาคาร" ออก
-        if not bank:
-            bank_name_without_prefix = update_data['bank_name'].replace('ธนาคาร', '').strip()
-            bank = db.query(Bank).filter(Bank.bank_name == bank_name_without_prefix).first()
-
-        # ถ้ายังไม่เจอ ลองหาแบบ LIKE
-        if not bank:
-            bank_name_search = f"%{update_data['bank_name'].replace('ธนาคาร', '').strip()}%"
-            bank = db.query(Bank).filter(Bank.bank_name.like(bank_name_search)).first()
-
-        if bank:
-            update_data['bank_id'] = bank.id
+        bank_id = resolve_bank_id(db, update_data['bank_name'])
+        if bank_id:
+            update_data['bank_id'] = bank_id
 
     # แปลง document_date เป็น document_date_thai อัตโนมัติ
 
@@ -182,13 +184,12 @@ async def update_bank_account(
                     'full_name': current_user.full_name
                 }
 
-                # ส่งการแจ้งเตือนผ่าน LINE (async)
-                await LineService.send_summons_notification(
+                # เข้าคิวส่ง LINE แล้วตอบกลับทันที (ไม่รอ LINE)
+                LineService.send_summons_notification(
                     user_id=current_user.id,
                     account_type='bank',
                     account_data=account_data,
                     criminal_case=case_data,
-                    db=db,
                     updated_by_user=updated_by_user
                 )
         except Exception as e:
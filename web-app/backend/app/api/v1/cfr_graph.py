@@ -0,0 +1,114 @@
+"""
+API endpoints สำหรับวิเคราะห์เส้นทางการเงินจากข้อมูล CFR
+"""
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.orm import Session
+from typing import List, Optional
+from app.core import get_db
+from app.models import CriminalCase, User
+from app.api.v1.auth import get_current_user
+from app.services.cfr_graph import get_money_flow_graph
+from app.services.case_search_service import CaseSearchService
+
+router = APIRouter()
+
+
+def _parse_case_ids(case_ids: str) -> List[int]:
+    try:
+        ids = [int(x) for x in case_ids.split(",") if x.strip()]
+    except ValueError:
+        raise HTTPException(status_code=400, detail="case_ids ต้องเป็นตัวเลขคั่นด้วย ,")
+    if not ids:
+        raise HTTPException(status_code=400, detail="กรุณาระบุ case_ids")
+    return ids
+
+
+@router.get("/graph/mules")
+def get_cross_case_mule_accounts(
+    case_ids: str = Query(..., description="ID ของคดีคั่นด้วย , เช่น 1,2,3"),
+    min_in: int = Query(2, ge=1),
+    min_out: int = Query(2, ge=1),
+    limit: int = Query(100, ge=1, le=1000),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """ตรวจหาบัญชีม้าจากข้อมูล CFR ของหลายคดีรวมกัน (เฉพาะคดีที่ผู้ใช้เห็นได้)"""
+    requested = _parse_case_ids(case_ids)
+    visible = {
+        case_id for (case_id,) in CaseSearchService(db).build_filtered_query(current_user)
+        .filter(CriminalCase.id.in_(requested)).with_entities(CriminalCase.id)
+    }
+    if not visible:
+        raise HTTPException(status_code=404, detail="ไม่พบข้อมูลคดี")
+
+    graph = get_money_flow_graph(db, visible)
+    return {
+        **graph.summary(),
+        "mule_candidates": graph.mule_candidates(min_in=min_in, min_out=min_out, limit=limit)
+    }
+
+
+@router.get("/{criminal_case_id}/graph")
+def get_money_flow_edges(
+    criminal_case_id: int,
+    min_amount: float = 0,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """เส้นทางการเงินทั้งหมดของคดี (รวมยอดโอนระหว่างบัญชีคู่เดียวกัน)"""
+    graph = get_money_flow_graph(db, [criminal_case_id])
+    return {
+        **graph.summary(),
+        "edges": graph.edges(min_amount=min_amount)
+    }
+
+
+@router.get("/{criminal_case_id}/graph/trace")
+def trace_money_flow(
+    criminal_case_id: int,
+    account: str,
+    max_hops: int = Query(3, ge=1, le=10),
+    direction: str = Query("out", description="out = เงินไหลไปที่ไหน, in = เงินมาจากไหน"),
+    min_amount: float = 0,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """ไล่เส้นทางการเงินจากบัญชีที่ระบุ (เช่น บัญชีผู้เสียหาย) ไม่เกิน max_hops ทอด"""
+    if direction not in ("out", "in"):
+        raise HTTPException(status_code=400, detail="direction ต้องเป็น out หรือ in")
+
+    graph = get_money_flow_graph(db, [criminal_case_id])
+    result = graph.trace(account, max_hops=max_hops, direction=direction, min_amount=min_amount)
+    if result is None:
+        raise HTTPException(status_code=404, detail=f"ไม่พบบัญชี {account} ในข้อมูล CFR")
+    return result
+
+
+@router.get("/{criminal_case_id}/graph/mules")
+def get_mule_accounts(
+    criminal_case_id: int,
+    min_in: int = Query(2, ge=1),
+    min_out: int = Query(2, ge=1),
+    limit: int = Query(100, ge=1, le=1000),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """ตรวจหาบัญชีม้า (รับเงินจากหลายบัญชีและโอนต่อหลายบัญชี)"""
+    graph = get_money_flow_graph(db, [criminal_case_id])
+    return graph.mule_candidates(min_in=min_in, min_out=min_out, limit=limit)
+
+
+@router.get("/{criminal_case_id}/graph/path")
+def get_money_path(
+    criminal_case_id: int,
+    source: str,
+    target: str,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """เส้นทางเงินที่สั้นที่สุดจากบัญชี source ไปยังบัญชี target"""
+    graph = get_money_flow_graph(db, [criminal_case_id])
+    result = graph.shortest_path(source, target)
+    if result is None:
+        raise HTTPException(status_code=404, detail="ไม่พบเส้นทางการเงินระหว่างบัญชีที่ระบุ")
+    return result
@@ -1,29 +1,38 @@
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File
+from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Query
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 from sqlalchemy import func
-from typing import List
-from app.core import get_db
+from typing import List, Optional
+from datetime import date
+from app.core import get_db, settings
 from app.models import CFR, CriminalCase, User
 from app.api.v1.auth import get_current_user
-import pandas as pd
+from app.services.job_store import get_job_store, JOB_FAILED
+from app.services.cfr_graph import invalidate_money_flow_graph
+from app.services.cfr_records import (
+    STREAM_FORMATS, TRANSFER_DIRECTIONS, account_transfers_query, cfr_records_query, get_records_page, stream_records
+)
+from app.services.case_search_service import CaseSearchService, InvalidCursorError
+from app.tasks.cfr_tasks import import_cfr_file_task
 import os
-from datetime import datetime
+import shutil
 
 router = APIRouter()
 
-@router.post("/upload/{criminal_case_id}")
-async def upload_cfr_file(
+@router.post("/upload/{criminal_case_id}", status_code=202)
+def upload_cfr_file(
     criminal_case_id: int,
     file: UploadFile = File(...),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
     """
-    อัพโหลดไฟล์ CFR และบันทึกข้อมูลลงฐานข้อมูล
+    อัพโหลดไฟล์ CFR และสร้างงานนำเข้าข้อมูลเบื้องหลัง
     
     Logic:
     - ถ้าชื่อไฟล์ซ้ำ → ลบข้อมูลเดิมทั้งหมดก่อน แล้ว insert ใหม่
     - ถ้าชื่อไฟล์ใหม่ → insert เพิ่ม
+    - ตอบกลับทันทีพร้อม job_id ให้ติดตามความคืบหน้าที่ GET /cfr/jobs/{job_id}
     """
     
     # ตรวจสอบว่าคดีมีอยู่จริง
@@ -35,122 +44,91 @@ async def upload_cfr_file(
     if not file.filename.endswith('.xlsx'):
         raise HTTPException(status_code=400, detail="รองรับเฉพาะไฟล์ .xlsx เท่านั้น")
     
+    store = get_job_store()
+    job = store.create(
+        "cfr_upload",
+        criminal_case_id=criminal_case_id,
+        filename=file.filename,
+        created_by=current_user.id
+    )
+    
     try:
-        # อ่านไฟล์ Excel
-        contents = await file.read()
-        
-        # Save to temp file
-        temp_path = f"/tmp/{file.filename}"
-        with open(temp_path, "wb") as f:
-            f.write(contents)
-        
-        # อ่านข้อมูลด้วย pandas โดยกำหนดให้เลขบัญชีเป็น string เพื่อรักษาเลข 0 หน้า
-        df = pd.read_excel(temp_path, dtype=str)
-        
-        # ลบไฟล์ temp
-        os.remove(temp_path)
-        
-        # ตรวจสอบว่ามีข้อมูลเดิมที่ชื่อไฟล์เดียวกันหรือไม่
-        existing_records = db.query(CFR).filter(
-            CFR.criminal_case_id == criminal_case_id,
-            CFR.filename == file.filename
-        ).all()
-        
-        if existing_records:
-            # ลบข้อมูลเดิม
-            for record in existing_records:
-                db.delete(record)
-            db.commit()
-        
-        # Helper function to safely convert values
-        def safe_int(val):
-            if pd.isna(val) or val == '' or val == 'nan':
-                return None
-            try:
-                return int(float(str(val)))
-            except:
-                return None
+        # เก็บไฟล์ไว้ใน uploads (worker อ่านจาก volume เดียวกัน)
+        jobs_dir = os.path.join(settings.UPLOAD_DIR, "cfr_jobs")
+        os.makedirs(jobs_dir, exist_ok=True)
+        path = os.path.join(jobs_dir, f"{job['id']}.xlsx")
+        with open(path, "wb") as f:
+            shutil.copyfileobj(file.file, f)
         
-        def safe_float(val):
-            if pd.isna(val) or val == '' or val == 'nan':
-                return None
-            try:
-                return float(str(val))
-            except:
-                return None
-        
-        def safe_str(val):
-            if pd.isna(val) or val == '' or val == 'nan':
-                return None
-            return str(val).strip()
-        
-        # Insert ข้อมูลใหม่
-        inserted_count = 0
-        for _, row in df.iterrows():
-            cfr_record = CFR(
-                criminal_case_id=criminal_case_id,
-                filename=file.filename,
-                upload_date=datetime.now(),
-                
-                # CFR Data
-                response_id=safe_int(row['response_id']),
-                bank_case_id=safe_str(row['bank_case_id']),
-                timestamp_insert=safe_str(row['timestamp_insert']),
-                
-                # From Account (รักษาเลข 0 หน้า)
-                from_bank_code=safe_int(row['from_bank_code']),
-                from_bank_short_name=safe_str(row['from_bank_short_name']),
-                from_account_no=safe_str(row['from_account_no']),  # รักษาเลข 0
-                from_account_name=safe_str(row['from_account_name']),
-                
-                # To Account (รักษาเลข 0 หน้า)
-                to_bank_code=safe_int(row['to_bank_code']),
-                to_bank_short_name=safe_str(row['to_bank_short_name']),
-                to_bank_branch=safe_str(row['to_bank_branch']),
-                to_id_type=safe_str(row['to_id_type']),
-                to_id=safe_str(row['to_id']),  # รักษาเลข 0
-                first_name=safe_str(row['first_name']),
-                last_name=safe_str(row['last_name']),
-                phone_number=safe_str(row['phone_number']),  # รักษาเลข 0
-                
-                # PromptPay (รักษาเลข 0 หน้า)
-                promptpay_type=safe_str(row['promptpay_type']),
-                promptpay_id=safe_str(row['promptpay_id']),  # รักษาเลข 0
-                
-                # To Account Details (รักษาเลข 0 หน้า)
-                to_account_no=safe_str(row['to_account_no']),  # รักษาเลข 0
-                to_account_name=safe_str(row['to_account_name']),
-                to_account_status=safe_str(row['to_account_status']),
-                to_open_date=safe_str(row['to_open_date']),
-                to_close_date=safe_str(row['to_close_date']),
-                to_balance=safe_float(row['to_balance']),
-                
-                # Transfer
-                transfer_date=safe_str(row['transfer_date']),
-                transfer_channel=safe_str(row['transfer_channel']),
-                transfer_channel_detail=safe_str(row['transfer_channel_detail']),
-                transfer_time=safe_str(row['transfer_time']),
-                transfer_amount=safe_float(row['transfer_amount']),
-                transfer_description=safe_str(row['transfer_description']),
-                transfer_ref=safe_str(row['transfer_ref']),
-                
-                created_by=current_user.id
-            )
-            db.add(cfr_record)
-            inserted_count += 1
-        
-        db.commit()
-        
-        return {
-            "message": "อัพโหลดไฟล์ CFR สำเร็จ",
-            "filename": file.filename,
-            "records_inserted": inserted_count,
-            "records_deleted": len(existing_records) if existing_records else 0
-        }
+        import_cfr_file_task.delay(job["id"], path, criminal_case_id, file.filename, current_user.id)
         
     except Exception as e:
-        db.rollback()
+        store.update(job["id"], status=JOB_FAILED, error=str(e))
         raise HTTPException(status_code=500, detail=f"เกิดข้อผิดพลาด: {str(e)}")
+    
+    return {
+        "message": "รับไฟล์ CFR แล้ว กำลังนำเข้าข้อมูล",
+        "filename": file.filename,
+        "job_id": job["id"],
+        "status": job["status"]
+    }
+
+def _get_own_job(job_id: str, current_user: User) -> dict:
+    """งานของผู้ใช้ (admin ดูได้ทุกงาน) งานของผู้อื่นตอบ 404 เหมือนไม่มีงานนี้"""
+    job = get_job_store().get(job_id)
+    is_admin = current_user.role and current_user.role.role_name == "admin"
+    if job is None or (not is_admin and job.get("created_by") != current_user.id):
+        raise HTTPException(status_code=404, detail="ไม่พบงานนำเข้าไฟล์")
+    return job
+
+@router.get("/jobs/{job_id}")
+def get_cfr_job(
+    job_id: str,
+    current_user: User = Depends(get_current_user)
+):
+    """ดูความคืบหน้า/ผลลัพธ์ของงานนำเข้าไฟล์ CFR"""
+    return _get_own_job(job_id, current_user)
+
+@router.post("/jobs/{job_id}/cancel")
+def cancel_cfr_job(
+    job_id: str,
+    current_user: User = Depends(get_current_user)
+):
+    """ยกเลิกงานนำเข้าไฟล์ CFR (ข้อมูลที่นำเข้าไปแล้วบางส่วนจะถูก rollback)"""
+    job = _get_own_job(job_id, current_user)
+    if not get_job_store().request_cancel(job_id):
+        raise HTTPException(status_code=400, detail=f"งานนี้สิ้นสุดแล้ว (สถานะ: {job['status']})")
+    
+    return {"message": "ส่งคำขอยกเลิกแล้ว", "job_id": job_id}
+
+@router.get("/accounts/{account_no}/transfers")
+def get_account_transfers(
+    account_no: str,
+    direction: str = Query("in", description="in = โอนเข้าบัญชี, out = โอนออกจากบัญชี"),
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    limit: int = Query(100, ge=1, le=5000),
+    cursor: Optional[str] = Query(None, description="next_cursor จากหน้าก่อน"),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    รายการโอนเข้า/ออกจากบัญชีในช่วงวันที่ จาก CFR ทุกคดีที่ผู้ใช้เห็นได้
+
+    เรียงจากรายการโอนล่าสุด แบ่งหน้าด้วย cursor เหมือน /{criminal_case_id}/records
+    """
+    if direction not in TRANSFER_DIRECTIONS:
+        raise HTTPException(status_code=400, detail="direction ต้องเป็น in หรือ out")
+    
+    visible_cases = CaseSearchService(db).build_filtered_query(current_user).with_entities(CriminalCase.id)
+    query = account_transfers_query(
+        db, account_no, direction, date_from, date_to, case_ids=visible_cases
+    )
+    
+    try:
+        return get_records_page(query, limit, cursor=cursor)
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
 @router.get("/{criminal_case_id}/files")
 def get_cfr_files(
@@ -182,23 +160,52 @@ def get_cfr_records(
     criminal_case_id: int,
     filename: str = None,
     skip: int = 0,
-    limit: int = 100,
+    limit: int = Query(100, ge=1, le=5000),
+    cursor: Optional[str] = Query(None, description="next_cursor จากหน้าก่อน"),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    """ดึงข้อมูล CFR records"""
+    """
+    ดึงข้อมูล CFR records เรียงจากรายการโอนล่าสุด
+
+    - แบ่งหน้าด้วย cursor (ส่ง next_cursor ของหน้าก่อนกลับมา) แทน skip
+    - total นับเฉพาะหน้าแรก (หน้าที่มี cursor ได้ total = null)
+    - ต้องการข้อมูลทั้งชุดใช้ GET /cfr/{criminal_case_id}/records/stream
+    """
+    
+    query = cfr_records_query(db, criminal_case_id, filename)
     
-    query = db.query(CFR).filter(CFR.criminal_case_id == criminal_case_id)
+    try:
+        page = get_records_page(query, limit, cursor=cursor, skip=skip)
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     
-    if filename:
-        query = query.filter(CFR.filename == filename)
+    page["total"] = query.count() if cursor is None else None
+    return page
+
+@router.get("/{criminal_case_id}/records/stream")
+def stream_cfr_records(
+    criminal_case_id: int,
+    filename: str = None,
+    format: str = Query("ndjson", description="ndjson หรือ csv"),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    ดึง CFR records ทั้งชุดแบบ streaming (NDJSON หรือ CSV) สำหรับวิเคราะห์ต่อภายนอก
+
+    อ่านผ่าน server-side cursor หน่วยความจำคงที่ไม่ขึ้นกับจำนวนแถว
+    """
+    if format not in STREAM_FORMATS:
+        raise HTTPException(status_code=400, detail=f"format ต้องเป็น: {', '.join(STREAM_FORMATS)}")
     
-    records = query.order_by(CFR.transfer_date.desc(), CFR.transfer_time.desc()).offset(skip).limit(limit).all()
+    query = cfr_records_query(db, criminal_case_id, filename)
     
-    return {
-        "records": records,
-        "total": query.count()
-    }
+    return StreamingResponse(
+        stream_records(query, format),
+        media_type=STREAM_FORMATS[format],
+        headers={"Content-Disposition": f'attachment; filename="cfr_case_{criminal_case_id}.{format}"'}
+    )
 
 @router.delete("/{criminal_case_id}/file/{filename}")
 def delete_cfr_file(
@@ -215,6 +222,7 @@ def delete_cfr_file(
     ).delete()
     
     db.commit()
+    invalidate_money_flow_graph(criminal_case_id)
     
     return {
         "message": f"ลบไฟล์ {filename} สำเร็จ",
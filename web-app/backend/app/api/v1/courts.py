@@ -1,15 +1,17 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
 from sqlalchemy.orm import Session
 from typing import List, Optional
 from app.core import get_db
 from app.models import Court, User
 from app.schemas import CourtCreate, CourtUpdate, Court as CourtSchema
 from app.api.v1.auth import get_current_user
+from app.services.master_data_cache import get_master_data, invalidate_master_data, master_data_response
 
 router = APIRouter()
 
 @router.get("/", response_model=List[CourtSchema])
 def get_courts(
+    request: Request,
     skip: int = 0,
     limit: int = 300,
     court_type: Optional[str] = Query(None, description="Filter by court type"),
@@ -19,22 +21,23 @@ def get_courts(
     db: Session = Depends(get_db)
 ):
     """Get list of courts with optional filters (public endpoint - no auth required)"""
-    query = db.query(Court)
+    snapshot = get_master_data(db, "courts")
+    courts = snapshot.rows
 
     if court_type:
-        query = query.filter(Court.court_type == court_type)
+        courts = [c for c in courts if c["court_type"] == court_type]
 
     if region:
-        query = query.filter(Court.region == region)
+        courts = [c for c in courts if c["region"] == region]
 
     if province:
-        query = query.filter(Court.province == province)
+        courts = [c for c in courts if c["province"] == province]
 
     if search:
-        query = query.filter(Court.court_name.ilike(f"%{search}%"))
+        search = search.lower()
+        courts = [c for c in courts if search in (c["court_name"] or "").lower()]
 
-    courts = query.offset(skip).limit(limit).all()
-    return courts
+    return master_data_response(request, snapshot, courts[skip:skip + limit])
 
 @router.get("/types")
 def get_court_types(
@@ -87,6 +90,7 @@ def create_court(
     db_court = Court(**court.dict())
     db.add(db_court)
     db.commit()
+    invalidate_master_data("courts")
     db.refresh(db_court)
     return db_court
 
@@ -107,6 +111,7 @@ def update_court(
         setattr(db_court, key, value)
 
     db.commit()
+    invalidate_master_data("courts")
     db.refresh(db_court)
     return db_court
 
@@ -123,4 +128,5 @@ def delete_court(
 
     db.delete(db_court)
     db.commit()
+    invalidate_master_data("courts")
     return {"message": "Court deleted successfully"}
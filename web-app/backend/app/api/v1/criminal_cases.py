@@ -1,18 +1,44 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session, joinedload
-from typing import List
-from datetime import datetime, timedelta
+from typing import List, Optional
+from datetime import date, datetime, timedelta
 from app.core import get_db
 from app.models import CriminalCase, User, BankAccount, Suspect
-from app.schemas import CriminalCaseCreate, CriminalCaseUpdate, CriminalCaseResponse, BankAccountResponse, SuspectResponse
+from app.schemas import CriminalCaseCreate, CriminalCaseUpdate, CriminalCaseResponse, CriminalCaseSearchResponse, BankAccountResponse, SuspectResponse
 from app.api.v1.auth import get_current_user
 from app.utils.string_utils import safe_string_conversion, name_contains, clean_name_for_matching
-from app.utils.case_styling import get_case_row_class, get_case_row_style
-from app.utils.case_number_generator import generate_case_number, validate_case_number
-from app.utils.virtual_fields import format_thai_date, get_bank_accounts_count, get_suspects_count
+from app.utils.case_styling import get_case_row_class, get_case_row_style, is_complaint_date_over_6_months
+from app.utils.case_number_generator import CASE_NUMBER_PREFIX, generate_case_number, parse_case_number, validate_case_number
+from app.utils.virtual_fields import format_thai_date, get_case_counts_batch, get_case_counts
+from app.services.case_search_service import CaseSearchService, InvalidCursorError
+from app.services.number_sequence import advance_to
 
 router = APIRouter()
 
+def build_case_response(case: CriminalCase, counts: dict) -> CriminalCaseResponse:
+    """สร้าง CriminalCaseResponse พร้อม virtual fields จากผลของ get_case_counts_batch()"""
+    complaint_date_thai = format_thai_date(case.complaint_date)
+    incident_date_thai = format_thai_date(case.incident_date)
+    bank_accounts_count = counts.get("bank_accounts_count", "0/0")
+
+    # Add row styling
+    complaint_date_str = complaint_date_thai or str(case.complaint_date) if case.complaint_date else ''
+    row_class = get_case_row_class(case.status, complaint_date_str, bank_accounts_count)
+    row_style = get_case_row_style(case.status, complaint_date_str, bank_accounts_count)
+
+    # Create response with virtual fields
+    response = CriminalCaseResponse.from_orm(case)
+    response.complaint_date_thai = complaint_date_thai
+    response.incident_date_thai = incident_date_thai
+    for field, value in counts.items():
+        setattr(response, field, value)
+    response.over_six_months = is_complaint_date_over_6_months(case.complaint_date)
+    response.row_class = row_class
+    response.row_style = row_style
+
+    return response
+
+
 @router.post("/", response_model=CriminalCaseResponse, status_code=201)
 def create_criminal_case(
     criminal_case: CriminalCaseCreate,
@@ -30,6 +56,10 @@ def create_criminal_case(
     if db_case:
         raise HTTPException(status_code=400, detail=f"Case number {case_data['case_number']} already exists")
 
+    # เลขคดีที่กรอกเอง: เลื่อนตัวนับให้ generate_case_number() ไม่ออกเลขซ้ำ
+    parsed = parse_case_number(case_data['case_number'])
+    advance_to(db, CASE_NUMBER_PREFIX, parsed["year"], parsed["number"])
+
     db_case = CriminalCase(
         **case_data,
         last_update_date=datetime.now(),
@@ -41,24 +71,8 @@ def create_criminal_case(
     db.refresh(db_case)
 
     # Compute virtual fields
-    complaint_date_thai = format_thai_date(db_case.complaint_date)
-    incident_date_thai = format_thai_date(db_case.incident_date)
-    bank_accounts_count = get_bank_accounts_count(db, db_case.id)
-    suspects_count = get_suspects_count(db, db_case.id)
-
-    # Add row styling
-    complaint_date_str = complaint_date_thai or str(db_case.complaint_date) if db_case.complaint_date else ''
-    row_class = get_case_row_class(db_case.status, complaint_date_str, bank_accounts_count)
-    row_style = get_case_row_style(db_case.status, complaint_date_str, bank_accounts_count)
-
-    # Create response with virtual fields
-    response = CriminalCaseResponse.from_orm(db_case)
-    response.complaint_date_thai = complaint_date_thai
-    response.incident_date_thai = incident_date_thai
-    response.bank_accounts_count = bank_accounts_count
-    response.suspects_count = suspects_count
-    response.row_class = row_class
-    response.row_style = row_style
+    counts = get_case_counts_batch(db, [db_case.id])[db_case.id]
+    response = build_case_response(db_case, counts)
 
     return response
 
@@ -89,7 +103,8 @@ def read_criminal_cases(
 ):
     # Build query based on user role
     query = db.query(CriminalCase).options(
-        joinedload(CriminalCase.owner).joinedload(User.rank)
+        joinedload(CriminalCase.owner).joinedload(User.rank),
+        joinedload(CriminalCase.summary)
     )
     
     # If user is not admin, filter by owner_id
@@ -98,33 +113,65 @@ def read_criminal_cases(
     
     cases = query.order_by(CriminalCase.complaint_date.desc()).offset(skip).limit(limit).all()
 
+    # Virtual fields from case_summary (loaded in the same query)
+    counts = get_case_counts(db, cases)
+
     # Add virtual fields to each case
     response_cases = []
     for case in cases:
-        # Compute virtual fields
-        complaint_date_thai = format_thai_date(case.complaint_date)
-        incident_date_thai = format_thai_date(case.incident_date)
-        bank_accounts_count = get_bank_accounts_count(db, case.id)
-        suspects_count = get_suspects_count(db, case.id)
-
-        # Add row styling information
-        complaint_date_str = complaint_date_thai or str(case.complaint_date) if case.complaint_date else ''
-        row_class = get_case_row_class(case.status, complaint_date_str, bank_accounts_count)
-        row_style = get_case_row_style(case.status, complaint_date_str, bank_accounts_count)
-
-        # Create response with virtual fields
-        response = CriminalCaseResponse.from_orm(case)
-        response.complaint_date_thai = complaint_date_thai
-        response.incident_date_thai = incident_date_thai
-        response.bank_accounts_count = bank_accounts_count
-        response.suspects_count = suspects_count
-        response.row_class = row_class
-        response.row_style = row_style
-        
-        response_cases.append(response)
+        response_cases.append(build_case_response(case, counts[case.id]))
 
     return response_cases
 
+@router.get("/search", response_model=CriminalCaseSearchResponse)
+def search_criminal_cases(
+    status: Optional[str] = None,
+    case_type: Optional[str] = None,
+    owner_id: Optional[int] = None,
+    bureau_id: Optional[int] = None,
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    q: Optional[str] = Query(None, description="ค้นหาจากชื่อผู้เสียหาย / CaseID / เลขคดี"),
+    sort_by: str = "complaint_date",
+    sort_order: str = "desc",
+    limit: int = Query(50, ge=1, le=500),
+    cursor: Optional[str] = None,
+    total: str = Query("none", description="none | exact | estimated"),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    ค้นหาคดีแบบกรอง/เรียงลำดับ/แบ่งหน้าที่ฝั่ง server
+
+    - แบ่งหน้าแบบ keyset: ส่ง next_cursor จากผลลัพธ์ก่อนหน้ามาใน cursor
+    - total=exact นับจริง, total=estimated ใช้ค่าประมาณจาก planner
+    """
+    service = CaseSearchService(db)
+    try:
+        result = service.search(
+            current_user,
+            sort_by=sort_by,
+            sort_order=sort_order,
+            limit=limit,
+            cursor=cursor,
+            total=total,
+            status=status,
+            case_type=case_type,
+            owner_id=owner_id,
+            bureau_id=bureau_id,
+            date_from=date_from,
+            date_to=date_to,
+            q=q,
+        )
+    except (ValueError, InvalidCursorError) as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    cases = result["cases"]
+    counts = get_case_counts(db, cases)
+    result["cases"] = [build_case_response(case, counts[case.id]) for case in cases]
+
+    return result
+
 @router.get("/aging", response_model=List[CriminalCaseResponse])
 def read_aging_cases(
     db: Session = Depends(get_db),
@@ -154,30 +201,15 @@ def read_criminal_case(
     current_user: User = Depends(get_current_user)
 ):
     case = db.query(CriminalCase).options(
-        joinedload(CriminalCase.owner).joinedload(User.rank)
+        joinedload(CriminalCase.owner).joinedload(User.rank),
+        joinedload(CriminalCase.summary)
     ).filter(CriminalCase.id == case_id).first()
     if case is None:
         raise HTTPException(status_code=404, detail="Case not found")
 
     # Compute virtual fields
-    complaint_date_thai = format_thai_date(case.complaint_date)
-    incident_date_thai = format_thai_date(case.incident_date)
-    bank_accounts_count = get_bank_accounts_count(db, case.id)
-    suspects_count = get_suspects_count(db, case.id)
-
-    # Add row styling
-    complaint_date_str = complaint_date_thai or str(case.complaint_date) if case.complaint_date else ''
-    row_class = get_case_row_class(case.status, complaint_date_str, bank_accounts_count)
-    row_style = get_case_row_style(case.status, complaint_date_str, bank_accounts_count)
-
-    # Create response with virtual fields
-    response = CriminalCaseResponse.from_orm(case)
-    response.complaint_date_thai = complaint_date_thai
-    response.incident_date_thai = incident_date_thai
-    response.bank_accounts_count = bank_accounts_count
-    response.suspects_count = suspects_count
-    response.row_class = row_class
-    response.row_style = row_style
+    counts = get_case_counts(db, [case])[case.id]
+    response = build_case_response(case, counts)
 
     return response
 
@@ -255,24 +287,8 @@ def update_criminal_case(
         db.refresh(db_case)
 
         # Compute virtual fields
-        complaint_date_thai = format_thai_date(db_case.complaint_date)
-        incident_date_thai = format_thai_date(db_case.incident_date)
-        bank_accounts_count = get_bank_accounts_count(db, db_case.id)
-        suspects_count = get_suspects_count(db, db_case.id)
-
-        # Add row styling
-        complaint_date_str = complaint_date_thai or str(db_case.complaint_date) if db_case.complaint_date else ''
-        row_class = get_case_row_class(db_case.status, complaint_date_str, bank_accounts_count)
-        row_style = get_case_row_style(db_case.status, complaint_date_str, bank_accounts_count)
-
-        # Create response with virtual fields
-        response = CriminalCaseResponse.from_orm(db_case)
-        response.complaint_date_thai = complaint_date_thai
-        response.incident_date_thai = incident_date_thai
-        response.bank_accounts_count = bank_accounts_count
-        response.suspects_count = suspects_count
-        response.row_class = row_class
-        response.row_style = row_style
+        counts = get_case_counts_batch(db, [db_case.id])[db_case.id]
+        response = build_case_response(db_case, counts)
 
         return response
     except Exception as e:
@@ -1,8 +1,8 @@
 from fastapi import APIRouter, Depends, HTTPException
-from fastapi.responses import FileResponse, HTMLResponse
+from fastapi.responses import FileResponse, HTMLResponse, Response, StreamingResponse
 from sqlalchemy.orm import Session
 from app.core import get_db
-from app.models import User, BankAccount, Suspect, CriminalCase, Bank, TelcoMobileAccount, TelcoMobile, TelcoInternetAccount, TelcoInternet
+from app.models import User, BankAccount, Suspect, CriminalCase, Bank, TelcoMobileAccount, TelcoMobile, TelcoInternetAccount, TelcoInternet, PaymentGatewayAccount
 from app.models.non_bank_account import NonBankAccount
 from app.models.non_bank import NonBank
 from app.services import DocumentGenerator
@@ -13,6 +13,13 @@ from app.services.telco_mobile_summons_generator import TelcoMobileSummonsGenera
 from app.services.telco_internet_summons_generator import TelcoInternetSummonsGenerator
 from app.services.suspect_summons_generator import suspect_summons_generator
 from app.services.case_report_generator import CaseReportGenerator
+from app.services.case_aggregate import case_report_data, load_case_aggregate
+from app.services.case_report_bundle import build_pdf_documents, iter_combined_report_html, load_report_data
+from app.services.case_search_service import CaseSearchService
+from app.services.summons_bundle import render_merged_pdf, stream_zip
+from app.services.pdf_renderer import PDFRendererBusyError
+from app.services.master_data_cache import resolve_bank_id
+from app.schemas.document import CaseReportBatchRequest, SummonsBatchRequest
 from app.api.v1.auth import get_current_user
 import os
 
@@ -141,19 +148,8 @@ def generate_bank_envelope_html(
             }
     else:
         # Fallback: ลอง lookup จาก bank_name (กรณี bank_id ไม่มีค่า)
-        if bank_account.bank_name:
-            # ลองหาแบบตรงทั้งหมดก่อน
-            bank = db.query(Bank).filter(Bank.bank_name == bank_account.bank_name).first()
-            
-            # ถ้าไม่เจอ ลองตัดคำว่า "ธนาคาร" ออก
-            if not bank:
-                bank_name_without_prefix = bank_account.bank_name.replace('ธนาคาร', '').strip()
-                bank = db.query(Bank).filter(Bank.bank_name == bank_name_without_prefix).first()
-            
-            # ถ้ายังไม่เจอ ลองหาแบบ LIKE
-            if not bank:
-                bank_name_search = f"%{bank_account.bank_name.replace('ธนาคาร', '').strip()}%"
-                bank = db.query(Bank).filter(Bank.bank_name.like(bank_name_search)).first()
+        bank_id = resolve_bank_id(db, bank_account.bank_name)
+        bank = db.get(Bank, bank_id) if bank_id else None
             
         if bank:
             bank_address = {
@@ -803,124 +799,181 @@ def generate_case_report_html(
     current_user: User = Depends(get_current_user)
 ):
     """สร้างรายงานคดีแบบสมบูรณ์ (HTML)"""
-    from app.models.payment_gateway_account import PaymentGatewayAccount
-    from app.models.payment_gateway import PaymentGateway
-
-    # ดึงข้อมูลคดี
-    criminal_case = db.query(CriminalCase).filter(
-        CriminalCase.id == criminal_case_id
-    ).first()
+    # ดึงข้อมูลคดีพร้อมบัญชีทุกประเภทและผู้ต้องหา (จำนวน query คงที่ ไม่ขึ้นกับจำนวนบัญชี)
+    criminal_case = load_case_aggregate(db, criminal_case_id)
     if not criminal_case:
         raise HTTPException(status_code=404, detail="Criminal case not found")
 
-    # แปลงข้อมูลคดีเป็น dict
-    case_data = {
-        'case_number': criminal_case.case_number,
-        'case_id': criminal_case.case_id,
-        'complainant': criminal_case.complainant,
-        'damage_amount': criminal_case.damage_amount,
-        'complaint_date': criminal_case.complaint_date,
-        'incident_date': criminal_case.incident_date,
-        'status': criminal_case.status,
-        'case_type': criminal_case.case_type,
-        'court_name': criminal_case.court_name,
-    }
+    # สร้าง HTML
+    html_content = case_report_generator.generate_case_report_html(**case_report_data(criminal_case))
 
-    # ดึงรายการบัญชีธนาคาร
-    bank_accounts = db.query(BankAccount).filter(
-        BankAccount.criminal_case_id == criminal_case_id
-    ).all()
-    bank_accounts_list = [{
-        'bank_name': ba.bank_name,
-        'account_number': ba.account_number,
-        'account_name': ba.account_name,
-        'document_date': ba.document_date,
-        'reply_status': ba.reply_status,
-    } for ba in bank_accounts]
-
-    # ดึงรายการผู้ต้องหา
-    suspects = db.query(Suspect).filter(
-        Suspect.criminal_case_id == criminal_case_id
-    ).all()
-    suspects_list = [{
-        'suspect_name': s.suspect_name,
-        'suspect_id_card': s.suspect_id_card,
-        'document_date': s.document_date,
-        'appointment_date': s.appointment_date,
-        'reply_status': s.reply_status,
-    } for s in suspects]
-
-    # ดึงรายการ Non-Bank
-    non_bank_accounts = db.query(NonBankAccount).filter(
-        NonBankAccount.criminal_case_id == criminal_case_id
-    ).all()
-    non_bank_accounts_list = []
-    for nba in non_bank_accounts:
-        provider_name = ''
-        if nba.non_bank_id:
-            non_bank = db.query(NonBank).filter(NonBank.id == nba.non_bank_id).first()
-            if non_bank:
-                provider_name = non_bank.company_name
-
-        non_bank_accounts_list.append({
-            'provider_name': provider_name,
-            'account_number': nba.account_number,
-            'account_name': nba.account_name,
-            'document_date': nba.document_date,
-            'reply_status': nba.reply_status,
-        })
-
-    # ดึงรายการ Payment Gateway
-    pg_accounts = db.query(PaymentGatewayAccount).filter(
-        PaymentGatewayAccount.criminal_case_id == criminal_case_id
-    ).all()
-    pg_accounts_list = []
-    for pga in pg_accounts:
-        provider_name = ''
-        if pga.payment_gateway_id:
-            pg = db.query(PaymentGateway).filter(PaymentGateway.id == pga.payment_gateway_id).first()
-            if pg:
-                provider_name = pg.company_name
-
-        pg_accounts_list.append({
-            'provider_name': provider_name,
-            'account_number': pga.account_number,
-            'account_name': pga.account_name,
-            'document_date': pga.document_date,
-            'reply_status': pga.reply_status,
-        })
-
-    # ดึงรายการหมายเลขโทรศัพท์
-    telco_mobile_accounts = db.query(TelcoMobileAccount).filter(
-        TelcoMobileAccount.criminal_case_id == criminal_case_id
-    ).all()
-    telco_mobile_list = [{
-        'provider_name': tma.provider_name,
-        'phone_number': tma.phone_number,
-        'document_date': tma.document_date,
-        'reply_status': tma.reply_status,
-    } for tma in telco_mobile_accounts]
-
-    # ดึงรายการ IP Address
-    telco_internet_accounts = db.query(TelcoInternetAccount).filter(
-        TelcoInternetAccount.criminal_case_id == criminal_case_id
-    ).all()
-    telco_internet_list = [{
-        'provider_name': tia.provider_name,
-        'ip_address': tia.ip_address,
-        'document_date': tia.document_date,
-        'reply_status': tia.reply_status,
-    } for tia in telco_internet_accounts]
+    return HTMLResponse(content=html_content, media_type="text/html; charset=utf-8")
 
-    # สร้าง HTML
-    html_content = case_report_generator.generate_case_report_html(
-        case_data=case_data,
-        bank_accounts=bank_accounts_list,
-        suspects=suspects_list,
-        non_bank_accounts=non_bank_accounts_list,
-        payment_gateway_accounts=pg_accounts_list,
-        telco_mobile_accounts=telco_mobile_list,
-        telco_internet_accounts=telco_internet_list
+
+MAX_REPORT_CASES = 500
+
+@router.post("/case-report-batch")
+def generate_case_report_batch(
+    request: CaseReportBatchRequest,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """รายงานคดีหลายคดีรวมในเอกสารเดียว (เช่น รายงานประจำเดือน)
+
+    - criminal_case_ids: คดีที่เลือก เรียงตามลำดับที่ส่งมา
+    - ไม่ระบุ criminal_case_ids: ทุกคดีที่ตรงเงื่อนไขกรอง เรียงตามวันที่รับแจ้ง
+    - output_format='html': ทยอยส่ง HTML ทีละคดี (แต่ละคดีขึ้นหน้าใหม่เมื่อพิมพ์)
+    - output_format='pdf': PDF ไฟล์เดียว
+    - output_format='zip': ทยอยส่ง ZIP ของ PDF ชุดละไม่เกิน 20 คดี
+    """
+    if request.output_format not in ('html', 'pdf', 'zip'):
+        raise HTTPException(status_code=400, detail="output_format must be 'html', 'pdf' or 'zip'")
+
+    # ใช้เงื่อนไขและสิทธิ์การเห็นคดีเดียวกับหน้าค้นหาคดี
+    query = CaseSearchService(db).build_filtered_query(
+        current_user,
+        status=request.status,
+        case_type=request.case_type,
+        owner_id=request.owner_id,
+        bureau_id=request.bureau_id,
+        date_from=request.date_from,
+        date_to=request.date_to,
+        q=request.q,
+    ).with_entities(CriminalCase.id)
+
+    if request.criminal_case_ids:
+        requested = list(dict.fromkeys(request.criminal_case_ids))
+        if len(requested) > MAX_REPORT_CASES:
+            raise HTTPException(status_code=400, detail=f"พิมพ์รายงานได้ไม่เกิน {MAX_REPORT_CASES} คดีต่อครั้ง")
+        allowed = {case_id for (case_id,) in query.filter(CriminalCase.id.in_(requested))}
+        case_ids = [case_id for case_id in requested if case_id in allowed]
+    else:
+        rows = query.order_by(CriminalCase.complaint_date, CriminalCase.id).limit(MAX_REPORT_CASES + 1).all()
+        case_ids = [case_id for (case_id,) in rows]
+
+    if not case_ids:
+        raise HTTPException(status_code=404, detail="ไม่พบคดีสำหรับพิมพ์รายงาน")
+    if len(case_ids) > MAX_REPORT_CASES:
+        raise HTTPException(status_code=400, detail=f"พิมพ์รายงานได้ไม่เกิน {MAX_REPORT_CASES} คดีต่อครั้ง")
+
+    # โหลดข้อมูลทั้งหมดก่อนส่ง response (session ถูกปิดก่อนเริ่ม streaming)
+    report_data = load_report_data(db, case_ids)
+    title = f"รายงานคดีอาญา ({len(report_data)} คดี)"
+
+    if request.output_format == 'html':
+        return StreamingResponse(
+            iter_combined_report_html(report_data, title),
+            media_type="text/html; charset=utf-8"
+        )
+
+    documents = build_pdf_documents(report_data, title)
+    if request.output_format == 'pdf':
+        try:
+            pdf_bytes = render_merged_pdf(documents)
+        except PDFRendererBusyError:
+            raise HTTPException(status_code=503, detail="ระบบสร้าง PDF ไม่ว่าง กรุณาลองใหม่อีกครั้ง")
+        return Response(
+            content=pdf_bytes,
+            media_type="application/pdf",
+            headers={"Content-Disposition": 'attachment; filename="case_reports.pdf"'}
+        )
+
+    return StreamingResponse(
+        stream_zip(documents),
+        media_type="application/zip",
+        headers={"Content-Disposition": 'attachment; filename="case_reports.zip"'}
     )
 
-    return HTMLResponse(content=html_content, media_type="text/html; charset=utf-8")
\ No newline at end of file
+
+# ==================== Batch Summons (PDF/ZIP) ====================
+
+MAX_BATCH_DOCUMENTS = 400
+
+# account_type → (model, สร้างหมายเรียก, สร้างซอง) ใช้ endpoint เดิมของแต่ละประเภท
+BATCH_SUMMONS_TYPES = {
+    'bank': (BankAccount, generate_bank_summons_html, generate_bank_envelope_html),
+    'non_bank': (NonBankAccount, generate_non_bank_summons_html, generate_non_bank_envelope_html),
+    'payment_gateway': (PaymentGatewayAccount, generate_payment_gateway_summons_html, generate_payment_gateway_envelope_html),
+    'telco_mobile': (TelcoMobileAccount, generate_telco_mobile_summons_html, generate_telco_mobile_envelope_html),
+    'telco_internet': (TelcoInternetAccount, generate_telco_internet_summons_html, generate_telco_internet_envelope_html),
+}
+
+@router.post("/summons-batch")
+def generate_summons_batch(
+    request: SummonsBatchRequest,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """สร้างหมายเรียกและซองหลายฉบับพร้อมกัน (PDF)
+
+    - criminal_case_id: ทุกบัญชีทุกประเภทในคดี
+    - accounts: รายการบัญชีข้ามประเภท [{account_type, account_id}]
+    - output_format='zip': ทยอยส่ง ZIP ตามลำดับที่ render เสร็จ
+    - output_format='pdf': PDF ไฟล์เดียว เรียงตามบัญชี (หมายเรียก, ซอง)
+    """
+    if request.output_format not in ('zip', 'pdf'):
+        raise HTTPException(status_code=400, detail="output_format must be 'zip' or 'pdf'")
+    if (request.criminal_case_id is None) == (not request.accounts):
+        raise HTTPException(status_code=400, detail="ต้องระบุ criminal_case_id หรือ accounts อย่างใดอย่างหนึ่ง")
+
+    # รวบรวมบัญชีที่ต้องออกหมาย เฉพาะคดีที่ผู้ใช้เห็นได้ (สิทธิ์เดียวกับหน้าค้นหาคดี)
+    visible_cases = CaseSearchService(db).build_filtered_query(current_user).with_entities(CriminalCase.id)
+    items = []
+    if request.criminal_case_id is not None:
+        if not visible_cases.filter(CriminalCase.id == request.criminal_case_id).first():
+            raise HTTPException(status_code=404, detail="Criminal case not found")
+        for account_type, (model, _, _) in BATCH_SUMMONS_TYPES.items():
+            account_ids = db.query(model.id).filter(
+                model.criminal_case_id == request.criminal_case_id
+            ).order_by(model.id).all()
+            items.extend((account_type, account_id) for (account_id,) in account_ids)
+        bundle_name = f"summons_case_{request.criminal_case_id}"
+    else:
+        requested = list(dict.fromkeys((item.account_type, item.account_id) for item in request.accounts))
+        for account_type, _ in requested:
+            if account_type not in BATCH_SUMMONS_TYPES:
+                raise HTTPException(status_code=400, detail=f"Unsupported account_type: {account_type}")
+        allowed = set()
+        for account_type, (model, _, _) in BATCH_SUMMONS_TYPES.items():
+            account_ids = [account_id for (t, account_id) in requested if t == account_type]
+            if account_ids:
+                rows = db.query(model.id).filter(
+                    model.id.in_(account_ids), model.criminal_case_id.in_(visible_cases)
+                ).all()
+                allowed.update((account_type, account_id) for (account_id,) in rows)
+        items = [item for item in requested if item in allowed]
+        bundle_name = "summons_batch"
+
+    documents_per_account = 2 if request.include_envelopes else 1
+    if not items:
+        raise HTTPException(status_code=404, detail="ไม่พบบัญชีสำหรับออกหมายเรียก")
+    if len(items) * documents_per_account > MAX_BATCH_DOCUMENTS:
+        raise HTTPException(status_code=400, detail=f"สร้างได้ไม่เกิน {MAX_BATCH_DOCUMENTS} ฉบับต่อครั้ง")
+
+    # สร้าง HTML ทั้งหมดก่อน (ใช้ db session ใน thread นี้) แล้วค่อย render พร้อมกัน
+    documents = []
+    for seq, (account_type, account_id) in enumerate(items, start=1):
+        _, summons_html, envelope_html = BATCH_SUMMONS_TYPES[account_type]
+        prefix = f"{seq:03d}_{account_type}_{account_id}"
+        summons = summons_html(account_id, request.freeze_account, db, current_user)
+        documents.append((f"{prefix}_summons.pdf", summons.body.decode("utf-8")))
+        if request.include_envelopes:
+            envelope = envelope_html(account_id, db, current_user)
+            documents.append((f"{prefix}_envelope.pdf", envelope.body.decode("utf-8")))
+
+    if request.output_format == 'pdf':
+        try:
+            pdf_bytes = render_merged_pdf(documents)
+        except PDFRendererBusyError:
+            raise HTTPException(status_code=503, detail="ระบบสร้าง PDF ไม่ว่าง กรุณาลองใหม่อีกครั้ง")
+        return Response(
+            content=pdf_bytes,
+            media_type="application/pdf",
+            headers={"Content-Disposition": f'attachment; filename="{bundle_name}.pdf"'}
+        )
+
+    return StreamingResponse(
+        stream_zip(documents),
+        media_type="application/zip",
+        headers={"Content-Disposition": f'attachment; filename="{bundle_name}.zip"'}
+    )
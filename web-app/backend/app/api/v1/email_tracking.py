@@ -19,7 +19,7 @@ router = APIRouter()
 TRACKING_PIXEL = bytes.fromhex('47494638396101000100800000000000ffffff21f90401000000002c00000000010001000002024401003b')
 
 @router.get("/track/{email_log_id}.gif")
-async def track_email_open(
+def track_email_open(
     email_log_id: int,
     db: Session = Depends(get_db)
 ):
@@ -69,7 +69,7 @@ async def track_email_open(
         )
 
 @router.get("/track-link/{email_log_id}/{link_id}")
-async def track_link_click(
+def track_link_click(
     email_log_id: int,
     link_id: str,
     db: Session = Depends(get_db)
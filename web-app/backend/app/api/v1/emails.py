@@ -19,16 +19,11 @@ from app.models.payment_gateway_account import PaymentGatewayAccount
 from app.models.telco_mobile_account import TelcoMobileAccount
 from app.models.telco_internet_account import TelcoInternetAccount
 from app.models.bank_account import BankAccount
-from app.models.non_bank import NonBank
-from app.models.payment_gateway import PaymentGateway
-from app.models.telco_mobile import TelcoMobile
-from app.models.telco_internet import TelcoInternet
-from app.models.bank import Bank
-from app.models.non_bank_transaction import NonBankTransaction
-from app.models.payment_gateway_transaction import PaymentGatewayTransaction
 from app.schemas.email import EmailSendRequest, EmailSendResponse, EmailLogResponse, EmailHistoryResponse
 from app.api.v1.auth import get_current_user
-from app.services.email_service import EmailService
+from app.services.case_aggregate import load_summons_account
+from app.services.email_queue import enqueue_email
+from app.services.pdf_renderer import get_browser_pool
 from app.services.non_bank_summons_generator import NonBankSummonsGenerator
 from app.services.payment_gateway_summons_generator import PaymentGatewaySummonsGenerator
 from app.services.telco_mobile_summons_generator import TelcoMobileSummonsGenerator
@@ -36,17 +31,6 @@ from app.services.telco_internet_summons_generator import TelcoInternetSummonsGe
 
 router = APIRouter()
 
-def get_email_service() -> EmailService:
-    """สร้าง EmailService instance จาก configuration"""
-    return EmailService(
-        smtp_host=settings.SMTP_HOST,
-        smtp_port=settings.SMTP_PORT,
-        smtp_username=settings.SMTP_USERNAME,
-        smtp_password=settings.SMTP_PASSWORD,
-        from_email=settings.FROM_EMAIL,
-        from_name=settings.FROM_NAME
-    )
-
 @router.post("/send-summons", response_model=EmailSendResponse)
 def send_summons_email(
     request: EmailSendRequest,
@@ -80,24 +64,18 @@ def send_summons_email(
 
     try:
         if request.account_type == 'non_bank':
-            account_data = db.query(NonBankAccount).filter(
-                NonBankAccount.id == request.account_id
-            ).first()
+            account_data = load_summons_account(db, NonBankAccount, request.account_id)
             if not account_data:
                 raise HTTPException(status_code=404, detail="Non-Bank account not found")
 
             criminal_case = account_data.criminal_case
-            provider_data = db.query(NonBank).filter(
-                NonBank.id == account_data.non_bank_id
-            ).first()
+            provider_data = account_data.non_bank
 
             # ดึงชื่อผู้ให้บริการจาก relationship
             provider_name = provider_data.company_name if provider_data else 'ไม่ระบุ'
 
-            # ดึงรายการ transactions
-            transactions = db.query(NonBankTransaction).filter(
-                NonBankTransaction.non_bank_account_id == account_data.id
-            ).all()
+            # รายการ transactions (โหลดพร้อมธนาคารต้นทางแล้ว)
+            transactions = account_data.transactions
 
             # แปลง transactions เป็น dict
             transactions_list = []
@@ -139,24 +117,18 @@ def send_summons_email(
             )
 
         elif request.account_type == 'payment_gateway':
-            account_data = db.query(PaymentGatewayAccount).filter(
-                PaymentGatewayAccount.id == request.account_id
-            ).first()
+            account_data = load_summons_account(db, PaymentGatewayAccount, request.account_id)
             if not account_data:
                 raise HTTPException(status_code=404, detail="Payment Gateway account not found")
 
             criminal_case = account_data.criminal_case
-            provider_data = db.query(PaymentGateway).filter(
-                PaymentGateway.id == account_data.payment_gateway_id
-            ).first()
+            provider_data = account_data.payment_gateway
 
             # ดึงชื่อผู้ให้บริการจาก relationship
             provider_name = provider_data.company_name if provider_data else 'ไม่ระบุ'
 
-            # ดึงรายการ transactions
-            transactions = db.query(PaymentGatewayTransaction).filter(
-                PaymentGatewayTransaction.payment_gateway_account_id == account_data.id
-            ).all()
+            # รายการ transactions (โหลดพร้อมธนาคารต้นทางแล้ว)
+            transactions = account_data.transactions
 
             # แปลง transactions เป็น dict
             transactions_list = []
@@ -197,16 +169,12 @@ def send_summons_email(
             )
 
         elif request.account_type == 'telco_mobile':
-            account_data = db.query(TelcoMobileAccount).filter(
-                TelcoMobileAccount.id == request.account_id
-            ).first()
+            account_data = load_summons_account(db, TelcoMobileAccount, request.account_id)
             if not account_data:
                 raise HTTPException(status_code=404, detail="Telco Mobile account not found")
 
             criminal_case = account_data.criminal_case
-            provider_data = db.query(TelcoMobile).filter(
-                TelcoMobile.id == account_data.telco_mobile_id
-            ).first()
+            provider_data = account_data.telco_mobile
 
             # ดึงชื่อผู้ให้บริการจาก relationship
             provider_name = provider_data.company_name if provider_data else 'ไม่ระบุ'
@@ -229,16 +197,12 @@ def send_summons_email(
             )
 
         elif request.account_type == 'telco_internet':
-            account_data = db.query(TelcoInternetAccount).filter(
-                TelcoInternetAccount.id == request.account_id
-            ).first()
+            account_data = load_summons_account(db, TelcoInternetAccount, request.account_id)
             if not account_data:
                 raise HTTPException(status_code=404, detail="Telco Internet account not found")
 
             criminal_case = account_data.criminal_case
-            provider_data = db.query(TelcoInternet).filter(
-                TelcoInternet.id == account_data.telco_internet_id
-            ).first()
+            provider_data = account_data.telco_internet
 
             # ดึงชื่อผู้ให้บริการจาก relationship
             provider_name = provider_data.company_name if provider_data else 'ไม่ระบุ'
@@ -261,16 +225,12 @@ def send_summons_email(
             )
 
         elif request.account_type == 'bank':
-            account_data = db.query(BankAccount).filter(
-                BankAccount.id == request.account_id
-            ).first()
+            account_data = load_summons_account(db, BankAccount, request.account_id)
             if not account_data:
                 raise HTTPException(status_code=404, detail="Bank account not found")
 
             criminal_case = account_data.criminal_case
-            provider_data = db.query(Bank).filter(
-                Bank.id == account_data.bank_id
-            ).first()
+            provider_data = account_data.bank
 
             # ดึงชื่อธนาคารจาก account data
             provider_name = account_data.bank_name
@@ -302,9 +262,6 @@ def send_summons_email(
         if not criminal_case:
             raise HTTPException(status_code=404, detail="Criminal case not found")
 
-        # สร้าง EmailService
-        email_service = get_email_service()
-
         # สร้างชื่อผู้ส่งแบบเต็ม: ยศ + ชื่อ + ตำแหน่ง
         sender_full_name = current_user.full_name
         if current_user.rank:
@@ -312,7 +269,7 @@ def send_summons_email(
         if current_user.position:
             sender_full_name = f"{sender_full_name} {current_user.position}"
 
-        # สร้าง email_log ก่อน เพื่อจะได้มี ID สำหรับ tracking
+        # บันทึก email_log เข้าคิว (email_worker.py สร้าง PDF และส่งพร้อม tracking pixel)
         email_log = EmailLog(
             account_type=request.account_type,
             account_id=request.account_id,
@@ -320,52 +277,24 @@ def send_summons_email(
             recipient_email=request.recipient_email,
             subject=f"หมายเรียกพยานเอกสาร {account_data.document_number} - CaseID {criminal_case.case_id or criminal_case.case_number}",
             document_type=request.document_type,
-            status='pending',  # เริ่มต้นเป็น pending
-            sent_by=current_user.id,
-            retry_count=0
+            sent_by=current_user.id
         )
-        db.add(email_log)
-        db.commit()
-        db.refresh(email_log)
-
-        # Debug: ตรวจสอบเบอร์โทรของ user
-        print(f"DEBUG: current_user.phone_number = '{current_user.phone_number}'")
-        print(f"DEBUG: current_user.email = '{current_user.email}'")
-        print(f"DEBUG: current_user.full_name = '{current_user.full_name}'")
-        
-        # ส่งอีเมล์ พร้อม tracking pixel (ใช้ email_log.id)
-        result = email_service.send_summons_email(
-            to_email=request.recipient_email,
-            provider_name=provider_name or 'ไม่ระบุ',
-            document_number=account_data.document_number or '',
-            html_content=html_content,
-            case_number=criminal_case.case_id or criminal_case.case_number or '',
-            account_type=request.account_type,
-            sender_name=sender_full_name,  # ยศ + ชื่อ + ตำแหน่ง (แสดงใน From)
-            sender_email=current_user.email,  # อีเมล์ของ user (ใช้สำหรับ Reply-To และ CC)
-            sender_phone=current_user.phone_number,  # เบอร์โทรของ user
-            email_log_id=email_log.id,  # สำหรับ tracking pixel
-            backend_url="http://localhost:8000"  # TODO: ใช้จาก settings
-        )
-
-        # อัปเดตสถานะ email_log หลังส่งเสร็จ
-        email_log.status = result['status']
-        email_log.sent_at = datetime.fromisoformat(result['sent_at']) if result['status'] == 'sent' else None
-        email_log.error_message = result.get('message') if result['status'] == 'failed' else None
-        email_log.pdf_filename = result.get('pdf_filename')
-        db.commit()
-        db.refresh(email_log)
-
-        # ลบไฟล์ PDF ชั่วคราว (ถ้าต้องการ)
-        if result.get('pdf_path'):
-            email_service.cleanup_temp_file(result['pdf_path'])
+        email_log = enqueue_email(db, email_log, payload={
+            'provider_name': provider_name or 'ไม่ระบุ',
+            'document_number': account_data.document_number or '',
+            'html_content': html_content,
+            'case_number': criminal_case.case_id or criminal_case.case_number or '',
+            'account_type': request.account_type,
+            'sender_name': sender_full_name,  # ยศ + ชื่อ + ตำแหน่ง (แสดงใน From)
+            'sender_email': current_user.email,  # อีเมล์ของ user (ใช้สำหรับ Reply-To และ CC)
+            'sender_phone': current_user.phone_number,  # เบอร์โทรของ user
+            'backend_url': "http://localhost:8000"  # TODO: ใช้จาก settings
+        })
 
         return EmailSendResponse(
-            status=result['status'],
-            message=result['message'],
-            email_log_id=email_log.id,
-            sent_at=email_log.sent_at,
-            pdf_filename=result.get('pdf_filename')
+            status=email_log.status,
+            message="อีเมล์อยู่ในคิวรอส่ง",
+            email_log_id=email_log.id
         )
 
     except HTTPException:
@@ -422,6 +351,15 @@ def get_email_history(
         emails=emails
     )
 
+@router.get("/pdf-renderer/metrics")
+def get_pdf_renderer_metrics(
+    current_user: User = Depends(get_current_user)
+):
+    """
+    สถานะของ BrowserPool (คิว, จำนวน render, latency p50/p95/p99)
+    """
+    return get_browser_pool().metrics()
+
 @router.get("/log/{email_log_id}", response_model=EmailLogResponse)
 def get_email_log(
     email_log_id: int,
@@ -437,6 +375,28 @@ def get_email_log(
 
     return email_log
 
+@router.post("/log/{email_log_id}/retry", response_model=EmailSendResponse)
+def retry_email(
+    email_log_id: int,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    นำอีเมล์ที่ส่งไม่สำเร็จกลับเข้าคิวอีกครั้ง
+    """
+    email_log = db.query(EmailLog).filter(EmailLog.id == email_log_id).first()
+    if not email_log:
+        raise HTTPException(status_code=404, detail="Email log not found")
+    if email_log.status != 'failed' or not email_log.payload:
+        raise HTTPException(status_code=400, detail="ส่งซ้ำได้เฉพาะอีเมล์ที่ส่งไม่สำเร็จ")
+
+    email_log = enqueue_email(db, email_log, payload=email_log.payload)
+    return EmailSendResponse(
+        status=email_log.status,
+        message="อีเมล์อยู่ในคิวรอส่ง",
+        email_log_id=email_log.id
+    )
+
 @router.get("/by-account/{account_type}/{account_id}", response_model=EmailHistoryResponse)
 def get_email_logs_by_account(
     account_type: str,
@@ -1,23 +1,25 @@
 from typing import List
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request
 from sqlalchemy.orm import Session
 from app.core import get_db
 from app.api.v1.auth import get_current_user
 from app.models.bank import Bank
 from app.schemas.bank import Bank as BankSchema, BankCreate, BankUpdate
+from app.services.master_data_cache import get_master_data, invalidate_master_data, master_data_response
 
 router = APIRouter()
 
 
 @router.get("/", response_model=List[BankSchema])
 def get_banks(
+    request: Request,
     db: Session = Depends(get_db),
     skip: int = 0,
     limit: int = 100
 ):
-    """Get all banks"""
-    banks = db.query(Bank).order_by(Bank.bank_name).offset(skip).limit(limit).all()
-    return banks
+    """Get all banks (cached, supports If-None-Match)"""
+    snapshot = get_master_data(db, "banks")
+    return master_data_response(request, snapshot, snapshot.rows[skip:skip + limit])
 
 
 @router.get("/{bank_id}", response_model=BankSchema)
@@ -47,6 +49,7 @@ def create_bank(
     bank = Bank(**bank_in.model_dump())
     db.add(bank)
     db.commit()
+    invalidate_master_data("banks")
     db.refresh(bank)
     return bank
 
@@ -68,6 +71,7 @@ def update_bank(
         setattr(bank, field, value)
 
     db.commit()
+    invalidate_master_data("banks")
     db.refresh(bank)
     return bank
 
@@ -92,4 +96,5 @@ def delete_bank(
 
     db.delete(bank)
     db.commit()
+    invalidate_master_data("banks")
     return {"message": "Bank deleted successfully"}
@@ -1,16 +1,18 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request
 from sqlalchemy.orm import Session
 from typing import List
 from app.core.database import get_db
 from app.models.charge import Charge
 from app.schemas.charge import ChargeCreate, ChargeUpdate, ChargeResponse
 from app.api.v1.auth import get_current_user, require_admin
+from app.services.master_data_cache import get_master_data, invalidate_master_data, master_data_response
 from app.models.user import User
 
 router = APIRouter()
 
 @router.get("/", response_model=List[ChargeResponse])
 def get_charges(
+    request: Request,
     skip: int = 0,
     limit: int = 100,
     db: Session = Depends(get_db),
@@ -19,8 +21,8 @@ def get_charges(
     """
     Get all charges (ดึงข้อมูลข้อหาทั้งหมด)
     """
-    charges = db.query(Charge).offset(skip).limit(limit).all()
-    return charges
+    snapshot = get_master_data(db, "charges")
+    return master_data_response(request, snapshot, snapshot.rows[skip:skip + limit])
 
 @router.get("/{charge_id}", response_model=ChargeResponse)
 def get_charge(
@@ -58,6 +60,7 @@ def create_charge(
     db_charge = Charge(**charge.dict())
     db.add(db_charge)
     db.commit()
+    invalidate_master_data("charges")
     db.refresh(db_charge)
     return db_charge
 
@@ -92,6 +95,7 @@ def update_charge(
         setattr(db_charge, field, value)
     
     db.commit()
+    invalidate_master_data("charges")
     db.refresh(db_charge)
     return db_charge
 
@@ -113,5 +117,6 @@ def delete_charge(
     
     db.delete(db_charge)
     db.commit()
+    invalidate_master_data("charges")
     return {"message": f"Charge '{db_charge.charge_name}' deleted successfully"}
 
@@ -1,15 +1,17 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request
 from sqlalchemy.orm import Session
 from typing import List
 from app.core import get_db
 from app.models import Exchange, User
 from app.schemas.exchange import ExchangeCreate, ExchangeUpdate, ExchangeResponse
 from app.api.v1.auth import get_current_user
+from app.services.master_data_cache import get_master_data, invalidate_master_data, master_data_response
 
 router = APIRouter()
 
 @router.get("/", response_model=List[ExchangeResponse])
 def get_exchanges(
+    request: Request,
     skip: int = 0,
     limit: int = 100,
     active_only: bool = True,
@@ -24,13 +26,11 @@ def get_exchanges(
         limit: จำนวนสูงสุดที่ต้องการ
         active_only: แสดงเฉพาะที่ active (default: True)
     """
-    query = db.query(Exchange)
-    
+    snapshot = get_master_data(db, "exchanges")
+    rows = snapshot.rows
     if active_only:
-        query = query.filter(Exchange.is_active == True)
-    
-    exchanges = query.order_by(Exchange.company_name_short).offset(skip).limit(limit).all()
-    return exchanges
+        rows = [row for row in rows if row["is_active"]]
+    return master_data_response(request, snapshot, rows[skip:skip + limit])
 
 @router.get("/{exchange_id}", response_model=ExchangeResponse)
 def get_exchange(
@@ -63,6 +63,7 @@ def create_exchange(
     db_exchange = Exchange(**exchange.dict())
     db.add(db_exchange)
     db.commit()
+    invalidate_master_data("exchanges")
     db.refresh(db_exchange)
     return db_exchange
 
@@ -88,6 +89,7 @@ def update_exchange(
         setattr(db_exchange, field, value)
     
     db.commit()
+    invalidate_master_data("exchanges")
     db.refresh(db_exchange)
     return db_exchange
 
@@ -108,5 +110,6 @@ def delete_exchange(
     
     db.delete(db_exchange)
     db.commit()
+    invalidate_master_data("exchanges")
     return {"message": "Exchange deleted successfully"}
 
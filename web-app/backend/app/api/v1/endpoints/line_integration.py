@@ -28,7 +28,7 @@ async def line_callback(
         return RedirectResponse(url=f"http://localhost:3001/profile?line=error&message={str(e)}")
 
 @router.get("/status")
-async def get_line_status(
+def get_line_status(
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
@@ -49,7 +49,7 @@ async def get_line_status(
     }
 
 @router.put("/preferences")
-async def update_notification_preferences(
+def update_notification_preferences(
     preferences: dict,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
@@ -58,7 +58,7 @@ async def update_notification_preferences(
     return result
 
 @router.delete("/disconnect")
-async def disconnect_line(
+def disconnect_line(
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
@@ -67,15 +67,13 @@ async def disconnect_line(
 
 @router.post("/test-notification")
 async def send_test_notification(
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: User = Depends(get_current_user)
 ):
     success = await LineService.send_notification(
         user_id=current_user.id,
         notification_type="connection_test",
         title="🔔 ทดสอบการแจ้งเตือน",
-        message="นี่คือข้อความทดสอบจากระบบ CCMS\n\nถ้าคุณเห็นข้อความนี้แสดงว่าระบบการแจ้งเตือนทำงานปกติ",
-        db=db
+        message="นี่คือข้อความทดสอบจากระบบ CCMS\n\nถ้าคุณเห็นข้อความนี้แสดงว่าระบบการแจ้งเตือนทำงานปกติ"
     )
 
     if success:
@@ -84,7 +82,7 @@ async def send_test_notification(
         raise HTTPException(status_code=400, detail="ไม่สามารถส่งการแจ้งเตือนได้")
 
 @router.get("/notification-history")
-async def get_notification_history(
+def get_notification_history(
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db),
     limit: int = 50
@@ -1,15 +1,17 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request
 from sqlalchemy.orm import Session
 from typing import List
 from app.core import get_db
 from app.models import NonBank, User
 from app.schemas.non_bank import NonBankCreate, NonBankUpdate, NonBankResponse
 from app.api.v1.auth import get_current_user
+from app.services.master_data_cache import get_master_data, invalidate_master_data, master_data_response
 
 router = APIRouter()
 
 @router.get("/", response_model=List[NonBankResponse])
 def get_non_banks(
+    request: Request,
     skip: int = 0,
     limit: int = 100,
     active_only: bool = True,
@@ -24,13 +26,11 @@ def get_non_banks(
         limit: จำนวนสูงสุดที่ต้องการ
         active_only: แสดงเฉพาะที่ active (default: True)
     """
-    query = db.query(NonBank)
-    
+    snapshot = get_master_data(db, "non_banks")
+    rows = snapshot.rows
     if active_only:
-        query = query.filter(NonBank.is_active == True)
-    
-    non_banks = query.order_by(NonBank.company_name_short).offset(skip).limit(limit).all()
-    return non_banks
+        rows = [row for row in rows if row["is_active"]]
+    return master_data_response(request, snapshot, rows[skip:skip + limit])
 
 @router.get("/{non_bank_id}", response_model=NonBankResponse)
 def get_non_bank(
@@ -63,6 +63,7 @@ def create_non_bank(
     db_non_bank = NonBank(**non_bank.dict())
     db.add(db_non_bank)
     db.commit()
+    invalidate_master_data("non_banks")
     db.refresh(db_non_bank)
     return db_non_bank
 
@@ -88,6 +89,7 @@ def update_non_bank(
         setattr(db_non_bank, field, value)
     
     db.commit()
+    invalidate_master_data("non_banks")
     db.refresh(db_non_bank)
     return db_non_bank
 
@@ -108,5 +110,6 @@ def delete_non_bank(
     
     db.delete(db_non_bank)
     db.commit()
+    invalidate_master_data("non_banks")
     return {"message": "Non-Bank company deleted successfully"}
 
@@ -7,9 +7,11 @@ from app.schemas.organization import (
     BureauResponse, BureauUpdate,
     DivisionResponse, DivisionUpdate,
     SupervisionResponse, SupervisionUpdate,
-    OrganizationTree, BureauWithDivisions, DivisionWithSupervisions, SupervisionWithStats
+    OrganizationTree
 )
 from app.api.v1.auth import get_current_user
+from app.core.principal_cache import invalidate_all_principals
+from app.services import organization_tree
 
 router = APIRouter()
 
@@ -47,6 +49,10 @@ def update_bureau(
     
     db.commit()
     db.refresh(db_bureau)
+
+    # สิทธิ์เข้าใช้งานของผู้ใช้ในหน่วยงานนี้เปลี่ยน
+    invalidate_all_principals()
+    organization_tree.invalidate_organization_tree()
     return db_bureau
 
 # ========================================
@@ -89,6 +95,10 @@ def update_division(
     
     db.commit()
     db.refresh(db_division)
+
+    # สิทธิ์เข้าใช้งานของผู้ใช้ในหน่วยงานนี้เปลี่ยน
+    invalidate_all_principals()
+    organization_tree.invalidate_organization_tree()
     return db_division
 
 # ========================================
@@ -131,6 +141,10 @@ def update_supervision(
     
     db.commit()
     db.refresh(db_supervision)
+
+    # สิทธิ์เข้าใช้งานของผู้ใช้ในหน่วยงานนี้เปลี่ยน
+    invalidate_all_principals()
+    organization_tree.invalidate_organization_tree()
     return db_supervision
 
 # ========================================
@@ -143,75 +157,5 @@ def get_organization_tree(
     current_user: User = Depends(get_current_user)
 ):
     """ดึงโครงสร้างหน่วยงานทั้งหมดแบบต้นไม้ พร้อมสถิติ"""
-    
-    bureaus = db.query(Bureau).order_by(Bureau.name_short).all()
-    
-    result_bureaus = []
-    total_users = 0
-    active_count = 0
-    inactive_count = 0
-    
-    for bureau in bureaus:
-        # นับ users ใน bureau
-        bureau_user_count = db.query(User).filter(User.bureau_id == bureau.id).count()
-        total_users += bureau_user_count
-        
-        if bureau.is_active:
-            active_count += 1
-        else:
-            inactive_count += 1
-        
-        # ดึง divisions
-        divisions = db.query(Division).filter(Division.bureau_id == bureau.id).order_by(Division.id).all()
-        result_divisions = []
-        
-        for division in divisions:
-            division_user_count = db.query(User).filter(User.division_id == division.id).count()
-            
-            if division.is_active:
-                active_count += 1
-            else:
-                inactive_count += 1
-            
-            # ดึง supervisions
-            supervisions = db.query(Supervision).filter(Supervision.division_id == division.id).order_by(Supervision.id).all()
-            result_supervisions = []
-            
-            for supervision in supervisions:
-                supervision_user_count = db.query(User).filter(User.supervision_id == supervision.id).count()
-                
-                if supervision.is_active:
-                    active_count += 1
-                else:
-                    inactive_count += 1
-                
-                result_supervisions.append(
-                    SupervisionWithStats(
-                        **supervision.__dict__,
-                        user_count=supervision_user_count
-                    )
-                )
-            
-            result_divisions.append(
-                DivisionWithSupervisions(
-                    **division.__dict__,
-                    supervisions=result_supervisions,
-                    user_count=division_user_count
-                )
-            )
-        
-        result_bureaus.append(
-            BureauWithDivisions(
-                **bureau.__dict__,
-                divisions=result_divisions,
-                user_count=bureau_user_count
-            )
-        )
-    
-    return OrganizationTree(
-        bureaus=result_bureaus,
-        total_users=total_users,
-        active_organizations=active_count,
-        inactive_organizations=inactive_count
-    )
+    return organization_tree.get_organization_tree(db)
 
@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request
 from sqlalchemy.orm import Session
 from typing import List
 from app.core.database import get_db
@@ -10,21 +10,22 @@ from app.schemas.payment_gateway import (
     PaymentGatewayUpdate
 )
 from app.api.v1.auth import get_current_user
+from app.services.master_data_cache import get_master_data, invalidate_master_data, master_data_response
 
 router = APIRouter()
 
 @router.get("/", response_model=List[PaymentGatewaySchema])
 def get_payment_gateways(
+    request: Request,
     skip: int = 0,
     limit: int = 100,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
     """ดึงรายการ Payment Gateway ทั้งหมด"""
-    payment_gateways = db.query(PaymentGateway).filter(
-        PaymentGateway.is_active == True
-    ).offset(skip).limit(limit).all()
-    return payment_gateways
+    snapshot = get_master_data(db, "payment_gateways")
+    rows = [row for row in snapshot.rows if row["is_active"]]
+    return master_data_response(request, snapshot, rows[skip:skip + limit])
 
 @router.get("/{payment_gateway_id}", response_model=PaymentGatewaySchema)
 def get_payment_gateway(
@@ -50,6 +51,7 @@ def create_payment_gateway(
     db_payment_gateway = PaymentGateway(**payment_gateway.dict())
     db.add(db_payment_gateway)
     db.commit()
+    invalidate_master_data("payment_gateways")
     db.refresh(db_payment_gateway)
     return db_payment_gateway
 
@@ -72,6 +74,7 @@ def update_payment_gateway(
         setattr(db_payment_gateway, field, value)
     
     db.commit()
+    invalidate_master_data("payment_gateways")
     db.refresh(db_payment_gateway)
     return db_payment_gateway
 
@@ -90,5 +93,6 @@ def delete_payment_gateway(
     
     db.delete(db_payment_gateway)
     db.commit()
+    invalidate_master_data("payment_gateways")
     return {"message": "Payment gateway deleted successfully"}
 
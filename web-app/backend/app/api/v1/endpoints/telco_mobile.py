@@ -1,15 +1,17 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request
 from sqlalchemy.orm import Session
 from typing import List
 from app.core import get_db
 from app.models import TelcoMobile, User
 from app.schemas.telco_mobile import TelcoMobileCreate, TelcoMobileUpdate, TelcoMobileResponse
 from app.api.v1.auth import get_current_user
+from app.services.master_data_cache import get_master_data, invalidate_master_data, master_data_response
 
 router = APIRouter()
 
 @router.get("/", response_model=List[TelcoMobileResponse])
 def get_telco_mobiles(
+    request: Request,
     skip: int = 0,
     limit: int = 100,
     active_only: bool = True,
@@ -24,13 +26,11 @@ def get_telco_mobiles(
         limit: จำนวนสูงสุดที่ต้องการ
         active_only: แสดงเฉพาะที่ active (default: True)
     """
-    query = db.query(TelcoMobile)
-    
+    snapshot = get_master_data(db, "telco_mobile")
+    rows = snapshot.rows
     if active_only:
-        query = query.filter(TelcoMobile.is_active == True)
-    
-    telcos = query.order_by(TelcoMobile.company_name_short).offset(skip).limit(limit).all()
-    return telcos
+        rows = [row for row in rows if row["is_active"]]
+    return master_data_response(request, snapshot, rows[skip:skip + limit])
 
 @router.get("/{telco_id}", response_model=TelcoMobileResponse)
 def get_telco_mobile(
@@ -63,6 +63,7 @@ def create_telco_mobile(
     db_telco = TelcoMobile(**telco.dict())
     db.add(db_telco)
     db.commit()
+    invalidate_master_data("telco_mobile")
     db.refresh(db_telco)
     return db_telco
 
@@ -88,6 +89,7 @@ def update_telco_mobile(
         setattr(db_telco, field, value)
     
     db.commit()
+    invalidate_master_data("telco_mobile")
     db.refresh(db_telco)
     return db_telco
 
@@ -108,5 +110,6 @@ def delete_telco_mobile(
     
     db.delete(db_telco)
     db.commit()
+    invalidate_master_data("telco_mobile")
     return {"message": "Telco Mobile company deleted successfully"}
 
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+API Endpoints สำหรับ export ข้อมูลเป็นไฟล์ Excel (.xlsx) แบบ streaming
+"""
+
+from datetime import date, datetime
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session
+
+from app.core.database import get_db
+from app.models.user import User
+from app.api.v1.auth import get_current_user
+from app.services.export_service import EXPORT_DATASETS, build_export_query, stream_export
+
+router = APIRouter()
+
+XLSX_MEDIA_TYPE = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+
+
+@router.get("/{dataset}")
+def export_xlsx(
+    dataset: str,
+    criminal_case_id: Optional[int] = None,
+    status: Optional[str] = None,
+    case_type: Optional[str] = None,
+    owner_id: Optional[int] = None,
+    bureau_id: Optional[int] = None,
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    q: Optional[str] = Query(None, description="ค้นหาจากชื่อผู้เสียหาย / CaseID / เลขคดี"),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Export ข้อมูลเป็น .xlsx (ทยอยส่งทีละส่วน หน่วยความจำคงที่ไม่ขึ้นกับจำนวนแถว)
+
+    dataset: cases, bank_accounts, non_bank_accounts, payment_gateway_accounts,
+    telco_mobile_accounts, telco_internet_accounts, suspects, cfr
+
+    - criminal_case_id: เฉพาะคดีเดียว
+    - เงื่อนไขอื่นเหมือน /criminal-cases/search (ข้อมูลลูกกรองตามคดีที่ผ่านเงื่อนไข)
+    """
+    if dataset not in EXPORT_DATASETS:
+        raise HTTPException(
+            status_code=404,
+            detail=f"Unknown dataset: {dataset} (ใช้ได้: {', '.join(EXPORT_DATASETS)})"
+        )
+
+    query = build_export_query(
+        db,
+        dataset,
+        current_user,
+        criminal_case_id=criminal_case_id,
+        status=status,
+        case_type=case_type,
+        owner_id=owner_id,
+        bureau_id=bureau_id,
+        date_from=date_from,
+        date_to=date_to,
+        q=q,
+    )
+
+    suffix = f"_case_{criminal_case_id}" if criminal_case_id is not None else ""
+    filename = f"{dataset}{suffix}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx"
+    return StreamingResponse(
+        stream_export(query, dataset),
+        media_type=XLSX_MEDIA_TYPE,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
@@ -0,0 +1,45 @@
+"""
+API endpoints สำหรับค้นหาบัญชี/เบอร์โทรที่เชื่อมโยงหลายคดี
+"""
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.orm import Session
+from typing import Optional
+from app.core import get_db
+from app.models import CriminalCase, User
+from app.api.v1.auth import get_current_user
+from app.services.linkage_service import LinkageService
+
+router = APIRouter()
+
+
+@router.get("/lookup")
+def lookup_identifier(
+    identifier: str = Query(..., min_length=3, description="เลขบัญชี/เบอร์โทร/PromptPay/เลขบัตรประชาชน"),
+    identifier_type: Optional[str] = Query(None, description="account | phone | promptpay | id_card"),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """ค้นหาทุกคดีที่มีเลขบัญชี/เบอร์โทร/PromptPay/เลขบัตรประชาชนนี้"""
+    try:
+        return LinkageService(db).find_cases(identifier, identifier_type)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.get("/cases/{criminal_case_id}/shared")
+def get_shared_identifiers(
+    criminal_case_id: int,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """รายการบัญชี/เบอร์โทร/PromptPay/เลขบัตรประชาชนของคดีนี้ที่พบในคดีอื่นด้วย"""
+    case = db.query(CriminalCase.id).filter(CriminalCase.id == criminal_case_id).first()
+    if not case:
+        raise HTTPException(status_code=404, detail="ไม่พบข้อมูลคดี")
+
+    shared = LinkageService(db).shared_identifiers(criminal_case_id)
+    return {
+        "criminal_case_id": criminal_case_id,
+        "shared_count": len(shared),
+        "shared": shared
+    }
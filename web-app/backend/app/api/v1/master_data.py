@@ -19,6 +19,7 @@ from app.schemas.telco_internet import TelcoInternetResponse as TelcoInternetSch
 from app.schemas.exchange import ExchangeResponse as ExchangeSchema, ExchangeCreate, ExchangeUpdate
 from app.models.charge import Charge
 from app.schemas.charge import ChargeResponse as ChargeSchema, ChargeCreate, ChargeUpdate
+from app.services.master_data_cache import invalidate_master_data
 
 router = APIRouter()
 
@@ -63,6 +64,7 @@ def create_bank(
     db_bank = Bank(**bank.dict())
     db.add(db_bank)
     db.commit()
+    invalidate_master_data("banks")
     db.refresh(db_bank)
     return db_bank
 
@@ -90,6 +92,7 @@ def update_bank(
         setattr(db_bank, key, value)
 
     db.commit()
+    invalidate_master_data("banks")
     db.refresh(db_bank)
     return db_bank
 
@@ -119,6 +122,7 @@ def delete_bank(
 
     db.delete(db_bank)
     db.commit()
+    invalidate_master_data("banks")
     return {"message": "Bank deleted successfully"}
 
 
@@ -161,6 +165,7 @@ def create_non_bank(
     db_non_bank = NonBank(**non_bank.dict())
     db.add(db_non_bank)
     db.commit()
+    invalidate_master_data("non_banks")
     db.refresh(db_non_bank)
     return db_non_bank
 
@@ -187,6 +192,7 @@ def update_non_bank(
         setattr(db_non_bank, key, value)
 
     db.commit()
+    invalidate_master_data("non_banks")
     db.refresh(db_non_bank)
     return db_non_bank
 
@@ -215,6 +221,7 @@ def delete_non_bank(
 
     db.delete(db_non_bank)
     db.commit()
+    invalidate_master_data("non_banks")
     return {"message": "Non-Bank deleted successfully"}
 
 
@@ -259,6 +266,7 @@ def create_payment_gateway(
     db_payment_gateway = PaymentGateway(**payment_gateway.dict())
     db.add(db_payment_gateway)
     db.commit()
+    invalidate_master_data("payment_gateways")
     db.refresh(db_payment_gateway)
     return db_payment_gateway
 
@@ -289,6 +297,7 @@ def update_payment_gateway(
         setattr(db_payment_gateway, key, value)
 
     db.commit()
+    invalidate_master_data("payment_gateways")
     db.refresh(db_payment_gateway)
     return db_payment_gateway
 
@@ -319,6 +328,7 @@ def delete_payment_gateway(
 
     db.delete(db_payment_gateway)
     db.commit()
+    invalidate_master_data("payment_gateways")
     return {"message": "Payment Gateway deleted successfully"}
 
 
@@ -363,6 +373,7 @@ def create_telco_mobile(
     db_telco_mobile = TelcoMobile(**telco_mobile.dict())
     db.add(db_telco_mobile)
     db.commit()
+    invalidate_master_data("telco_mobile")
     db.refresh(db_telco_mobile)
     return db_telco_mobile
 
@@ -391,6 +402,7 @@ def update_telco_mobile(
         setattr(db_telco_mobile, key, value)
 
     db.commit()
+    invalidate_master_data("telco_mobile")
     db.refresh(db_telco_mobile)
     return db_telco_mobile
 
@@ -419,6 +431,7 @@ def delete_telco_mobile(
 
     db.delete(db_telco_mobile)
     db.commit()
+    invalidate_master_data("telco_mobile")
     return {"message": "Telco Mobile provider deleted successfully"}
 
 
@@ -463,6 +476,7 @@ def create_telco_internet(
     db_telco_internet = TelcoInternet(**telco_internet.dict())
     db.add(db_telco_internet)
     db.commit()
+    invalidate_master_data("telco_internet")
     db.refresh(db_telco_internet)
     return db_telco_internet
 
@@ -493,6 +507,7 @@ def update_telco_internet(
         setattr(db_telco_internet, key, value)
 
     db.commit()
+    invalidate_master_data("telco_internet")
     db.refresh(db_telco_internet)
     return db_telco_internet
 
@@ -523,6 +538,7 @@ def delete_telco_internet(
 
     db.delete(db_telco_internet)
     db.commit()
+    invalidate_master_data("telco_internet")
     return {"message": "Telco Internet provider deleted successfully"}
 
 
@@ -565,6 +581,7 @@ def create_exchange(
     db_exchange = Exchange(**exchange.dict())
     db.add(db_exchange)
     db.commit()
+    invalidate_master_data("exchanges")
     db.refresh(db_exchange)
     return db_exchange
 
@@ -591,6 +608,7 @@ def update_exchange(
         setattr(db_exchange, key, value)
 
     db.commit()
+    invalidate_master_data("exchanges")
     db.refresh(db_exchange)
     return db_exchange
 
@@ -608,6 +626,7 @@ def delete_exchange(
 
     db.delete(db_exchange)
     db.commit()
+    invalidate_master_data("exchanges")
     return {"message": "Exchange deleted successfully"}
 
 
@@ -656,6 +675,7 @@ def create_charge(
     db_obj = Charge(**charge.dict())
     db.add(db_obj)
     db.commit()
+    invalidate_master_data("charges")
     db.refresh(db_obj)
     return db_obj
 
@@ -688,6 +708,7 @@ def update_charge(
         setattr(db_obj, k, v)
 
     db.commit()
+    invalidate_master_data("charges")
     db.refresh(db_obj)
     return db_obj
 
@@ -709,4 +730,5 @@ def delete_charge(
 
     db.delete(db_obj)
     db.commit()
+    invalidate_master_data("charges")
     return {"message": "Charge deleted successfully"}
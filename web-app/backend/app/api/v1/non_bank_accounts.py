@@ -13,8 +13,9 @@ from app.schemas.non_bank_account import (
     NonBankAccountPaginationResponse
 )
 from app.api.v1.auth import get_current_user
+from app.schemas.bulk import BulkCreateRequest, BulkCreateResponse, BulkPasteRequest
+from app.services.bulk_create import NON_BANK_ACCOUNT_BULK, BulkCreateError, bulk_create_response, parse_pasted_rows
 from app.services.line_service import LineService
-import asyncio
 
 router = APIRouter()
 
@@ -38,6 +39,33 @@ def create_non_bank_account(
     db.refresh(db_non_bank_account)
     return db_non_bank_account
 
+@router.post("/bulk", response_model=BulkCreateResponse, status_code=201)
+def bulk_create_non_bank_accounts(
+    bulk: BulkCreateRequest,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """สร้างหมายเรียกผู้ให้บริการ Non-Bank หลายรายการ (ตรวจทุกแถวก่อน บันทึกทั้งหมดหรือไม่บันทึกเลย, 422 = มีแถวผิด)"""
+    try:
+        return bulk_create_response(db, NON_BANK_ACCOUNT_BULK, bulk.rows, bulk.criminal_case_id, current_user.id, bulk.dry_run)
+    except BulkCreateError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.post("/bulk/paste", response_model=BulkCreateResponse, status_code=201)
+def paste_non_bank_accounts(
+    paste: BulkPasteRequest,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """สร้างหมายเรียกผู้ให้บริการ Non-Bank จากข้อความที่คัดลอกจาก Excel (บรรทัดแรกเป็นหัวคอลัมน์)"""
+    try:
+        rows, ignored = parse_pasted_rows(NON_BANK_ACCOUNT_BULK, paste.text)
+        return bulk_create_response(
+            db, NON_BANK_ACCOUNT_BULK, rows, paste.criminal_case_id, current_user.id, paste.dry_run, ignored
+        )
+    except BulkCreateError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
 @router.get("/", response_model=NonBankAccountPaginationResponse)
 def get_non_bank_accounts(
     skip: int = 0,
@@ -70,7 +98,7 @@ def get_non_bank_account(
     return non_bank_account
 
 @router.put("/{non_bank_account_id}", response_model=NonBankAccountResponse)
-async def update_non_bank_account(
+def update_non_bank_account(
     non_bank_account_id: int,
     non_bank_account: NonBankAccountUpdate,
     db: Session = Depends(get_db),
@@ -114,12 +142,12 @@ async def update_non_bank_account(
                     'rank': current_user.rank.rank_short if current_user.rank else '',
                     'full_name': current_user.full_name
                 }
-                await LineService.send_summons_notification(
+                # เข้าคิวส่ง LINE แล้วตอบกลับทันที (ไม่รอ LINE)
+                LineService.send_summons_notification(
                     user_id=current_user.id,
                     account_type='non_bank',
                     account_data=account_data,
                     criminal_case=case_data,
-                    db=db,
                     updated_by_user=updated_by_user
                 )
         except Exception as e:
@@ -13,8 +13,9 @@ from app.schemas.payment_gateway_account import (
     PaymentGatewayAccountPaginationResponse
 )
 from app.api.v1.auth import get_current_user
+from app.schemas.bulk import BulkCreateRequest, BulkCreateResponse, BulkPasteRequest
+from app.services.bulk_create import PAYMENT_GATEWAY_ACCOUNT_BULK, BulkCreateError, bulk_create_response, parse_pasted_rows
 from app.services.line_service import LineService
-import asyncio
 
 router = APIRouter()
 
@@ -38,6 +39,33 @@ def create_payment_gateway_account(
     db.refresh(db_pg_account)
     return db_pg_account
 
+@router.post("/bulk", response_model=BulkCreateResponse, status_code=201)
+def bulk_create_payment_gateway_accounts(
+    bulk: BulkCreateRequest,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """สร้างหมายเรียกผู้ให้บริการ Payment Gateway หลายรายการ (ตรวจทุกแถวก่อน บันทึกทั้งหมดหรือไม่บันทึกเลย, 422 = มีแถวผิด)"""
+    try:
+        return bulk_create_response(db, PAYMENT_GATEWAY_ACCOUNT_BULK, bulk.rows, bulk.criminal_case_id, current_user.id, bulk.dry_run)
+    except BulkCreateError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.post("/bulk/paste", response_model=BulkCreateResponse, status_code=201)
+def paste_payment_gateway_accounts(
+    paste: BulkPasteRequest,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """สร้างหมายเรียกผู้ให้บริการ Payment Gateway จากข้อความที่คัดลอกจาก Excel (บรรทัดแรกเป็นหัวคอลัมน์)"""
+    try:
+        rows, ignored = parse_pasted_rows(PAYMENT_GATEWAY_ACCOUNT_BULK, paste.text)
+        return bulk_create_response(
+            db, PAYMENT_GATEWAY_ACCOUNT_BULK, rows, paste.criminal_case_id, current_user.id, paste.dry_run, ignored
+        )
+    except BulkCreateError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
 @router.get("/", response_model=PaymentGatewayAccountPaginationResponse)
 def get_payment_gateway_accounts(
     skip: int = 0,
@@ -70,7 +98,7 @@ def get_payment_gateway_account(
     return pg_account
 
 @router.put("/{payment_gateway_account_id}", response_model=PaymentGatewayAccountResponse)
-async def update_payment_gateway_account(
+def update_payment_gateway_account(
     payment_gateway_account_id: int,
     payment_gateway_account: PaymentGatewayAccountUpdate,
     db: Session = Depends(get_db),
@@ -114,12 +142,12 @@ async def update_payment_gateway_account(
                     'rank': current_user.rank.rank_short if current_user.rank else '',
                     'full_name': current_user.full_name
                 }
-                await LineService.send_summons_notification(
+                # เข้าคิวส่ง LINE แล้วตอบกลับทันที (ไม่รอ LINE)
+                LineService.send_summons_notification(
                     user_id=current_user.id,
                     account_type='payment_gateway',
                     account_data=account_data,
                     criminal_case=case_data,
-                    db=db,
                     updated_by_user=updated_by_user
                 )
         except Exception as e:
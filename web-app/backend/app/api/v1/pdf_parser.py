@@ -1,12 +1,38 @@
 """
 API endpoints สำหรับการแกะข้อมูลจากไฟล์ PDF
 """
+import asyncio
+from typing import List
 from fastapi import APIRouter, UploadFile, File, HTTPException
 from fastapi.responses import JSONResponse
 from app.services.pdf_parser import pdf_parser
 
 router = APIRouter()
 
+MAX_PDF_SIZE = 10 * 1024 * 1024  # 10MB
+MAX_BATCH_FILES = 50
+
+
+def _success_content(extracted_data: dict) -> dict:
+    # ตรวจสอบความถูกต้องของที่อยู่
+    address_valid = extracted_data.get('address_valid', True)
+    
+    # สร้างข้อความแจ้งเตือน
+    message = "แกะข้อมูลจากไฟล์ PDF สำเร็จ"
+    if not address_valid:
+        message = "แกะข้อมูลจากไฟล์ PDF สำเร็จ แต่ระบบไม่สามารถแกะข้อมูลที่อยู่ของผู้ต้องหาจากไฟล์ได้ กรุณาระบุด้วยตนเอง"
+    
+    return {
+        "success": True,
+        "message": message,
+        "data": {
+            "name": extracted_data.get('name', ''),
+            "idCard": extracted_data.get('id_card', ''),
+            "address": extracted_data.get('address', ''),
+            "addressValid": address_valid
+        }
+    }
+
 
 @router.post("/parse-pdf-thor14")
 async def parse_pdf_thor14(file: UploadFile = File(...)):
@@ -29,19 +55,14 @@ async def parse_pdf_thor14(file: UploadFile = File(...)):
         
         # ตรวจสอบขนาดไฟล์ (จำกัดที่ 10MB)
         content = await file.read()
-        if len(content) > 10 * 1024 * 1024:  # 10MB
+        if len(content) > MAX_PDF_SIZE:
             raise HTTPException(
                 status_code=400,
                 detail="ขนาดไฟล์ใหญ่เกินไป (จำกัดที่ 10MB)"
             )
         
-        # สร้าง UploadFile object ใหม่เพื่อส่งไปยัง parser
-        from io import BytesIO
-        file.file = BytesIO(content)
-        file.file.seek(0)
-        
-        # แกะข้อมูลจาก PDF
-        extracted_data = await pdf_parser.parse_pdf(file)
+        # แกะข้อมูลจาก PDF (รันใน process pool / ใช้ผลจาก cache ถ้าเคยอัปโหลดไฟล์นี้)
+        extracted_data = await pdf_parser.parse_bytes(content)
         
         # ตรวจสอบว่ามีข้อมูลหรือไม่
         if not any(extracted_data.values()):
@@ -54,26 +75,9 @@ async def parse_pdf_thor14(file: UploadFile = File(...)):
                 }
             )
         
-        # ตรวจสอบความถูกต้องของที่อยู่
-        address_valid = extracted_data.get('address_valid', True)
-        
-        # สร้างข้อความแจ้งเตือน
-        message = "แกะข้อมูลจากไฟล์ PDF สำเร็จ"
-        if not address_valid:
-            message = "แกะข้อมูลจากไฟล์ PDF สำเร็จ แต่ระบบไม่สามารถแกะข้อมูลที่อยู่ของผู้ต้องหาจากไฟล์ได้ กรุณาระบุด้วยตนเอง"
-        
         return JSONResponse(
             status_code=200,
-            content={
-                "success": True,
-                "message": message,
-                "data": {
-                    "name": extracted_data.get('name', ''),
-                    "idCard": extracted_data.get('id_card', ''),
-                    "address": extracted_data.get('address', ''),
-                    "addressValid": address_valid
-                }
-            }
+            content=_success_content(extracted_data)
         )
         
     except HTTPException:
@@ -84,3 +88,46 @@ async def parse_pdf_thor14(file: UploadFile = File(...)):
             status_code=500,
             detail=f"เกิดข้อผิดพลาดในการประมวลผลไฟล์: {str(e)}"
         )
+
+
+@router.post("/parse-pdf-thor14/batch")
+async def parse_pdf_thor14_batch(files: List[UploadFile] = File(...)):
+    """
+    แกะข้อมูลจากไฟล์ PDF ทร.14 หลายไฟล์พร้อมกัน
+    
+    ผลลัพธ์เรียงตามลำดับไฟล์ที่อัปโหลด ไฟล์ที่ผิดพลาดไม่ทำให้ไฟล์อื่นล้มเหลว
+    """
+    if len(files) > MAX_BATCH_FILES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"อัปโหลดได้ไม่เกิน {MAX_BATCH_FILES} ไฟล์ต่อครั้ง"
+        )
+    
+    async def parse_one(file: UploadFile) -> dict:
+        if not file.filename.lower().endswith('.pdf'):
+            return {"filename": file.filename, "success": False, "message": "ไม่ใช่ไฟล์ PDF", "data": None}
+        
+        content = await file.read()
+        if len(content) > MAX_PDF_SIZE:
+            return {"filename": file.filename, "success": False, "message": "ขนาดไฟล์ใหญ่เกินไป (จำกัดที่ 10MB)", "data": None}
+        
+        extracted_data = await pdf_parser.parse_bytes(content)
+        if not any(extracted_data.values()):
+            return {
+                "filename": file.filename,
+                "success": False,
+                "message": "ไม่สามารถแกะข้อมูลจากไฟล์ PDF ได้ กรุณาตรวจสอบรูปแบบไฟล์",
+                "data": extracted_data
+            }
+        
+        return {"filename": file.filename, **_success_content(extracted_data)}
+    
+    # จำนวนไฟล์ที่แกะพร้อมกันถูกจำกัดด้วยขนาดของ process pool
+    results = await asyncio.gather(*(parse_one(file) for file in files))
+    
+    return {
+        "success": True,
+        "total": len(results),
+        "parsed": sum(1 for result in results if result["success"]),
+        "results": results
+    }
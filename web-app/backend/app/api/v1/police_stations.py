@@ -5,14 +5,24 @@ from fastapi import APIRouter, HTTPException, Depends
 from fastapi.responses import JSONResponse
 from sqlalchemy.orm import Session
 from app.core.database import get_db
+from app.api.v1.auth import get_current_user
+from app.models import CriminalCase, Suspect, User
 from app.services.police_station_service import PoliceStationService
-from app.schemas.police_station import PoliceStationSearchRequest, PoliceStationSearchResponse
+from app.schemas.police_station import (
+    PoliceStationSearchRequest,
+    PoliceStationSearchResponse,
+    PoliceStationBatchRequest,
+    PoliceStationBatchItem,
+    PoliceStationBatchResponse,
+)
 
 router = APIRouter()
 
+MAX_BATCH_ADDRESSES = 1000
+
 
 @router.post("/search", response_model=PoliceStationSearchResponse)
-async def search_police_stations(
+def search_police_stations(
     request: PoliceStationSearchRequest,
     db: Session = Depends(get_db)
 ):
@@ -51,15 +61,71 @@ async def search_police_stations(
         )
 
 
+@router.post("/resolve-batch", response_model=PoliceStationBatchResponse)
+def resolve_police_stations_batch(
+    request: PoliceStationBatchRequest,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    ค้นหาสถานีตำรวจให้หลายที่อยู่ในครั้งเดียว
+    
+    ระบุ addresses หรือ criminal_case_id (ใช้ที่อยู่ของผู้ต้องหาทุกคนในคดี เช่น ตอนออกหมายเรียกทั้งคดี)
+    ผู้ใช้ที่ไม่ใช่ admin ระบุได้เฉพาะคดีของตนเอง
+    """
+    suspect_ids = []
+    addresses = list(request.addresses)
+    if request.criminal_case_id is not None:
+        case_query = db.query(CriminalCase.id).filter(CriminalCase.id == request.criminal_case_id)
+        if not current_user.role or current_user.role.role_name != "admin":
+            case_query = case_query.filter(CriminalCase.owner_id == current_user.id)
+        if case_query.first() is None:
+            raise HTTPException(status_code=404, detail="ไม่พบคดี")
+
+        suspects = db.query(Suspect.id, Suspect.suspect_address).filter(
+            Suspect.criminal_case_id == request.criminal_case_id
+        ).order_by(Suspect.id).all()
+        suspect_ids = [suspect.id for suspect in suspects]
+        addresses.extend(suspect.suspect_address or "" for suspect in suspects)
+
+    if not addresses:
+        raise HTTPException(
+            status_code=400,
+            detail="กรุณาระบุที่อยู่หรือคดีสำหรับค้นหา"
+        )
+    if len(addresses) > MAX_BATCH_ADDRESSES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"ค้นหาได้ไม่เกิน {MAX_BATCH_ADDRESSES} ที่อยู่ต่อครั้ง"
+        )
+
+    service = PoliceStationService(db)
+    resolved = service.resolve_addresses(addresses)
+
+    # ผู้ต้องหาต่อท้ายรายการ addresses ที่ส่งมา
+    first_suspect = len(addresses) - len(suspect_ids)
+    results = []
+    for i, (address, result) in enumerate(zip(addresses, resolved)):
+        results.append(PoliceStationBatchItem(
+            address=address,
+            suspect_id=suspect_ids[i - first_suspect] if i >= first_suspect else None,
+            **result.dict()
+        ))
+
+    return PoliceStationBatchResponse(results=results)
+
+
 @router.get("/provinces")
-async def get_provinces(db: Session = Depends(get_db)):
-    """Get all provinces with police stations"""
+def get_provinces(db: Session = Depends(get_db)):
+    """
+    Get all provinces with police stations
+    
+    ชื่อจังหวัดเป็นชื่อที่ normalize แล้ว (ไม่มีคำนำหน้า จ./จังหวัด, กทม./กรุงเทพฯ → กรุงเทพมหานคร)
+    ไม่ซ้ำกัน และเรียงตามตัวอักษร - ใช้ค้นหาผ่าน /stations/{province} ได้โดยตรง
+    """
     try:
         service = PoliceStationService(db)
-        stations = service.get_all_stations(limit=1000)
-        
-        provinces = list(set([station.province for station in stations if station.province]))
-        provinces.sort()
+        provinces = service.get_provinces()
         
         return {
             "success": True,
@@ -75,7 +141,7 @@ async def get_provinces(db: Session = Depends(get_db)):
 
 
 @router.get("/stations/{province}")
-async def get_stations_by_province(
+def get_stations_by_province(
     province: str,
     db: Session = Depends(get_db)
 ):
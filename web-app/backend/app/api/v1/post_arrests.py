@@ -1,20 +1,16 @@
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
 from typing import List
-from datetime import datetime
 from app.core import get_db
 from app.models import PostArrest, User
 from app.schemas import PostArrestCreate, PostArrestUpdate, PostArrestResponse
 from app.api.v1.auth import get_current_user
+from app.services.number_sequence import POST_ARREST_PREFIX, next_document_number
 
 router = APIRouter()
 
 def generate_arrest_number(db: Session) -> str:
-    current_year = datetime.now().year + 543
-    count = db.query(PostArrest).filter(
-        PostArrest.arrest_number.like(f"AR-{current_year}-%")
-    ).count()
-    return f"AR-{current_year}-{count + 1:04d}"
+    return next_document_number(db, POST_ARREST_PREFIX)
 
 @router.post("/", response_model=PostArrestResponse)
 def create_post_arrest(
@@ -15,6 +15,8 @@ from pydantic import BaseModel, EmailStr
 
 from app.core.database import get_db
 from app.api.v1.auth import get_current_user
+from app.core.executors import IO, offload
+from app.core.principal_cache import invalidate_principal
 from app.models.user import User
 from app.core.config import settings
 
@@ -93,6 +95,7 @@ def update_my_profile(
         current_user.email = profile_data.email
 
     db.commit()
+    invalidate_principal(current_user.username)
     db.refresh(current_user)
 
     return UserProfileResponse(
@@ -107,6 +110,32 @@ def update_my_profile(
         has_signature=bool(current_user.signature_path)
     )
 
+@offload(IO)
+def _save_signature(db: Session, user: User, contents: bytes) -> str:
+    """เขียนไฟล์ลายเซ็นและอัปเดต path ใน database (รันใน IO executor)"""
+    # สร้างโฟลเดอร์สำหรับเก็บลายเซ็น
+    signatures_dir = os.path.join(settings.UPLOAD_DIR, "signatures")
+    os.makedirs(signatures_dir, exist_ok=True)
+
+    # สร้างชื่อไฟล์ใหม่ (user_id.png)
+    filename = f"{user.id}.png"
+    file_path = os.path.join(signatures_dir, filename)
+
+    # ลบไฟล์เก่าถ้ามี
+    if os.path.exists(file_path):
+        os.remove(file_path)
+
+    # บันทึกไฟล์ใหม่
+    with open(file_path, "wb") as buffer:
+        buffer.write(contents)
+
+    # อัปเดต path ใน database
+    signature_relative_path = f"signatures/{filename}"
+    user.signature_path = signature_relative_path
+    db.commit()
+    invalidate_principal(user.username)
+    return signature_relative_path
+
 @router.post("/me/signature")
 async def upload_signature(
     file: UploadFile = File(...),
@@ -136,26 +165,7 @@ async def upload_signature(
             detail="File size must not exceed 2MB"
         )
 
-    # สร้างโฟลเดอร์สำหรับเก็บลายเซ็น
-    signatures_dir = os.path.join(settings.UPLOAD_DIR, "signatures")
-    os.makedirs(signatures_dir, exist_ok=True)
-
-    # สร้างชื่อไฟล์ใหม่ (user_id.png)
-    filename = f"{current_user.id}.png"
-    file_path = os.path.join(signatures_dir, filename)
-
-    # ลบไฟล์เก่าถ้ามี
-    if os.path.exists(file_path):
-        os.remove(file_path)
-
-    # บันทึกไฟล์ใหม่
-    with open(file_path, "wb") as buffer:
-        buffer.write(contents)
-
-    # อัปเดต path ใน database
-    signature_relative_path = f"signatures/{filename}"
-    current_user.signature_path = signature_relative_path
-    db.commit()
+    signature_relative_path = await _save_signature(db, current_user, contents)
 
     return {
         "message": "Signature uploaded successfully",
@@ -185,6 +195,7 @@ def delete_signature(
     # ลบ path ใน database
     current_user.signature_path = None
     db.commit()
+    invalidate_principal(current_user.username)
 
     return {
         "message": "Signature deleted successfully",
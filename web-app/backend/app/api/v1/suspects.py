@@ -1,20 +1,18 @@
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session, joinedload
 from typing import List
-from datetime import datetime
 from app.core import get_db
 from app.models import Suspect, User, CriminalCase
 from app.schemas import SuspectCreate, SuspectUpdate, SuspectResponse
 from app.api.v1.auth import get_current_user
+from app.schemas.bulk import BulkCreateRequest, BulkCreateResponse, BulkPasteRequest
+from app.services.bulk_create import SUSPECT_BULK, BulkCreateError, bulk_create_response, parse_pasted_rows
+from app.services.number_sequence import SUSPECT_DOCUMENT_PREFIX, next_document_number
 
 router = APIRouter()
 
 def generate_document_number(db: Session) -> str:
-    current_year = datetime.now().year + 543
-    count = db.query(Suspect).filter(
-        Suspect.document_number.like(f"SUS-{current_year}-%")
-    ).count()
-    return f"SUS-{current_year}-{count + 1:04d}"
+    return next_document_number(db, SUSPECT_DOCUMENT_PREFIX)
 
 @router.post("/", response_model=SuspectResponse)
 def create_suspect(
@@ -39,6 +37,33 @@ def create_suspect(
     db.refresh(db_suspect)
     return db_suspect
 
+@router.post("/bulk", response_model=BulkCreateResponse, status_code=201)
+def bulk_create_suspects(
+    bulk: BulkCreateRequest,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """สร้างผู้ต้องหาหลายรายการ (ตรวจทุกแถวก่อน บันทึกทั้งหมดหรือไม่บันทึกเลย, 422 = มีแถวผิด)"""
+    try:
+        return bulk_create_response(db, SUSPECT_BULK, bulk.rows, bulk.criminal_case_id, current_user.id, bulk.dry_run)
+    except BulkCreateError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.post("/bulk/paste", response_model=BulkCreateResponse, status_code=201)
+def paste_suspects(
+    paste: BulkPasteRequest,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """สร้างผู้ต้องหาจากข้อความที่คัดลอกจาก Excel (บรรทัดแรกเป็นหัวคอลัมน์)"""
+    try:
+        rows, ignored = parse_pasted_rows(SUSPECT_BULK, paste.text)
+        return bulk_create_response(
+            db, SUSPECT_BULK, rows, paste.criminal_case_id, current_user.id, paste.dry_run, ignored
+        )
+    except BulkCreateError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
 @router.get("/", response_model=List[SuspectResponse])
 def read_suspects(
     skip: int = 0,
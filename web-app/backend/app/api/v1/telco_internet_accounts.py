@@ -4,7 +4,6 @@ from typing import List
 from datetime import datetime
 from app.core.database import get_db
 from app.models.telco_internet_account import TelcoInternetAccount
-from app.models.telco_internet import TelcoInternet
 from app.models.user import User
 from app.models.criminal_case import CriminalCase
 from app.schemas.telco_internet_account import (
@@ -14,8 +13,10 @@ from app.schemas.telco_internet_account import (
     TelcoInternetAccountPaginationResponse
 )
 from app.api.v1.auth import get_current_user
+from app.schemas.bulk import BulkCreateRequest, BulkCreateResponse, BulkPasteRequest
+from app.services.bulk_create import TELCO_INTERNET_ACCOUNT_BULK, BulkCreateError, bulk_create_response, parse_pasted_rows
 from app.services.line_service import LineService
-import asyncio
+from app.services.master_data_cache import resolve_master_id
 
 router = APIRouter()
 
@@ -30,26 +31,10 @@ def create_telco_internet_account(
 
     # Auto-lookup telco_internet_id from provider_name
     if telco_data.get('provider_name'):
-        # ลองหาแบบตรงทั้งหมดก่อน (company_name_short)
-        telco = db.query(TelcoInternet).filter(
-            TelcoInternet.company_name_short == telco_data['provider_name']
-        ).first()
-        
-        # ถ้าไม่เจอ ลองหาจาก company_name
-        if not telco:
-            telco = db.query(TelcoInternet).filter(
-                TelcoInternet.company_name == telco_data['provider_name']
-            ).first()
-        
-        # ถ้ายังไม่เจอ ลองหาแบบ LIKE
-        if not telco:
-            provider_search = f"%{telco_data['provider_name']}%"
-            telco = db.query(TelcoInternet).filter(
-                TelcoInternet.company_name.like(provider_search)
-            ).first()
-        
-        if telco:
-            telco_data['telco_internet_id'] = telco.id
+        # ชื่อเต็ม/ชื่อย่อ/ชื่อบางส่วน จากดัชนีชื่อใน master-data cache
+        telco_id = resolve_master_id(db, "telco_internet", telco_data['provider_name'])
+        if telco_id:
+            telco_data['telco_internet_id'] = telco_id
 
     # เพิ่ม created_by
     telco_data['created_by'] = current_user.id
@@ -61,6 +46,33 @@ def create_telco_internet_account(
     db.refresh(db_telco_account)
     return db_telco_account
 
+@router.post("/bulk", response_model=BulkCreateResponse, status_code=201)
+def bulk_create_telco_internet_accounts(
+    bulk: BulkCreateRequest,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """สร้างข้อมูล IP Address หลายรายการ (ตรวจทุกแถวก่อน บันทึกทั้งหมดหรือไม่บันทึกเลย, 422 = มีแถวผิด)"""
+    try:
+        return bulk_create_response(db, TELCO_INTERNET_ACCOUNT_BULK, bulk.rows, bulk.criminal_case_id, current_user.id, bulk.dry_run)
+    except BulkCreateError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.post("/bulk/paste", response_model=BulkCreateResponse, status_code=201)
+def paste_telco_internet_accounts(
+    paste: BulkPasteRequest,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """สร้างข้อมูล IP Address จากข้อความที่คัดลอกจาก Excel (บรรทัดแรกเป็นหัวคอลัมน์)"""
+    try:
+        rows, ignored = parse_pasted_rows(TELCO_INTERNET_ACCOUNT_BULK, paste.text)
+        return bulk_create_response(
+            db, TELCO_INTERNET_ACCOUNT_BULK, rows, paste.criminal_case_id, current_user.id, paste.dry_run, ignored
+        )
+    except BulkCreateError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
 @router.get("/", response_model=TelcoInternetAccountPaginationResponse)
 def read_telco_internet_accounts(
     page: int = 1,
@@ -138,7 +150,7 @@ def read_telco_internet_account(
     return telco_account
 
 @router.put("/{telco_account_id}", response_model=TelcoInternetAccountResponse)
-async def update_telco_internet_account(
+def update_telco_internet_account(
     telco_account_id: int,
     telco_account: TelcoInternetAccountUpdate,
     db: Session = Depends(get_db),
@@ -158,26 +170,10 @@ async def update_telco_internet_account(
 
     # Auto-lookup telco_internet_id from provider_name if being updated
     if 'provider_name' in update_data and update_data['provider_name']:
-        # ลองหาแบบตรงทั้งหมดก่อน (company_name_short)
-        telco = db.query(TelcoInternet).filter(
-            TelcoInternet.company_name_short == update_data['provider_name']
-        ).first()
-
-        # ถ้าไม่เจอ ลองหาจาก company_name
-        if not telco:
-            telco = db.query(TelcoInternet).filter(
-                TelcoInternet.company_name == update_data['provider_name']
-            ).first()
-
-        # ถ้ายังไม่เจอ ลองหาแบบ LIKE
-        if not telco:
-            provider_search = f"%{update_data['provider_name']}%"
-            telco = db.query(TelcoInternet).filter(
-                TelcoInternet.company_name.like(provider_search)
-            ).first()
-
-        if telco:
-            update_data['telco_internet_id'] = telco.id
+        # ชื่อเต็ม/ชื่อย่อ/ชื่อบางส่วน จากดัชนีชื่อใน master-data cache
+        telco_id = resolve_master_id(db, "telco_internet", update_data['provider_name'])
+        if telco_id:
+            update_data['telco_internet_id'] = telco_id
 
     for key, value in update_data.items():
         setattr(db_telco_account, key, value)
@@ -205,12 +201,12 @@ async def update_telco_internet_account(
                     'rank': current_user.rank.rank_short if current_user.rank else '',
                     'full_name': current_user.full_name
                 }
-                await LineService.send_summons_notification(
+                # เข้าคิวส่ง LINE แล้วตอบกลับทันที (ไม่รอ LINE)
+                LineService.send_summons_notification(
                     user_id=current_user.id,
                     account_type='telco_internet',
                     account_data=account_data,
                     criminal_case=case_data,
-                    db=db,
                     updated_by_user=updated_by_user
                 )
         except Exception as e:
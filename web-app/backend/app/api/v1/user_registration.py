@@ -11,6 +11,7 @@ from app.schemas.user_registration import (
     UserRoleResponse
 )
 from app.core.security import get_password_hash
+from app.services.organization_tree import invalidate_organization_tree
 
 router = APIRouter()
 
@@ -102,6 +103,7 @@ def register_user(
         db.add(role_mapping)
     
     db.commit()
+    invalidate_organization_tree()
     
     return new_user
 
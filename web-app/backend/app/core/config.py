@@ -14,6 +14,35 @@ class Settings(BaseSettings):
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 240  # 4 ชั่วโมง
     REFRESH_TOKEN_EXPIRE_DAYS: int = 7
 
+    # Principal cache (get_current_user)
+    PRINCIPAL_CACHE_TTL_SECONDS: int = 30
+    PRINCIPAL_CACHE_MAXSIZE: int = 1024
+    PRINCIPAL_CACHE_SHARED: bool = False  # True = ใช้ Redis ร่วมกันทุก process
+
+    # Executors สำหรับงานที่ block (app.core.executors)
+    CPU_EXECUTOR_WORKERS: int = 0  # 0 = จำนวน CPU
+    IO_EXECUTOR_WORKERS: int = 32
+    PROCESS_EXECUTOR_WORKERS: int = 0  # 0 = จำนวน CPU
+
+    # แกะข้อมูล PDF ทร.14
+    THOR14_MAX_PAGES: int = 3  # ทร.14 มีข้อมูลอยู่หน้าแรก ไม่อ่านเกินจำนวนหน้านี้
+    THOR14_CACHE_SIZE: int = 256  # จำนวนผลลัพธ์ที่ cache ตาม hash ของไฟล์
+
+    # ดัชนีเขตรับผิดชอบสถานีตำรวจ (ตรวจว่าตารางเปลี่ยนหรือไม่ทุกกี่วินาที)
+    POLICE_STATION_INDEX_CHECK_SECONDS: int = 300
+
+    # หมายเรียก: จำนวน HTML ที่ render แล้วเก็บไว้ตาม (template, ข้อมูล) (0 = ไม่ cache)
+    SUMMONS_RENDER_CACHE_SIZE: int = 128
+
+    # โครงสร้างหน่วยงาน (GET /organizations/tree): ตรวจว่าหน่วยงาน/ผู้ใช้เปลี่ยนหรือไม่ทุกกี่วินาที
+    ORGANIZATION_TREE_CHECK_SECONDS: int = 60
+
+    # ข้อมูลหลัก (ธนาคาร/ผู้ให้บริการ/ศาล/ข้อหา): ตรวจว่าตารางเปลี่ยนหรือไม่ทุกกี่วินาที
+    MASTER_DATA_CHECK_SECONDS: int = 60
+
+    # สร้างบัญชี/ผู้ต้องหาหลายรายการ (POST .../bulk): จำนวนแถวสูงสุดต่อคำขอ
+    BULK_CREATE_MAX_ROWS: int = 500
+
     UPLOAD_DIR: str = "/app/uploads"
     STATIC_DIR: str = "/app/static"
 
@@ -29,11 +58,40 @@ class Settings(BaseSettings):
     SMTP_PASSWORD: str = ""
     FROM_EMAIL: str = ""
     FROM_NAME: str = "กองบังคับการตำรวจสืบสวนสอบสวนอาชญากรรมทางเทคโนโลยี 4"
+    SMTP_USE_TLS: bool = True  # False สำหรับ SMTP stub (เช่น aiosmtpd) ในการทดสอบ
+
+    # Outbound email queue (email_worker.py)
+    EMAIL_MAX_RETRIES: int = 5
+    EMAIL_RETRY_BASE_SECONDS: int = 60  # 1, 2, 4, 8, ... นาที
+    EMAIL_RETRY_MAX_SECONDS: int = 3600
+    EMAIL_DOMAIN_RATE_PER_MINUTE: int = 20  # ต่อโดเมนผู้รับ ต่อ worker
+    EMAIL_SMTP_MESSAGES_PER_CONNECTION: int = 100
+    EMAIL_WORKER_BATCH_SIZE: int = 10
+    EMAIL_WORKER_POLL_SECONDS: int = 5
+    EMAIL_SENDING_TIMEOUT_SECONDS: int = 600  # งาน 'sending' ที่ค้างนานกว่านี้จะถูกดึงกลับมาส่งใหม่
+
+    # Background jobs (Celery + Redis)
+    CELERY_TASK_ALWAYS_EAGER: bool = False  # True = รันงานใน process เดียวกัน (ใช้ทดสอบ)
+    JOB_TTL_SECONDS: int = 86400  # เก็บสถานะงานไว้ 1 วัน
+
+    # HTML → PDF (headless Chromium pool)
+    PDF_POOL_SIZE: int = 2  # จำนวน browser ที่เปิดค้างไว้
+    PDF_POOL_MAX_QUEUE: int = 20  # งานที่รอได้สูงสุด (เกินนี้ตอบ 503)
+    PDF_PAGE_MAX_USES: int = 50  # ใช้ page ซ้ำได้กี่ครั้งก่อนเปิดใหม่
+    PDF_RENDER_TIMEOUT_SECONDS: int = 60
 
     LINE_CHANNEL_ID: str = ""
     LINE_CHANNEL_SECRET: str = ""
     LINE_CHANNEL_ACCESS_TOKEN: str = ""
     LINE_CALLBACK_URL: str = ""
+
+    # คิวส่งการแจ้งเตือน LINE (app.services.line_dispatcher)
+    LINE_DISPATCH_WORKERS: int = 4  # จำนวนผู้รับที่ส่งพร้อมกันได้ (= จำนวน connection สูงสุด)
+    LINE_DISPATCH_MAX_QUEUE: int = 1000  # การแจ้งเตือนที่รอส่งได้สูงสุด (เกินนี้ไม่ส่ง)
+    LINE_BATCH_WINDOW_SECONDS: float = 0.5  # รอรวมข้อความถึงผู้รับเดียวกันก่อนส่ง
+    LINE_MAX_RETRIES: int = 3
+    LINE_RETRY_BASE_SECONDS: float = 2  # 2, 4, 8 วินาที
+    LINE_HTTP_TIMEOUT_SECONDS: float = 10
     ENCRYPTION_KEY: str = ""
 
     class Config:
@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Dedicated executors for blocking work called from async code
+
+ห้ามทำงานที่ block (SQLAlchemy, bcrypt, pandas, อ่าน/เขียนไฟล์) บน event loop โดยตรง
+- CPU pool: งานคำนวณหนัก เช่น bcrypt (จำนวน thread = จำนวน CPU เพื่อไม่แย่ง CPU กันเอง)
+- IO pool: งานที่รอ I/O เช่น query ฐานข้อมูล, อ่าน/เขียนไฟล์
+- Process pool: งาน pure-Python ที่ถือ GIL นาน เช่น แกะข้อความจาก PDF
+  (func และ arguments ต้อง pickle ได้ - ใช้ฟังก์ชันระดับ module)
+  ถ้า process ใน pool ตาย (OOM, segfault) pool จะใช้ไม่ได้อีก → สร้าง pool ใหม่แล้วลองอีกครั้งเดียว
+
+ใช้งาน:
+    result = await run_in_io(func, *args)       # เรียกครั้งเดียว
+    @offload(IO)                                # ทำให้ฟังก์ชัน sync เป็น awaitable
+    def save_file(...): ...
+    await save_file(...)
+    save_file.sync(...)                         # เรียกแบบ sync เดิม
+
+route ที่เป็น sync def ทั้งหมดไม่ต้องใช้ (FastAPI รันใน threadpool อยู่แล้ว)
+"""
+
+import asyncio
+import contextvars
+import functools
+import multiprocessing
+import os
+import threading
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Optional
+
+from app.core.config import settings
+
+CPU = "cpu"
+IO = "io"
+PROCESS = "process"
+
+_executors = {}
+_executors_lock = threading.Lock()
+
+
+def get_executor(kind: str) -> Executor:
+    """Executor สำหรับงานประเภท CPU, IO หรือ PROCESS (สร้างเมื่อใช้ครั้งแรก)"""
+    executor = _executors.get(kind)
+    if executor is not None:
+        return executor
+
+    with _executors_lock:
+        executor = _executors.get(kind)
+        if executor is not None:
+            return executor
+        if kind == CPU:
+            # bcrypt/openpyxl ปล่อย GIL ระหว่างคำนวณได้บางส่วน, จำกัดไว้ที่จำนวน CPU
+            workers = settings.CPU_EXECUTOR_WORKERS or os.cpu_count() or 1
+        elif kind == IO:
+            workers = settings.IO_EXECUTOR_WORKERS
+        elif kind == PROCESS:
+            workers = settings.PROCESS_EXECUTOR_WORKERS or os.cpu_count() or 1
+        else:
+            raise ValueError(f"Unknown executor kind: {kind}")
+        if kind == PROCESS:
+            # spawn: ไม่ fork process ที่มี thread อื่นทำงานอยู่ (DB pool, executors)
+            executor = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+        else:
+            executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix=f"{kind}-executor")
+        _executors[kind] = executor
+        return executor
+
+
+def _discard_executor(kind: str, executor: Executor) -> None:
+    """เลิกใช้ executor ที่เสียแล้ว (ถ้ายังเป็นตัวที่ cache ไว้) ให้การเรียกครั้งถัดไปสร้างใหม่"""
+    with _executors_lock:
+        if _executors.get(kind) is executor:
+            del _executors[kind]
+    executor.shutdown(wait=False)
+
+
+async def run_in_executor(kind: str, func: Callable, *args, **kwargs) -> Any:
+    """รัน func ใน executor ที่กำหนด (คง contextvars ของ request ไว้ ยกเว้น PROCESS)"""
+    loop = asyncio.get_running_loop()
+    if kind != PROCESS:
+        context = contextvars.copy_context()
+        call = functools.partial(context.run, func, *args, **kwargs)
+        return await loop.run_in_executor(get_executor(kind), call)
+
+    call = functools.partial(func, *args, **kwargs)
+    executor = get_executor(PROCESS)
+    try:
+        return await loop.run_in_executor(executor, call)
+    except BrokenProcessPool:
+        _discard_executor(PROCESS, executor)
+        return await loop.run_in_executor(get_executor(PROCESS), call)
+
+
+async def run_in_cpu(func: Callable, *args, **kwargs) -> Any:
+    return await run_in_executor(CPU, func, *args, **kwargs)
+
+
+async def run_in_io(func: Callable, *args, **kwargs) -> Any:
+    return await run_in_executor(IO, func, *args, **kwargs)
+
+
+async def run_in_process(func: Callable, *args, **kwargs) -> Any:
+    return await run_in_executor(PROCESS, func, *args, **kwargs)
+
+
+def offload(kind: str = IO):
+    """
+    Decorator: แปลงฟังก์ชัน sync ให้เป็น coroutine ที่รันใน executor
+
+    ฟังก์ชันเดิมยังเรียกได้ผ่าน .sync
+    """
+    # PROCESS ใช้ไม่ได้: ชื่อฟังก์ชันใน module ถูกแทนด้วย wrapper จึง pickle func เดิมไม่ได้
+    if kind not in (CPU, IO):
+        raise ValueError(f"Unknown executor kind: {kind}")
+
+    def decorator(func: Callable):
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            return await run_in_executor(kind, func, *args, **kwargs)
+
+        wrapper.sync = func
+        return wrapper
+
+    return decorator
+
+
+def shutdown_executors(wait: bool = True) -> None:
+    """ปิด executors ทั้งหมด (เรียกตอน application shutdown)"""
+    for kind in list(_executors):
+        executor: Optional[Executor] = _executors.pop(kind, None)
+        if executor is not None:
+            executor.shutdown(wait=wait)
@@ -0,0 +1,251 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Authenticated-principal cache for get_current_user
+
+เก็บข้อมูลผู้ใช้ (พร้อม rank, role, bureau, division, supervision) ตาม username ใน token
+เพื่อไม่ต้อง query ซ้ำทุก request
+
+- cache ในหน่วยความจำ (LRU + TTL) ของแต่ละ process
+- ถ้า PRINCIPAL_CACHE_SHARED=True ใช้ Redis เป็น cache ชั้นที่สอง และใช้ epoch ใน Redis
+  ให้การ invalidate มีผลกับทุก process (ตรวจ epoch ไม่เกิน 1 ครั้งต่อ EPOCH_CHECK_SECONDS)
+- ต้องเรียก invalidate_principal()/invalidate_all_principals() เมื่อข้อมูลผู้ใช้หรือหน่วยงานเปลี่ยน
+"""
+
+import pickle
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional
+
+import redis
+from sqlalchemy import inspect
+from sqlalchemy.orm import Session
+from sqlalchemy.orm.attributes import set_committed_value
+from sqlalchemy.orm.session import make_transient_to_detached
+
+from app.core.config import settings
+
+# ความสัมพันธ์ที่ get_current_user โหลดมาพร้อมผู้ใช้
+PRINCIPAL_RELATIONSHIPS = ("rank", "role", "bureau", "division", "supervision")
+
+# ไม่เก็บ password hash ไว้ใน cache (โหลดจากฐานข้อมูลเมื่อถูกเรียกใช้)
+EXCLUDED_COLUMNS = ("hashed_password",)
+
+EPOCH_CHECK_SECONDS = 1.0
+
+_SHARED_KEY_PREFIX = "principal:"
+_SHARED_EPOCH_KEY = "principal:epoch"
+
+
+def _columns(obj) -> Dict[str, Any]:
+    return {attr.key: getattr(obj, attr.key) for attr in inspect(obj).mapper.column_attrs}
+
+
+def snapshot_principal(user) -> Dict[str, Any]:
+    """แปลง User ที่โหลดพร้อม PRINCIPAL_RELATIONSHIPS เป็น dict (ไม่ผูกกับ session)"""
+    columns = _columns(user)
+    for name in EXCLUDED_COLUMNS:
+        columns.pop(name, None)
+    snapshot = {"user": columns}
+    for name in PRINCIPAL_RELATIONSHIPS:
+        related = getattr(user, name)
+        snapshot[name] = _columns(related) if related is not None else None
+    return snapshot
+
+
+def restore_principal(db: Session, snapshot: Dict[str, Any]):
+    """
+    สร้าง User จาก snapshot แล้วผูกกับ session ของ request โดยไม่ query ฐานข้อมูล
+
+    ผลลัพธ์เป็น persistent object ใน db จึงแก้ไข/commit หรือ lazy-load ความสัมพันธ์อื่นได้ตามปกติ
+    """
+    from app.models import User
+
+    user = User(**snapshot["user"])
+    make_transient_to_detached(user)
+
+    relationships = inspect(User).relationships
+    for name in PRINCIPAL_RELATIONSHIPS:
+        columns = snapshot[name]
+        related = None
+        if columns is not None:
+            related = relationships[name].mapper.class_(**columns)
+            make_transient_to_detached(related)
+        set_committed_value(user, name, related)
+
+    return db.merge(user, load=False)
+
+
+class PrincipalCache:
+    """LRU + TTL cache ของ principal snapshot (thread-safe) พร้อม shared backend (Redis) แบบเลือกได้"""
+
+    def __init__(
+        self,
+        maxsize: int = 1024,
+        ttl: float = 30,
+        shared: Optional[redis.Redis] = None,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.shared = shared
+        self.clock = clock
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()  # key → (expires_at, epoch, snapshot)
+        self._lock = threading.Lock()
+        self._epoch = 0
+        self._epoch_checked_at = None
+        self.hits = 0
+        self.misses = 0
+
+    # ---------- shared epoch ----------
+
+    def _current_epoch(self) -> int:
+        if self.shared is None:
+            return self._epoch
+
+        now = self.clock()
+        if self._epoch_checked_at is None or now - self._epoch_checked_at >= EPOCH_CHECK_SECONDS:
+            try:
+                self._epoch = int(self.shared.get(_SHARED_EPOCH_KEY) or 0)
+            except redis.RedisError:
+                # Redis ใช้งานไม่ได้ → ไม่เชื่อ cache ที่มีอยู่
+                self._epoch += 1
+            self._epoch_checked_at = now
+        return self._epoch
+
+    # ---------- get/set ----------
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        now = self.clock()
+        with self._lock:
+            epoch = self._current_epoch()
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires_at, entry_epoch, snapshot = entry
+                if expires_at > now and entry_epoch == epoch:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return snapshot
+                del self._entries[key]
+
+        snapshot = self._get_shared(key)
+        with self._lock:
+            if snapshot is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._store_local(key, snapshot, now)
+        return snapshot
+
+    def epoch(self) -> int:
+        """epoch ปัจจุบัน (เรียกก่อน query ผู้ใช้ แล้วส่งให้ set() เพื่อไม่ให้เก็บข้อมูลที่ถูก invalidate ระหว่างนั้น)"""
+        with self._lock:
+            return self._current_epoch()
+
+    def set(self, key: str, snapshot: Dict[str, Any], loaded_epoch: Optional[int] = None) -> None:
+        with self._lock:
+            if loaded_epoch is not None and loaded_epoch != self._current_epoch():
+                return
+            self._store_local(key, snapshot, self.clock())
+        if self.shared is not None:
+            try:
+                self.shared.set(_SHARED_KEY_PREFIX + key, pickle.dumps(snapshot), ex=max(int(self.ttl), 1))
+            except redis.RedisError:
+                pass
+
+    def _store_local(self, key: str, snapshot: Dict[str, Any], now: float) -> None:
+        self._entries[key] = (now + self.ttl, self._current_epoch(), snapshot)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def _get_shared(self, key: str) -> Optional[Dict[str, Any]]:
+        if self.shared is None:
+            return None
+        try:
+            raw = self.shared.get(_SHARED_KEY_PREFIX + key)
+        except redis.RedisError:
+            return None
+        return pickle.loads(raw) if raw else None
+
+    # ---------- invalidation ----------
+
+    def invalidate(self, key: str) -> None:
+        """ลบ principal ของผู้ใช้คนเดียว"""
+        with self._lock:
+            self._entries.pop(key, None)
+            self._epoch += 1
+        if self.shared is not None:
+            try:
+                self.shared.delete(_SHARED_KEY_PREFIX + key)
+                # ให้ process อื่นล้าง cache ในหน่วยความจำด้วย
+                self.shared.incr(_SHARED_EPOCH_KEY)
+            except redis.RedisError:
+                pass
+            with self._lock:
+                self._epoch_checked_at = None
+
+    def invalidate_all(self) -> None:
+        """ลบ principal ทั้งหมด (เช่น เปิด/ปิดสิทธิ์หน่วยงาน)"""
+        with self._lock:
+            self._entries.clear()
+            self._epoch += 1
+        if self.shared is not None:
+            try:
+                self.shared.incr(_SHARED_EPOCH_KEY)
+                # snapshot ใน Redis หมดอายุเองภายใน TTL แต่ต้องไม่ถูกใช้อีก
+                for shared_key in self.shared.scan_iter(match=_SHARED_KEY_PREFIX + "*"):
+                    if shared_key not in (_SHARED_EPOCH_KEY, _SHARED_EPOCH_KEY.encode()):
+                        self.shared.delete(shared_key)
+            except redis.RedisError:
+                pass
+            with self._lock:
+                self._epoch_checked_at = None
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "ttl_seconds": self.ttl,
+                "shared": self.shared is not None,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+
+_cache: Optional[PrincipalCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_principal_cache() -> PrincipalCache:
+    """PrincipalCache ของ process นี้ (สร้างตาม settings ครั้งแรกที่เรียก)"""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                shared = None
+                if settings.PRINCIPAL_CACHE_SHARED:
+                    shared = redis.Redis.from_url(settings.REDIS_URL)
+                _cache = PrincipalCache(
+                    maxsize=settings.PRINCIPAL_CACHE_MAXSIZE,
+                    ttl=settings.PRINCIPAL_CACHE_TTL_SECONDS,
+                    shared=shared
+                )
+    return _cache
+
+
+def set_principal_cache(cache: Optional[PrincipalCache]) -> None:
+    """เปลี่ยน PrincipalCache (ใช้ในการทดสอบ)"""
+    global _cache
+    _cache = cache
+
+
+def invalidate_principal(username: Optional[str]) -> None:
+    if username:
+        get_principal_cache().invalidate(username)
+
+
+def invalidate_all_principals() -> None:
+    get_principal_cache().invalidate_all()
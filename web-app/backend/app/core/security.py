@@ -3,6 +3,7 @@ from typing import Optional
 from jose import JWTError, jwt
 import bcrypt
 from .config import settings
+from .executors import run_in_cpu
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verify a password against a hashed password using bcrypt"""
@@ -17,6 +18,14 @@ def get_password_hash(password: str) -> str:
     hashed = bcrypt.hashpw(password.encode('utf-8'), salt)
     return hashed.decode('utf-8')
 
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """verify_password() ใน CPU executor (สำหรับ async route ไม่ให้ bcrypt block event loop)"""
+    return await run_in_cpu(verify_password, plain_password, hashed_password)
+
+async def get_password_hash_async(password: str) -> str:
+    """get_password_hash() ใน CPU executor"""
+    return await run_in_cpu(get_password_hash, password)
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     to_encode = data.copy()
     if expires_delta:
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Signature-checked cache for data derived from whole tables
+
+ค่าที่สร้างจากทั้งตาราง (index, ต้นไม้หน่วยงาน, snapshot ข้อมูลหลัก) เก็บไว้ในหน่วยความจำของ process
+- ตรวจ signature (เช่น count/max(id)/max(updated_at) จาก table_signature) ไม่เกิน 1 ครั้งต่อช่วงเวลาที่กำหนด
+  แล้วสร้างใหม่เมื่อ signature เปลี่ยน จึงเห็นการแก้ไขจาก process อื่นภายในช่วงเวลานั้น
+- invalidate() บังคับให้ตรวจใหม่ในการเรียกครั้งถัดไป (เรียกหลังแก้ไขข้อมูลใน process นี้)
+"""
+
+import threading
+import time
+from typing import Any, Callable, Generic, Optional, TypeVar
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+T = TypeVar("T")
+
+
+def table_signature(db: Session, *models) -> tuple:
+    """count/max(id)/max(updated_at) ของทุก model ใน query เดียว"""
+    columns = []
+    for model in models:
+        columns += [
+            select(func.count(model.id)).scalar_subquery(),
+            select(func.max(model.id)).scalar_subquery(),
+            select(func.max(model.updated_at)).scalar_subquery(),
+        ]
+    return tuple(db.execute(select(*columns)).one())
+
+
+class SignatureCache(Generic[T]):
+    """
+    ค่าที่ loader(db) สร้าง โดยสร้างใหม่เมื่อ signature(db) เปลี่ยน
+
+    check_seconds: ช่วงเวลาระหว่างการตรวจ signature (callable เพื่ออ่านค่าจาก settings ทุกครั้ง)
+    """
+
+    def __init__(
+        self,
+        loader: Callable[[Session], T],
+        signature: Callable[[Session], Any],
+        check_seconds: Callable[[], float]
+    ):
+        self._loader = loader
+        self._signature = signature
+        self._check_seconds = check_seconds
+        self._value: Optional[T] = None
+        self._loaded = False
+        self._value_signature = None
+        self._checked_at: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def _is_fresh(self, now: float) -> bool:
+        return (
+            self._loaded
+            and self._checked_at is not None
+            and now - self._checked_at < self._check_seconds()
+        )
+
+    def get(self, db: Session) -> T:
+        """ค่าปัจจุบัน (สร้างครั้งแรก / สร้างใหม่เมื่อ signature เปลี่ยน)"""
+        if self._is_fresh(time.monotonic()):
+            return self._value
+
+        with self._lock:
+            if self._is_fresh(time.monotonic()):
+                return self._value
+            signature = self._signature(db)
+            if not self._loaded or signature != self._value_signature:
+                self._value = self._loader(db)
+                self._value_signature = signature
+                self._loaded = True
+            self._checked_at = time.monotonic()
+            return self._value
+
+    def invalidate(self) -> None:
+        """บังคับให้ตรวจ signature ในการเรียกครั้งถัดไป และสร้างใหม่ (ค่าเดิมยังใช้ได้จนกว่าจะสร้างเสร็จ)"""
+        with self._lock:
+            self._value_signature = None
+            self._checked_at = None
@@ -3,8 +3,12 @@ from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 import os
 from app.core.config import settings
-from app.core.database import Base, engine
+from app.core.database import Base, engine, SessionLocal
 from app.api.v1 import api_router
+from app.services.pdf_renderer import shutdown_browser_pool
+from app.core.executors import shutdown_executors
+from app.services.line_dispatcher import shutdown_line_dispatcher
+from app.services.police_station_index import get_jurisdiction_index
 
 Base.metadata.create_all(bind=engine)
 
@@ -29,6 +33,24 @@ app.add_middleware(
 
 app.include_router(api_router, prefix=settings.API_V1_STR)
 
+@app.on_event("startup")
+def load_jurisdiction_index():
+    # โหลดดัชนีสถานีตำรวจล่วงหน้า เพื่อไม่ให้ request แรกต้องรอ
+    db = SessionLocal()
+    try:
+        get_jurisdiction_index(db)
+    except Exception as e:
+        print(f"Warning: Failed to load police station index: {str(e)}")
+    finally:
+        db.close()
+
+@app.on_event("shutdown")
+def close_browser_pool():
+    shutdown_browser_pool()
+    # ส่งการแจ้งเตือน LINE ที่ค้างอยู่ (ใช้ IO executor) ก่อนปิด executors
+    shutdown_line_dispatcher()
+    shutdown_executors()
+
 @app.get("/")
 def root():
     return {
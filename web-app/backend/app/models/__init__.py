@@ -22,7 +22,12 @@ from .telco_internet_account import TelcoInternetAccount
 from .suspect import Suspect
 from .cfr import CFR
 from .criminal_case import CriminalCase
+from .case_summary import CaseSummary
+from .identifier_link import IdentifierLink
 from .post_arrest import PostArrest
 from .police_station import PoliceStation
 from .email_log import EmailLog
 from .charge import Charge
+from .line_account import LineAccount
+from .line_notification_log import LineNotificationLog
+from .number_sequence import NumberSequence
@@ -0,0 +1,27 @@
+from sqlalchemy import Column, Integer, DateTime, ForeignKey
+from sqlalchemy.sql import func
+from app.core.database import Base
+
+class CaseSummary(Base):
+    """
+    สรุปจำนวนข้อมูลลูกของแต่ละคดี (ทั้งหมด/ตอบกลับแล้ว)
+    อัพเดทด้วย trigger ในฐานข้อมูล (migration 038) - ห้ามแก้ไขจากโค้ดโดยตรง
+    """
+    __tablename__ = "case_summary"
+
+    criminal_case_id = Column(Integer, ForeignKey("criminal_cases.id", ondelete="CASCADE"), primary_key=True)
+
+    bank_accounts_total = Column(Integer, nullable=False, default=0)
+    bank_accounts_replied = Column(Integer, nullable=False, default=0)
+    non_bank_accounts_total = Column(Integer, nullable=False, default=0)
+    non_bank_accounts_replied = Column(Integer, nullable=False, default=0)
+    payment_gateway_accounts_total = Column(Integer, nullable=False, default=0)
+    payment_gateway_accounts_replied = Column(Integer, nullable=False, default=0)
+    telco_mobile_accounts_total = Column(Integer, nullable=False, default=0)
+    telco_mobile_accounts_replied = Column(Integer, nullable=False, default=0)
+    telco_internet_accounts_total = Column(Integer, nullable=False, default=0)
+    telco_internet_accounts_replied = Column(Integer, nullable=False, default=0)
+    suspects_total = Column(Integer, nullable=False, default=0)
+    suspects_replied = Column(Integer, nullable=False, default=0)
+
+    updated_at = Column(DateTime(timezone=True), server_default=func.now())
@@ -1,10 +1,15 @@
-from sqlalchemy import Column, Integer, String, DateTime, DECIMAL, BigInteger, ForeignKey, Text
+from sqlalchemy import Column, Integer, String, Date, DateTime, DECIMAL, BigInteger, ForeignKey, Text
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from app.core.database import Base
 
 class CFR(Base):
-    """Model สำหรับ Central Fraud Registry - ข้อมูลเส้นทางการเงิน"""
+    """
+    Model สำหรับ Central Fraud Registry - ข้อมูลเส้นทางการเงิน
+
+    ตารางแบ่ง partition แบบ HASH (criminal_case_id) ตั้งแต่ migration 042
+    (primary key ในฐานข้อมูลคือ (criminal_case_id, id) โดย id ไม่ซ้ำจาก sequence เดียว)
+    """
     __tablename__ = "cfr"
 
     id = Column(Integer, primary_key=True, index=True)
@@ -20,6 +25,7 @@ class CFR(Base):
     response_id = Column(BigInteger)
     bank_case_id = Column(String(100), index=True)
     timestamp_insert = Column(String(50))
+    inserted_at = Column(DateTime)  # timestamp_insert แบบมีชนิดข้อมูล
 
     # From Account (ต้นทาง)
     from_bank_code = Column(Integer)
@@ -47,6 +53,8 @@ class CFR(Base):
     to_account_status = Column(String(50))
     to_open_date = Column(String(50))
     to_close_date = Column(String(50))
+    to_open_on = Column(Date)  # to_open_date แบบมีชนิดข้อมูล (ค.ศ.)
+    to_close_on = Column(Date)  # to_close_date แบบมีชนิดข้อมูล (ค.ศ.)
     to_balance = Column(DECIMAL(15, 2))
 
     # Transfer Information
@@ -57,6 +65,7 @@ class CFR(Base):
     transfer_amount = Column(DECIMAL(15, 2))
     transfer_description = Column(Text)
     transfer_ref = Column(String(100))
+    transfer_at = Column(DateTime)  # transfer_date + transfer_time แบบมีชนิดข้อมูล (ค.ศ.) ใช้เรียงลำดับ
 
     # Metadata
     created_at = Column(DateTime(timezone=True), server_default=func.now())
@@ -44,4 +44,5 @@ class CriminalCase(Base):
     suspects = relationship("Suspect", back_populates="criminal_case", cascade="all, delete-orphan")
     post_arrests = relationship("PostArrest", back_populates="criminal_case", cascade="all, delete-orphan")
     cfr_records = relationship("CFR", back_populates="criminal_case", cascade="all, delete-orphan")
+    summary = relationship("CaseSummary", uselist=False, viewonly=True)  # อัพเดทด้วย trigger
     owner = relationship("User", foreign_keys=[owner_id], overlaps="owned_criminal_cases")
\ No newline at end of file
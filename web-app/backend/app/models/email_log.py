@@ -1,4 +1,5 @@
 from sqlalchemy import Column, Integer, String, DateTime, Text, ForeignKey
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from app.core.database import Base
@@ -19,7 +20,7 @@ class EmailLog(Base):
     document_type = Column(String(50), nullable=False)
 
     # Sending status
-    status = Column(String(20), nullable=False, default='pending', index=True)
+    status = Column(String(20), nullable=False, default='pending', index=True)  # pending, sending, sent, failed
     sent_at = Column(DateTime(timezone=True))
     error_message = Column(Text)
 
@@ -27,6 +28,11 @@ class EmailLog(Base):
     retry_count = Column(Integer, default=0)
     last_retry_at = Column(DateTime(timezone=True))
 
+    # Outbound queue (email_worker.py)
+    payload = Column(JSONB)  # ข้อมูลสำหรับสร้างอีเมล์ ลบทิ้งเมื่อส่งสำเร็จ
+    next_attempt_at = Column(DateTime(timezone=True))
+    locked_at = Column(DateTime(timezone=True))
+
     # Tracking
     opened_at = Column(DateTime(timezone=True))
     opened_count = Column(Integer, default=0)
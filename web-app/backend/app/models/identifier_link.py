@@ -0,0 +1,15 @@
+from sqlalchemy import Column, Integer, String, ForeignKey
+from app.core.database import Base
+
+class IdentifierLink(Base):
+    """
+    ดัชนีบัญชี/เบอร์โทร/PromptPay/เลขบัตรประชาชน ที่ปรากฏในแต่ละคดี
+    อัพเดทด้วย trigger ในฐานข้อมูล (migration 039, 046) - ห้ามแก้ไขจากโค้ดโดยตรง
+    """
+    __tablename__ = "identifier_links"
+
+    identifier_type = Column(String(20), primary_key=True)  # account, phone, promptpay, id_card
+    identifier = Column(String(100), primary_key=True, index=True)
+    criminal_case_id = Column(Integer, ForeignKey("criminal_cases.id", ondelete="CASCADE"), primary_key=True)
+    source = Column(String(50), primary_key=True)  # ตารางต้นทาง เช่น bank_accounts, cfr
+    occurrences = Column(Integer, nullable=False, default=0)
@@ -19,6 +19,10 @@ class LineNotificationLog(Base):
     error_message = Column(Text)
     sent_at = Column(DateTime(timezone=True))
 
+    # Retry (app.services.line_dispatcher)
+    retry_count = Column(Integer, default=0)
+    last_retry_at = Column(DateTime(timezone=True))
+
     created_at = Column(DateTime(timezone=True), server_default=func.now())
 
     line_account = relationship("LineAccount", back_populates="notification_logs")
@@ -0,0 +1,12 @@
+from sqlalchemy import Column, Integer, String, DateTime
+from sqlalchemy.sql import func
+from app.core.database import Base
+
+class NumberSequence(Base):
+    """เลขรันล่าสุดต่อ (prefix, ปี พ.ศ.) ใช้ผ่าน app.services.number_sequence เท่านั้น"""
+    __tablename__ = "number_sequences"
+
+    prefix = Column(String(20), primary_key=True)  # CASE, SUS, BA, AR
+    year = Column(Integer, primary_key=True)        # ปี พ.ศ.
+    last_value = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
@@ -3,6 +3,6 @@ from .bank_account import BankAccountCreate, BankAccountUpdate, BankAccountRespo
 from .telco_mobile_account import TelcoMobileAccountCreate, TelcoMobileAccountUpdate, TelcoMobileAccountResponse, TelcoMobileAccountPaginationResponse
 from .telco_internet_account import TelcoInternetAccountCreate, TelcoInternetAccountUpdate, TelcoInternetAccountResponse, TelcoInternetAccountPaginationResponse
 from .suspect import SuspectCreate, SuspectUpdate, SuspectResponse
-from .criminal_case import CriminalCaseCreate, CriminalCaseUpdate, CriminalCaseResponse
+from .criminal_case import CriminalCaseCreate, CriminalCaseUpdate, CriminalCaseResponse, CriminalCaseSearchResponse
 from .post_arrest import PostArrestCreate, PostArrestUpdate, PostArrestResponse
 from .court import CourtCreate, CourtUpdate, Court
\ No newline at end of file
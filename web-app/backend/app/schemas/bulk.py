@@ -0,0 +1,29 @@
+from pydantic import BaseModel, Field
+from typing import Optional, List, Dict, Any
+
+class BulkCreateRequest(BaseModel):
+    """สร้างหลายรายการในครั้งเดียว (บัญชี/ผู้ต้องหา)"""
+    rows: List[Dict[str, Any]] = Field(..., min_length=1)
+    criminal_case_id: Optional[int] = None  # ใช้กับแถวที่ไม่ได้ระบุ criminal_case_id
+    dry_run: bool = False                   # ตรวจสอบอย่างเดียว ไม่บันทึก
+
+class BulkPasteRequest(BaseModel):
+    """ข้อความที่คัดลอกจาก Excel (คั่นด้วย tab, บรรทัดแรกเป็นหัวคอลัมน์)"""
+    text: str
+    criminal_case_id: Optional[int] = None
+    dry_run: bool = False
+
+class BulkRowResult(BaseModel):
+    row: int                                # ลำดับแถวข้อมูล (เริ่มที่ 1)
+    id: Optional[int] = None                # id ที่สร้าง (ว่างเมื่อ dry_run หรือมีข้อผิดพลาด)
+    document_number: Optional[str] = None
+    data: Dict[str, Any] = {}               # ข้อมูลหลังตรวจสอบ/จับคู่ข้อมูลหลักแล้ว
+    errors: List[str] = []
+    warnings: List[str] = []
+
+class BulkCreateResponse(BaseModel):
+    created: int
+    failed: int
+    dry_run: bool
+    ignored_columns: List[str] = []         # หัวคอลัมน์ที่ไม่รู้จัก (เฉพาะ /bulk/paste)
+    results: List[BulkRowResult]
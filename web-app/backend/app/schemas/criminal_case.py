@@ -1,5 +1,5 @@
 from pydantic import BaseModel
-from typing import Optional
+from typing import List, Optional
 from datetime import datetime, date
 
 class PoliceRankInfo(BaseModel):
@@ -66,10 +66,22 @@ class CriminalCaseResponse(CriminalCaseBase):
     created_at: datetime
     bank_accounts_count: Optional[str] = "0/0"
     suspects_count: Optional[str] = "0/0"
+    non_bank_accounts_count: Optional[str] = "0/0"
+    payment_gateway_accounts_count: Optional[str] = "0/0"
+    telco_mobile_accounts_count: Optional[str] = "0/0"
+    telco_internet_accounts_count: Optional[str] = "0/0"
+    over_six_months: bool = False
     row_class: Optional[str] = ""
     row_style: Optional[dict] = {}
     owner_id: Optional[int] = None
     owner: Optional[CaseOwnerInfo] = None
 
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+class CriminalCaseSearchResponse(BaseModel):
+    """ผลการค้นหาคดีแบบแบ่งหน้าด้วย keyset"""
+    cases: List[CriminalCaseResponse]
+    next_cursor: Optional[str] = None  # ส่งกลับมาเป็น cursor เพื่อดึงหน้าถัดไป
+    total: Optional[int] = None
+    total_is_estimate: bool = False
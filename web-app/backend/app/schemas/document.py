@@ -0,0 +1,35 @@
+from pydantic import BaseModel, Field
+from typing import List, Optional
+from datetime import date
+
+class SummonsBatchItem(BaseModel):
+    """บัญชีที่ต้องการออกหมายเรียก"""
+    account_type: str  # 'bank', 'non_bank', 'payment_gateway', 'telco_mobile', 'telco_internet'
+    account_id: int
+
+class SummonsBatchRequest(BaseModel):
+    """Request schema สำหรับสร้างหมายเรียก/ซองหลายฉบับพร้อมกัน
+
+    ระบุ criminal_case_id (ทุกบัญชีในคดี) หรือ accounts (เลือกเอง) อย่างใดอย่างหนึ่ง
+    """
+    criminal_case_id: Optional[int] = None
+    accounts: List[SummonsBatchItem] = Field(default_factory=list)
+    include_envelopes: bool = True
+    freeze_account: bool = False  # True = อายัดบัญชี, False = ไม่อายัดบัญชี
+    output_format: str = 'zip'  # 'zip' (ทยอยส่งตามที่เสร็จ) หรือ 'pdf' (รวมเป็นไฟล์เดียว)
+
+class CaseReportBatchRequest(BaseModel):
+    """Request schema สำหรับพิมพ์รายงานคดีหลายคดีรวมในเอกสารเดียว
+
+    ระบุ criminal_case_ids (เลือกเอง) หรือเงื่อนไขกรองแบบเดียวกับ /criminal-cases/search
+    (ถ้าระบุทั้งสองอย่าง ใช้เฉพาะคดีที่เลือกและตรงเงื่อนไข)
+    """
+    criminal_case_ids: List[int] = Field(default_factory=list)
+    status: Optional[str] = None
+    case_type: Optional[str] = None
+    owner_id: Optional[int] = None
+    bureau_id: Optional[int] = None
+    date_from: Optional[date] = None  # วันที่รับแจ้ง
+    date_to: Optional[date] = None
+    q: Optional[str] = None
+    output_format: str = 'html'  # 'html' (ทยอยส่ง), 'pdf' (รวมเป็นไฟล์เดียว) หรือ 'zip' (PDF เป็นชุด)
@@ -21,7 +21,7 @@ class PoliceStationUpdate(PoliceStationBase):
 
 class PoliceStationResponse(PoliceStationBase):
     id: int
-    created_at: datetime
+    created_at: Optional[datetime] = None  # สถานีสมมติ (ไม่พบในฐานข้อมูล) ไม่มีค่านี้
     updated_at: Optional[datetime] = None
 
     class Config:
@@ -36,3 +36,14 @@ class PoliceStationSearchResponse(BaseModel):
     district_matches: list[PoliceStationResponse] = []  # สถานีในอำเภอเดียวกัน
     has_incomplete_address: bool = False  # มีสถานีที่ไม่มีเลขที่ในที่อยู่
     warning_message: Optional[str] = None  # ข้อความแจ้งเตือน
+
+class PoliceStationBatchRequest(BaseModel):
+    addresses: list[str] = []  # ที่อยู่ผู้ต้องหาหลายรายการ
+    criminal_case_id: Optional[int] = None  # หรือระบุคดี เพื่อค้นหาให้ผู้ต้องหาทุกคนในคดี
+
+class PoliceStationBatchItem(PoliceStationSearchResponse):
+    address: str
+    suspect_id: Optional[int] = None  # เมื่อค้นหาจาก criminal_case_id
+
+class PoliceStationBatchResponse(BaseModel):
+    results: list[PoliceStationBatchItem] = []
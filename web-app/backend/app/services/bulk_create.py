@@ -0,0 +1,341 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Bulk create for accounts and suspects (POST /{resource}/bulk และ /bulk/paste)
+
+เจ้าหน้าที่กรอกบัญชีม้า/ผู้ต้องหาครั้งละ 20-50 รายการต่อคดี เดิมต้องส่งทีละ POST
+(แต่ละรายการ commit, refresh และค้นหาชื่อธนาคาร/ผู้ให้บริการเอง)
+
+- ตรวจทุกแถวก่อนด้วย schema เดียวกับ endpoint สร้างทีละรายการ ถ้ามีแถวผิดจะไม่บันทึกเลย
+- จับคู่ชื่อธนาคาร/ผู้ให้บริการเป็น FK จาก master-data cache (ไม่ query ต่อแถว)
+- ตรวจคดีที่อ้างถึงทั้งหมดใน query เดียว
+- เลขที่หนังสือที่เว้นว่าง (ผู้ต้องหา) จองจาก number_sequences ครั้งเดียว
+- INSERT หลายแถวในคำสั่งเดียว และ commit ครั้งเดียว
+- /bulk/paste แปลงข้อความที่คัดลอกจาก Excel (คั่นด้วย tab) เป็นแถวแล้วใช้ขั้นตอนเดียวกัน
+"""
+
+import re
+import typing
+from dataclasses import dataclass, field
+from datetime import date
+from typing import Any, Dict, List, Optional, Tuple, Type
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel, ValidationError
+from sqlalchemy import insert
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models import (
+    BankAccount, CriminalCase, NonBankAccount, PaymentGatewayAccount, Suspect,
+    TelcoInternetAccount, TelcoMobileAccount
+)
+from app.schemas import BankAccountCreate, SuspectCreate, TelcoInternetAccountCreate, TelcoMobileAccountCreate
+from app.schemas.bulk import BulkCreateResponse, BulkRowResult
+from app.schemas.non_bank_account import NonBankAccountCreate
+from app.schemas.payment_gateway_account import PaymentGatewayAccountCreate
+from app.services.master_data_cache import get_master_data
+from app.services.number_sequence import SUSPECT_DOCUMENT_PREFIX, reserve_document_numbers
+from app.utils.thai_date_utils import parse_thai_date_to_date_object
+
+
+class BulkCreateError(ValueError):
+    """คำขอทั้งชุดใช้ไม่ได้ (ไม่มีข้อมูล, เกินจำนวนที่รับได้, บันทึกไม่สำเร็จ)"""
+
+
+@dataclass(frozen=True)
+class MasterLookup:
+    """ชื่อที่ผู้ใช้กรอก → FK ในตารางข้อมูลหลัก"""
+    name_field: str  # เช่น bank_name
+    id_field: str    # เช่น bank_id
+    table: str       # ชื่อตารางใน master_data_cache เช่น "banks"
+    label: str       # ใช้ในข้อความเตือน เช่น "ธนาคาร"
+
+
+@dataclass(frozen=True)
+class BulkSpec:
+    model: Any
+    schema: Type[BaseModel]                  # schema ของ endpoint สร้างทีละรายการ
+    lookups: Tuple[MasterLookup, ...] = ()
+    document_prefix: Optional[str] = None    # เติมเลขที่หนังสืออัตโนมัติเมื่อเว้นว่าง
+    columns: Dict[str, str] = field(default_factory=dict)  # หัวคอลัมน์ใน Excel → field
+
+
+# หัวคอลัมน์ที่ใช้ร่วมกัน (ตามป้ายในฟอร์มของหน้าเว็บ)
+COMMON_COLUMNS = {
+    "เลขที่หนังสือ": "document_number",
+    "ลงวันที่": "document_date",
+    "กำหนดให้ส่งเอกสาร": "delivery_date",
+    "สถานะตอบกลับ": "reply_status",
+    "สถานะการตอบกลับ": "reply_status",
+    "หมายเหตุ": "notes",
+    "ลำดับ": "order_number",
+}
+
+BANK_LOOKUP = MasterLookup("bank_name", "bank_id", "banks", "ธนาคาร")
+
+BANK_ACCOUNT_BULK = BulkSpec(
+    model=BankAccount,
+    schema=BankAccountCreate,
+    lookups=(BANK_LOOKUP,),
+    columns={
+        "ชื่อธนาคาร": "bank_name", "ธนาคาร": "bank_name",
+        "เลขที่บัญชี": "account_number", "เลขบัญชี": "account_number",
+        "ชื่อบัญชี": "account_name",
+        "ช่วงเวลาที่ทำธุรกรรม": "time_period", "ช่วงเวลา": "time_period",
+    },
+)
+
+NON_BANK_ACCOUNT_BULK = BulkSpec(
+    model=NonBankAccount,
+    schema=NonBankAccountCreate,
+    lookups=(MasterLookup("non_bank_name", "non_bank_id", "non_banks", "ผู้ให้บริการ Non-Bank"),),
+    columns={
+        "ชื่อผู้ให้บริการ": "non_bank_name", "ผู้ให้บริการ": "non_bank_name",
+        "เลขที่บัญชี": "account_number", "หมายเลขผู้ใช้": "account_number",
+        "ชื่อบัญชี": "account_name",
+        "ช่วงเวลา": "time_period",
+    },
+)
+
+PAYMENT_GATEWAY_ACCOUNT_BULK = BulkSpec(
+    model=PaymentGatewayAccount,
+    schema=PaymentGatewayAccountCreate,
+    lookups=(
+        MasterLookup("payment_gateway_name", "payment_gateway_id", "payment_gateways", "Payment Gateway"),
+        BANK_LOOKUP,
+    ),
+    columns={
+        "ชื่อผู้ให้บริการ": "payment_gateway_name", "ผู้ให้บริการ": "payment_gateway_name",
+        "payment gateway": "payment_gateway_name",
+        "ชื่อธนาคาร": "bank_name", "ธนาคาร": "bank_name",
+        "เลขที่บัญชี": "account_number", "หมายเลขผู้ใช้": "account_number",
+        "ชื่อบัญชี": "account_name",
+        "ช่วงเวลา": "time_period",
+    },
+)
+
+TELCO_MOBILE_ACCOUNT_BULK = BulkSpec(
+    model=TelcoMobileAccount,
+    schema=TelcoMobileAccountCreate,
+    lookups=(MasterLookup("provider_name", "telco_mobile_id", "telco_mobile", "ผู้ให้บริการโทรศัพท์"),),
+    columns={
+        "ชื่อผู้ให้บริการ": "provider_name", "ผู้ให้บริการ": "provider_name",
+        "หมายเลขโทรศัพท์": "phone_number", "เบอร์โทรศัพท์": "phone_number",
+        "ช่วงเวลา": "time_period",
+    },
+)
+
+TELCO_INTERNET_ACCOUNT_BULK = BulkSpec(
+    model=TelcoInternetAccount,
+    schema=TelcoInternetAccountCreate,
+    lookups=(MasterLookup("provider_name", "telco_internet_id", "telco_internet", "ผู้ให้บริการอินเทอร์เน็ต"),),
+    columns={
+        "ชื่อผู้ให้บริการ": "provider_name", "ผู้ให้บริการ": "provider_name",
+        "ip address": "ip_address", "ip": "ip_address",
+        "วันที่": "datetime_used", "วันเวลาที่ใช้งาน": "datetime_used",
+    },
+)
+
+SUSPECT_BULK = BulkSpec(
+    model=Suspect,
+    schema=SuspectCreate,
+    document_prefix=SUSPECT_DOCUMENT_PREFIX,
+    columns={
+        "ชื่อผู้ต้องหา": "suspect_name",
+        "เลขบัตรประชาชน/เลขที่หนังสือเดินทาง": "suspect_id_card", "เลขบัตรประชาชน": "suspect_id_card",
+        "ที่อยู่ผู้ต้องหา": "suspect_address",
+        "สถานีตำรวจ": "police_station",
+        "จังหวัด": "police_province",
+        "ที่อยู่สถานีตำรวจ": "police_address",
+        "วันนัดหมาย": "appointment_date",
+        "สถานะผลหมายเรียก": "reply_status",
+    },
+)
+
+
+_SLASH_DATE = re.compile(r"^(\d{1,2})[/-](\d{1,2})[/-](\d{4})$")
+
+
+def _header_key(header: str) -> str:
+    return re.sub(r"\s+", "", header).lower()
+
+
+def _date_fields(schema: Type[BaseModel]) -> List[str]:
+    """field ที่เป็นวันที่ (ไม่รวม datetime)"""
+    return [
+        name for name, info in schema.model_fields.items()
+        if info.annotation is date or date in typing.get_args(info.annotation)
+    ]
+
+
+def _parse_date(value: Any) -> Any:
+    """วันที่แบบที่พิมพ์/คัดลอกจาก Excel: 15/01/2568, 15-01-2025, 18 ก.ย. 2568 (อย่างอื่นปล่อยให้ schema ตรวจ)"""
+    if not isinstance(value, str):
+        return value
+    match = _SLASH_DATE.match(value)
+    if match:
+        day, month, year = (int(part) for part in match.groups())
+        if year > 2400:
+            year -= 543
+        try:
+            return date(year, month, day)
+        except ValueError:
+            return value
+    return parse_thai_date_to_date_object(value) or value
+
+
+def _format_errors(error: ValidationError) -> List[str]:
+    return [
+        f"{'.'.join(str(part) for part in e['loc'])}: {e['msg']}" if e["loc"] else e["msg"]
+        for e in error.errors()
+    ]
+
+
+def prepare_rows(
+    db: Session,
+    spec: BulkSpec,
+    rows: List[Dict[str, Any]],
+    criminal_case_id: Optional[int],
+    user_id: int,
+) -> Tuple[List[BulkRowResult], List[Dict[str, Any]]]:
+    """ตรวจและแปลงทุกแถว คืน (ผลต่อแถว, ข้อมูลพร้อม INSERT ตามลำดับเดียวกัน)"""
+    if not rows:
+        raise BulkCreateError("ไม่มีข้อมูลที่จะบันทึก")
+    if len(rows) > settings.BULK_CREATE_MAX_ROWS:
+        raise BulkCreateError(f"บันทึกได้ครั้งละไม่เกิน {settings.BULK_CREATE_MAX_ROWS} รายการ")
+
+    date_fields = _date_fields(spec.schema)
+    snapshots = {lookup.table: get_master_data(db, lookup.table) for lookup in spec.lookups}
+    results: List[BulkRowResult] = []
+    prepared: List[Dict[str, Any]] = []
+
+    for number, raw in enumerate(rows, start=1):
+        result = BulkRowResult(row=number)
+        results.append(result)
+
+        data = {
+            key: value.strip() if isinstance(value, str) else value
+            for key, value in raw.items()
+        }
+        data = {key: value for key, value in data.items() if value is not None and value != ""}
+        if criminal_case_id and "criminal_case_id" not in data:
+            data["criminal_case_id"] = criminal_case_id
+        for name in date_fields:
+            if name in data:
+                data[name] = _parse_date(data[name])
+
+        try:
+            values = spec.schema.model_validate(data).model_dump()
+        except ValidationError as e:
+            result.errors.extend(_format_errors(e))
+            values = {}
+
+        for lookup in spec.lookups:
+            snapshot = snapshots[lookup.table]
+            if values.get(lookup.id_field) is not None:
+                if values[lookup.id_field] not in snapshot.ids:
+                    result.errors.append(f"{lookup.id_field}: ไม่พบ{lookup.label} id={values[lookup.id_field]}")
+                continue
+            name = data.get(lookup.name_field)
+            found = snapshot.name_index.find(name) if name else None
+            values[lookup.id_field] = found["id"] if found else None
+            if name and not found:
+                result.warnings.append(f"ไม่พบ{lookup.label} '{name}' ในข้อมูลหลัก")
+
+        values["created_by"] = user_id
+        result.data = jsonable_encoder(values)
+        prepared.append(values)
+
+    # คดีที่อ้างถึงทั้งหมดใน query เดียว
+    case_ids = {values.get("criminal_case_id") for values in prepared} - {None}
+    existing = {
+        case_id for (case_id,) in db.query(CriminalCase.id).filter(CriminalCase.id.in_(case_ids))
+    } if case_ids else set()
+    for result, values in zip(results, prepared):
+        case_id = values.get("criminal_case_id")
+        if case_id is not None and case_id not in existing:
+            result.errors.append(f"criminal_case_id: ไม่พบคดี id={case_id}")
+
+    return results, prepared
+
+
+def bulk_create(
+    db: Session,
+    spec: BulkSpec,
+    rows: List[Dict[str, Any]],
+    criminal_case_id: Optional[int],
+    user_id: int,
+    dry_run: bool = False,
+) -> BulkCreateResponse:
+    """
+    ตรวจสอบแล้วบันทึกทุกแถวใน transaction เดียว
+
+    ถ้ามีแถวใดผิด (หรือ dry_run) จะไม่บันทึกเลย และคืนผลตรวจของทุกแถว
+    """
+    results, prepared = prepare_rows(db, spec, rows, criminal_case_id, user_id)
+    failed = sum(1 for result in results if result.errors)
+    if failed or dry_run:
+        return BulkCreateResponse(created=0, failed=failed, dry_run=dry_run, results=results)
+
+    if spec.document_prefix:
+        missing = [values for values in prepared if not values.get("document_number")]
+        if missing:
+            numbers = reserve_document_numbers(db, spec.document_prefix, len(missing))
+            for values, document_number in zip(missing, numbers):
+                values["document_number"] = document_number
+
+    columns = set(spec.model.__table__.columns.keys())
+    insert_rows = [{key: value for key, value in values.items() if key in columns} for values in prepared]
+    statement = insert(spec.model).returning(spec.model.id, sort_by_parameter_order=True)
+    try:
+        ids = db.execute(statement, insert_rows).scalars().all()
+        db.commit()
+    except IntegrityError as e:
+        db.rollback()
+        raise BulkCreateError(f"บันทึกไม่สำเร็จ: {e.orig}") from e
+
+    for result, values, new_id in zip(results, insert_rows, ids):
+        result.id = new_id
+        result.document_number = values.get("document_number")
+    return BulkCreateResponse(created=len(ids), failed=0, dry_run=False, results=results)
+
+
+def parse_pasted_rows(spec: BulkSpec, text: str) -> Tuple[List[Dict[str, Any]], List[str]]:
+    """
+    ข้อความที่คัดลอกจาก Excel → แถวข้อมูล
+
+    บรรทัดแรกเป็นหัวคอลัมน์ (ชื่อ field หรือป้ายภาษาไทยตามฟอร์ม เช่น "ชื่อธนาคาร", "เลขที่บัญชี")
+    คืน (แถวข้อมูล, หัวคอลัมน์ที่ไม่รู้จัก)
+    """
+    lines = [line for line in text.replace("\r\n", "\n").replace("\r", "\n").split("\n") if line.strip()]
+    if len(lines) < 2:
+        raise BulkCreateError("ต้องมีหัวคอลัมน์และข้อมูลอย่างน้อย 1 แถว")
+
+    known = set(spec.schema.model_fields) | {lookup.name_field for lookup in spec.lookups}
+    aliases = {_header_key(name): name for name in known}
+    for label, name in {**COMMON_COLUMNS, **spec.columns}.items():
+        if name in known:
+            aliases.setdefault(_header_key(label), name)
+
+    headers = [aliases.get(_header_key(header)) for header in lines[0].split("\t")]
+    ignored = [header.strip() for header, name in zip(lines[0].split("\t"), headers) if name is None and header.strip()]
+    if not any(headers):
+        raise BulkCreateError("ไม่พบหัวคอลัมน์ที่รู้จักในบรรทัดแรก")
+
+    rows = []
+    for line in lines[1:]:
+        cells = line.split("\t")
+        rows.append({name: cell for name, cell in zip(headers, cells) if name})
+    return rows, ignored
+
+
+def bulk_create_response(db: Session, spec: BulkSpec, rows: List[Dict[str, Any]], criminal_case_id: Optional[int],
+                         user_id: int, dry_run: bool = False, ignored_columns: Optional[List[str]] = None) -> JSONResponse:
+    """JSON response ของ /bulk: 201 เมื่อบันทึกแล้ว, 200 เมื่อ dry_run ผ่าน, 422 เมื่อมีแถวผิด"""
+    response = bulk_create(db, spec, rows, criminal_case_id, user_id, dry_run)
+    response.ignored_columns = ignored_columns or []
+    status_code = 422 if response.failed else 200 if dry_run else 201
+    return JSONResponse(status_code=status_code, content=jsonable_encoder(response))
@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Case aggregate loader
+
+โหลดคดีพร้อมข้อมูลลูกทั้งหมด (บัญชีทุกประเภท, ผู้ต้องหา, ชื่อผู้ให้บริการ)
+ด้วยจำนวน query คงที่ ไม่ขึ้นกับจำนวนบัญชีในคดี (ไม่มี N+1)
+- 1 query สำหรับคดี + 1 query ต่อความสัมพันธ์ (selectinload ใช้ WHERE ... IN)
+- ชื่อผู้ให้บริการ Non-Bank / Payment Gateway โหลดรวมครั้งเดียวต่อประเภท (เฉพาะ id, company_name)
+
+ใช้ร่วมกันระหว่างรายงานคดี, การส่งหมายเรียกทางอีเมล์ และการ export
+"""
+
+from typing import Any, Dict, Iterable, List, Optional
+
+from sqlalchemy.orm import Session, configure_mappers, joinedload, selectinload
+
+from app.models.bank_account import BankAccount
+from app.models.criminal_case import CriminalCase
+from app.models.non_bank import NonBank
+from app.models.non_bank_account import NonBankAccount
+from app.models.non_bank_transaction import NonBankTransaction
+from app.models.payment_gateway import PaymentGateway
+from app.models.payment_gateway_account import PaymentGatewayAccount
+from app.models.payment_gateway_transaction import PaymentGatewayTransaction
+from app.models.telco_internet_account import TelcoInternetAccount
+from app.models.telco_mobile_account import TelcoMobileAccount
+
+# ความสัมพันธ์ไปยังผู้ให้บริการของบัญชีแต่ละประเภท
+ACCOUNT_PROVIDERS = {
+    BankAccount: "bank",
+    NonBankAccount: "non_bank",
+    PaymentGatewayAccount: "payment_gateway",
+    TelcoMobileAccount: "telco_mobile",
+    TelcoInternetAccount: "telco_internet",
+}
+
+# บัญชีที่มีรายการโอน (backref "transactions" จากตารางรายการโอน)
+ACCOUNT_TRANSACTIONS = {
+    NonBankAccount: NonBankTransaction,
+    PaymentGatewayAccount: PaymentGatewayTransaction,
+}
+
+
+def case_aggregate_options() -> list:
+    """loader options สำหรับ query CriminalCase ให้ได้ข้อมูลลูกครบในจำนวน query คงที่"""
+    # CriminalCase.payment_gateway_accounts เป็น backref ซึ่งถูกสร้างตอน configure mappers
+    configure_mappers()
+    return [
+        selectinload(CriminalCase.bank_accounts),
+        selectinload(CriminalCase.suspects),
+        selectinload(CriminalCase.non_bank_accounts)
+        .selectinload(NonBankAccount.non_bank)
+        .load_only(NonBank.company_name),
+        selectinload(CriminalCase.payment_gateway_accounts)
+        .selectinload(PaymentGatewayAccount.payment_gateway)
+        .load_only(PaymentGateway.company_name),
+        selectinload(CriminalCase.telco_mobile_accounts),
+        selectinload(CriminalCase.telco_internet_accounts),
+    ]
+
+
+def load_case_aggregate(db: Session, criminal_case_id: int) -> Optional[CriminalCase]:
+    """โหลดคดีพร้อมข้อมูลลูกทั้งหมด (None ถ้าไม่พบคดี)"""
+    return db.query(CriminalCase).options(*case_aggregate_options()).filter(
+        CriminalCase.id == criminal_case_id
+    ).first()
+
+
+def load_case_aggregates(db: Session, criminal_case_ids: Iterable[int]) -> List[CriminalCase]:
+    """โหลดหลายคดีพร้อมข้อมูลลูก (จำนวน query เท่ากับกรณีคดีเดียว) เรียงตาม id"""
+    ids = list(criminal_case_ids)
+    if not ids:
+        return []
+    return db.query(CriminalCase).options(*case_aggregate_options()).filter(
+        CriminalCase.id.in_(ids)
+    ).order_by(CriminalCase.id).all()
+
+
+def _provider_name(provider) -> str:
+    return provider.company_name if provider else ''
+
+
+def case_report_data(criminal_case: CriminalCase) -> Dict[str, Any]:
+    """
+    แปลงคดีที่โหลดด้วย load_case_aggregate() เป็น arguments ของ
+    CaseReportGenerator.generate_case_report_html()
+    """
+    return {
+        'case_data': {
+            'case_number': criminal_case.case_number,
+            'case_id': criminal_case.case_id,
+            'complainant': criminal_case.complainant,
+            'damage_amount': criminal_case.damage_amount,
+            'complaint_date': criminal_case.complaint_date,
+            'incident_date': criminal_case.incident_date,
+            'status': criminal_case.status,
+            'case_type': criminal_case.case_type,
+            'court_name': criminal_case.court_name,
+        },
+        'bank_accounts': [{
+            'bank_name': ba.bank_name,
+            'account_number': ba.account_number,
+            'account_name': ba.account_name,
+            'document_date': ba.document_date,
+            'reply_status': ba.reply_status,
+        } for ba in criminal_case.bank_accounts],
+        'suspects': [{
+            'suspect_name': s.suspect_name,
+            'suspect_id_card': s.suspect_id_card,
+            'document_date': s.document_date,
+            'appointment_date': s.appointment_date,
+            'reply_status': s.reply_status,
+        } for s in criminal_case.suspects],
+        'non_bank_accounts': [{
+            'provider_name': _provider_name(nba.non_bank),
+            'account_number': nba.account_number,
+            'account_name': nba.account_name,
+            'document_date': nba.document_date,
+            'reply_status': nba.reply_status,
+        } for nba in criminal_case.non_bank_accounts],
+        'payment_gateway_accounts': [{
+            'provider_name': _provider_name(pga.payment_gateway),
+            'account_number': pga.account_number,
+            'account_name': pga.account_name,
+            'document_date': pga.document_date,
+            'reply_status': pga.reply_status,
+        } for pga in criminal_case.payment_gateway_accounts],
+        'telco_mobile_accounts': [{
+            'provider_name': tma.provider_name,
+            'phone_number': tma.phone_number,
+            'document_date': tma.document_date,
+            'reply_status': tma.reply_status,
+        } for tma in criminal_case.telco_mobile_accounts],
+        'telco_internet_accounts': [{
+            'provider_name': tia.provider_name,
+            'ip_address': tia.ip_address,
+            'document_date': tia.document_date,
+            'reply_status': tia.reply_status,
+        } for tia in criminal_case.telco_internet_accounts],
+    }
+
+
+def load_summons_account(db: Session, model, account_id: int):
+    """
+    โหลดบัญชี 1 รายการสำหรับออกหมายเรียก พร้อมคดี, ผู้ให้บริการ
+    และรายการโอน (ถ้ามี) พร้อมธนาคารต้นทาง ในจำนวน query คงที่
+    """
+    configure_mappers()
+    options = [
+        joinedload(model.criminal_case),
+        joinedload(getattr(model, ACCOUNT_PROVIDERS[model])),
+    ]
+    transaction_model = ACCOUNT_TRANSACTIONS.get(model)
+    if transaction_model is not None:
+        options.append(selectinload(model.transactions).joinedload(transaction_model.source_bank))
+    return db.query(model).options(*options).filter(model.id == account_id).first()
@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Combined case reports (หลายคดีในเอกสารเดียว)
+
+- โหลดคดีเป็นชุดละ CASE_LOAD_BATCH_SIZE คดีผ่าน load_case_aggregates (จำนวน query คงที่ต่อชุด)
+- HTML: render และทยอยส่งทีละคดีตามลำดับ (ไม่ต้องรอ render ครบทุกคดี)
+- PDF: แบ่งเป็นเอกสารย่อยละ CASES_PER_PDF_DOCUMENT คดี แล้ว render พร้อมกันผ่าน BrowserPool
+  (รวมเป็นไฟล์เดียวด้วย render_merged_pdf หรือทยอยส่งเป็น ZIP ด้วย stream_zip)
+
+หน้ารายงานของคดีเดียวใช้เวลา render ราว 1 ms จึงไม่ส่งไปรันใน process pool
+(ค่า pickle ข้อมูลไป-กลับสูงกว่าเวลาที่ประหยัดได้) งานที่ช้าจริงคือการแปลงเป็น PDF
+"""
+
+from typing import Dict, Iterator, List
+
+from sqlalchemy.orm import Session
+
+from app.services.case_aggregate import case_report_data, load_case_aggregates
+from app.services.case_report_generator import CaseReportGenerator
+from app.services.summons_bundle import BundleDocument
+
+CASE_LOAD_BATCH_SIZE = 100
+CASES_PER_PDF_DOCUMENT = 20
+
+_generator = CaseReportGenerator()
+
+
+def load_report_data(db: Session, case_ids: List[int]) -> List[Dict]:
+    """ข้อมูลรายงานของทุกคดี (arguments ของ generate_case_page_html) เรียงตาม case_ids"""
+    report_data = []
+    for start in range(0, len(case_ids), CASE_LOAD_BATCH_SIZE):
+        batch = case_ids[start:start + CASE_LOAD_BATCH_SIZE]
+        cases = {case.id: case for case in load_case_aggregates(db, batch)}
+        report_data.extend(case_report_data(cases[case_id]) for case_id in batch if case_id in cases)
+    return report_data
+
+
+def render_pages(report_data: List[Dict]) -> Iterator[str]:
+    """หน้ารายงานของแต่ละคดีตามลำดับ (render เมื่อถูกดึงค่า)"""
+    for data in report_data:
+        yield _generator.generate_case_page_html(**data)
+
+
+def iter_combined_report_html(report_data: List[Dict], title: str) -> Iterator[str]:
+    """HTML รายงานรวมแบบ streaming (หัวเอกสาร, หน้าของแต่ละคดี, ท้ายเอกสาร)"""
+    return _generator.iter_combined_report_html(render_pages(report_data), title)
+
+
+def build_pdf_documents(report_data: List[Dict], title: str) -> List[BundleDocument]:
+    """แบ่งรายงานรวมเป็นเอกสาร HTML ย่อย สำหรับ render เป็น PDF พร้อมกัน"""
+    pages = list(render_pages(report_data))
+    documents = []
+    for number, start in enumerate(range(0, len(pages), CASES_PER_PDF_DOCUMENT), start=1):
+        html = "".join(_generator.iter_combined_report_html(pages[start:start + CASES_PER_PDF_DOCUMENT], title))
+        documents.append((f"case_report_{number:03d}.pdf", html))
+    return documents
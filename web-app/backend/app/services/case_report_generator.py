@@ -7,7 +7,13 @@ Service สำหรับสร้างรายงานคดี (Case Repor
 import os
 import base64
 from datetime import datetime
-from typing import Dict, Optional, List
+from typing import Dict, Iterable, Iterator, Optional, List
+
+from app.utils.thai_date_utils import format_date_to_thai_buddhist_era
+
+DOCUMENT_END = """</body>
+</html>
+"""
 
 class CaseReportGenerator:
     """Generator สำหรับสร้างรายงานคดี"""
@@ -37,7 +43,6 @@ class CaseReportGenerator:
         if not date_value:
             return '-'
         try:
-            from app.utils.thai_date_utils import format_date_to_thai_buddhist_era
             return format_date_to_thai_buddhist_era(date_value)
         except:
             return str(date_value)
@@ -71,60 +76,14 @@ class CaseReportGenerator:
         except:
             return str(value)
 
-    def generate_case_report_html(
-        self,
-        case_data: Dict,
-        bank_accounts: List[Dict] = None,
-        suspects: List[Dict] = None,
-        non_bank_accounts: List[Dict] = None,
-        payment_gateway_accounts: List[Dict] = None,
-        telco_mobile_accounts: List[Dict] = None,
-        telco_internet_accounts: List[Dict] = None
-    ) -> str:
-        """
-        สร้าง HTML รายงานคดี
-
-        Args:
-            case_data: ข้อมูลคดีหลัก
-            bank_accounts: รายการบัญชีธนาคาร
-            suspects: รายการผู้ต้องหา
-            non_bank_accounts: รายการ Non-Bank
-            payment_gateway_accounts: รายการ Payment Gateway
-            telco_mobile_accounts: รายการหมายเลขโทรศัพท์
-            telco_internet_accounts: รายการ IP Address
-
-        Returns:
-            HTML content string
-        """
-
-        # ดึงข้อมูลคดี
-        case_number = self._format_value(case_data.get('case_number'))
-        case_id = self._format_value(case_data.get('case_id'))
-        complainant = self._format_value(case_data.get('complainant'))
-        damage_amount = self._format_currency(case_data.get('damage_amount'))
-        complaint_date = self._format_date(case_data.get('complaint_date'))
-        status = self._format_value(case_data.get('status'))
-        case_type = self._format_value(case_data.get('case_type'))
-        court_name = self._format_value(case_data.get('court_name'))
-
-        # นับสถิติ
-        total_banks = len(bank_accounts) if bank_accounts else 0
-        total_suspects = len(suspects) if suspects else 0
-        total_non_banks = len(non_bank_accounts) if non_bank_accounts else 0
-        total_payment_gateways = len(payment_gateway_accounts) if payment_gateway_accounts else 0
-        total_telco_mobile = len(telco_mobile_accounts) if telco_mobile_accounts else 0
-        total_telco_internet = len(telco_internet_accounts) if telco_internet_accounts else 0
-
-        # วันที่ปริ้น
-        from app.utils.thai_date_utils import format_date_to_thai_buddhist_era
-        print_date = format_date_to_thai_buddhist_era(datetime.now())
-
-        html_content = f"""<!DOCTYPE html>
+    def _document_head(self, title: str) -> str:
+        """ส่วนหัวของเอกสาร (<head> + CSS) ใช้ร่วมกันทั้งรายงานคดีเดียวและรายงานรวม"""
+        return f"""<!DOCTYPE html>
 <html lang="th">
 <head>
     <meta charset="UTF-8">
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>รายงานคดี {case_number}</title>
+    <title>{title}</title>
     <style>
         @import url('https://fonts.googleapis.com/css2?family=Sarabun:wght@400;600;700&display=swap');
 
@@ -330,7 +289,104 @@ class CaseReportGenerator:
     </style>
 </head>
 <body>
-    <div class="page">
+"""
+
+    def generate_case_report_html(
+        self,
+        case_data: Dict,
+        bank_accounts: List[Dict] = None,
+        suspects: List[Dict] = None,
+        non_bank_accounts: List[Dict] = None,
+        payment_gateway_accounts: List[Dict] = None,
+        telco_mobile_accounts: List[Dict] = None,
+        telco_internet_accounts: List[Dict] = None
+    ) -> str:
+        """
+        สร้าง HTML รายงานคดี
+
+        Args:
+            case_data: ข้อมูลคดีหลัก
+            bank_accounts: รายการบัญชีธนาคาร
+            suspects: รายการผู้ต้องหา
+            non_bank_accounts: รายการ Non-Bank
+            payment_gateway_accounts: รายการ Payment Gateway
+            telco_mobile_accounts: รายการหมายเลขโทรศัพท์
+            telco_internet_accounts: รายการ IP Address
+
+        Returns:
+            HTML content string
+        """
+        case_number = self._format_value(case_data.get('case_number'))
+        page = self.generate_case_page_html(
+            case_data,
+            bank_accounts=bank_accounts,
+            suspects=suspects,
+            non_bank_accounts=non_bank_accounts,
+            payment_gateway_accounts=payment_gateway_accounts,
+            telco_mobile_accounts=telco_mobile_accounts,
+            telco_internet_accounts=telco_internet_accounts
+        )
+        return self._document_head(f"รายงานคดี {case_number}") + page + DOCUMENT_END
+
+    def iter_combined_report_html(self, pages: Iterable[str], title: str = "รายงานคดีอาญา") -> Iterator[str]:
+        """
+        รวมหน้ารายงานหลายคดี (จาก generate_case_page_html) เป็นเอกสารเดียว
+
+        yield ทีละส่วนเพื่อส่งแบบ streaming; แต่ละคดีขึ้นหน้าใหม่เมื่อพิมพ์ (.page)
+        """
+        yield self._document_head(title)
+        for page in pages:
+            yield page
+        yield DOCUMENT_END
+
+    def generate_case_page_html(
+        self,
+        case_data: Dict,
+        bank_accounts: List[Dict] = None,
+        suspects: List[Dict] = None,
+        non_bank_accounts: List[Dict] = None,
+        payment_gateway_accounts: List[Dict] = None,
+        telco_mobile_accounts: List[Dict] = None,
+        telco_internet_accounts: List[Dict] = None
+    ) -> str:
+        """
+        สร้าง HTML หน้ารายงานของคดีเดียว (<div class="page">)
+
+        Args:
+            case_data: ข้อมูลคดีหลัก
+            bank_accounts: รายการบัญชีธนาคาร
+            suspects: รายการผู้ต้องหา
+            non_bank_accounts: รายการ Non-Bank
+            payment_gateway_accounts: รายการ Payment Gateway
+            telco_mobile_accounts: รายการหมายเลขโทรศัพท์
+            telco_internet_accounts: รายการ IP Address
+
+        Returns:
+            HTML ของหน้ารายงาน (ไม่รวม <head>)
+        """
+
+        # ดึงข้อมูลคดี
+        case_number = self._format_value(case_data.get('case_number'))
+        case_id = self._format_value(case_data.get('case_id'))
+        complainant = self._format_value(case_data.get('complainant'))
+        damage_amount = self._format_currency(case_data.get('damage_amount'))
+        complaint_date = self._format_date(case_data.get('complaint_date'))
+        status = self._format_value(case_data.get('status'))
+        case_type = self._format_value(case_data.get('case_type'))
+        court_name = self._format_value(case_data.get('court_name'))
+
+        # นับสถิติ
+        total_banks = len(bank_accounts) if bank_accounts else 0
+        total_suspects = len(suspects) if suspects else 0
+        total_non_banks = len(non_bank_accounts) if non_bank_accounts else 0
+        total_payment_gateways = len(payment_gateway_accounts) if payment_gateway_accounts else 0
+        total_telco_mobile = len(telco_mobile_accounts) if telco_mobile_accounts else 0
+        total_telco_internet = len(telco_internet_accounts) if telco_internet_accounts else 0
+
+        # วันที่ปริ้น
+        print_date = format_date_to_thai_buddhist_era(datetime.now())
+
+        return f"""    <div class="page">
         <!-- Header -->
         <div class="header">
             <h1>รายงานคดีอาญา</h1>
@@ -421,10 +477,7 @@ class CaseReportGenerator:
         {self._generate_suspects_section(suspects)}
 
     </div>
-</body>
-</html>
 """
-        return html_content
 
     def _generate_bank_accounts_section(self, bank_accounts: List[Dict]) -> str:
         """สร้างส่วนรายการบัญชีธนาคาร"""
@@ -436,7 +489,7 @@ class CaseReportGenerator:
         </div>
 """
 
-        rows = ""
+        row_html = []
         for i, account in enumerate(bank_accounts, 1):
             bank_name = self._format_value(account.get('bank_name'))
             account_number = self._format_value(account.get('account_number'))
@@ -452,7 +505,7 @@ class CaseReportGenerator:
                 else:
                     status_text = '✗ ยังไม่ตอบกลับ'
 
-            rows += f"""
+            row_html.append(f"""
                     <tr>
                         <td>{i}</td>
                         <td>{bank_name}</td>
@@ -460,7 +513,9 @@ class CaseReportGenerator:
                         <td>{account_name}</td>
                         <td>{status_text}</td>
                     </tr>
-"""
+""")
+
+        rows = "".join(row_html)
 
         return f"""
         <div class="section">
@@ -492,7 +547,7 @@ class CaseReportGenerator:
         </div>
 """
 
-        rows = ""
+        row_html = []
         for i, account in enumerate(non_bank_accounts, 1):
             provider_name = self._format_value(account.get('provider_name'))
             account_number = self._format_value(account.get('account_number'))
@@ -508,7 +563,7 @@ class CaseReportGenerator:
                 else:
                     status_text = '✗ ยังไม่ตอบกลับ'
 
-            rows += f"""
+            row_html.append(f"""
                     <tr>
                         <td>{i}</td>
                         <td>{provider_name}</td>
@@ -516,7 +571,9 @@ class CaseReportGenerator:
                         <td>{account_name}</td>
                         <td>{status_text}</td>
                     </tr>
-"""
+""")
+
+        rows = "".join(row_html)
 
         return f"""
         <div class="section">
@@ -548,7 +605,7 @@ class CaseReportGenerator:
         </div>
 """
 
-        rows = ""
+        row_html = []
         for i, account in enumerate(pg_accounts, 1):
             provider_name = self._format_value(account.get('provider_name'))
             account_number = self._format_value(account.get('account_number'))
@@ -564,7 +621,7 @@ class CaseReportGenerator:
                 else:
                     status_text = '✗ ยังไม่ตอบกลับ'
 
-            rows += f"""
+            row_html.append(f"""
                     <tr>
                         <td>{i}</td>
                         <td>{provider_name}</td>
@@ -572,7 +629,9 @@ class CaseReportGenerator:
                         <td>{account_name}</td>
                         <td>{status_text}</td>
                     </tr>
-"""
+""")
+
+        rows = "".join(row_html)
 
         return f"""
         <div class="section">
@@ -604,7 +663,7 @@ class CaseReportGenerator:
         </div>
 """
 
-        rows = ""
+        row_html = []
         for i, account in enumerate(telco_accounts, 1):
             provider_name = self._format_value(account.get('provider_name'))
             phone_number = self._format_value(account.get('phone_number'))
@@ -619,14 +678,16 @@ class CaseReportGenerator:
                 else:
                     status_text = '✗ ยังไม่ตอบกลับ'
 
-            rows += f"""
+            row_html.append(f"""
                     <tr>
                         <td>{i}</td>
                         <td>{provider_name}</td>
                         <td>{phone_number}</td>
                         <td>{status_text}</td>
                     </tr>
-"""
+""")
+
+        rows = "".join(row_html)
 
         return f"""
         <div class="section">
@@ -657,7 +718,7 @@ class CaseReportGenerator:
         </div>
 """
 
-        rows = ""
+        row_html = []
         for i, account in enumerate(telco_accounts, 1):
             provider_name = self._format_value(account.get('provider_name'))
             ip_address = self._format_value(account.get('ip_address'))
@@ -672,14 +733,16 @@ class CaseReportGenerator:
                 else:
                     status_text = '✗ ยังไม่ตอบกลับ'
 
-            rows += f"""
+            row_html.append(f"""
                     <tr>
                         <td>{i}</td>
                         <td>{provider_name}</td>
                         <td>{ip_address}</td>
                         <td>{status_text}</td>
                     </tr>
-"""
+""")
+
+        rows = "".join(row_html)
 
         return f"""
         <div class="section">
@@ -710,7 +773,7 @@ class CaseReportGenerator:
         </div>
 """
 
-        rows = ""
+        row_html = []
         for i, suspect in enumerate(suspects, 1):
             suspect_name = self._format_value(suspect.get('suspect_name'))
             suspect_id_card = self._format_value(suspect.get('suspect_id_card'))
@@ -726,7 +789,7 @@ class CaseReportGenerator:
                 else:
                     status_text = '✗ ยังไม่มา'
 
-            rows += f"""
+            row_html.append(f"""
                     <tr>
                         <td>{i}</td>
                         <td>{suspect_name}</td>
@@ -734,7 +797,9 @@ class CaseReportGenerator:
                         <td>{appointment_date}</td>
                         <td>{status_text}</td>
                     </tr>
-"""
+""")
+
+        rows = "".join(row_html)
 
         return f"""
         <div class="section">
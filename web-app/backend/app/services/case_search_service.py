@@ -0,0 +1,223 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Service for server-side criminal case search
+(filter, whitelisted sort, keyset pagination and total counts)
+"""
+
+import base64
+import json
+from datetime import date, datetime
+from typing import Any, Dict, List, Optional, Tuple
+from sqlalchemy import and_, or_, func
+from sqlalchemy.orm import Session, Query, joinedload
+from app.models import CriminalCase, User
+
+# คอลัมน์ที่อนุญาตให้เรียงลำดับได้ (ทุกคอลัมน์มี index รองรับ)
+SORT_COLUMNS = {
+    "complaint_date": CriminalCase.complaint_date,
+    "incident_date": CriminalCase.incident_date,
+    "case_number": CriminalCase.case_number,
+    "case_id": CriminalCase.case_id,
+    "status": CriminalCase.status,
+    "created_at": CriminalCase.created_at,
+    "id": CriminalCase.id,
+}
+
+# คอลัมน์ที่เป็นวันที่ ต้องแปลง cursor กลับเป็น date/datetime
+DATE_SORT_COLUMNS = {"complaint_date", "incident_date"}
+DATETIME_SORT_COLUMNS = {"created_at"}
+
+TOTAL_MODES = ("none", "exact", "estimated")
+
+
+class InvalidCursorError(ValueError):
+    """Raised when a keyset cursor cannot be decoded"""
+
+
+def encode_cursor(sort_by: str, value: Any, last_id: int, sort_order: str = "desc") -> str:
+    """เข้ารหัส cursor สำหรับหน้าถัดไป (การเรียงลำดับ + ค่าคอลัมน์ที่เรียง + id ของแถวสุดท้าย)"""
+    if isinstance(value, (date, datetime)):
+        value = value.isoformat()
+    raw = json.dumps({"s": sort_by, "o": sort_order, "v": value, "id": last_id}, ensure_ascii=False)
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii")
+
+
+def decode_cursor(cursor: str, sort_by: str, sort_order: str = "desc") -> Tuple[Any, int]:
+    """ถอดรหัส cursor ที่ได้จาก encode_cursor()"""
+    try:
+        data = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")).decode("utf-8"))
+        value, last_id = data["v"], int(data["id"])
+    except Exception:
+        raise InvalidCursorError("Invalid cursor")
+
+    # cursor ต้องมาจากการเรียงลำดับแบบเดียวกัน (ไม่เช่นนั้นจะข้าม/ซ้ำแถว)
+    if data.get("s") != sort_by:
+        raise InvalidCursorError("Cursor does not match sort_by")
+    if data.get("o") != sort_order:
+        raise InvalidCursorError("Cursor does not match sort_order")
+
+    if value is not None:
+        if sort_by in DATE_SORT_COLUMNS:
+            value = date.fromisoformat(value)
+        elif sort_by in DATETIME_SORT_COLUMNS:
+            value = datetime.fromisoformat(value)
+    return value, last_id
+
+
+class CaseSearchService:
+    """Service for criminal case search operations"""
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def build_filtered_query(
+        self,
+        current_user: User,
+        status: Optional[str] = None,
+        case_type: Optional[str] = None,
+        owner_id: Optional[int] = None,
+        bureau_id: Optional[int] = None,
+        date_from: Optional[date] = None,
+        date_to: Optional[date] = None,
+        q: Optional[str] = None,
+    ) -> Query:
+        """
+        สร้าง query พร้อมเงื่อนไขกรองทั้งหมด (ยังไม่เรียงลำดับ/แบ่งหน้า)
+
+        ผู้ใช้ทั่วไปเห็นเฉพาะคดีของตนเอง, admin เห็นทุกคดีและกรองตาม owner/bureau ได้
+        """
+        query = self.db.query(CriminalCase)
+
+        is_admin = current_user.role and current_user.role.role_name == "admin"
+        if not is_admin:
+            query = query.filter(CriminalCase.owner_id == current_user.id)
+        else:
+            if owner_id is not None:
+                query = query.filter(CriminalCase.owner_id == owner_id)
+            if bureau_id is not None:
+                query = query.filter(
+                    CriminalCase.owner_id.in_(
+                        self.db.query(User.id).filter(User.bureau_id == bureau_id)
+                    )
+                )
+
+        if status:
+            query = query.filter(CriminalCase.status == status)
+        if case_type:
+            query = query.filter(CriminalCase.case_type == case_type)
+        if date_from:
+            query = query.filter(CriminalCase.complaint_date >= date_from)
+        if date_to:
+            query = query.filter(CriminalCase.complaint_date <= date_to)
+
+        if q and q.strip():
+            pattern = f"%{q.strip()}%"
+            query = query.filter(or_(
+                CriminalCase.complainant.ilike(pattern),
+                CriminalCase.case_id.ilike(pattern),
+                CriminalCase.case_number.ilike(pattern),
+            ))
+
+        return query
+
+    def _apply_keyset(self, query: Query, sort_by: str, descending: bool, cursor: Optional[str]) -> Query:
+        """
+        เรียงลำดับ + กรองด้วย keyset (seek) จาก cursor
+
+        ลำดับคือ (คอลัมน์ที่เลือก, id) โดยค่า NULL อยู่ท้ายเสมอ
+        """
+        column = SORT_COLUMNS[sort_by]
+        id_column = CriminalCase.id
+
+        if descending:
+            order = [column.desc().nullslast(), id_column.desc()]
+        else:
+            order = [column.asc().nullslast(), id_column.asc()]
+        if sort_by == "id":
+            order = order[1:]
+
+        if cursor:
+            value, last_id = decode_cursor(cursor, sort_by, "desc" if descending else "asc")
+            id_after = id_column < last_id if descending else id_column > last_id
+
+            if sort_by == "id":
+                query = query.filter(id_after)
+            elif value is None:
+                # อยู่ในช่วงค่า NULL แล้ว เหลือเฉพาะ NULL ที่ id ถัดไป
+                query = query.filter(and_(column.is_(None), id_after))
+            else:
+                value_after = column < value if descending else column > value
+                query = query.filter(or_(
+                    value_after,
+                    and_(column == value, id_after),
+                    column.is_(None),
+                ))
+
+        return query.order_by(*order)
+
+    def estimate_count(self, query: Query) -> int:
+        """
+        ประมาณจำนวนแถวจาก planner ของ PostgreSQL (EXPLAIN) แทน COUNT(*)
+
+        เหมาะกับตารางขนาดใหญ่ที่ต้องการเพียงตัวเลขโดยประมาณ
+        """
+        statement = query.statement
+        compiled = statement.compile(dialect=self.db.get_bind().dialect)
+        result = self.db.connection().exec_driver_sql(
+            f"EXPLAIN (FORMAT JSON) {compiled}", compiled.params
+        ).scalar()
+        plan = result if isinstance(result, list) else json.loads(result)
+        return int(plan[0]["Plan"]["Plan Rows"])
+
+    def search(
+        self,
+        current_user: User,
+        sort_by: str = "complaint_date",
+        sort_order: str = "desc",
+        limit: int = 50,
+        cursor: Optional[str] = None,
+        total: str = "none",
+        **filters,
+    ) -> Dict[str, Any]:
+        """
+        ค้นหาคดีพร้อมเรียงลำดับและแบ่งหน้าแบบ keyset
+
+        Returns:
+            dict: {"cases": [...], "next_cursor": str|None,
+                   "total": int|None, "total_is_estimate": bool}
+        """
+        if sort_by not in SORT_COLUMNS:
+            raise ValueError(f"sort_by must be one of: {', '.join(SORT_COLUMNS)}")
+        if sort_order not in ("asc", "desc"):
+            raise ValueError("sort_order must be 'asc' or 'desc'")
+        if total not in TOTAL_MODES:
+            raise ValueError(f"total must be one of: {', '.join(TOTAL_MODES)}")
+
+        filtered = self.build_filtered_query(current_user, **filters)
+
+        page_query = self._apply_keyset(filtered, sort_by, sort_order == "desc", cursor)
+        # ดึงเกิน 1 แถวเพื่อตรวจว่ามีหน้าถัดไปหรือไม่
+        cases: List[CriminalCase] = page_query.options(
+            joinedload(CriminalCase.owner).joinedload(User.rank),
+            joinedload(CriminalCase.summary)
+        ).limit(limit + 1).all()
+
+        next_cursor = None
+        if len(cases) > limit:
+            cases = cases[:limit]
+            last = cases[-1]
+            next_cursor = encode_cursor(sort_by, getattr(last, sort_by), last.id, sort_order)
+
+        total_count = None
+        if total == "exact":
+            total_count = filtered.with_entities(func.count(CriminalCase.id)).scalar()
+        elif total == "estimated":
+            total_count = self.estimate_count(filtered.with_entities(CriminalCase.id))
+
+        return {
+            "cases": cases,
+            "next_cursor": next_cursor,
+            "total": total_count,
+            "total_is_estimate": total == "estimated",
+        }
@@ -0,0 +1,341 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Money-flow graph over CFR transfers
+
+สร้างกราฟเส้นทางการเงิน (บัญชี → บัญชี) จากตาราง cfr เก็บแบบ array (CSR)
+รองรับการไล่เส้นทาง k-hop, น้ำหนักเส้นรวม, ตรวจจับบัญชีม้า (fan-in/fan-out)
+และเส้นทางเงินที่สั้นที่สุด
+"""
+
+import threading
+from array import array
+from collections import OrderedDict, deque
+from datetime import datetime
+from decimal import Decimal
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app.models import CFR
+
+# จำนวนกราฟสูงสุดที่เก็บใน cache (LRU)
+GRAPH_CACHE_SIZE = 32
+
+
+class MoneyFlowGraph:
+    """
+    กราฟทิศทางของการโอนเงิน โดยรวมรายการโอนซ้ำระหว่างบัญชีคู่เดียวกันเป็นเส้นเดียว
+
+    โครงสร้างข้อมูล:
+        - nodes: รายชื่อบัญชี (index = node id)
+        - edge_src / edge_dst / edge_amount / edge_count: ข้อมูลเส้นแยกเป็น array
+        - out_offsets / out_edges, in_offsets / in_edges: ดัชนีแบบ CSR สำหรับเส้นขาออก/ขาเข้า
+    """
+
+    def __init__(self, transfers: Iterable[Sequence[Any]]):
+        """
+        Args:
+            transfers: iterable ของ (from_account, from_bank, from_name,
+                                     to_account, to_bank, to_name,
+                                     amount, transfer_at)
+                       transfer_at เป็น datetime (CFR.transfer_at) ใช้หาวันที่โอนครั้งแรก/ล่าสุด
+        """
+        self.nodes: List[str] = []
+        self.node_info: List[Dict[str, Optional[str]]] = []
+        self._node_index: Dict[str, int] = {}
+
+        edge_index: Dict[Tuple[int, int], int] = {}
+        self.edge_src = array("i")
+        self.edge_dst = array("i")
+        self.edge_amount = array("d")
+        self.edge_count = array("i")
+        self.edge_first_at: List[Optional[datetime]] = []
+        self.edge_last_at: List[Optional[datetime]] = []
+
+        for (from_acc, from_bank, from_name, to_acc, to_bank, to_name, amount, transfer_at) in transfers:
+            if not from_acc or not to_acc:
+                continue
+            src = self._add_node(from_acc, from_bank, from_name)
+            dst = self._add_node(to_acc, to_bank, to_name)
+
+            edge_id = edge_index.get((src, dst))
+            if edge_id is None:
+                edge_id = len(self.edge_src)
+                edge_index[(src, dst)] = edge_id
+                self.edge_src.append(src)
+                self.edge_dst.append(dst)
+                self.edge_amount.append(0.0)
+                self.edge_count.append(0)
+                self.edge_first_at.append(transfer_at)
+                self.edge_last_at.append(transfer_at)
+
+            self.edge_amount[edge_id] += float(amount or 0)
+            self.edge_count[edge_id] += 1
+            if transfer_at:
+                if not self.edge_first_at[edge_id] or transfer_at < self.edge_first_at[edge_id]:
+                    self.edge_first_at[edge_id] = transfer_at
+                if not self.edge_last_at[edge_id] or transfer_at > self.edge_last_at[edge_id]:
+                    self.edge_last_at[edge_id] = transfer_at
+
+        self.out_offsets, self.out_edges = self._build_csr(self.edge_src)
+        self.in_offsets, self.in_edges = self._build_csr(self.edge_dst)
+
+    def _add_node(self, account: str, bank: Optional[str], name: Optional[str]) -> int:
+        account = str(account).strip()
+        node_id = self._node_index.get(account)
+        if node_id is None:
+            node_id = len(self.nodes)
+            self._node_index[account] = node_id
+            self.nodes.append(account)
+            self.node_info.append({"bank": bank, "name": name})
+        else:
+            info = self.node_info[node_id]
+            if not info["bank"] and bank:
+                info["bank"] = bank
+            if not info["name"] and name:
+                info["name"] = name
+        return node_id
+
+    def _build_csr(self, endpoint: array) -> Tuple[array, array]:
+        """สร้างดัชนี CSR: edges ของ node i อยู่ที่ edges[offsets[i]:offsets[i + 1]]"""
+        offsets = array("i", [0] * (len(self.nodes) + 1))
+        for node_id in endpoint:
+            offsets[node_id + 1] += 1
+        for i in range(len(self.nodes)):
+            offsets[i + 1] += offsets[i]
+
+        edges = array("i", [0] * len(endpoint))
+        cursor = array("i", offsets[:-1])
+        for edge_id, node_id in enumerate(endpoint):
+            edges[cursor[node_id]] = edge_id
+            cursor[node_id] += 1
+        return offsets, edges
+
+    # ========================================
+    # Accessors
+    # ========================================
+
+    @property
+    def node_count(self) -> int:
+        return len(self.nodes)
+
+    @property
+    def edge_count_total(self) -> int:
+        return len(self.edge_src)
+
+    def node_id(self, account: str) -> Optional[int]:
+        return self._node_index.get(str(account).strip())
+
+    def out_edge_ids(self, node_id: int) -> array:
+        return self.out_edges[self.out_offsets[node_id]:self.out_offsets[node_id + 1]]
+
+    def in_edge_ids(self, node_id: int) -> array:
+        return self.in_edges[self.in_offsets[node_id]:self.in_offsets[node_id + 1]]
+
+    def node_dict(self, node_id: int) -> Dict[str, Any]:
+        return {"account_no": self.nodes[node_id], **self.node_info[node_id]}
+
+    def edge_dict(self, edge_id: int) -> Dict[str, Any]:
+        first_at, last_at = self.edge_first_at[edge_id], self.edge_last_at[edge_id]
+        return {
+            "from_account_no": self.nodes[self.edge_src[edge_id]],
+            "to_account_no": self.nodes[self.edge_dst[edge_id]],
+            "total_amount": round(self.edge_amount[edge_id], 2),
+            "transfer_count": self.edge_count[edge_id],
+            "first_transfer_date": first_at.isoformat() if first_at else None,
+            "last_transfer_date": last_at.isoformat() if last_at else None,
+        }
+
+    # ========================================
+    # Queries
+    # ========================================
+
+    def edges(self, min_amount: float = 0) -> List[Dict[str, Any]]:
+        """เส้นทั้งหมด (รวมยอดแล้ว) เรียงจากยอดเงินมากไปน้อย"""
+        edge_ids = [e for e in range(len(self.edge_src)) if self.edge_amount[e] >= min_amount]
+        edge_ids.sort(key=lambda e: self.edge_amount[e], reverse=True)
+        return [self.edge_dict(e) for e in edge_ids]
+
+    def trace(self, account: str, max_hops: int = 3, direction: str = "out",
+              min_amount: float = 0) -> Optional[Dict[str, Any]]:
+        """
+        ไล่เส้นทางการเงินจากบัญชีที่ระบุไม่เกิน max_hops ทอด (BFS)
+
+        Args:
+            direction: "out" = เงินไหลออกไปที่ไหน, "in" = เงินมาจากไหน
+            min_amount: ข้ามเส้นที่ยอดรวมน้อยกว่านี้
+
+        Returns:
+            dict: nodes (พร้อม hop), edges ที่เดินผ่าน หรือ None ถ้าไม่พบบัญชี
+        """
+        start = self.node_id(account)
+        if start is None:
+            return None
+
+        forward = direction != "in"
+        hops = {start: 0}
+        visited_edges = []
+        queue = deque([start])
+
+        while queue:
+            node = queue.popleft()
+            if hops[node] >= max_hops:
+                continue
+            edge_ids = self.out_edge_ids(node) if forward else self.in_edge_ids(node)
+            for edge_id in edge_ids:
+                if self.edge_amount[edge_id] < min_amount:
+                    continue
+                visited_edges.append(edge_id)
+                neighbor = self.edge_dst[edge_id] if forward else self.edge_src[edge_id]
+                if neighbor not in hops:
+                    hops[neighbor] = hops[node] + 1
+                    queue.append(neighbor)
+
+        return {
+            "account_no": self.nodes[start],
+            "direction": "out" if forward else "in",
+            "max_hops": max_hops,
+            "nodes": [{**self.node_dict(n), "hop": h} for n, h in sorted(hops.items(), key=lambda x: x[1])],
+            "edges": [self.edge_dict(e) for e in visited_edges],
+        }
+
+    def mule_candidates(self, min_in: int = 2, min_out: int = 2, limit: int = 100) -> List[Dict[str, Any]]:
+        """
+        บัญชีที่มีลักษณะบัญชีม้า: รับเงินจากหลายบัญชี (fan-in) และโอนต่อหลายบัญชี (fan-out)
+
+        เรียงตามยอดเงินที่ผ่านบัญชี (min(รับเข้า, โอนออก)) มากไปน้อย
+        """
+        candidates = []
+        for node_id in range(len(self.nodes)):
+            fan_in = self.in_offsets[node_id + 1] - self.in_offsets[node_id]
+            fan_out = self.out_offsets[node_id + 1] - self.out_offsets[node_id]
+            if fan_in < min_in or fan_out < min_out:
+                continue
+            amount_in = sum(self.edge_amount[e] for e in self.in_edge_ids(node_id))
+            amount_out = sum(self.edge_amount[e] for e in self.out_edge_ids(node_id))
+            candidates.append({
+                **self.node_dict(node_id),
+                "fan_in": fan_in,
+                "fan_out": fan_out,
+                "amount_in": round(amount_in, 2),
+                "amount_out": round(amount_out, 2),
+                "pass_through_amount": round(min(amount_in, amount_out), 2),
+            })
+
+        candidates.sort(key=lambda c: c["pass_through_amount"], reverse=True)
+        return candidates[:limit]
+
+    def shortest_path(self, source: str, target: str) -> Optional[Dict[str, Any]]:
+        """
+        เส้นทางเงินที่ผ่านจำนวนทอดน้อยที่สุดจาก source ไป target (BFS)
+
+        Returns:
+            dict: accounts ตามลำดับ, edges และยอดเงินต่ำสุดในเส้นทาง (bottleneck)
+                  หรือ None ถ้าไม่มีเส้นทาง
+        """
+        start = self.node_id(source)
+        goal = self.node_id(target)
+        if start is None or goal is None:
+            return None
+
+        via_edge = {start: -1}
+        queue = deque([start])
+        while queue and goal not in via_edge:
+            node = queue.popleft()
+            for edge_id in self.out_edge_ids(node):
+                neighbor = self.edge_dst[edge_id]
+                if neighbor not in via_edge:
+                    via_edge[neighbor] = edge_id
+                    queue.append(neighbor)
+
+        if goal not in via_edge:
+            return None
+
+        path_edges = []
+        node = goal
+        while via_edge[node] != -1:
+            edge_id = via_edge[node]
+            path_edges.append(edge_id)
+            node = self.edge_src[edge_id]
+        path_edges.reverse()
+
+        return {
+            "accounts": [self.node_dict(start)] + [self.node_dict(self.edge_dst[e]) for e in path_edges],
+            "edges": [self.edge_dict(e) for e in path_edges],
+            "hops": len(path_edges),
+            "bottleneck_amount": round(min((self.edge_amount[e] for e in path_edges), default=0.0), 2),
+        }
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "accounts": self.node_count,
+            "edges": self.edge_count_total,
+            "total_amount": round(sum(self.edge_amount), 2),
+        }
+
+
+# ========================================
+# Cache
+# ========================================
+
+_graph_cache: "OrderedDict[Tuple[int, ...], Tuple[Tuple, MoneyFlowGraph]]" = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+def _cfr_signature(db: Session, case_ids: Tuple[int, ...]) -> Tuple:
+    """
+    ลายเซ็นของข้อมูล CFR (จำนวนแถว, id สูงสุด, เวลาอัพโหลดล่าสุด)
+
+    เปลี่ยนทุกครั้งที่มีการอัพโหลด/ลบไฟล์ แม้จะทำจาก worker process อื่น
+    """
+    row = db.query(
+        func.count(CFR.id), func.max(CFR.id), func.max(CFR.upload_date)
+    ).filter(CFR.criminal_case_id.in_(case_ids)).one()
+    return tuple(row)
+
+
+def _load_transfers(db: Session, case_ids: Tuple[int, ...]):
+    query = db.query(
+        CFR.from_account_no, CFR.from_bank_short_name, CFR.from_account_name,
+        func.coalesce(CFR.to_account_no, CFR.promptpay_id), CFR.to_bank_short_name, CFR.to_account_name,
+        CFR.transfer_amount, CFR.transfer_at
+    ).filter(CFR.criminal_case_id.in_(case_ids))
+
+    for row in query.yield_per(5000):
+        amount = row[6]
+        yield (*row[:6], float(amount) if isinstance(amount, Decimal) else amount, row[7])
+
+
+def get_money_flow_graph(db: Session, case_ids: Iterable[int]) -> MoneyFlowGraph:
+    """
+    คืนกราฟเส้นทางการเงินของคดีที่ระบุ (คดีเดียวหรือหลายคดีรวมกัน) จาก cache
+
+    สร้างใหม่เมื่อข้อมูล CFR ของคดีเปลี่ยน หรือถูก invalidate_money_flow_graph()
+    """
+    key = tuple(sorted(set(case_ids)))
+    signature = _cfr_signature(db, key)
+
+    with _cache_lock:
+        cached = _graph_cache.get(key)
+        if cached and cached[0] == signature:
+            _graph_cache.move_to_end(key)
+            return cached[1]
+
+    graph = MoneyFlowGraph(_load_transfers(db, key))
+
+    with _cache_lock:
+        _graph_cache[key] = (signature, graph)
+        _graph_cache.move_to_end(key)
+        while len(_graph_cache) > GRAPH_CACHE_SIZE:
+            _graph_cache.popitem(last=False)
+
+    return graph
+
+
+def invalidate_money_flow_graph(criminal_case_id: int) -> None:
+    """ลบกราฟทุกชุดที่มีคดีนี้ออกจาก cache (เรียกหลังอัพโหลด/ลบไฟล์ CFR)"""
+    with _cache_lock:
+        for key in [k for k in _graph_cache if criminal_case_id in k]:
+            del _graph_cache[key]
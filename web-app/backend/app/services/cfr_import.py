@@ -0,0 +1,304 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Bulk CFR (Central Fraud Registry) ingestion
+
+อ่านไฟล์ .xlsx แบบ streaming ทีละชุด (chunk), แปลงชนิดข้อมูลทั้งคอลัมน์ด้วย pandas
+แล้วโหลดเข้าตาราง cfr ด้วย PostgreSQL COPY
+"""
+
+import io
+import os
+import time
+from datetime import datetime
+from typing import BinaryIO, Callable, Dict, Iterator, List, Optional, Union
+
+import numpy as np
+import pandas as pd
+from openpyxl import load_workbook
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+from app.core.database import SessionLocal
+from app.models import CFR
+from app.services.cfr_graph import invalidate_money_flow_graph
+from app.services.job_store import (
+    JobStore, JobCancelled, get_job_store,
+    JOB_RUNNING, JOB_COMPLETED, JOB_FAILED, JOB_CANCELLED
+)
+
+CHUNK_SIZE = 5000
+
+# คอลัมน์ในไฟล์ CFR แยกตามชนิดข้อมูล (ชื่อคอลัมน์ตรงกับตาราง cfr)
+CFR_INT_COLUMNS = ["response_id", "from_bank_code", "to_bank_code"]
+CFR_DECIMAL_COLUMNS = ["to_balance", "transfer_amount"]
+CFR_STR_COLUMNS = [
+    "bank_case_id", "timestamp_insert",
+    "from_bank_short_name", "from_account_no", "from_account_name",
+    "to_bank_short_name", "to_bank_branch", "to_id_type", "to_id",
+    "first_name", "last_name", "phone_number",
+    "promptpay_type", "promptpay_id",
+    "to_account_no", "to_account_name", "to_account_status",
+    "to_open_date", "to_close_date",
+    "transfer_date", "transfer_channel", "transfer_channel_detail",
+    "transfer_time", "transfer_description", "transfer_ref",
+]
+CFR_FILE_COLUMNS = CFR_INT_COLUMNS + CFR_DECIMAL_COLUMNS + CFR_STR_COLUMNS
+
+# คอลัมน์ที่คำนวณจากข้อมูลในไฟล์
+CFR_DERIVED_COLUMNS = ["transfer_at", "to_open_on", "to_close_on", "inserted_at"]
+
+# คอลัมน์ที่เติมจากระบบ (ไม่ได้มาจากไฟล์)
+CFR_META_COLUMNS = ["criminal_case_id", "filename", "upload_date", "created_by"]
+
+# รูปแบบวันที่/เวลาในไฟล์ CFR (เหมือน cfr_parse_timestamp ใน migration 041)
+CFR_DATE_PATTERN = r"^(?:(?P<y>\d{4})-(?P<m>\d{1,2})-(?P<d>\d{1,2})|(?P<d2>\d{1,2})/(?P<m2>\d{1,2})/(?P<y2>\d{4}))"
+CFR_TIME_PATTERN = r"(?P<hour>\d{1,2}):(?P<minute>\d{2})(?::(?P<second>\d{2}))?"
+BUDDHIST_ERA_MIN_YEAR = 2400  # ปีตั้งแต่นี้ถือเป็น พ.ศ.
+
+COPY_NULL = "\\N"
+
+ProgressCallback = Callable[[int, int], None]
+
+
+class CFRFileError(ValueError):
+    """Raised when an uploaded CFR file has an unexpected layout"""
+
+
+def iter_cfr_chunks(source: Union[str, BinaryIO], chunk_size: int = CHUNK_SIZE) -> Iterator[pd.DataFrame]:
+    """
+    อ่านไฟล์ CFR .xlsx ทีละ chunk_size แถว (openpyxl read-only mode)
+
+    ใช้หน่วยความจำคงที่ตามขนาด chunk ไม่ใช่ขนาดไฟล์
+    """
+    workbook = load_workbook(source, read_only=True, data_only=True)
+    try:
+        rows = workbook.active.iter_rows(values_only=True)
+        header = next(rows, None)
+        if header is None:
+            return
+
+        header = [str(h).strip() if h is not None else "" for h in header]
+        missing = [c for c in CFR_FILE_COLUMNS if c not in header]
+        if missing:
+            raise CFRFileError(f"ไฟล์ CFR ไม่มีคอลัมน์: {', '.join(missing)}")
+
+        chunk: List[tuple] = []
+        for row in rows:
+            if row is None or all(v is None for v in row):
+                continue
+            chunk.append(row)
+            if len(chunk) >= chunk_size:
+                yield pd.DataFrame(chunk, columns=header, dtype=object)
+                chunk = []
+        if chunk:
+            yield pd.DataFrame(chunk, columns=header, dtype=object)
+    finally:
+        workbook.close()
+
+
+def parse_cfr_datetime(dates: pd.Series, times: Optional[pd.Series] = None) -> pd.Series:
+    """
+    แปลงข้อความวันที่ (+ เวลา) ของ CFR ทั้งคอลัมน์เป็น datetime64
+
+    - วันที่: YYYY-MM-DD หรือ DD/MM/YYYY, ปี พ.ศ. แปลงเป็น ค.ศ.
+    - เวลา: HH:MM[:SS] จาก times หรือส่วนที่ต่อท้ายวันที่ (ถ้า times เป็นค่าว่าง)
+    - ค่าที่แปลงไม่ได้เป็น NaT
+    """
+    dates = dates.astype("string").str.strip()
+    parts = dates.str.extract(CFR_DATE_PATTERN).astype("float64")
+    year = parts["y"].fillna(parts["y2"])
+    year = year.mask(year >= BUDDHIST_ERA_MIN_YEAR, year - 543)
+
+    time_text = dates.str.slice(10)
+    if times is not None:
+        time_text = times.astype("string").fillna(time_text)
+    clock = time_text.str.extract(CFR_TIME_PATTERN).astype("float64").fillna(0)
+    valid_clock = (clock["hour"] < 24) & (clock["minute"] < 60) & (clock["second"] < 60)
+
+    return pd.to_datetime(pd.DataFrame({
+        "year": year,
+        "month": parts["m"].fillna(parts["m2"]),
+        "day": parts["d"].fillna(parts["d2"]),
+        "hour": clock["hour"],
+        "minute": clock["minute"],
+        "second": clock["second"],
+    }), errors="coerce").where(valid_clock)
+
+
+def normalize_cfr_chunk(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    แปลงชนิดข้อมูลทั้งคอลัมน์ (แทน safe_int/safe_float/safe_str ทีละ cell)
+
+    - ตัวเลขจำนวนเต็ม: ตัดทศนิยม, ค่าที่แปลงไม่ได้เป็น NULL
+    - จำนวนเงิน: float, ค่าที่แปลงไม่ได้เป็น NULL
+    - ข้อความ: strip, ค่าว่าง/'nan' เป็น NULL (รักษาเลข 0 หน้าเลขบัญชี)
+    - transfer_at / to_open_on / to_close_on / inserted_at: ค่าแบบมีชนิดข้อมูลจากคอลัมน์ข้อความ
+    """
+    out = pd.DataFrame(index=df.index)
+
+    for col in CFR_INT_COLUMNS:
+        values = pd.to_numeric(df[col].astype(str).str.strip(), errors="coerce")
+        out[col] = np.trunc(values).astype("Int64")
+
+    for col in CFR_DECIMAL_COLUMNS:
+        out[col] = pd.to_numeric(df[col].astype(str).str.strip(), errors="coerce")
+
+    for col in CFR_STR_COLUMNS:
+        values = df[col]
+        is_null = values.isna()
+        values = values.astype(str).str.strip()
+        out[col] = values.mask(is_null | values.isin(["", "nan", "None", "NaT"]))
+
+    out["transfer_at"] = parse_cfr_datetime(out["transfer_date"], out["transfer_time"])
+    out["to_open_on"] = parse_cfr_datetime(out["to_open_date"]).dt.date
+    out["to_close_on"] = parse_cfr_datetime(out["to_close_date"]).dt.date
+    out["inserted_at"] = parse_cfr_datetime(out["timestamp_insert"])
+
+    return out
+
+
+def _copy_chunk(db: Session, df: pd.DataFrame, columns: List[str]) -> None:
+    """โหลด DataFrame เข้าตาราง cfr ด้วย COPY ... FROM STDIN (CSV)"""
+    buffer = io.StringIO()
+    df.to_csv(buffer, columns=columns, header=False, index=False, na_rep=COPY_NULL)
+    buffer.seek(0)
+
+    # ใช้ DBAPI connection ของ session เพื่ออยู่ใน transaction เดียวกับ DELETE
+    dbapi_connection = db.connection().connection
+    with dbapi_connection.cursor() as cursor:
+        cursor.copy_expert(
+            f"COPY cfr ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv, NULL '{COPY_NULL}')",
+            buffer
+        )
+
+
+def _insert_chunk(db: Session, df: pd.DataFrame, columns: List[str]) -> None:
+    """Fallback สำหรับฐานข้อมูลที่ไม่รองรับ COPY (multi-row INSERT)"""
+    records = df[columns].astype(object).where(df[columns].notna(), None).to_dict("records")
+    db.execute(insert(CFR), records)
+
+
+def import_cfr_file(
+    db: Session,
+    source: Union[str, BinaryIO],
+    criminal_case_id: int,
+    filename: str,
+    created_by: Optional[int] = None,
+    chunk_size: int = CHUNK_SIZE,
+    progress: Optional[ProgressCallback] = None,
+) -> Dict[str, Union[int, float]]:
+    """
+    นำเข้าไฟล์ CFR ทั้งไฟล์ใน transaction เดียว
+
+    ถ้าชื่อไฟล์ซ้ำในคดีเดียวกัน → ลบข้อมูลเดิมด้วย DELETE คำสั่งเดียวก่อน insert ใหม่
+
+    Args:
+        progress: callback(rows_parsed, rows_inserted) เรียกหลังโหลดแต่ละ chunk
+
+    Returns:
+        dict: records_inserted, records_deleted, elapsed_seconds, rows_per_second
+    """
+    started = time.perf_counter()
+    use_copy = db.get_bind().dialect.name == "postgresql"
+    columns = CFR_META_COLUMNS + CFR_FILE_COLUMNS + CFR_DERIVED_COLUMNS
+    upload_date = datetime.now()
+
+    try:
+        deleted = db.query(CFR).filter(
+            CFR.criminal_case_id == criminal_case_id,
+            CFR.filename == filename
+        ).delete(synchronize_session=False)
+
+        parsed = 0
+        inserted = 0
+        for chunk in iter_cfr_chunks(source, chunk_size):
+            df = normalize_cfr_chunk(chunk)
+            parsed += len(df)
+            if progress:
+                progress(parsed, inserted)
+
+            df["criminal_case_id"] = criminal_case_id
+            df["filename"] = filename
+            df["upload_date"] = upload_date
+            df["created_by"] = created_by
+            df["created_by"] = df["created_by"].astype("Int64")
+
+            if use_copy:
+                _copy_chunk(db, df, columns)
+            else:
+                _insert_chunk(db, df, columns)
+
+            inserted += len(df)
+            if progress:
+                progress(parsed, inserted)
+
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+
+    elapsed = time.perf_counter() - started
+    return {
+        "records_inserted": inserted,
+        "records_deleted": deleted,
+        "elapsed_seconds": round(elapsed, 3),
+        "rows_per_second": round(inserted / elapsed, 1) if elapsed > 0 else float(inserted),
+    }
+
+
+def run_cfr_import_job(
+    job_id: str,
+    path: str,
+    criminal_case_id: int,
+    filename: str,
+    created_by: Optional[int] = None,
+    store: Optional[JobStore] = None,
+    session_factory: Callable[[], Session] = SessionLocal,
+) -> None:
+    """
+    รันการนำเข้าไฟล์ CFR เป็นงานเบื้องหลัง พร้อมรายงานความคืบหน้าลง JobStore
+
+    - ตรวจสอบคำขอยกเลิกหลังแต่ละ chunk; ถ้ายกเลิก transaction จะถูก rollback ทั้งหมด
+    - ลบไฟล์ที่อัพโหลดไว้ชั่วคราวเมื่อจบงานเสมอ
+    - store / session_factory ระบุแทนค่าปกติได้ (เช่น fakeredis / SQLite ในการทดสอบ)
+    """
+    store = store or get_job_store()
+
+    if store.is_cancel_requested(job_id):
+        store.update(job_id, status=JOB_CANCELLED, finished_at=datetime.now())
+        _remove_file(path)
+        return
+
+    store.update(job_id, status=JOB_RUNNING, started_at=datetime.now())
+
+    def progress(rows_parsed: int, rows_inserted: int) -> None:
+        store.update(job_id, rows_parsed=rows_parsed, rows_inserted=rows_inserted)
+        if store.is_cancel_requested(job_id):
+            raise JobCancelled()
+
+    db = session_factory()
+    try:
+        with open(path, "rb") as source:
+            result = import_cfr_file(
+                db, source, criminal_case_id, filename,
+                created_by=created_by, progress=progress
+            )
+        invalidate_money_flow_graph(criminal_case_id)
+        store.update(job_id, status=JOB_COMPLETED, result=result, finished_at=datetime.now())
+    except JobCancelled:
+        # ข้อมูลที่ insert ไปแล้วถูก rollback (ข้อมูลเดิมของไฟล์ยังอยู่)
+        store.update(job_id, status=JOB_CANCELLED, rows_inserted=0, finished_at=datetime.now())
+    except Exception as e:
+        print(f"Error importing CFR file {filename} (job {job_id}): {e}")
+        store.update(job_id, status=JOB_FAILED, error=str(e), finished_at=datetime.now())
+    finally:
+        db.close()
+        _remove_file(path)
+
+
+def _remove_file(path: str) -> None:
+    try:
+        os.remove(path)
+    except OSError:
+        pass
@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+CFR record reads
+
+- แบ่งหน้าแบบ keyset บน (transfer_at, id) ตาม index idx_cfr_case_transfer_at_id
+  (ไม่มี OFFSET ทำให้หน้าลึก ๆ เร็วเท่าหน้าแรก)
+- ดึงทั้งชุดเป็น NDJSON / CSV ผ่าน server-side cursor (Query.yield_per)
+  หน่วยความจำคงที่ไม่ขึ้นกับจำนวนแถว
+- รายการโอนเข้า/ออกจากบัญชีในช่วงวันที่ (ข้ามคดี) ตาม index idx_cfr_to/from_account_transfer_at
+"""
+
+import csv
+import io
+import json
+from datetime import date, datetime, time, timedelta
+from decimal import Decimal
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from sqlalchemy import tuple_
+from sqlalchemy.orm import Query, Session
+
+from app.core.database import SessionLocal
+from app.models import CFR
+from app.services.case_search_service import InvalidCursorError, decode_cursor, encode_cursor
+
+STREAM_BATCH_SIZE = 2000  # จำนวนแถวที่ดึงจาก server-side cursor ต่อครั้ง
+STREAM_FORMATS = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv; charset=utf-8",
+}
+
+# คอลัมน์ทั้งหมดของตาราง cfr ตามลำดับในตาราง
+RECORD_COLUMNS = list(CFR.__table__.columns)
+RECORD_FIELDS = [column.name for column in RECORD_COLUMNS]
+
+CURSOR_KEY = "transfer_at"
+
+TRANSFER_DIRECTIONS = {
+    "in": CFR.to_account_no,
+    "out": CFR.from_account_no,
+}
+
+
+def cfr_records_query(db: Session, criminal_case_id: int, filename: Optional[str] = None) -> Query:
+    """query ของ CFR records ในคดี (กรองตามไฟล์ได้) ยังไม่เรียงลำดับ"""
+    query = db.query(CFR).filter(CFR.criminal_case_id == criminal_case_id)
+    if filename:
+        query = query.filter(CFR.filename == filename)
+    return query
+
+
+def account_transfers_query(
+    db: Session,
+    account_no: str,
+    direction: str = "in",
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    case_ids: Optional[Query] = None,
+) -> Query:
+    """
+    รายการโอนเข้า (direction="in") หรือออก ("out") ของบัญชีในช่วงวันที่ (รวมวันสุดท้าย) ทุกคดี
+
+    case_ids: query ของ id คดีที่เห็นได้ (None = ทุกคดี)
+    """
+    query = db.query(CFR).filter(TRANSFER_DIRECTIONS[direction] == account_no)
+    if date_from:
+        query = query.filter(CFR.transfer_at >= datetime.combine(date_from, time.min))
+    if date_to:
+        query = query.filter(CFR.transfer_at < datetime.combine(date_to + timedelta(days=1), time.min))
+    if case_ids is not None:
+        query = query.filter(CFR.criminal_case_id.in_(case_ids))
+    return query
+
+
+def _decode_cursor(cursor: str) -> Tuple[Optional[datetime], int]:
+    value, last_id = decode_cursor(cursor, CURSOR_KEY)
+    if value is not None:
+        try:
+            value = datetime.fromisoformat(value)
+        except (TypeError, ValueError):
+            raise InvalidCursorError("Invalid cursor")
+    return value, last_id
+
+
+def order_by_transfer(query: Query, cursor: Optional[str] = None) -> Query:
+    """
+    เรียงจากรายการโอนล่าสุด (transfer_at, id) โดยค่า NULL อยู่ท้าย
+    + กรองด้วย keyset จาก cursor ของหน้าก่อน
+
+    cursor ที่มีค่า transfer_at ใช้ row comparison ซึ่ง seek ใน index ได้โดยตรง
+    แต่ไม่รวมแถวที่ transfer_at เป็น NULL (get_records_page ดึงต่อท้ายให้)
+    """
+    if cursor:
+        value, last_id = _decode_cursor(cursor)
+        if value is None:
+            # อยู่ในช่วงค่า NULL แล้ว เหลือเฉพาะ NULL ที่ id ถัดไป
+            query = query.filter(CFR.transfer_at.is_(None), CFR.id < last_id)
+        else:
+            query = query.filter(tuple_(CFR.transfer_at, CFR.id) < tuple_(value, last_id))
+    return query.order_by(CFR.transfer_at.desc().nullslast(), CFR.id.desc())
+
+
+def get_records_page(query: Query, limit: int, cursor: Optional[str] = None, skip: int = 0) -> Dict[str, Any]:
+    """
+    CFR records 1 หน้า
+
+    Returns:
+        dict: {"records": [...], "next_cursor": str|None}
+    """
+    page_query = order_by_transfer(query, cursor)
+    if skip:
+        page_query = page_query.offset(skip)
+    # ดึงเกิน 1 แถวเพื่อตรวจว่ามีหน้าถัดไปหรือไม่
+    records: List[CFR] = page_query.limit(limit + 1).all()
+
+    if cursor and len(records) <= limit and _decode_cursor(cursor)[0] is not None:
+        # หมดแถวที่มีวันเวลาโอนแล้ว ต่อด้วยแถวที่ transfer_at เป็น NULL
+        records += query.filter(CFR.transfer_at.is_(None)).order_by(
+            CFR.id.desc()
+        ).limit(limit + 1 - len(records)).all()
+
+    next_cursor = None
+    if len(records) > limit:
+        records = records[:limit]
+        last = records[-1]
+        next_cursor = encode_cursor(CURSOR_KEY, last.transfer_at, last.id)
+
+    return {"records": records, "next_cursor": next_cursor}
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    return str(value)
+
+
+def _iter_ndjson(rows: Iterator[tuple]) -> Iterator[str]:
+    lines: List[str] = []
+    for row in rows:
+        lines.append(json.dumps(dict(zip(RECORD_FIELDS, row)), ensure_ascii=False, default=_json_default))
+        if len(lines) >= STREAM_BATCH_SIZE:
+            yield "\n".join(lines) + "\n"
+            lines = []
+    if lines:
+        yield "\n".join(lines) + "\n"
+
+
+def _iter_csv(rows: Iterator[tuple]) -> Iterator[str]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    # BOM ให้ Excel อ่านภาษาไทยถูกต้อง
+    buffer.write("\ufeff")
+    writer.writerow(RECORD_FIELDS)
+    for number, row in enumerate(rows, start=1):
+        writer.writerow(row)
+        if number % STREAM_BATCH_SIZE == 0:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue()
+
+
+def stream_records(query: Query, output_format: str) -> Iterator[bytes]:
+    """
+    ทยอยส่ง CFR records ทั้งหมดของ query จาก cfr_records_query() เป็น NDJSON หรือ CSV
+
+    ส่งออกทุก ๆ STREAM_BATCH_SIZE แถว และใช้ session ของตัวเองตลอดการ stream
+    (session ของ request ถูกปิดก่อนเริ่มส่ง response)
+    """
+    encode = _iter_ndjson if output_format == "ndjson" else _iter_csv
+    db = SessionLocal()
+    try:
+        rows = order_by_transfer(query.with_entities(*RECORD_COLUMNS)).with_session(db).yield_per(STREAM_BATCH_SIZE)
+        for text in encode(rows):
+            yield text.encode("utf-8")
+    finally:
+        db.close()
@@ -0,0 +1,249 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Outbound email queue backed by email_logs
+
+API บันทึกอีเมล์ลง email_logs (status='pending' พร้อม payload) แล้วตอบกลับทันที
+EmailQueueWorker ดึงงานด้วย FOR UPDATE SKIP LOCKED (รันหลาย process พร้อมกันได้)
+สร้าง PDF ผ่าน BrowserPool แล้วส่งผ่าน SMTP session ที่เปิดค้างไว้
+"""
+
+import os
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Dict, List, Optional
+
+from sqlalchemy import and_, or_
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.models.email_log import EmailLog
+from app.services.email_service import EmailService, SMTPSession
+
+EMAIL_PENDING = 'pending'
+EMAIL_SENDING = 'sending'
+EMAIL_SENT = 'sent'
+EMAIL_FAILED = 'failed'
+
+# error_type จาก EmailService.send_email ที่ส่งซ้ำไปก็ไม่สำเร็จ
+PERMANENT_ERROR_TYPES = {'recipients'}
+
+
+def get_email_service() -> EmailService:
+    """สร้าง EmailService instance จาก configuration"""
+    return EmailService(
+        smtp_host=settings.SMTP_HOST,
+        smtp_port=settings.SMTP_PORT,
+        smtp_username=settings.SMTP_USERNAME,
+        smtp_password=settings.SMTP_PASSWORD,
+        from_email=settings.FROM_EMAIL,
+        from_name=settings.FROM_NAME,
+        smtp_use_tls=settings.SMTP_USE_TLS
+    )
+
+
+def enqueue_email(db: Session, email_log: EmailLog, payload: Dict) -> EmailLog:
+    """
+    เพิ่มอีเมล์เข้าคิว (commit ทันที)
+
+    Args:
+        payload: keyword arguments ของ EmailService.send_summons_email()
+                 (ยกเว้น to_email และ email_log_id ซึ่งมาจาก email_log)
+    """
+    email_log.status = EMAIL_PENDING
+    email_log.payload = payload
+    email_log.retry_count = 0
+    email_log.next_attempt_at = None
+    email_log.locked_at = None
+    db.add(email_log)
+    db.commit()
+    db.refresh(email_log)
+    return email_log
+
+
+def compute_backoff(retry_count: int) -> int:
+    """เวลารอก่อนส่งซ้ำ (วินาที) แบบ exponential: base * 2^(n-1) ไม่เกิน EMAIL_RETRY_MAX_SECONDS"""
+    delay = settings.EMAIL_RETRY_BASE_SECONDS * (2 ** max(retry_count - 1, 0))
+    return min(delay, settings.EMAIL_RETRY_MAX_SECONDS)
+
+
+def _now() -> datetime:
+    """เวลาปัจจุบันแบบมี timezone (คอลัมน์คิวเป็น TIMESTAMPTZ ไม่ขึ้นกับ timezone ของ session)"""
+    return datetime.now(timezone.utc)
+
+
+def recipient_domain(email: str) -> str:
+    return email.rsplit('@', 1)[-1].strip().lower()
+
+
+class DomainRateLimiter:
+    """
+    จำกัดจำนวนอีเมล์ต่อโดเมนผู้รับ (token bucket ต่อโดเมน)
+
+    ใช้ภายใน worker process เดียว - ถ้ารันหลาย worker อัตรารวมจะเป็น N เท่า
+    """
+
+    def __init__(self, per_minute: int, clock: Callable[[], float] = time.monotonic):
+        self.capacity = max(per_minute, 1)
+        self.rate = self.capacity / 60.0  # tokens ต่อวินาที
+        self.clock = clock
+        self._buckets: Dict[str, List[float]] = {}  # domain → [tokens, last_refill]
+
+    def _refill(self, domain: str) -> List[float]:
+        now = self.clock()
+        bucket = self._buckets.setdefault(domain, [float(self.capacity), now])
+        bucket[0] = min(self.capacity, bucket[0] + (now - bucket[1]) * self.rate)
+        bucket[1] = now
+        return bucket
+
+    def try_acquire(self, domain: str) -> bool:
+        bucket = self._refill(domain)
+        if bucket[0] >= 1:
+            bucket[0] -= 1
+            return True
+        return False
+
+    def retry_after(self, domain: str) -> float:
+        """วินาทีจนกว่าจะมี token ว่าง"""
+        bucket = self._refill(domain)
+        return max(0.0, (1 - bucket[0]) / self.rate)
+
+
+class EmailQueueWorker:
+    """Worker สำหรับส่งอีเมล์จากคิว email_logs"""
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session] = SessionLocal,
+        email_service: Optional[EmailService] = None,
+        rate_limiter: Optional[DomainRateLimiter] = None,
+        batch_size: Optional[int] = None
+    ):
+        self.session_factory = session_factory
+        self.email_service = email_service or get_email_service()
+        self.rate_limiter = rate_limiter or DomainRateLimiter(settings.EMAIL_DOMAIN_RATE_PER_MINUTE)
+        self.batch_size = batch_size or settings.EMAIL_WORKER_BATCH_SIZE
+        self.smtp_session: SMTPSession = self.email_service.open_session(
+            max_messages=settings.EMAIL_SMTP_MESSAGES_PER_CONNECTION
+        )
+
+    def claim_batch(self, db: Session) -> List[EmailLog]:
+        """
+        ดึงงานที่ถึงกำหนดส่ง และเปลี่ยนสถานะเป็น 'sending'
+
+        รวมงาน 'sending' ที่ค้างเกิน EMAIL_SENDING_TIMEOUT_SECONDS (worker เดิมหยุดทำงาน)
+        """
+        now = _now()
+        stale_before = now - timedelta(seconds=settings.EMAIL_SENDING_TIMEOUT_SECONDS)
+
+        logs = db.query(EmailLog).filter(
+            EmailLog.payload.isnot(None),
+            or_(
+                and_(
+                    EmailLog.status == EMAIL_PENDING,
+                    or_(EmailLog.next_attempt_at.is_(None), EmailLog.next_attempt_at <= now)
+                ),
+                and_(EmailLog.status == EMAIL_SENDING, EmailLog.locked_at < stale_before)
+            )
+        ).order_by(
+            EmailLog.next_attempt_at.asc().nullsfirst(), EmailLog.id
+        ).limit(self.batch_size).with_for_update(skip_locked=True).all()
+
+        for log in logs:
+            log.status = EMAIL_SENDING
+            log.locked_at = now
+        db.commit()
+        return logs
+
+    def _defer(self, log: EmailLog, seconds: float) -> None:
+        """เลื่อนการส่ง (ติด rate limit) โดยไม่นับเป็นการ retry"""
+        log.status = EMAIL_PENDING
+        log.locked_at = None
+        log.next_attempt_at = _now() + timedelta(seconds=seconds)
+
+    def _mark_failed_attempt(self, log: EmailLog, message: str, permanent: bool = False) -> None:
+        now = _now()
+        log.error_message = message
+        log.locked_at = None
+        if permanent or log.retry_count >= settings.EMAIL_MAX_RETRIES:
+            log.status = EMAIL_FAILED
+            log.next_attempt_at = None
+            return
+
+        log.retry_count = (log.retry_count or 0) + 1
+        log.last_retry_at = now
+        log.status = EMAIL_PENDING
+        log.next_attempt_at = now + timedelta(seconds=compute_backoff(log.retry_count))
+
+    def process(self, log: EmailLog) -> str:
+        """ส่งอีเมล์ 1 ฉบับและอัปเดตสถานะใน log (ยังไม่ commit)"""
+        domain = recipient_domain(log.recipient_email)
+        if not self.rate_limiter.try_acquire(domain):
+            self._defer(log, self.rate_limiter.retry_after(domain))
+            return log.status
+
+        try:
+            result = self.email_service.send_summons_email(
+                to_email=log.recipient_email,
+                email_log_id=log.id,
+                smtp_session=self.smtp_session,
+                **log.payload
+            )
+        except Exception as e:
+            # สร้าง PDF ไม่สำเร็จ (เช่น คิวของ BrowserPool เต็ม) → ลองใหม่ภายหลัง
+            self._mark_failed_attempt(log, f"Error preparing email: {str(e)}")
+            return log.status
+
+        pdf_path = result.get('pdf_path')
+        if pdf_path and os.path.exists(pdf_path):
+            log.pdf_size_bytes = os.path.getsize(pdf_path)
+            self.email_service.cleanup_temp_file(pdf_path)
+        log.pdf_filename = result.get('pdf_filename')
+
+        if result['status'] == EMAIL_SENT:
+            log.status = EMAIL_SENT
+            log.sent_at = datetime.fromisoformat(result['sent_at'])
+            log.error_message = None
+            log.locked_at = None
+            log.next_attempt_at = None
+            log.payload = None
+        else:
+            if result.get('error_type') != 'recipients':
+                # connection อาจเสีย → เปิดใหม่ในการส่งครั้งถัดไป
+                self.smtp_session.close()
+            self._mark_failed_attempt(
+                log, result.get('message'),
+                permanent=result.get('error_type') in PERMANENT_ERROR_TYPES
+            )
+
+        return log.status
+
+    def run_once(self) -> int:
+        """ส่งงาน 1 batch คืนจำนวนงานที่ดึงมา"""
+        db = self.session_factory()
+        try:
+            logs = self.claim_batch(db)
+            for log in logs:
+                self.process(log)
+                db.commit()
+            return len(logs)
+        finally:
+            db.close()
+
+    def run_forever(self, poll_seconds: Optional[float] = None) -> None:
+        poll_seconds = poll_seconds or settings.EMAIL_WORKER_POLL_SECONDS
+        try:
+            while True:
+                try:
+                    claimed = self.run_once()
+                except Exception as e:
+                    print(f"Email worker error: {e}")
+                    claimed = 0
+                if claimed < self.batch_size:
+                    # คิวว่าง → ปิด SMTP connection ระหว่างรอ
+                    if claimed == 0:
+                        self.smtp_session.close()
+                    time.sleep(poll_seconds)
+        finally:
+            self.smtp_session.close()
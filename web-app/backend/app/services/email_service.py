@@ -7,7 +7,6 @@ Service สำหรับส่งหมายเรียกพยานเอ
 
 import os
 import smtplib
-import tempfile
 from datetime import datetime
 from email.mime.multipart import MIMEMultipart
 from email.mime.text import MIMEText
@@ -15,9 +14,83 @@ from email.mime.base import MIMEBase
 from email import encoders
 from email.header import Header
 from email.utils import formataddr
-from typing import Dict, Optional
-from playwright.sync_api import sync_playwright
+from typing import Dict, List, Optional
 from jinja2 import Template
+from app.services.pdf_renderer import render_pdf
+
+class SMTPSession:
+    """
+    SMTP connection ที่เปิดค้างไว้เพื่อส่งหลายอีเมล์ต่อ 1 connection
+
+    - เชื่อมต่อเมื่อส่งครั้งแรก และเปิดใหม่ทุก max_messages ฉบับ
+    - ถ้า server ตัดการเชื่อมต่อ จะเชื่อมต่อใหม่และส่งซ้ำ 1 ครั้ง
+    """
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        username: str = "",
+        password: str = "",
+        use_tls: bool = True,
+        max_messages: int = 100,
+        timeout: float = 30
+    ):
+        self.host = host
+        self.port = port
+        self.username = username
+        self.password = password
+        self.use_tls = use_tls
+        self.max_messages = max_messages
+        self.timeout = timeout
+        self._server = None
+        self._sent_on_connection = 0
+
+    def _connect(self) -> None:
+        if self.port == 465:
+            # SSL connection
+            server = smtplib.SMTP_SSL(self.host, self.port, timeout=self.timeout)
+        else:
+            server = smtplib.SMTP(self.host, self.port, timeout=self.timeout)
+            server.ehlo()
+            if self.use_tls:
+                # TLS connection (port 587)
+                server.starttls()
+                server.ehlo()
+        if self.username:
+            server.login(self.username, self.password)
+        self._server = server
+        self._sent_on_connection = 0
+
+    def send(self, from_email: str, recipients: List[str], message: str) -> None:
+        """ส่งอีเมล์ 1 ฉบับผ่าน connection เดิม (raise smtplib exceptions)"""
+        if self._server is None or self._sent_on_connection >= self.max_messages:
+            self.close()
+            self._connect()
+
+        try:
+            self._server.sendmail(from_email, recipients, message)
+        except smtplib.SMTPServerDisconnected:
+            self.close()
+            self._connect()
+            self._server.sendmail(from_email, recipients, message)
+        self._sent_on_connection += 1
+
+    def close(self) -> None:
+        if self._server is not None:
+            try:
+                self._server.quit()
+            except Exception:
+                pass
+            self._server = None
+            self._sent_on_connection = 0
+
+    def __enter__(self) -> "SMTPSession":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
 
 class EmailService:
     """Service สำหรับส่งหมายเรียกพยานเอกสารทางอีเมล์"""
@@ -29,7 +102,8 @@ class EmailService:
         smtp_username: str,
         smtp_password: str,
         from_email: str,
-        from_name: str = "กองบังคับการตำรวจสืบสวนสอบสวนอาชญากรรมทางเทคโนโลยี 4"
+        from_name: str = "กองบังคับการตำรวจสืบสวนสอบสวนอาชญากรรมทางเทคโนโลยี 4",
+        smtp_use_tls: bool = True
     ):
         """
         Initialize EmailService
@@ -41,6 +115,7 @@ class EmailService:
             smtp_password: SMTP password
             from_email: Sender email address
             from_name: Sender display name
+            smtp_use_tls: ใช้ STARTTLS (ปิดได้สำหรับ SMTP stub ในการทดสอบ)
         """
         self.smtp_host = smtp_host
         self.smtp_port = smtp_port
@@ -48,12 +123,25 @@ class EmailService:
         self.smtp_password = smtp_password
         self.from_email = from_email
         self.from_name = from_name
+        self.smtp_use_tls = smtp_use_tls
+
+    def open_session(self, max_messages: int = 100) -> SMTPSession:
+        """เปิด SMTP session สำหรับส่งหลายอีเมล์ต่อ connection"""
+        return SMTPSession(
+            self.smtp_host,
+            self.smtp_port,
+            self.smtp_username,
+            self.smtp_password,
+            use_tls=self.smtp_use_tls,
+            max_messages=max_messages
+        )
 
     def html_to_pdf(self, html_content: str, output_path: Optional[str] = None) -> str:
         """
         แปลง HTML เป็น PDF ด้วย Playwright (Chromium)
 
         PDF จะมีรูปแบบเหมือนกับหน้าจอ 100% เพราะใช้ Chromium rendering engine
+        render ผ่าน BrowserPool กลาง (ไม่เปิด browser ใหม่ทุกครั้ง)
 
         Args:
             html_content: HTML content string
@@ -62,43 +150,7 @@ class EmailService:
         Returns:
             Path to generated PDF file
         """
-        if not output_path:
-            # สร้างไฟล์ชั่วคราว
-            temp_file = tempfile.NamedTemporaryFile(
-                delete=False,
-                suffix='.pdf',
-                prefix='summons_'
-            )
-            output_path = temp_file.name
-            temp_file.close()
-
-        # แปลง HTML เป็น PDF ด้วย Playwright (Chromium)
-        with sync_playwright() as p:
-            # เปิด browser (headless mode)
-            browser = p.chromium.launch(headless=True)
-            page = browser.new_page()
-
-            # โหลด HTML content
-            page.set_content(html_content, wait_until='networkidle')
-
-            # สร้าง PDF (A4, margins สำหรับการปริ้น)
-            page.pdf(
-                path=output_path,
-                format='A4',
-                margin={
-                    'top': '15mm',
-                    'right': '20mm',
-                    'bottom': '15mm',
-                    'left': '20mm'
-                },
-                print_background=True,  # รวม background colors/images
-                prefer_css_page_size=False  # ใช้ format='A4' แทน @page size
-            )
-
-            # ปิด browser
-            browser.close()
-
-        return output_path
+        return render_pdf(html_content, output_path)
 
     def send_email(
         self,
@@ -110,7 +162,8 @@ class EmailService:
         attachment_filename: Optional[str] = None,
         from_name: Optional[str] = None,
         reply_to: Optional[str] = None,
-        cc: Optional[str] = None
+        cc: Optional[str] = None,
+        smtp_session: Optional[SMTPSession] = None
     ) -> Dict:
         """
         ส่งอีเมล์พร้อม attachment
@@ -125,6 +178,7 @@ class EmailService:
             from_name: Sender display name (optional, uses default if not provided)
             reply_to: Reply-To email address (optional)
             cc: CC email address (optional)
+            smtp_session: SMTP session ที่เปิดค้างไว้ (optional, ถ้าไม่ระบุจะเปิด connection ใหม่)
 
         Returns:
             Dict with status and message
@@ -180,19 +234,11 @@ class EmailService:
             if cc:
                 recipients.append(cc)
 
-            if self.smtp_port == 465:
-                # SSL connection
-                with smtplib.SMTP_SSL(self.smtp_host, self.smtp_port) as server:
-                    server.login(self.smtp_username, self.smtp_password)
-                    server.sendmail(self.from_email, recipients, msg.as_string())
+            if smtp_session is not None:
+                smtp_session.send(self.from_email, recipients, msg.as_string())
             else:
-                # TLS connection (port 587)
-                with smtplib.SMTP(self.smtp_host, self.smtp_port) as server:
-                    server.ehlo()
-                    server.starttls()
-                    server.ehlo()
-                    server.login(self.smtp_username, self.smtp_password)
-                    server.sendmail(self.from_email, recipients, msg.as_string())
+                with self.open_session(max_messages=1) as session:
+                    session.send(self.from_email, recipients, msg.as_string())
 
             return {
                 "status": "sent",
@@ -206,6 +252,12 @@ class EmailService:
                 "message": f"SMTP Authentication failed: {str(e)}",
                 "error_type": "authentication"
             }
+        except smtplib.SMTPRecipientsRefused as e:
+            return {
+                "status": "failed",
+                "message": f"Recipient refused: {str(e)}",
+                "error_type": "recipients"
+            }
         except smtplib.SMTPException as e:
             return {
                 "status": "failed",
@@ -231,7 +283,8 @@ class EmailService:
         sender_email: Optional[str] = None,
         sender_phone: Optional[str] = None,
         email_log_id: Optional[int] = None,
-        backend_url: str = "http://localhost:8000"
+        backend_url: str = "http://localhost:8000",
+        smtp_session: Optional[SMTPSession] = None
     ) -> Dict:
         """
         ส่งหมายเรียกพยานเอกสารทางอีเมล์
@@ -247,6 +300,7 @@ class EmailService:
             sender_email: Sender's email (optional, for Reply-To and CC)
             email_log_id: Email log ID สำหรับ tracking (optional)
             backend_url: Backend URL สำหรับ tracking pixel (optional)
+            smtp_session: SMTP session ที่เปิดค้างไว้ (optional)
 
         Returns:
             Dict with status, message, and pdf_path
@@ -291,7 +345,8 @@ class EmailService:
             attachment_filename=pdf_filename,
             from_name=sender_name,  # ชื่อผู้ส่ง (แสดงใน From)
             reply_to=sender_email,  # อีเมล์สำหรับตอบกลับ
-            cc=sender_email  # CC ให้ผู้ส่งด้วย
+            cc=sender_email,  # CC ให้ผู้ส่งด้วย
+            smtp_session=smtp_session
         )
 
         # เพิ่มข้อมูล PDF path ใน result
@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Streaming Excel export of cases, accounts, suspects and CFR records
+
+ดึงข้อมูลด้วย server-side cursor (Query.yield_per) แล้วเขียนเป็น .xlsx ด้วย stream_xlsx
+หน่วยความจำคงที่ไม่ขึ้นกับจำนวนแถว (เหมาะกับ CFR ชุดใหญ่)
+
+สิทธิ์การเห็นข้อมูลและเงื่อนไขกรองคดีใช้ CaseSearchService.build_filtered_query
+ชุดข้อมูลที่เป็นข้อมูลลูกของคดีถูกกรองด้วยคดีที่ผ่านเงื่อนไขนั้น
+"""
+
+from typing import Iterator, Optional
+
+from sqlalchemy.orm import Query, Session
+
+from app.core.database import SessionLocal
+from app.models import (
+    CFR, BankAccount, CriminalCase, NonBank, NonBankAccount, PaymentGateway, PaymentGatewayAccount,
+    Suspect, TelcoInternetAccount, TelcoMobileAccount, User,
+)
+from app.services.case_search_service import CaseSearchService
+from app.services.xlsx_stream import stream_xlsx
+
+EXPORT_BATCH_SIZE = 2000  # จำนวนแถวที่ดึงจาก server-side cursor ต่อครั้ง
+
+CASE_COLUMNS = [
+    ("เลขคดี", CriminalCase.case_number),
+    ("CaseID", CriminalCase.case_id),
+]
+
+# dataset → (ชื่อ sheet, model, [(หัวคอลัมน์, คอลัมน์)], [(ตาราง outer join, เงื่อนไข)])
+EXPORT_DATASETS = {
+    'cases': ("คดี", CriminalCase, CASE_COLUMNS + [
+        ("สถานะ", CriminalCase.status),
+        ("ประเภทคดี", CriminalCase.case_type),
+        ("ผู้เสียหาย", CriminalCase.complainant),
+        ("ความเสียหาย", CriminalCase.damage_amount),
+        ("วันที่รับแจ้ง", CriminalCase.complaint_date),
+        ("วันที่เกิดเหตุ", CriminalCase.incident_date),
+        ("ศาล", CriminalCase.court_name),
+        ("วันที่บันทึก", CriminalCase.created_at),
+    ], []),
+    'bank_accounts': ("บัญชีธนาคาร", BankAccount, CASE_COLUMNS + [
+        ("เลขที่หนังสือ", BankAccount.document_number),
+        ("วันที่หนังสือ", BankAccount.document_date),
+        ("ธนาคาร", BankAccount.bank_name),
+        ("เลขบัญชี", BankAccount.account_number),
+        ("ชื่อบัญชี", BankAccount.account_name),
+        ("ช่วงเวลา", BankAccount.time_period),
+        ("วันที่ส่ง", BankAccount.delivery_date),
+        ("ตอบกลับ", BankAccount.reply_status),
+        ("สถานะ", BankAccount.status),
+        ("หมายเหตุ", BankAccount.notes),
+    ], []),
+    'non_bank_accounts': ("Non-Bank", NonBankAccount, CASE_COLUMNS + [
+        ("เลขที่หนังสือ", NonBankAccount.document_number),
+        ("วันที่หนังสือ", NonBankAccount.document_date),
+        ("ผู้ให้บริการ", NonBank.company_name),
+        ("เลขบัญชี", NonBankAccount.account_number),
+        ("ชื่อบัญชี", NonBankAccount.account_name),
+        ("ช่วงเวลา", NonBankAccount.time_period),
+        ("วันที่ส่ง", NonBankAccount.delivery_date),
+        ("ตอบกลับ", NonBankAccount.reply_status),
+        ("สถานะ", NonBankAccount.status),
+    ], [(NonBank, NonBankAccount.non_bank_id == NonBank.id)]),
+    'payment_gateway_accounts': ("Payment Gateway", PaymentGatewayAccount, CASE_COLUMNS + [
+        ("เลขที่หนังสือ", PaymentGatewayAccount.document_number),
+        ("วันที่หนังสือ", PaymentGatewayAccount.document_date),
+        ("ผู้ให้บริการ", PaymentGateway.company_name),
+        ("เลขบัญชี", PaymentGatewayAccount.account_number),
+        ("ชื่อบัญชี", PaymentGatewayAccount.account_name),
+        ("ช่วงเวลา", PaymentGatewayAccount.time_period),
+        ("วันที่ส่ง", PaymentGatewayAccount.delivery_date),
+        ("ตอบกลับ", PaymentGatewayAccount.reply_status),
+        ("สถานะ", PaymentGatewayAccount.status),
+    ], [(PaymentGateway, PaymentGatewayAccount.payment_gateway_id == PaymentGateway.id)]),
+    'telco_mobile_accounts': ("หมายเลขโทรศัพท์", TelcoMobileAccount, CASE_COLUMNS + [
+        ("เลขที่หนังสือ", TelcoMobileAccount.document_number),
+        ("วันที่หนังสือ", TelcoMobileAccount.document_date),
+        ("ผู้ให้บริการ", TelcoMobileAccount.provider_name),
+        ("หมายเลขโทรศัพท์", TelcoMobileAccount.phone_number),
+        ("ช่วงเวลา", TelcoMobileAccount.time_period),
+        ("วันที่ส่ง", TelcoMobileAccount.delivery_date),
+        ("ตอบกลับ", TelcoMobileAccount.reply_status),
+        ("สถานะ", TelcoMobileAccount.status),
+        ("หมายเหตุ", TelcoMobileAccount.notes),
+    ], []),
+    'telco_internet_accounts': ("IP Address", TelcoInternetAccount, CASE_COLUMNS + [
+        ("เลขที่หนังสือ", TelcoInternetAccount.document_number),
+        ("วันที่หนังสือ", TelcoInternetAccount.document_date),
+        ("ผู้ให้บริการ", TelcoInternetAccount.provider_name),
+        ("IP Address", TelcoInternetAccount.ip_address),
+        ("วันเวลาที่ใช้งาน", TelcoInternetAccount.datetime_used),
+        ("วันที่ส่ง", TelcoInternetAccount.delivery_date),
+        ("ตอบกลับ", TelcoInternetAccount.reply_status),
+        ("สถานะ", TelcoInternetAccount.status),
+        ("หมายเหตุ", TelcoInternetAccount.notes),
+    ], []),
+    'suspects': ("ผู้ต้องหา", Suspect, CASE_COLUMNS + [
+        ("เลขที่หนังสือ", Suspect.document_number),
+        ("วันที่หนังสือ", Suspect.document_date),
+        ("ชื่อผู้ต้องหา", Suspect.suspect_name),
+        ("เลขบัตรประชาชน", Suspect.suspect_id_card),
+        ("ที่อยู่", Suspect.suspect_address),
+        ("สถานีตำรวจ", Suspect.police_station),
+        ("จังหวัด", Suspect.police_province),
+        ("วันนัดหมาย", Suspect.appointment_date),
+        ("มาตามนัด", Suspect.reply_status),
+        ("สถานะ", Suspect.status),
+        ("หมายเหตุ", Suspect.notes),
+    ], []),
+    'cfr': ("CFR", CFR, CASE_COLUMNS + [
+        ("ไฟล์", CFR.filename),
+        ("Bank Case ID", CFR.bank_case_id),
+        ("ธนาคารต้นทาง", CFR.from_bank_short_name),
+        ("บัญชีต้นทาง", CFR.from_account_no),
+        ("ชื่อบัญชีต้นทาง", CFR.from_account_name),
+        ("ธนาคารปลายทาง", CFR.to_bank_short_name),
+        ("สาขา", CFR.to_bank_branch),
+        ("บัญชีปลายทาง", CFR.to_account_no),
+        ("ชื่อบัญชีปลายทาง", CFR.to_account_name),
+        ("ชื่อ", CFR.first_name),
+        ("นามสกุล", CFR.last_name),
+        ("เลขประจำตัว", CFR.to_id),
+        ("โทรศัพท์", CFR.phone_number),
+        ("PromptPay", CFR.promptpay_id),
+        ("สถานะบัญชี", CFR.to_account_status),
+        ("ยอดคงเหลือ", CFR.to_balance),
+        ("วันที่โอน", CFR.transfer_date),
+        ("เวลาโอน", CFR.transfer_time),
+        ("ช่องทาง", CFR.transfer_channel),
+        ("รายละเอียดช่องทาง", CFR.transfer_channel_detail),
+        ("จำนวนเงิน", CFR.transfer_amount),
+        ("รายละเอียด", CFR.transfer_description),
+        ("เลขอ้างอิง", CFR.transfer_ref),
+    ], []),
+}
+
+
+def build_export_query(
+    db: Session,
+    dataset: str,
+    current_user: User,
+    criminal_case_id: Optional[int] = None,
+    **case_filters
+) -> Query:
+    """
+    สร้าง query ของชุดข้อมูลที่จะ export (ยังไม่ execute)
+
+    case_filters: เงื่อนไขเดียวกับ CaseSearchService.build_filtered_query
+    """
+    _, model, columns, joins = EXPORT_DATASETS[dataset]
+    entities = [column for _, column in columns]
+
+    cases = CaseSearchService(db).build_filtered_query(current_user, **case_filters)
+    if criminal_case_id is not None:
+        cases = cases.filter(CriminalCase.id == criminal_case_id)
+    if model is CriminalCase:
+        return cases.with_entities(*entities).order_by(CriminalCase.id)
+
+    query = db.query(*entities).select_from(model).join(
+        CriminalCase, model.criminal_case_id == CriminalCase.id
+    )
+    for target, onclause in joins:
+        query = query.outerjoin(target, onclause)
+    return query.filter(
+        model.criminal_case_id.in_(cases.with_entities(CriminalCase.id))
+    ).order_by(model.id)
+
+
+def stream_export(query: Query, dataset: str) -> Iterator[bytes]:
+    """
+    ทยอยส่งไฟล์ .xlsx ของ query จาก build_export_query()
+
+    ใช้ session ของตัวเองตลอดการ stream (session ของ request ถูกปิดก่อนเริ่มส่ง response)
+    """
+    sheet_name, _, columns, _ = EXPORT_DATASETS[dataset]
+    headers = [header for header, _ in columns]
+    db = SessionLocal()
+    try:
+        rows = query.with_session(db).yield_per(EXPORT_BATCH_SIZE)
+        yield from stream_xlsx([(sheet_name, headers, rows)])
+    finally:
+        db.close()
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Redis-backed status store for background jobs
+(progress polling, cancellation and final report)
+"""
+
+import json
+import uuid
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+import redis
+
+from app.core.config import settings
+
+# สถานะของงาน
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_COMPLETED = "completed"
+JOB_FAILED = "failed"
+JOB_CANCELLED = "cancelled"
+
+FINISHED_STATUSES = {JOB_COMPLETED, JOB_FAILED, JOB_CANCELLED}
+
+# ฟิลด์ที่เก็บเป็นตัวเลข / JSON ใน Redis hash
+_INT_FIELDS = {"rows_parsed", "rows_inserted", "criminal_case_id", "created_by"}
+_JSON_FIELDS = {"result"}
+
+
+class JobCancelled(Exception):
+    """Raised inside a running job when cancellation was requested"""
+
+
+class JobStore:
+    """
+    เก็บสถานะงานใน Redis hash (key: job:{job_id}) พร้อม TTL
+
+    รับ client จากภายนอกได้ เช่น fakeredis.FakeRedis(decode_responses=True) สำหรับทดสอบ
+    """
+
+    def __init__(self, client: Optional[redis.Redis] = None, ttl: int = None):
+        self.client = client or redis.Redis.from_url(settings.REDIS_URL, decode_responses=True)
+        self.ttl = ttl or settings.JOB_TTL_SECONDS
+
+    @staticmethod
+    def _key(job_id: str) -> str:
+        return f"job:{job_id}"
+
+    @staticmethod
+    def _cancel_key(job_id: str) -> str:
+        return f"job:{job_id}:cancel"
+
+    @staticmethod
+    def _encode(fields: Dict[str, Any]) -> Dict[str, str]:
+        encoded = {}
+        for key, value in fields.items():
+            if value is None:
+                value = ""
+            elif key in _JSON_FIELDS:
+                value = json.dumps(value, ensure_ascii=False, default=str)
+            elif isinstance(value, datetime):
+                value = value.isoformat()
+            encoded[key] = str(value)
+        return encoded
+
+    @staticmethod
+    def _decode(raw: Dict[str, str]) -> Dict[str, Any]:
+        job = {}
+        for key, value in raw.items():
+            if isinstance(key, bytes):
+                key, value = key.decode(), value.decode()
+            if value == "":
+                job[key] = None
+            elif key in _INT_FIELDS:
+                job[key] = int(value)
+            elif key in _JSON_FIELDS:
+                job[key] = json.loads(value)
+            else:
+                job[key] = value
+        return job
+
+    def create(self, job_type: str, **fields) -> Dict[str, Any]:
+        """สร้างงานใหม่ในสถานะ queued"""
+        job_id = uuid.uuid4().hex
+        job = {
+            "id": job_id,
+            "job_type": job_type,
+            "status": JOB_QUEUED,
+            "rows_parsed": 0,
+            "rows_inserted": 0,
+            "error": None,
+            "result": None,
+            "created_at": datetime.now(),
+            "updated_at": datetime.now(),
+            **fields
+        }
+        key = self._key(job_id)
+        pipe = self.client.pipeline()
+        pipe.hset(key, mapping=self._encode(job))
+        pipe.expire(key, self.ttl)
+        pipe.execute()
+        return self.get(job_id)
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        raw = self.client.hgetall(self._key(job_id))
+        if not raw:
+            return None
+        job = self._decode(raw)
+        job["cancel_requested"] = self.is_cancel_requested(job_id)
+        return job
+
+    def update(self, job_id: str, **fields) -> None:
+        fields["updated_at"] = datetime.now()
+        key = self._key(job_id)
+        pipe = self.client.pipeline()
+        pipe.hset(key, mapping=self._encode(fields))
+        pipe.expire(key, self.ttl)
+        pipe.execute()
+
+    def request_cancel(self, job_id: str) -> bool:
+        """ขอยกเลิกงาน (งานจะหยุดเมื่อถึงจุดตรวจสอบถัดไป)"""
+        job = self.get(job_id)
+        if job is None or job["status"] in FINISHED_STATUSES:
+            return False
+        self.client.set(self._cancel_key(job_id), "1", ex=self.ttl)
+        return True
+
+    def is_cancel_requested(self, job_id: str) -> bool:
+        return bool(self.client.exists(self._cancel_key(job_id)))
+
+
+_job_store: Optional[JobStore] = None
+
+
+def get_job_store() -> JobStore:
+    """คืนค่า JobStore ที่ใช้ร่วมกันทั้งระบบ"""
+    global _job_store
+    if _job_store is None:
+        _job_store = JobStore()
+    return _job_store
+
+
+def set_job_store(store: Optional[JobStore]) -> None:
+    """เปลี่ยน JobStore (เช่น ใช้ fakeredis ระหว่างทดสอบ)"""
+    global _job_store
+    _job_store = store
@@ -0,0 +1,407 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Background dispatcher for LINE push notifications
+
+API เพิ่มการแจ้งเตือนเข้าคิวในหน่วยความจำแล้วตอบกลับทันที (ไม่รอ LINE)
+- event loop ของตัวเองใน thread แยก พร้อม httpx.AsyncClient ตัวเดียว (ใช้ connection ซ้ำ)
+- worker จำนวนจำกัด (LINE_DISPATCH_WORKERS) แต่ละตัวส่งให้ผู้รับทีละคน ตามลำดับที่เข้าคิว
+- ข้อความถึงผู้รับเดียวกันที่เข้ามาภายใน LINE_BATCH_WINDOW_SECONDS ถูกรวมส่งใน push เดียว
+  (ไม่เกิน LINE_MAX_MESSAGES_PER_PUSH ข้อความต่อ request ตามข้อจำกัดของ LINE)
+- ปัญหาชั่วคราว (network, HTTP 429/5xx) ส่งซ้ำแบบ exponential backoff
+  บันทึกจำนวนครั้งใน line_notification_logs.retry_count
+- งานฐานข้อมูล (สร้าง/อัปเดต log) รันใน IO executor ไม่ block event loop
+
+คิวอยู่ในหน่วยความจำของ process: การแจ้งเตือนที่ยังไม่ได้ส่งจะหายถ้า process หยุดกะทันหัน
+(shutdown ปกติจะส่งที่ค้างอยู่ก่อนปิด)
+"""
+
+import asyncio
+import threading
+from concurrent.futures import Future
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Tuple
+
+import httpx
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.core.executors import run_in_io
+from app.models.line_account import LineAccount
+from app.models.line_notification_log import LineNotificationLog
+
+LINE_PUSH_URL = "https://api.line.me/v2/bot/message/push"
+LINE_MAX_MESSAGES_PER_PUSH = 5
+
+LINE_PENDING = "pending"
+LINE_SENT = "sent"
+LINE_FAILED = "failed"
+
+# notification_type → คอลัมน์การตั้งค่าใน LineAccount (None = ส่งเสมอ)
+NOTIFICATION_PREFERENCES = {
+    "connection_test": None,
+    "new_case": "notify_new_case",
+    "case_update": "notify_case_update",
+    "summons_sent": "notify_summons_sent",
+    "email_opened": "notify_email_opened",
+}
+
+
+def notification_enabled(line_account: LineAccount, notification_type: str) -> bool:
+    """ผู้ใช้เปิดรับการแจ้งเตือนประเภทนี้หรือไม่"""
+    if notification_type not in NOTIFICATION_PREFERENCES:
+        return False
+    column = NOTIFICATION_PREFERENCES[notification_type]
+    return column is None or bool(getattr(line_account, column))
+
+
+def compute_retry_delay(retry_count: int) -> float:
+    """เวลารอก่อนส่งซ้ำ (วินาที): LINE_RETRY_BASE_SECONDS * 2^(n-1)"""
+    return settings.LINE_RETRY_BASE_SECONDS * (2 ** max(retry_count - 1, 0))
+
+
+class _Notification:
+    def __init__(
+        self,
+        user_id: int,
+        notification_type: str,
+        title: str,
+        message: str,
+        criminal_case_id: Optional[int]
+    ):
+        self.user_id = user_id
+        self.notification_type = notification_type
+        self.title = title
+        self.message = message
+        self.criminal_case_id = criminal_case_id
+        self.log_id: Optional[int] = None
+        self.completed = False  # นับใน stats แล้ว (เปลี่ยนภายใต้ lock ของ dispatcher)
+        self.future: Future = Future()  # True เมื่อส่งสำเร็จ
+
+    @property
+    def text(self) -> str:
+        return f"{self.title}\n\n{self.message}"
+
+
+class LineNotificationDispatcher:
+    """คิวส่งการแจ้งเตือน LINE แบบ background (thread-safe)"""
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session] = SessionLocal,
+        push_url: str = LINE_PUSH_URL,
+        access_token: Optional[str] = None,
+        workers: Optional[int] = None,
+        max_queue: Optional[int] = None,
+        batch_window: Optional[float] = None,
+        max_retries: Optional[int] = None,
+        timeout: Optional[float] = None
+    ):
+        self.session_factory = session_factory
+        self.push_url = push_url
+        self.access_token = access_token if access_token is not None else settings.LINE_CHANNEL_ACCESS_TOKEN
+        self.workers = workers or settings.LINE_DISPATCH_WORKERS
+        self.max_queue = max_queue or settings.LINE_DISPATCH_MAX_QUEUE
+        self.batch_window = batch_window if batch_window is not None else settings.LINE_BATCH_WINDOW_SECONDS
+        self.max_retries = max_retries if max_retries is not None else settings.LINE_MAX_RETRIES
+        self.timeout = timeout or settings.LINE_HTTP_TIMEOUT_SECONDS
+
+        self._lock = threading.Lock()
+        self._pending: Dict[int, List[_Notification]] = {}  # user_id → ข้อความที่รอส่ง
+        self._scheduled = set()  # ผู้รับที่อยู่ในคิว / รอรวมข้อความ / กำลังส่ง
+        self._queued = 0
+        self._thread: Optional[threading.Thread] = None
+        self._ready = threading.Event()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+        self._sent = 0
+        self._not_sent = 0
+        self._retries = 0
+        self._rejected = 0
+        self._pushes = 0
+
+    # ---------- lifecycle ----------
+
+    def start(self) -> None:
+        """เริ่ม event loop thread (เรียกอัตโนมัติเมื่อเพิ่มการแจ้งเตือนครั้งแรก)"""
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._ready.clear()
+            self._thread = threading.Thread(target=self._run, name="line-dispatcher", daemon=True)
+            self._thread.start()
+        self._ready.wait()
+
+    def shutdown(self, timeout: float = 10) -> None:
+        """ส่งการแจ้งเตือนที่ค้างอยู่ทันที (ไม่รอรวมข้อความ) แล้วปิด event loop"""
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is None:
+            return
+        self._loop.call_soon_threadsafe(self._stopping.set)
+        thread.join(timeout)
+
+    def _run(self) -> None:
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        self._loop = loop
+        try:
+            loop.run_until_complete(self._main())
+        finally:
+            loop.close()
+
+    async def _main(self) -> None:
+        self._queue: "asyncio.Queue[int]" = asyncio.Queue()
+        self._stopping = asyncio.Event()
+        self._timers: Dict[int, asyncio.TimerHandle] = {}
+
+        limits = httpx.Limits(max_connections=self.workers, max_keepalive_connections=self.workers)
+        headers = {"Authorization": f"Bearer {self.access_token}"}
+        async with httpx.AsyncClient(limits=limits, headers=headers, timeout=self.timeout) as client:
+            self._client = client
+            workers = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+            self._ready.set()
+
+            await self._stopping.wait()
+            for user_id, timer in list(self._timers.items()):
+                timer.cancel()
+                self._queue.put_nowait(user_id)
+            self._timers.clear()
+            await self._queue.join()
+
+            for worker in workers:
+                worker.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+
+    # ---------- enqueue ----------
+
+    def submit(
+        self,
+        user_id: int,
+        notification_type: str,
+        title: str,
+        message: str,
+        criminal_case_id: Optional[int] = None
+    ) -> Future:
+        """
+        เพิ่มการแจ้งเตือนเข้าคิวและคืนค่าทันที
+
+        Returns:
+            Future ที่ได้ True เมื่อส่งสำเร็จ, False เมื่อไม่ได้ส่ง
+            (ไม่ได้เชื่อม LINE, ปิดรับการแจ้งเตือนประเภทนี้, ส่งไม่สำเร็จ หรือคิวเต็ม)
+        """
+        self.start()
+        notification = _Notification(user_id, notification_type, title, message, criminal_case_id)
+
+        with self._lock:
+            if self._queued >= self.max_queue:
+                self._rejected += 1
+                notification.future.set_result(False)
+                print(f"Warning: LINE notification queue is full, dropped {notification_type} for user {user_id}")
+                return notification.future
+            self._queued += 1
+            self._pending.setdefault(user_id, []).append(notification)
+            schedule = user_id not in self._scheduled
+            self._scheduled.add(user_id)
+
+        if schedule:
+            self._loop.call_soon_threadsafe(self._schedule, user_id)
+        return notification.future
+
+    def _schedule(self, user_id: int) -> None:
+        """เข้าคิวหลังรอรวมข้อความถึงผู้รับเดียวกัน (เรียกบน event loop)"""
+        if self._stopping.is_set() or not self.batch_window:
+            self._queue.put_nowait(user_id)
+        else:
+            self._timers[user_id] = self._loop.call_later(self.batch_window, self._release, user_id)
+
+    def _release(self, user_id: int) -> None:
+        self._timers.pop(user_id, None)
+        self._queue.put_nowait(user_id)
+
+    # ---------- delivery ----------
+
+    async def _worker(self) -> None:
+        while True:
+            user_id = await self._queue.get()
+            try:
+                with self._lock:
+                    batch = self._pending.pop(user_id, [])
+                try:
+                    await self._deliver(user_id, batch)
+                except Exception as e:
+                    print(f"LINE dispatcher error: {e}")
+                    self._complete(batch, False)
+            finally:
+                with self._lock:
+                    reschedule = user_id in self._pending
+                    if not reschedule:
+                        self._scheduled.discard(user_id)
+                if reschedule:
+                    self._schedule(user_id)
+                self._queue.task_done()
+
+    async def _deliver(self, user_id: int, batch: List[_Notification]) -> None:
+        prepared = await run_in_io(self._prepare, user_id, batch)
+        if prepared is None:
+            self._complete(batch, False)
+            return
+
+        account_id, line_user_id, notifications = prepared
+        self._complete([n for n in batch if n.log_id is None], False)
+        for start in range(0, len(notifications), LINE_MAX_MESSAGES_PER_PUSH):
+            chunk = notifications[start:start + LINE_MAX_MESSAGES_PER_PUSH]
+            delivered = await self._push(account_id, line_user_id, chunk)
+            self._complete(chunk, delivered)
+
+    def _prepare(
+        self, user_id: int, batch: List[_Notification]
+    ) -> Optional[Tuple[int, str, List[_Notification]]]:
+        """สร้าง log (status='pending') ของข้อความที่ผู้ใช้เปิดรับ ใน commit เดียว"""
+        db = self.session_factory()
+        try:
+            line_account = db.query(LineAccount).filter_by(user_id=user_id, is_active=True).first()
+            if not line_account:
+                return None
+
+            logs = []
+            for notification in batch:
+                if not notification_enabled(line_account, notification.notification_type):
+                    continue
+                log = LineNotificationLog(
+                    line_account_id=line_account.id,
+                    notification_type=notification.notification_type,
+                    title=notification.title,
+                    message=notification.message,
+                    criminal_case_id=notification.criminal_case_id,
+                    status=LINE_PENDING,
+                    retry_count=0
+                )
+                db.add(log)
+                logs.append((notification, log))
+
+            db.flush()
+            for notification, log in logs:
+                notification.log_id = log.id
+            account_id, line_user_id = line_account.id, line_account.line_user_id
+            db.commit()
+            return account_id, line_user_id, [notification for notification, _ in logs]
+        finally:
+            db.close()
+
+    async def _push(self, account_id: int, line_user_id: str, chunk: List[_Notification]) -> bool:
+        """ส่ง 1 push (ส่งซ้ำเมื่อเป็นปัญหาชั่วคราว) และบันทึกผลใน log"""
+        log_ids = [notification.log_id for notification in chunk]
+        payload = {
+            "to": line_user_id,
+            "messages": [{"type": "text", "text": notification.text} for notification in chunk]
+        }
+        retry_count = 0
+        while True:
+            try:
+                response = await self._client.post(self.push_url, json=payload)
+                with self._lock:
+                    self._pushes += 1
+                if response.status_code == 200:
+                    await run_in_io(self._record_sent, account_id, log_ids)
+                    return True
+                error = f"HTTP {response.status_code}: {response.text}"
+                retryable = response.status_code == 429 or response.status_code >= 500
+            except httpx.HTTPError as e:
+                error = str(e) or type(e).__name__
+                retryable = isinstance(e, httpx.TransportError)
+
+            if not retryable or retry_count >= self.max_retries:
+                await run_in_io(self._record_logs, log_ids, status=LINE_FAILED, error_message=error)
+                return False
+
+            retry_count += 1
+            with self._lock:
+                self._retries += 1
+            await run_in_io(
+                self._record_logs, log_ids,
+                retry_count=retry_count, last_retry_at=datetime.now(), error_message=error
+            )
+            await asyncio.sleep(compute_retry_delay(retry_count))
+
+    def _record_logs(self, log_ids: List[int], **values) -> None:
+        db = self.session_factory()
+        try:
+            db.query(LineNotificationLog).filter(
+                LineNotificationLog.id.in_(log_ids)
+            ).update(values, synchronize_session=False)
+            db.commit()
+        finally:
+            db.close()
+
+    def _record_sent(self, account_id: int, log_ids: List[int]) -> None:
+        now = datetime.now()
+        db = self.session_factory()
+        try:
+            db.query(LineNotificationLog).filter(LineNotificationLog.id.in_(log_ids)).update(
+                {"status": LINE_SENT, "sent_at": now, "error_message": None}, synchronize_session=False
+            )
+            db.query(LineAccount).filter(LineAccount.id == account_id).update(
+                {"last_used_at": now}, synchronize_session=False
+            )
+            db.commit()
+        finally:
+            db.close()
+
+    def _complete(self, notifications: List[_Notification], delivered: bool) -> None:
+        # นับเฉพาะรายการที่ยังไม่เสร็จ: เมื่อ _deliver ล้มกลางคัน worker ส่งทั้ง batch มา
+        # ซึ่งบางส่วน (ไม่ได้สร้าง log / chunk ที่ส่งไปแล้ว) ถูก complete ไปแล้ว
+        with self._lock:
+            remaining = [n for n in notifications if not n.completed]
+            for notification in remaining:
+                notification.completed = True
+            self._queued -= len(remaining)
+            if delivered:
+                self._sent += len(remaining)
+            else:
+                self._not_sent += len(remaining)
+        for notification in remaining:
+            notification.future.set_result(delivered)
+
+    # ---------- metrics ----------
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "queued": self._queued,
+                "sent": self._sent,
+                "not_sent": self._not_sent,
+                "retries": self._retries,
+                "rejected": self._rejected,
+                "pushes": self._pushes,
+            }
+
+
+_dispatcher: Optional[LineNotificationDispatcher] = None
+_dispatcher_lock = threading.Lock()
+
+
+def get_line_dispatcher() -> LineNotificationDispatcher:
+    """LineNotificationDispatcher ของ process นี้ (สร้างครั้งแรกเมื่อเรียกใช้)"""
+    global _dispatcher
+    if _dispatcher is None:
+        with _dispatcher_lock:
+            if _dispatcher is None:
+                _dispatcher = LineNotificationDispatcher()
+    return _dispatcher
+
+
+def set_line_dispatcher(dispatcher: Optional[LineNotificationDispatcher]) -> None:
+    """เปลี่ยน LineNotificationDispatcher (ใช้ในการทดสอบ)"""
+    global _dispatcher
+    _dispatcher = dispatcher
+
+
+def shutdown_line_dispatcher() -> None:
+    """ส่งการแจ้งเตือนที่ค้างอยู่แล้วปิด dispatcher (เรียกตอน application shutdown)"""
+    global _dispatcher
+    with _dispatcher_lock:
+        if _dispatcher is not None:
+            _dispatcher.shutdown()
+            _dispatcher = None
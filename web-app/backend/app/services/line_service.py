@@ -1,5 +1,7 @@
+import asyncio
 import httpx
 import secrets
+from concurrent.futures import Future
 from datetime import datetime, timedelta
 from sqlalchemy.orm import Session
 from fastapi import HTTPException
@@ -9,12 +11,13 @@ from app.core.config import settings
 from app.models.line_account import LineAccount
 from app.models.line_notification_log import LineNotificationLog
 from app.core.encryption import encrypt_token, decrypt_token
+from app.services.line_dispatcher import LINE_PUSH_URL, get_line_dispatcher
 
 class LineService:
     LINE_AUTH_URL = "https://access.line.me/oauth2/v2.1/authorize"
     LINE_TOKEN_URL = "https://api.line.me/oauth2/v2.1/token"
     LINE_PROFILE_URL = "https://api.line.me/v2/profile"
-    LINE_MESSAGE_URL = "https://api.line.me/v2/bot/message/push"
+    LINE_MESSAGE_URL = LINE_PUSH_URL
 
     @staticmethod
     def generate_auth_url(user_id: int) -> str:
@@ -96,12 +99,11 @@ class LineService:
         db.commit()
         db.refresh(line_account)
 
-        await LineService.send_notification(
+        LineService.queue_notification(
             user_id=user_id,
             notification_type="connection_test",
             title="🎉 เชื่อมต่อ LINE สำเร็จ!",
-            message=f"ยินดีต้อนรับคุณ {profile_data['displayName']} เข้าสู่ระบบ CCMS\n\nบัญชี LINE ของคุณได้เชื่อมต่อกับระบบจัดการคดีอาญาเรียบร้อยแล้ว คุณจะได้รับการแจ้งเตือนสำคัญผ่าน LINE นี้ต่อไป",
-            db=db
+            message=f"ยินดีต้อนรับคุณ {profile_data['displayName']} เข้าสู่ระบบ CCMS\n\nบัญชี LINE ของคุณได้เชื่อมต่อกับระบบจัดการคดีอาญาเรียบร้อยแล้ว คุณจะได้รับการแจ้งเตือนสำคัญผ่าน LINE นี้ต่อไป"
         )
 
         return {"success": True, "message": "เชื่อมต่อ LINE สำเร็จ"}
@@ -111,76 +113,43 @@ class LineService:
         return db.query(LineAccount).filter_by(user_id=user_id, is_active=True).first()
 
     @staticmethod
-    async def send_notification(
+    def queue_notification(
         user_id: int,
         notification_type: str,
         title: str,
         message: str,
-        db: Session,
         criminal_case_id: Optional[int] = None
-    ) -> bool:
-        line_account = LineService.get_user_line_account(user_id, db)
-        if not line_account:
-            return False
-
-        preference_map = {
-            "connection_test": True,
-            "new_case": line_account.notify_new_case,
-            "case_update": line_account.notify_case_update,
-            "summons_sent": line_account.notify_summons_sent,
-            "email_opened": line_account.notify_email_opened,
-        }
-
-        if not preference_map.get(notification_type, False):
-            return False
+    ) -> Future:
+        """
+        เพิ่มการแจ้งเตือนเข้าคิวส่ง (LineNotificationDispatcher) และคืนค่าทันทีโดยไม่รอ LINE
 
-        log = LineNotificationLog(
-            line_account_id=line_account.id,
+        Returns:
+            Future ที่ได้ True เมื่อส่งสำเร็จ
+        """
+        return get_line_dispatcher().submit(
+            user_id=user_id,
             notification_type=notification_type,
             title=title,
             message=message,
-            criminal_case_id=criminal_case_id,
-            status="pending"
+            criminal_case_id=criminal_case_id
         )
-        db.add(log)
-        db.commit()
-
-        try:
-            full_message = f"{title}\n\n{message}"
-
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    LineService.LINE_MESSAGE_URL,
-                    headers={
-                        "Authorization": f"Bearer {settings.LINE_CHANNEL_ACCESS_TOKEN}",
-                        "Content-Type": "application/json"
-                    },
-                    json={
-                        "to": line_account.line_user_id,
-                        "messages": [{
-                            "type": "text",
-                            "text": full_message
-                        }]
-                    },
-                    timeout=10.0
-                )
-
-            if response.status_code == 200:
-                log.status = "sent"
-                log.sent_at = datetime.now()
-                line_account.last_used_at = datetime.now()
-            else:
-                log.status = "failed"
-                log.error_message = f"HTTP {response.status_code}: {response.text}"
-
-            db.commit()
-            return response.status_code == 200
 
-        except Exception as e:
-            log.status = "failed"
-            log.error_message = str(e)
-            db.commit()
-            return False
+    @staticmethod
+    async def send_notification(
+        user_id: int,
+        notification_type: str,
+        title: str,
+        message: str,
+        criminal_case_id: Optional[int] = None
+    ) -> bool:
+        """ส่งการแจ้งเตือนผ่านคิวและรอผลการส่ง"""
+        return await asyncio.wrap_future(LineService.queue_notification(
+            user_id=user_id,
+            notification_type=notification_type,
+            title=title,
+            message=message,
+            criminal_case_id=criminal_case_id
+        ))
 
     @staticmethod
     def update_preferences(user_id: int, preferences: dict, db: Session) -> dict:
@@ -233,23 +202,21 @@ class LineService:
         } for log in logs]
 
     @staticmethod
-    async def send_summons_notification(
+    def send_summons_notification(
         user_id: int,
         account_type: str,
         account_data: dict,
         criminal_case: dict,
-        db: Session,
         updated_by_user: dict = None
-    ) -> bool:
+    ) -> Future:
         """
-        ส่งการแจ้งเตือนเมื่อได้รับข้อมูลตอบกลับจากหมายเรียก
+        แจ้งเตือนเมื่อได้รับข้อมูลตอบกลับจากหมายเรียก (เข้าคิวส่ง ไม่รอ LINE)
 
         Args:
             user_id: ID ของผู้ใช้ที่จะรับการแจ้งเตือน
             account_type: ประเภทบัญชี (bank, non_bank, payment_gateway, telco_mobile, telco_internet, suspect)
             account_data: ข้อมูลบัญชีที่ส่งหมายเรียก
             criminal_case: ข้อมูลคดี
-            db: Database session
             updated_by_user: ข้อมูลผู้อัปเดตสถานะ (rank, full_name)
         """
 
@@ -328,12 +295,11 @@ class LineService:
 
         message = "\n".join(message_parts)
 
-        # ส่งการแจ้งเตือน
-        return await LineService.send_notification(
+        # เข้าคิวส่งการแจ้งเตือน
+        return LineService.queue_notification(
             user_id=user_id,
             notification_type="summons_sent",
             title=title,
             message=message,
-            db=db,
             criminal_case_id=criminal_case.get('id')
         )
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Service for cross-case identifier linkage
+(บัญชีม้า/เบอร์โทร/PromptPay/เลขบัตรประชาชน ที่ปรากฏในหลายคดี)
+"""
+
+from typing import Any, Dict, List, Optional
+from sqlalchemy import and_, or_, func
+from sqlalchemy.orm import Session, aliased
+from app.models import CriminalCase, IdentifierLink
+from app.utils.identifier_utils import IDENTIFIER_TYPES, normalize_identifier, normalize_all_types
+
+
+class LinkageService:
+    """Service for cross-case linkage lookups"""
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def find_cases(self, identifier: str, identifier_type: Optional[str] = None) -> Dict[str, Any]:
+        """
+        ค้นหาทุกคดีที่มีค่านี้ปรากฏอยู่
+
+        Args:
+            identifier: เลขบัญชี/เบอร์โทร/PromptPay/เลขบัตรประชาชน (รูปแบบใดก็ได้)
+            identifier_type: ถ้าไม่ระบุ จะค้นหาทุกประเภท
+
+        Returns:
+            dict: ค่าที่ normalize แล้ว และรายการคดีพร้อมตารางต้นทาง
+        """
+        if identifier_type:
+            if identifier_type not in IDENTIFIER_TYPES:
+                raise ValueError(f"identifier_type must be one of: {', '.join(IDENTIFIER_TYPES)}")
+            normalized = normalize_identifier(identifier_type, identifier)
+            candidates = {identifier_type: normalized} if normalized else {}
+        else:
+            candidates = normalize_all_types(identifier)
+
+        if not candidates:
+            return {"identifier": identifier, "normalized": {}, "cases": []}
+
+        rows = self.db.query(
+            IdentifierLink, CriminalCase.case_number, CriminalCase.complainant, CriminalCase.status
+        ).join(
+            CriminalCase, CriminalCase.id == IdentifierLink.criminal_case_id
+        ).filter(or_(*[
+            and_(IdentifierLink.identifier_type == t, IdentifierLink.identifier == v)
+            for t, v in candidates.items()
+        ])).order_by(IdentifierLink.criminal_case_id).all()
+
+        cases: Dict[int, Dict[str, Any]] = {}
+        for link, case_number, complainant, status in rows:
+            case = cases.setdefault(link.criminal_case_id, {
+                "criminal_case_id": link.criminal_case_id,
+                "case_number": case_number,
+                "complainant": complainant,
+                "status": status,
+                "matches": []
+            })
+            case["matches"].append({
+                "identifier_type": link.identifier_type,
+                "identifier": link.identifier,
+                "source": link.source,
+                "occurrences": link.occurrences
+            })
+
+        return {
+            "identifier": identifier,
+            "normalized": candidates,
+            "cases": list(cases.values())
+        }
+
+    def shared_identifiers(self, criminal_case_id: int) -> List[Dict[str, Any]]:
+        """
+        ค่าทั้งหมดของคดีนี้ที่ปรากฏในคดีอื่นด้วย (self-join ครั้งเดียวบน primary key)
+
+        Returns:
+            list: [{"identifier_type", "identifier", "sources", "other_cases": [...]}]
+        """
+        mine = aliased(IdentifierLink)
+        other = aliased(IdentifierLink)
+
+        rows = self.db.query(
+            mine.identifier_type,
+            mine.identifier,
+            func.array_agg(func.distinct(mine.source)),
+            other.criminal_case_id,
+            CriminalCase.case_number,
+            func.array_agg(func.distinct(other.source)),
+        ).join(
+            other,
+            and_(
+                other.identifier_type == mine.identifier_type,
+                other.identifier == mine.identifier,
+                other.criminal_case_id != mine.criminal_case_id
+            )
+        ).join(
+            CriminalCase, CriminalCase.id == other.criminal_case_id
+        ).filter(
+            mine.criminal_case_id == criminal_case_id
+        ).group_by(
+            mine.identifier_type, mine.identifier, other.criminal_case_id, CriminalCase.case_number
+        ).order_by(
+            mine.identifier_type, mine.identifier, other.criminal_case_id
+        ).all()
+
+        shared: Dict[tuple, Dict[str, Any]] = {}
+        for identifier_type, identifier, my_sources, other_case_id, case_number, other_sources in rows:
+            item = shared.setdefault((identifier_type, identifier), {
+                "identifier_type": identifier_type,
+                "identifier": identifier,
+                "sources": sorted(my_sources),
+                "other_cases": []
+            })
+            item["other_cases"].append({
+                "criminal_case_id": other_case_id,
+                "case_number": case_number,
+                "sources": sorted(other_sources)
+            })
+
+        return list(shared.values())
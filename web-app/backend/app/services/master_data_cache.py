@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+In-memory cache of master data (banks, providers, exchanges, courts, charges)
+
+ตารางเหล่านี้เปลี่ยนไม่กี่ครั้งต่อปีแต่ถูกอ่านทุกหน้าจอ จึงโหลดทั้งตารางเก็บไว้เป็น snapshot
+- แต่ละ snapshot มี version (hash ของข้อมูล) ใช้เป็น ETag ของ list endpoints
+  client ส่ง If-None-Match กลับมา → ตอบ 304 โดยไม่ต้องส่งข้อมูลซ้ำ
+- โหลดใหม่เมื่อข้อมูลในตารางเปลี่ยน (ตรวจ count/max(id)/max(updated_at)
+  ไม่เกิน 1 ครั้งต่อ MASTER_DATA_CHECK_SECONDS) หรือเมื่อเรียก invalidate_master_data()
+- ดัชนีชื่อธนาคาร (ตัดคำนำหน้า/ต่อท้าย เช่น "ธนาคาร", "จำกัด (มหาชน)" และชื่อย่อ เช่น KBANK, กสิกร)
+  ใช้หา bank_id จากชื่อที่ผู้ใช้กรอก แทน query หลายครั้งและ LIKE '%...%'
+"""
+
+import hashlib
+import json
+import re
+from functools import partial
+from typing import Any, Dict, List, Optional, Tuple
+
+from fastapi import Request, Response
+from fastapi.responses import JSONResponse
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.signature_cache import SignatureCache, table_signature
+from app.models.bank import Bank
+from app.models.charge import Charge
+from app.models.court import Court
+from app.models.exchange import Exchange
+from app.models.non_bank import NonBank
+from app.models.payment_gateway import PaymentGateway
+from app.models.telco_internet import TelcoInternet
+from app.models.telco_mobile import TelcoMobile
+from app.schemas.bank import Bank as BankSchema
+from app.schemas.charge import ChargeResponse
+from app.schemas.court import Court as CourtSchema
+from app.schemas.exchange import ExchangeResponse
+from app.schemas.non_bank import NonBankResponse
+from app.schemas.payment_gateway import PaymentGateway as PaymentGatewaySchema
+from app.schemas.telco_internet import TelcoInternetResponse
+from app.schemas.telco_mobile import TelcoMobileResponse
+
+# ชื่อ → (model, response schema, ลำดับ) ตามที่ list endpoints เดิมใช้ (id เป็นลำดับรอง)
+MASTER_DATA_TABLES = {
+    "banks": (Bank, BankSchema, (Bank.bank_name,)),
+    "non_banks": (NonBank, NonBankResponse, (NonBank.company_name_short,)),
+    "payment_gateways": (PaymentGateway, PaymentGatewaySchema, ()),
+    "telco_mobile": (TelcoMobile, TelcoMobileResponse, (TelcoMobile.company_name_short,)),
+    "telco_internet": (TelcoInternet, TelcoInternetResponse, (TelcoInternet.company_name_short,)),
+    "exchanges": (Exchange, ExchangeResponse, (Exchange.company_name_short,)),
+    "courts": (Court, CourtSchema, ()),
+    "charges": (Charge, ChargeResponse, ()),
+}
+
+# คำนำหน้า/ต่อท้ายชื่อสถาบันการเงิน (เรียงจากยาวไปสั้น, ตัดช่องว่างแล้ว)
+NAME_PREFIXES = ("ธนาคาร", "บริษัท", "บมจ.", "บจก.", "ธ.")
+NAME_SUFFIXES = (
+    "จำกัด(มหาชน)", "publiccompanylimited", "สำนักงานใหญ่", "(มหาชน)", "co.,ltd.", "จำกัด", "pcl.", "pcl"
+)
+
+# ชื่อย่อ/ชื่อเรียกทั่วไป → ชื่อธนาคารในตาราง banks
+BANK_ALIASES = {
+    "กสิกร": "กสิกรไทย",
+    "KBANK": "กสิกรไทย",
+    "KBank": "กสิกรไทย",
+    "SCB": "ไทยพาณิชย์",
+    "BBL": "กรุงเทพ",
+    "KTB": "กรุงไทย",
+    "กรุงศรี": "กรุงศรีอยุธยา",
+    "BAY": "กรุงศรีอยุธยา",
+    "Krungsri": "กรุงศรีอยุธยา",
+    "TTB": "ทหารไทยธนชาต",
+    "ทีทีบี": "ทหารไทยธนชาต",
+    "GSB": "ออมสิน",
+    "ธกส": "เพื่อการเกษตรและสหกรณ์การเกษตร",
+    "ธ.ก.ส.": "เพื่อการเกษตรและสหกรณ์การเกษตร",
+    "BAAC": "เพื่อการเกษตรและสหกรณ์การเกษตร",
+    "ธอส": "อาคารสงเคราะห์",
+    "ธ.อ.ส.": "อาคารสงเคราะห์",
+    "GHB": "อาคารสงเคราะห์",
+    "UOB": "ยูโอบี",
+    "CIMB": "ซีไอเอ็มบี ไทย",
+    "KKP": "เกียรตินาคินภัทร",
+    "TISCO": "ทิสโก้",
+    "LH Bank": "แลนด์ แอนด์ เฮ้าส์",
+    "ICBC": "ไอซีบีซี (ไทย)",
+    "ธอท": "อิสลามแห่งประเทศไทย",
+    "IBANK": "อิสลามแห่งประเทศไทย",
+}
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_name(name: Optional[str]) -> str:
+    """ตัดช่องว่าง คำนำหน้า (ธนาคาร, บริษัท, ...) และคำต่อท้าย (จำกัด (มหาชน), ...) สำหรับใช้เป็น key"""
+    if not name:
+        return ""
+    text = _WHITESPACE.sub("", str(name)).lower()
+    stripped = True
+    while stripped:
+        stripped = False
+        for prefix in NAME_PREFIXES:
+            if text.startswith(prefix) and len(text) > len(prefix):
+                text = text[len(prefix):]
+                stripped = True
+        for suffix in NAME_SUFFIXES:
+            if text.endswith(suffix) and len(text) > len(suffix):
+                text = text[:-len(suffix)]
+                stripped = True
+    return text
+
+
+# ตาราง → คอลัมน์ที่ใช้ค้นหาจากชื่อ (คอลัมน์แรก = ชื่อเต็ม ใช้ค้นหาแบบบางส่วน)
+NAME_INDEX_FIELDS = {
+    "banks": ("bank_name", "bank_short_name", "bank_code"),
+    "non_banks": ("company_name", "company_name_short"),
+    "payment_gateways": ("company_name", "company_name_short"),
+    "telco_mobile": ("company_name", "company_name_short"),
+    "telco_internet": ("company_name", "company_name_short"),
+    "exchanges": ("company_name", "company_name_short"),
+}
+
+
+class NameIndex:
+    """ค้นหาแถวของข้อมูลหลักจากชื่อ/ชื่อย่อ/รหัส/ชื่อเรียกทั่วไป"""
+
+    def __init__(self, rows: List[Dict[str, Any]], fields: Tuple[str, ...], aliases: Optional[Dict[str, str]] = None):
+        self._by_key: Dict[str, Dict[str, Any]] = {}
+        self._names: List[Tuple[str, Dict[str, Any]]] = []
+        for row in rows:
+            for field in fields:
+                key = normalize_name(row.get(field))
+                if key:
+                    self._by_key.setdefault(key, row)
+            self._names.append((normalize_name(row.get(fields[0])), row))
+        for alias, name in (aliases or {}).items():
+            row = self._by_key.get(normalize_name(name))
+            if row is not None:
+                self._by_key.setdefault(normalize_name(alias), row)
+
+    def find(self, name: Optional[str]) -> Optional[Dict[str, Any]]:
+        key = normalize_name(name)
+        if not key:
+            return None
+        row = self._by_key.get(key)
+        if row is None:
+            # ชื่อที่มีคำอื่นปนอยู่ (เดิมใช้ LIKE '%...%')
+            row = next((row for normalized, row in self._names if normalized and key in normalized), None)
+        return row
+
+
+class MasterDataSnapshot:
+    """ข้อมูลทั้งตาราง (list ของ dict ตาม response schema) + version"""
+
+    def __init__(self, name: str, rows: List[Dict[str, Any]]):
+        self.name = name
+        self.rows = rows
+        raw = json.dumps(rows, ensure_ascii=False, sort_keys=True, default=str)
+        self.version = hashlib.sha1(raw.encode("utf-8")).hexdigest()[:16]
+        self.ids = {row["id"] for row in rows}
+        self._name_index: Optional[NameIndex] = None
+
+    def etag(self, variant: str = "") -> str:
+        """ETag ของ response (variant = query string ที่ใช้กรอง/แบ่งหน้า)"""
+        tag = f"{self.name}-{self.version}"
+        if variant:
+            tag += "-" + hashlib.sha1(variant.encode("utf-8")).hexdigest()[:8]
+        return f'"{tag}"'
+
+    @property
+    def name_index(self) -> NameIndex:
+        if self._name_index is None:
+            aliases = BANK_ALIASES if self.name == "banks" else None
+            self._name_index = NameIndex(self.rows, NAME_INDEX_FIELDS[self.name], aliases)
+        return self._name_index
+
+
+def _load_snapshot(name: str, db: Session) -> MasterDataSnapshot:
+    model, schema, order_by = MASTER_DATA_TABLES[name]
+    objects = db.query(model).order_by(*order_by, model.id).all()
+    rows = [schema.model_validate(obj).model_dump(mode="json") for obj in objects]
+    return MasterDataSnapshot(name, rows)
+
+
+def _table_signature(name: str, db: Session):
+    return table_signature(db, MASTER_DATA_TABLES[name][0])
+
+
+_caches: Dict[str, SignatureCache[MasterDataSnapshot]] = {
+    name: SignatureCache(
+        partial(_load_snapshot, name),
+        partial(_table_signature, name),
+        lambda: settings.MASTER_DATA_CHECK_SECONDS,
+    )
+    for name in MASTER_DATA_TABLES
+}
+
+
+def get_master_data(db: Session, name: str) -> MasterDataSnapshot:
+    """snapshot ปัจจุบันของตาราง (โหลดครั้งแรก / โหลดใหม่เมื่อข้อมูลเปลี่ยน)"""
+    return _caches[name].get(db)
+
+
+def invalidate_master_data(name: Optional[str] = None) -> None:
+    """บังคับให้ตรวจ/โหลดตารางใหม่ในการเรียกครั้งถัดไป (เรียกหลังเพิ่ม/แก้ไข/ลบข้อมูล) None = ทุกตาราง"""
+    for table in ([name] if name else list(MASTER_DATA_TABLES)):
+        _caches[table].invalidate()
+
+
+def resolve_master_id(db: Session, name: str, value: Optional[str]) -> Optional[int]:
+    """id ในตาราง name จากชื่อที่ผู้ใช้กรอก (None ถ้าไม่พบ)"""
+    row = get_master_data(db, name).name_index.find(value)
+    return row["id"] if row else None
+
+
+def resolve_bank_id(db: Session, bank_name: Optional[str]) -> Optional[int]:
+    """bank_id จากชื่อธนาคารที่ผู้ใช้กรอก (None ถ้าไม่พบ)"""
+    return resolve_master_id(db, "banks", bank_name)
+
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in candidates or any(tag.removeprefix("W/") == etag for tag in candidates)
+
+
+def master_data_response(request: Request, snapshot: MasterDataSnapshot, rows: List[Dict[str, Any]]) -> Response:
+    """
+    JSON response ของ list endpoint พร้อม ETag
+
+    ตอบ 304 ถ้า If-None-Match ตรงกับ version ปัจจุบัน (no-cache = browser ต้องถามทุกครั้ง)
+    """
+    etag = snapshot.etag(request.url.query)
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if _etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+    return JSONResponse(rows, headers=headers)
@@ -9,6 +9,17 @@ import base64
 from datetime import datetime
 from typing import Dict, Optional
 
+from app.core.config import settings
+from app.services.summons_templates import load_asset_base64, render_summons
+from app.utils.thai_date_utils import format_date_to_thai_buddhist_era
+
+# เดือนไทยแบบย่อ สำหรับวันที่ในตารางรายการโอน
+THAI_MONTHS_SHORT = [
+    'ม.ค.', 'ก.พ.', 'มี.ค.', 'เม.ย.', 'พ.ค.', 'มิ.ย.',
+    'ก.ค.', 'ส.ค.', 'ก.ย.', 'ต.ค.', 'พ.ย.', 'ธ.ค.'
+]
+
+
 class NonBankSummonsGenerator:
     """Generator สำหรับสร้างหมายเรียกผู้ให้บริการ Non-Bank"""
     
@@ -17,14 +28,8 @@ class NonBankSummonsGenerator:
         self.logo_base64 = self._load_logo()
     
     def _load_logo(self) -> str:
-        """โหลด logo แล้วแปลงเป็น base64"""
-        if os.path.exists(self.logo_path):
-            try:
-                with open(self.logo_path, "rb") as img_file:
-                    return base64.b64encode(img_file.read()).decode()
-            except Exception as e:
-                print(f"ไม่สามารถโหลด logo: {e}")
-        return ""
+        """โหลด logo แล้วแปลงเป็น base64 (อ่านไฟล์ครั้งเดียวต่อ path)"""
+        return load_asset_base64(self.logo_path)
     
     def _format_number(self, value) -> str:
         """จัดรูปแบบตัวเลข (ลบทศนิยม)"""
@@ -103,13 +108,11 @@ class NonBankSummonsGenerator:
         # ดึงข้อมูลวันที่ (แปลงจาก document_date)
         date_thai = ''
         if bank_data.get('document_date'):
-            from app.utils.thai_date_utils import format_date_to_thai_buddhist_era
             date_thai = format_date_to_thai_buddhist_era(bank_data.get('document_date'))
 
         # โหลดลายเซ็น (ถ้ามี)
         signature_base64 = ''
         if signature_path:
-            from app.core.config import settings
             full_signature_path = os.path.join(settings.UPLOAD_DIR, signature_path)
             if os.path.exists(full_signature_path):
                 try:
@@ -128,397 +131,78 @@ class NonBankSummonsGenerator:
         # สร้าง title ตามที่ต้องการ
         html_title = f"หมายเรียกพยานเอกสาร{document_no} ลงวันที่ {date_thai}"
 
-        # สร้าง HTML
-        html_content = f"""<!DOCTYPE html>
-<html lang="th">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>{html_title}</title>
-    <style>
-        @import url('https://fonts.googleapis.com/css2?family=Sarabun:wght@400;600;700&display=swap');
-
-        * {{
-            margin: 0;
-            padding: 0;
-            box-sizing: border-box;
-        }}
-
-        body {{
-            font-family: 'Sarabun', 'THSarabunNew', sans-serif;
-            font-size: 16px;
-            line-height: 1.4;
-            color: #000;
-            background: white;
-        }}
-
-        .page {{
-            width: 210mm;
-            min-height: 297mm;
-            margin: 0 auto;
-            padding: 8mm 20mm 10mm 20mm;
-            background: white;
-            box-shadow: 0 0 10px rgba(0,0,0,0.1);
-        }}
-
-        .header {{
-            position: relative;
-            margin-bottom: 20px;
-        }}
-
-        .urgent {{
-            position: absolute;
-            top: 0;
-            left: 0;
-            color: red;
-            font-weight: bold;
-            font-size: 18px;
-        }}
-
-        .document-number {{
-            position: absolute;
-            top: 25px;
-            left: 0;
-            font-size: 16px;
-        }}
-
-        .logo {{
-            position: absolute;
-            top: 0;
-            left: 50%;
-            transform: translateX(-50%);
-            width: 108px;
-            height: 108px;
-        }}
-
-        .agency {{
-            position: absolute;
-            top: 25px;
-            right: 0;
-            text-align: right;
-            font-size: 14px;
-            line-height: 1.2;
-        }}
-
-        .date {{
-            text-align: center;
-            margin-top: 140px;
-            font-size: 16px;
-        }}
-
-        .content {{
-            margin-top: 15px;
-        }}
-
-        .subject {{
-            margin-bottom: 10px;
-        }}
-
-        .subject-label {{
-            font-weight: bold;
-            display: inline;
-        }}
-
-        .to {{
-            margin-bottom: 10px;
-        }}
-
-        .to-label {{
-            font-weight: bold;
-            display: inline;
-        }}
-
-        .paragraph {{
-            margin-bottom: 12px;
-            text-align: justify;
-            text-indent: 2em;
-        }}
-
-        .bank-table {{
-            width: 100%;
-            border-collapse: collapse;
-            margin: 15px 0;
-        }}
-
-        .bank-table th,
-        .bank-table td {{
-            border: 1px solid #000;
-            padding: 8px;
-            text-align: center;
-            font-size: 14px;
-        }}
-
-        .bank-table th {{
-            font-weight: bold;
-            background-color: #f5f5f5;
-        }}
-
-        .authority {{
-            margin-top: 12px;
-            text-align: justify;
-            text-indent: 2em;
-        }}
-
-        .document-list {{
-            margin-top: 12px;
-        }}
-
-        .document-list ol {{
-            padding-left: 2em;
-        }}
-
-        .document-list li {{
-            margin-bottom: 8px;
-            text-align: justify;
-        }}
-
-        .signature {{
-            margin-top: 20px;
-            text-align: center;
-        }}
-
-        .signature-line {{
-            margin-bottom: 10px;
-        }}
-
-        .signature-title {{
-            margin-bottom: 10px;
-            text-align: left;
-            padding-left: 200px;
-        }}
-
-        @media print {{
-            body {{
-                font-size: 14px;
-            }}
-            .page {{
-                width: 210mm;
-                height: 297mm;
-                margin: 0;
-                padding: 15mm 20mm;
-                box-shadow: none;
-                page-break-after: always;
-            }}
-            .page:last-child {{
-                page-break-after: avoid;
-            }}
-            .header {{
-                margin-bottom: 15px;
-            }}
-            .date {{
-                margin-top: 130px;
-            }}
-        }}
-    </style>
-</head>
-<body>
-    <!-- หน้าที่ 1 -->
-    <div class="page">
-        <div class="header">
-            <div class="urgent">ด่วนที่สุด</div>
-            <div class="document-number">
-                ที่ {document_no}<br>
-                หมายเรียกพยานเอกสาร
-            </div>
-            {"<img src='data:image/jpeg;base64," + self.logo_base64 + "' class='logo' alt='Logo'>" if self.logo_base64 else ""}
-            <div class="agency">
-                กองกำกับการ 1 กองบังคับการตำรวจสืบสวน<br>
-                สอบสวนอาชญากรรมทางเทคโนโลยี 4
-            </div>
-        </div>
-
-        <div class="date">{date_thai}</div>
-
-        <div class="content">
-            <div class="subject">
-                <span class="subject-label">เรื่อง</span>
-                &nbsp;&nbsp;{subject_text}
-            </div>
-
-            <div class="to">
-                <span class="to-label">เรียน</span>
-                &nbsp;&nbsp;กรรมการผู้จัดการ {provider_name_full} สำนักงานใหญ่
-            </div>
-
-            <div class="paragraph">
-                ด้วยเหตุ {victim_name} (case id : {case_id}) ได้แจ้งความร้องทุกข์ต่อพนักงานสอบสวน ให้
-                ดำเนินคดีกับ {account_name} ที่มีส่วนเกี่ยวข้องในกระทำความผิดอาญา และมีการใช้บัญชี {provider_name_clean} ที่อยู่ในความ
-                ดูแลของท่านเกี่ยวข้องกับการกระทำความผิดตามกฎหมาย จึงขอให้ท่านดำเนินการจัดส่งสำเนาคำร้องเปิดบัญชี
-                ธนาคาร รายการเดินบัญชีและข้อมูลอื่น ๆ ดังนี้
-            </div>
-
-            <table class="bank-table">
-                <thead>
-                    <tr>
-                        <th>ผู้ให้บริการ</th>
-                        <th>เลขบัญชี</th>
-                        <th>ชื่อบัญชี</th>
-                        <th>ช่วงเวลาขอข้อมูลรายการเดินบัญชี</th>
-                    </tr>
-                </thead>
-                <tbody>
-                    <tr>
-                        <td>{provider_name_full}</td>
-                        <td>{account_no}</td>
-                        <td>{account_name}</td>
-                        <td>{time_period if time_period else '-'}</td>
-                    </tr>
-                </tbody>
-            </table>
-"""
-        
-        # เพิ่มตารางรายการโอน (ถ้ามี)
-        if transactions and len(transactions) > 0:
-            html_content += """
-            <h4 style="margin-top: 20px; margin-bottom: 10px; font-weight: bold;">รายละเอียดการโอนเงิน</h4>
-            <table class="bank-table" style="font-size: 65%; width: 100%; table-layout: fixed;">
-                <thead>
-                    <tr>
-                        <th style="width: 30px;">#</th>
-                        <th style="width: 120px;">ธนาคารต้นทาง</th>
-                        <th style="width: 100px;">เลขบัญชีต้นทาง</th>
-                        <th style="width: 120px;">ชื่อบัญชีต้นทาง</th>
-                        <th style="width: 110px;">วันเวลาโอน</th>
-                        <th style="width: 80px;">จำนวนเงิน</th>
-                    </tr>
-                </thead>
-                <tbody>
-"""
-            for index, transaction in enumerate(transactions, 1):
-                # Format transfer_date (แบบสั้น: 16 ต.ค. 68)
-                transfer_date_str = ''
-                if transaction.get('transfer_date'):
-                    try:
-                        from datetime import datetime
-                        # Thai months (ย่อ)
-                        thai_months_short = [
-                            'ม.ค.', 'ก.พ.', 'มี.ค.', 'เม.ย.', 'พ.ค.', 'มิ.ย.',
-                            'ก.ค.', 'ส.ค.', 'ก.ย.', 'ต.ค.', 'พ.ย.', 'ธ.ค.'
-                        ]
-                        
-                        # Parse date
-                        if isinstance(transaction['transfer_date'], str):
-                            date_obj = datetime.strptime(transaction['transfer_date'], '%Y-%m-%d')
-                        else:
-                            date_obj = transaction['transfer_date']
-                        
-                        day = date_obj.day
-                        month_short = thai_months_short[date_obj.month - 1]
-                        year_short = str(date_obj.year + 543)[-2:]  # แค่ 2 หัก เช่น 68
-                        
-                        transfer_date_str = f"{day} {month_short} {year_short}"
-                    except Exception as e:
-                        transfer_date_str = str(transaction.get('transfer_date', ''))
-                
-                # Format วันเวลาโอน (รวมกัน)
-                transfer_time = self._format_value(transaction.get('transfer_time', ''))
-                if not transfer_time or transfer_time == '-':
-                    datetime_str = transfer_date_str if transfer_date_str else '-'
-                else:
-                    # รวมวันที่และเวลา
-                    if transfer_date_str:
-                        # ตรวจสอบว่า transfer_time มี "น." ไหม
-                        if 'น.' not in transfer_time:
-                            transfer_time = f"{transfer_time} น."
-                        datetime_str = f"{transfer_date_str} {transfer_time}"
+        # เตรียมตารางรายการโอน (ถ้ามี)
+        transaction_rows = []
+        for index, transaction in enumerate(transactions or [], 1):
+            # Format transfer_date (แบบสั้น: 16 ต.ค. 68)
+            transfer_date_str = ''
+            if transaction.get('transfer_date'):
+                try:
+                    # Parse date
+                    if isinstance(transaction['transfer_date'], str):
+                        date_obj = datetime.strptime(transaction['transfer_date'], '%Y-%m-%d')
                     else:
-                        datetime_str = transfer_time
-                
-                # Format transfer_amount
-                transfer_amount_str = ''
-                if transaction.get('transfer_amount'):
-                    try:
-                        amount = float(transaction['transfer_amount'])
-                        transfer_amount_str = f"{amount:,.2f}"
-                    except:
-                        transfer_amount_str = str(transaction['transfer_amount'])
-                
-                # Get source_account_name
-                source_account_name = self._format_value(transaction.get('source_account_name', '-'))
-                
-                html_content += f"""
-                    <tr>
-                        <td style="text-align: center;">{index}</td>
-                        <td style="white-space: nowrap;">{transaction.get('source_bank_name', '-')}</td>
-                        <td style="white-space: nowrap;">{transaction.get('source_account_number', '-')}</td>
-                        <td style="white-space: nowrap; overflow: hidden; text-overflow: ellipsis;">{source_account_name}</td>
-                        <td style="white-space: nowrap;">{datetime_str}</td>
-                        <td style="text-align: right; white-space: nowrap;">{transfer_amount_str if transfer_amount_str else '-'}</td>
-                    </tr>
-"""
-            html_content += """
-                </tbody>
-            </table>
-"""
-        
-        html_content += """
-
-            <div class="authority">
-                อาศัยอำนาจตามประมวลกฎหมายวิธีพิจารณาความอาญา พุทธศักราช 2477 มาตรา 52,131,132(3),(4) และ
-                133 ฉะนั้นให้ท่านมาพบพนักงานสอบสวนหรือนำส่งเอกสารตามรายละเอียดดังต่อไปนี้
-            </div>
-
-            <div class="document-list">
-                <ol>
-                    <li>สำเนาเอกสารคำขอเปิดบัญชี พร้อมภาพการยืนยันตัวตน (KYC) ขณะขอเปิดบัญชี, ยอดเงิน
-                        คงเหลือ ณ ปัจจุบัน และเอกสารที่เกี่ยวข้องพร้อมรับรองสำเนา พร้อมทั้งวิธีขั้นตอนการเปิดบัญชี</li>
-
-                    <li>รายการเคลื่อนไหวทางบัญชี (statement) ของบัญชีดังกล่าว ตามห้วงเวลาที่แจ้งข้างต้น โดยแสดง
-                        รายละเอียดการโอน แสดงบัญชีต้นทางปลายทาง วันเวลา และจำนวนเงินที่โอนให้ครบถ้วน ขอทราบหมายเลขโทรศัพท์
-                        ไอพีเเอดเดรส และ พิกัด latitude, longitude ในการทำธุรกรรม (กรณีข้อมูลจำนวนมากไม่สามารถปริ้นเป็นเอกสารได้
-                        ให้บันทึกข้อมูลเป็นลงแผ่นซีดี หรือ ส่งไปที่อีเมล์ <strong style="color: #0066cc;">ampon.th@police.go.th</strong>)</li>
-"""
-        
-        # เพิ่มข้อ 3 ถ้าเป็นการอายัดบัญชี
-        if freeze_account:
-            html_content += """
-                    <li>ให้ท่านอายัดบัญชีดังกล่าวและแจ้งผลการอายัดบัญชี พร้อมยอดเงินคงเหลือมาพร้อมกับข้อมูลข้างต้น</li>
-"""
-        
-        html_content += """
-                </ol>
-            </div>
-
-            <div class="paragraph">
-                ทั้งนี้ให้สำเนาข้อมูลดังกล่าวเป็นเอกสาร/แผ่นบันทึกข้อมูล (DVD Rom) ส่งมาที่ "พ.ต.ต.อำพล ทอง
-                อร่าม ที่อยู่ กองกำกับการ 1 กองบังคับการตำรวจสืบสวนสอบสวนอาชญากรรมทางเทคโนโลยี 4 เลขที่ 370 หมู่ 3
-                ตำบลดอนแก้ว อำเภอแม่ริม จังหวัดเชียงใหม่ 50180" และ อีเมล์ <strong style="color: #0066cc;">ampon.th@police.go.th</strong> ภายใน 7 วัน นับ
-                แต่ได้รับหมายเรียกนี้
-            </div>
-
-            <div class="signature">
-                <div class="signature-line">ขอแสดงความนับถือ</div>
-                <br>"""
-
-        # ถ้ามีลายเซ็น (ส่งอีเมล์) → จัดกลาง
-        if signature_base64:
-            html_content += """
-                <div style="text-align: center;">
-                    <div style="display: flex; align-items: center; justify-content: center; margin-bottom: 5px;">
-                        <span style="display: inline-block;">พันตำรวจตรี</span>
-                        <img src="data:image/png;base64,""" + signature_base64 + """" alt="ลายเซ็น" style="max-width: 120px; max-height: 60px; margin-left: 15px; vertical-align: middle;">
-                    </div>
-                    <div style="text-align: center; margin-top: 5px;">( อำพล ทองอร่าม )</div>
-                    <div style="text-align: center;">สารวัตร (สอบสวน)ฯ ปฏิบัติราชการแทน</div>
-                    <div style="text-align: center;">ผู้กำกับการกองกำกับการ 1 กองบังคับการตำรวจสืบสวนสอบสวนอาชญากรรมทางเทคโนโลยี 4</div>
-                </div>"""
-        else:
-            # ถ้าไม่มีลายเซ็น (ปริ้นปกติ) → ใช้ CSS classes เหมือน bank_summons_generator
-            html_content += """
-                <div class="signature-title">พันตำรวจตรี</div>
-                <div class="signature-line">( อำพล ทองอร่าม )</div>
-                <div class="signature-line">สารวัตร (สอบสวน)ฯ ปฏิบัติราชการแทน</div>
-                <div class="signature-line">ผู้กำกับการกองกำกับการ 1 กองบังคับการตำรวจสืบสวนสอบสวนอาชญากรรมทางเทคโนโลยี 4</div>"""
-
-        html_content += """
-            </div>
-        </div>
-    </div>
-
-</body>
-</html>
-"""
-        return html_content
+                        date_obj = transaction['transfer_date']
+                    
+                    day = date_obj.day
+                    month_short = THAI_MONTHS_SHORT[date_obj.month - 1]
+                    year_short = str(date_obj.year + 543)[-2:]  # แค่ 2 หัก เช่น 68
+                    
+                    transfer_date_str = f"{day} {month_short} {year_short}"
+                except Exception as e:
+                    transfer_date_str = str(transaction.get('transfer_date', ''))
+            
+            # Format วันเวลาโอน (รวมกัน)
+            transfer_time = self._format_value(transaction.get('transfer_time', ''))
+            if not transfer_time or transfer_time == '-':
+                datetime_str = transfer_date_str if transfer_date_str else '-'
+            else:
+                # รวมวันที่และเวลา
+                if transfer_date_str:
+                    # ตรวจสอบว่า transfer_time มี "น." ไหม
+                    if 'น.' not in transfer_time:
+                        transfer_time = f"{transfer_time} น."
+                    datetime_str = f"{transfer_date_str} {transfer_time}"
+                else:
+                    datetime_str = transfer_time
+            
+            # Format transfer_amount
+            transfer_amount_str = ''
+            if transaction.get('transfer_amount'):
+                try:
+                    amount = float(transaction['transfer_amount'])
+                    transfer_amount_str = f"{amount:,.2f}"
+                except:
+                    transfer_amount_str = str(transaction['transfer_amount'])
+            
+            # Get source_account_name
+            source_account_name = self._format_value(transaction.get('source_account_name', '-'))
+
+            transaction_rows.append({
+                'index': index,
+                'source_bank_name': transaction.get('source_bank_name', '-'),
+                'source_account_number': transaction.get('source_account_number', '-'),
+                'source_account_name': source_account_name,
+                'transfer_datetime': datetime_str,
+                'transfer_amount': transfer_amount_str,
+            })
+
+        return render_summons('non_bank_letter.html', {
+            'html_title': html_title,
+            'document_no': document_no,
+            'date_thai': date_thai,
+            'subject_text': subject_text,
+            'provider_name_full': provider_name_full,
+            'provider_name_clean': provider_name_clean,
+            'account_no': account_no,
+            'account_name': account_name,
+            'time_period': time_period,
+            'victim_name': victim_name,
+            'case_id': case_id,
+            'freeze_account': freeze_account,
+            'transactions': transaction_rows,
+            'signature_base64': signature_base64,
+        }, logo_path=self.logo_path)
     
     def generate_envelope_html(self, non_bank_data: Dict, non_bank_address: Optional[Dict] = None) -> str:
         """
@@ -591,141 +275,8 @@ class NonBankSummonsGenerator:
             if line4_parts:
                 address_lines.append(' '.join(line4_parts))
         
-        # สร้าง HTML
-        html_content = f"""<!DOCTYPE html>
-<html lang="th">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>ซองหมายเรียก</title>
-    <style>
-        @import url('https://fonts.googleapis.com/css2?family=Sarabun:wght@400;700&display=swap');
-
-        @page {{
-            size: A4;
-            margin: 0.5cm 0.2cm 1.5cm 0.5cm;
-        }}
-
-        body {{
-            font-family: 'Sarabun', sans-serif;
-            font-size: 16px;
-            line-height: 1.5;
-            margin: 0;
-            padding: 0;
-            width: 210mm;
-            height: 297mm;
-            box-sizing: border-box;
-            position: relative;
-        }}
-
-        .absolute {{
-            position: absolute;
-        }}
-
-        #header-left {{
-            top: 0.5cm;
-            left: 0.5cm;
-            font-weight: bold;
-            max-width: 8cm;
-        }}
-
-        #postage-box {{
-            top: 0.5cm;
-            right: 0.2cm;
-            border: 1px solid black;
-            padding: 5px 10px;
-            text-align: center;
-            width: 5cm;
-        }}
-
-        #recipient-address {{
-            top: 2.5cm;
-            left: 9cm;
-        }}
-
-        #recipient-address .label {{
-            font-weight: bold;
-        }}
-
-        #recipient-address table {{
-            border-collapse: collapse;
-            margin-top: 5px;
-        }}
-
-        #recipient-address td {{
-            padding: 2px 0;
-            vertical-align: top;
-        }}
-
-        .fold-line {{
-            position: absolute;
-            left: 0;
-            right: 0;
-            height: 2px;
-            border-top: 2px dashed #333;
-            opacity: 0.8;
-        }}
-
-        .fold-line-1 {{
-            top: 9.9cm;
-        }}
-
-        .fold-line-2 {{
-            display: none;
-        }}
-
-        @media print {{
-            .fold-line {{
-                opacity: 0.3;
-            }}
-        }}
-    </style>
-</head>
-<body>
-
-    <div id="header-left" class="absolute">
-        <div style="display: flex; align-items: flex-start;">
-            <div style="margin-right: 8px;">
-                {"<img src='data:image/jpeg;base64," + self.logo_base64 + "' style='width: 67px; height: 67px;' alt='ตราครุฑ'>" if self.logo_base64 else "<div style='width: 67px; height: 67px; background: #ccc; border-radius: 50%; text-align: center; line-height: 67px; font-size: 14px;'>ตรา</div>"}
-            </div>
-            <div style="font-size: 12px; line-height: 1.2; font-weight: bold;">
-                ใช้ในราชการสำนักงานตำรวจแห่งชาติ<br>
-                กองกำกับการ 1 กองบังคับการตำรวจสืบสวน<br>
-                สอบสวนอาชญากรรมทางเทคโนโลยี 4<br>
-                เลขที่ 370 หมู่ 3 ตำบลดอนแก้ว อำเภอแม่ริม<br>
-                จังหวัดเชียงใหม่ 50180
-            </div>
-        </div>
-    </div>
-
-    <div id="postage-box" class="absolute">
-        <p style="margin: 0; padding: 0;">ชำระฝากส่งเป็นรายเดือน<br>ใบอนุญาตที่ ๑๙๙/๒๕๖๘<br>ไปรษณีย์ ศาลากลาง ชม.</p>
-    </div>
-
-    <div id="recipient-address" class="absolute">
-        <p class="label">กรุณาส่ง</p>
-        <table>
-            <tr>
-                <td>{provider_name}</td>
-            </tr>
-"""
-        
-        # เพิ่มแต่ละบรรทัดของที่อยู่
-        for address_line in address_lines:
-            html_content += f"""            <tr>
-                <td>{address_line}</td>
-            </tr>
-"""
-        
-        html_content += """        </table>
-    </div>
-
-    <!-- เส้นแบ่งส่วนสำหรับพับซอง -->
-    <div class="fold-line fold-line-1"></div>
-    <div class="fold-line fold-line-2"></div>
-
-</body>
-</html>
-"""
-        return html_content
+        return render_summons('envelope.html', {
+            'recipient_name': provider_name,
+            'address_lines': address_lines,
+        }, logo_path=self.logo_path)
 
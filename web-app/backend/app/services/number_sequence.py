@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Gap-free running numbers per (prefix, Buddhist year)
+
+เลขคดี (1385/2568) และเลขที่หนังสือ (SUS-2568-0001, BA-2568-0001, AR-2568-0001)
+เดิมคำนวณจาก MAX()/COUNT() + 1 ของตารางทุกครั้งที่สร้าง → scan ทั้งตาราง และได้เลขซ้ำเมื่อสร้างพร้อมกัน
+
+ตาราง number_sequences (migration 044) เก็บเลขล่าสุดของแต่ละ (prefix, ปี พ.ศ.)
+- reserve_numbers() เพิ่มค่าด้วย INSERT ... ON CONFLICT DO UPDATE ... RETURNING คำสั่งเดียว
+- แถวของตัวนับถูกล็อกจนกว่า transaction ของผู้เรียกจะ commit/rollback
+  → ไม่ซ้ำ และไม่มีเลขหาย (rollback คืนเลขให้คนถัดไป ต่างจาก Postgres SEQUENCE)
+  ผู้เรียกจึงควร commit ทันทีหลังบันทึกข้อมูล
+- จองหลายเลขในคำสั่งเดียวสำหรับการสร้าง/นำเข้าแบบกลุ่ม
+"""
+
+from typing import List, Optional
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.utils.case_number_generator import CASE_NUMBER_PREFIX, get_buddhist_year
+
+SUSPECT_DOCUMENT_PREFIX = "SUS"
+BANK_ACCOUNT_DOCUMENT_PREFIX = "BA"
+POST_ARREST_PREFIX = "AR"
+
+# ใช้ได้ทั้ง PostgreSQL และ SQLite (>= 3.35)
+_RESERVE_SQL = text("""
+    INSERT INTO number_sequences (prefix, year, last_value, updated_at)
+    VALUES (:prefix, :year, :count, CURRENT_TIMESTAMP)
+    ON CONFLICT (prefix, year) DO UPDATE
+    SET last_value = number_sequences.last_value + excluded.last_value,
+        updated_at = excluded.updated_at
+    RETURNING last_value
+""")
+
+_ADVANCE_SQL = text("""
+    INSERT INTO number_sequences (prefix, year, last_value, updated_at)
+    VALUES (:prefix, :year, :value, CURRENT_TIMESTAMP)
+    ON CONFLICT (prefix, year) DO UPDATE
+    SET last_value = CASE WHEN excluded.last_value > number_sequences.last_value
+                          THEN excluded.last_value ELSE number_sequences.last_value END,
+        updated_at = excluded.updated_at
+""")
+
+
+def reserve_numbers(db: Session, prefix: str, count: int = 1, year: Optional[int] = None) -> range:
+    """
+    จองเลขถัดไป count เลขของ (prefix, year) (ค่าเริ่มต้น: ปี พ.ศ. ปัจจุบัน)
+
+    Returns:
+        range ของเลขที่ได้ เช่น range(41, 51) สำหรับ count=10
+
+    เลขจะถูกใช้จริงเมื่อ transaction ของ db commit (rollback = คืนเลข)
+    """
+    if count < 1:
+        raise ValueError("count must be at least 1")
+    year = year or get_buddhist_year()
+    last_value = db.execute(_RESERVE_SQL, {"prefix": prefix, "year": year, "count": count}).scalar_one()
+    return range(last_value - count + 1, last_value + 1)
+
+
+def next_number(db: Session, prefix: str, year: Optional[int] = None) -> int:
+    """จองเลขถัดไปหนึ่งเลข"""
+    return reserve_numbers(db, prefix, 1, year)[0]
+
+
+def advance_to(db: Session, prefix: str, year: int, value: int) -> None:
+    """เลื่อนตัวนับให้ไม่น้อยกว่า value (เมื่อผู้ใช้กรอกเลขเอง เช่น เลขคดีจากระบบอื่น)"""
+    db.execute(_ADVANCE_SQL, {"prefix": prefix, "year": year, "value": value})
+
+
+def format_document_number(prefix: str, year: int, number: int) -> str:
+    """เลขที่หนังสือรูปแบบ {prefix}-{year}-{number:04d} เช่น SUS-2568-0001"""
+    return f"{prefix}-{year}-{number:04d}"
+
+
+def reserve_document_numbers(db: Session, prefix: str, count: int = 1) -> List[str]:
+    """จองเลขที่หนังสือ count เลขของปีปัจจุบัน"""
+    year = get_buddhist_year()
+    return [format_document_number(prefix, year, number) for number in reserve_numbers(db, prefix, count, year)]
+
+
+def next_document_number(db: Session, prefix: str) -> str:
+    """จองเลขที่หนังสือถัดไปหนึ่งเลข"""
+    return reserve_document_numbers(db, prefix, 1)[0]
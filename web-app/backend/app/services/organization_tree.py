@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Organization tree (bureau → division → supervision) with user counts
+
+สร้างจาก query 4 ครั้งไม่ขึ้นกับจำนวนหน่วยงาน
+- หน่วยงานทั้ง 3 ระดับ ระดับละ 1 query แล้วจัดกลุ่มเป็นต้นไม้ในหน่วยความจำ
+- จำนวนผู้ใช้ของทุกหน่วยงานจาก GROUP BY (bureau_id, division_id, supervision_id) ครั้งเดียว
+
+ผลลัพธ์ถูก cache ไว้ทั้งต้น และสร้างใหม่เมื่อข้อมูลเปลี่ยน (ตรวจ count/max(id)/max(updated_at)
+ของ bureaus, divisions, supervisions, users ไม่เกิน 1 ครั้งต่อ ORGANIZATION_TREE_CHECK_SECONDS)
+หรือเมื่อเรียก invalidate_organization_tree()
+"""
+
+from collections import Counter, defaultdict
+from typing import Dict, List
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.signature_cache import SignatureCache, table_signature
+from app.models import Bureau, Division, Supervision, User
+from app.schemas.organization import (
+    OrganizationTree, BureauWithDivisions, DivisionWithSupervisions, SupervisionWithStats
+)
+
+
+def build_organization_tree(db: Session) -> OrganizationTree:
+    """โครงสร้างหน่วยงานทั้งหมดแบบต้นไม้ พร้อมจำนวนผู้ใช้และจำนวนหน่วยงานที่เปิด/ปิดใช้งาน"""
+    bureaus = db.query(Bureau).order_by(Bureau.name_short).all()
+
+    divisions_by_bureau: Dict[int, List[Division]] = defaultdict(list)
+    for division in db.query(Division).order_by(Division.id):
+        divisions_by_bureau[division.bureau_id].append(division)
+
+    supervisions_by_division: Dict[int, List[Supervision]] = defaultdict(list)
+    for supervision in db.query(Supervision).order_by(Supervision.id):
+        supervisions_by_division[supervision.division_id].append(supervision)
+
+    bureau_users: Counter = Counter()
+    division_users: Counter = Counter()
+    supervision_users: Counter = Counter()
+    user_groups = db.query(
+        User.bureau_id, User.division_id, User.supervision_id, func.count(User.id)
+    ).group_by(User.bureau_id, User.division_id, User.supervision_id)
+    for bureau_id, division_id, supervision_id, count in user_groups:
+        bureau_users[bureau_id] += count
+        division_users[division_id] += count
+        supervision_users[supervision_id] += count
+
+    result_bureaus = []
+    total_users = 0
+    nodes = []  # หน่วยงานทุกระดับที่อยู่ในต้นไม้ (นับเปิด/ปิดใช้งาน)
+
+    for bureau in bureaus:
+        total_users += bureau_users[bureau.id]
+        nodes.append(bureau)
+        result_divisions = []
+
+        for division in divisions_by_bureau[bureau.id]:
+            supervisions = supervisions_by_division[division.id]
+            nodes.append(division)
+            nodes.extend(supervisions)
+            result_supervisions = [
+                SupervisionWithStats(**supervision.__dict__, user_count=supervision_users[supervision.id])
+                for supervision in supervisions
+            ]
+
+            result_divisions.append(
+                DivisionWithSupervisions(
+                    **division.__dict__,
+                    supervisions=result_supervisions,
+                    user_count=division_users[division.id]
+                )
+            )
+
+        result_bureaus.append(
+            BureauWithDivisions(
+                **bureau.__dict__,
+                divisions=result_divisions,
+                user_count=bureau_users[bureau.id]
+            )
+        )
+
+    active_count = sum(1 for node in nodes if node.is_active)
+    return OrganizationTree(
+        bureaus=result_bureaus,
+        total_users=total_users,
+        active_organizations=active_count,
+        inactive_organizations=len(nodes) - active_count
+    )
+
+
+_tree_cache: SignatureCache[OrganizationTree] = SignatureCache(
+    build_organization_tree,
+    lambda db: table_signature(db, Bureau, Division, Supervision, User),
+    lambda: settings.ORGANIZATION_TREE_CHECK_SECONDS,
+)
+
+
+def get_organization_tree(db: Session) -> OrganizationTree:
+    """OrganizationTree ปัจจุบัน (สร้างครั้งแรก / สร้างใหม่เมื่อข้อมูลหน่วยงานหรือผู้ใช้เปลี่ยน)"""
+    return _tree_cache.get(db)
+
+
+def invalidate_organization_tree() -> None:
+    """บังคับให้ตรวจ/สร้างต้นไม้ใหม่ในการเรียกครั้งถัดไป (เรียกหลังแก้ไขหน่วยงานหรือเพิ่ม/ลบ/อนุมัติผู้ใช้)"""
+    _tree_cache.invalidate()
@@ -1,46 +1,139 @@
 """
 PDF Parser Service สำหรับแกะข้อมูลจากไฟล์ ทร.14
+
+- regex ทั้งหมด compile ครั้งเดียวตอน import
+- อ่านไม่เกิน THOR14_MAX_PAGES หน้า และหยุดทันทีเมื่อได้ชื่อ, เลขบัตร และที่อยู่ครบ
+- async API รันการแกะใน process pool (pdfplumber เป็น pure Python ถือ GIL นาน)
+- ผลลัพธ์ถูก cache ตาม SHA-256 ของไฟล์ อัปโหลดไฟล์เดิมซ้ำได้ผลทันที
 """
-import re
+import hashlib
 import io
+import re
+import threading
+from collections import OrderedDict
 from typing import Dict, Optional
 from fastapi import UploadFile
 import PyPDF2
 import pdfplumber
 
+from app.core.config import settings
+from app.core.executors import run_in_process
+
+
+# ---------- ชื่อ-นามสกุล ----------
+
+# "ชื่อสกุล นายอภิสิทธิ์ ผ่องศรี เพศ ชาย" หรือ "ชื่อสกุล น.ส.ณิลธิรา เหตุเกษ เพศ หญิง"
+NAME_WITH_GENDER = re.compile(r'ชื่อสกุล\s+(นาย|นาง|นางสาว|เด็กชาย|เด็กหญิง|น\.ส\.|นส\.|น\.ส|นาย|นาง)\s+([^\s]+(?:\s+[^\s]+)*?)\s+เพศ')
+# รูปแบบที่ไม่มีคำว่า "เพศ"
+NAME_LINE = re.compile(r'ชื่อสกุล\s+(นาย|นาง|นางสาว|เด็กชาย|เด็กหญิง|น\.ส\.|นส\.|น\.ส)\s+([^\n\r]+)')
+NAME_FALLBACKS = [
+    re.compile(pattern, re.IGNORECASE | re.MULTILINE)
+    for pattern in (
+        r'ชื่อ-นามสกุล[:\s]*([^\n\r]+)',
+        r'ชื่อนามสกุล[:\s]*([^\n\r]+)',
+        r'ชื่อ[:\s]*([^\n\r]+)',
+        r'(นาย|นาง|นางสาว|เด็กชาย|เด็กหญิง|น\.ส\.|นส\.|น\.ส)\s+([^\s]+(?:\s+[^\s]+)*)',
+    )
+]
+MISS_TITLES = ('น.ส.', 'นส.', 'น.ส')
+NAME_GENDER_SUFFIX = re.compile(r'\s+เพศ.*$')
+NAME_LABEL_PREFIX = re.compile(r'^-?ชื่อสกุล\s+')
+NAME_SURNAME_PREFIX = re.compile(r'^สกุล\s+')
+
+# ---------- เลขบัตรประชาชน ----------
+
+ID_CARD_PATTERNS = [
+    re.compile(pattern, re.IGNORECASE | re.MULTILINE)
+    for pattern in (
+        # รูปแบบที่มีเครื่องหมายขีด 13 หลัก (เช่น 3-4302-00509-67-6)
+        r'เลขประจำตัวประชาชน[:\s]*(\d{1,2}-\d{4}-\d{5}-\d{2}-\d{1})',
+        r'เลขบัตรประชาชน[:\s]*(\d{1,2}-\d{4}-\d{5}-\d{2}-\d{1})',
+        # รูปแบบมาตรฐาน 13 หลัก
+        r'เลขประจำตัวประชาชน[:\s]*(\d{13})',
+        r'เลขบัตรประชาชน[:\s]*(\d{13})',
+        r'เลขประจำตัว[:\s]*(\d{13})',
+        # รูปแบบที่มีช่องว่างระหว่างตัวเลข
+        r'เลขประจำตัวประชาชน[:\s]*(\d{1,3}\s?\d{1,3}\s?\d{1,3}\s?\d{1,3}\s?\d{1,3})',
+        r'เลขบัตรประชาชน[:\s]*(\d{1,3}\s?\d{1,3}\s?\d{1,3}\s?\d{1,3}\s?\d{1,3})',
+        # รูปแบบทั่วไป - หาเลข 13 หลักที่อยู่ใกล้กับคำว่า "เลขประจำตัว"
+        r'(?:เลขประจำตัว|เลขบัตร|เลขประจำตัวประชาชน|เลขบัตรประชาชน)[^\d]*(\d{13})',
+        # รูปแบบทั่วไป - หาเลข 13 หลักที่อยู่ใกล้กับคำว่า "ประชาชน"
+        r'ประชาชน[^\d]*(\d{13})',
+    )
+]
+HOUSE_CODE_PATTERNS = [
+    re.compile(pattern, re.IGNORECASE | re.MULTILINE)
+    for pattern in (
+        r'เลขรหัสประจำบ้าน\s+(\d{4}-\d{6}-\d{1})',
+        r'เลขรหัสประจำบ้าน\s+(\d{4}-\d{6}-\d{1}-\d{1}-\d{1})',
+    )
+]
+NON_DIGIT = re.compile(r'\D')
+DIGIT_RUN = re.compile(r'\d+')
+
+# ---------- ที่อยู่ ----------
+
+# 1. รูปแบบที่สมบูรณ์ (จบก่อน "สถานภาพบุคคล"/"พิมพ์จากฐานข้อมูล")
+ADDRESS_FULL = re.compile(
+    r'บ้านเลขที่\s+(\d+(?:-\d+)*)\s+หมู่ที่\s+(\d+).*?ตรอก\s+ซอย\s+ถนน.*?ตำบล\s+([^\s]+)\s+อำเภอ\s+([^\s]+)\s+จังหวัด\s+([^\s]+)(?=\s+สถานภาพบุคคล|\s+พิมพ์จากฐานข้อมูล|$)',
+    re.MULTILINE | re.DOTALL
+)
+# 1.1 รูปแบบที่ยืดหยุ่นกว่า (ครอบคลุมรูปแบบหลายบรรทัดและรูปแบบที่มี lookahead อื่นๆ ทั้งหมด)
+ADDRESS_FLEXIBLE = re.compile(
+    r'บ้านเลขที่\s+(\d+(?:-\d+)*)\s+หมู่ที่\s+(\d+).*?ตรอก\s+ซอย\s+ถนน.*?ตำบล\s+([^\s]+)\s+อำเภอ\s+([^\s]+)\s+จังหวัด\s+([^\s]+)',
+    re.MULTILINE | re.DOTALL
+)
+# 5. รูปแบบอื่นๆ - ต้องทำความสะอาดข้อมูล
+ADDRESS_FALLBACKS = [
+    re.compile(pattern, re.IGNORECASE | re.MULTILINE)
+    for pattern in (
+        r'ที่อยู่[:\s]*([^\n\r]+(?:\n\r?[^\n\r]+)*)',
+        r'อยู่ที่[:\s]*([^\n\r]+(?:\n\r?[^\n\r]+)*)',
+        r'บ้านเลขที่[:\s]*([^\n\r]+(?:\n\r?[^\n\r]+)*)',
+    )
+]
+# ข้อความหลังที่อยู่ในไฟล์ ทร.14 ที่ต้องตัดออก
+ADDRESS_TRAILERS = [
+    re.compile(pattern)
+    for pattern in (
+        r'สถานภาพบุคคล.*$',
+        r'พิมพ์จากฐานข้อมูล.*$',
+        r'บุคคลนี้มีภูมิลำเนาอยู่ในบ้านนี้.*$',
+        r'วันที่ย้ายเข้า.*$',
+    )
+]
+WHITESPACE = re.compile(r'\s+')
+
+ADDRESS_UNWANTED = (
+    'สถานภาพบุคคล',
+    'พิมพ์จากฐานข้อมูล',
+    'บุคคลนี้มีภูมิลำเนาอยู่ในบ้านนี้',
+    'วันที่ย้ายเข้า',
+    'หน่วยงานที่พิมพ์',
+    'ผู้พิมพ์รายงาน'
+)
+ADDRESS_REQUIRED = (
+    'บ้านเลขที่',
+    'หมู่ที่',
+    'ตรอก',
+    'ซอย',
+    'ถนน',
+    'ตำบล',
+    'อำเภอ',
+    'จังหวัด'
+)
+
+EMPTY_RESULT = {'name': '', 'id_card': '', 'address': ''}
+
 
 class Thor14PDFParser:
     """คลาสสำหรับแกะข้อมูลจากไฟล์ ทร.14"""
     
-    def __init__(self):
-        self.patterns = {
-            # รูปแบบชื่อ-นามสกุล (ปรับปรุงตามข้อมูลจริง)
-            'name': [
-                r'ชื่อ-นามสกุล[:\s]*([^\n\r]+)',
-                r'ชื่อนามสกุล[:\s]*([^\n\r]+)',
-                r'ชื่อ[:\s]*([^\n\r]+)',
-                # รูปแบบเฉพาะสำหรับไฟล์ ทร.14
-                r'ชื่อสกุล\s+(นาย|นาง|นางสาว|เด็กชาย|เด็กหญิง)\s+([^\s]+(?:\s+[^\s]+)*)',
-                r'(นาย|นาง|นางสาว|เด็กชาย|เด็กหญิง)\s+([^\s]+(?:\s+[^\s]+)*)',
-            ],
-            # รูปแบบเลขบัตรประชาชน (ปรับปรุงตามข้อมูลจริง)
-            'id_card': [
-                r'เลขประจำตัวประชาชน[:\s]*(\d{13})',
-                r'เลขบัตรประชาชน[:\s]*(\d{13})',
-                r'เลขประจำตัว[:\s]*(\d{13})',
-                # รูปแบบเฉพาะสำหรับไฟล์ ทร.14
-                r'เลขประจำตัวประชาชน\s*(\d{13})',
-                r'(\d{13})',
-            ],
-            # รูปแบบที่อยู่ (ปรับปรุงตามข้อมูลจริง)
-            'address': [
-                r'ที่อยู่[:\s]*([^\n\r]+(?:\n\r?[^\n\r]+)*)',
-                r'อยู่ที่[:\s]*([^\n\r]+(?:\n\r?[^\n\r]+)*)',
-                # รูปแบบเฉพาะสำหรับไฟล์ ทร.14
-                r'บ้านเลขที่\s+(\d+(?:-\d+)*)\s+หมู่ที่\s+(\d+)\s+ตรอก\s+ซอย\s+ถนน\s+ตำบล\s+([^\s]+)\s+อำเภอ\s+([^\s]+)\s+จังหวัด\s+([^\s]+)',
-                r'บ้านเลขที่\s+(\d+(?:-\d+)*)\s+หมู่ที่\s+(\d+)\s+ตรอก\s+ซอย\s+ถนน\s+ตำบล\s+([^\s]+)\s+อำเภอ\s+([^\s]+)\s+จังหวัด\s+([^\s]+).*?(?=สถานภาพบุคคล|พิมพ์จากฐานข้อมูล|$)',
-            ]
-        }
+    def __init__(self, max_pages: Optional[int] = None, cache_size: Optional[int] = None):
+        self.max_pages = max_pages or settings.THOR14_MAX_PAGES
+        self.cache_size = cache_size or settings.THOR14_CACHE_SIZE
+        self._cache: "OrderedDict[str, Dict]" = OrderedDict()
+        self._cache_lock = threading.Lock()
     
     async def parse_pdf(self, file: UploadFile) -> Dict[str, str]:
         """
@@ -48,62 +141,116 @@ class Thor14PDFParser:
         
         Args:
             file: ไฟล์ PDF ที่อัปโหลด
-            
+        
         Returns:
             Dict ที่มี name, id_card, address
         """
+        pdf_content = await file.read()
+        return await self.parse_bytes(pdf_content)
+    
+    async def parse_bytes(self, pdf_content: bytes) -> Dict[str, str]:
+        """แกะข้อมูลจากเนื้อหาไฟล์ PDF ใน process pool (ใช้ผลจาก cache ถ้าเคยแกะไฟล์นี้แล้ว)"""
+        key = self._cache_key(pdf_content)
+        cached = self._cache_get(key)
+        if cached is not None:
+            return cached
+        
+        try:
+            extracted_data = await run_in_process(parse_thor14_content, pdf_content, self.max_pages)
+        except Exception as e:
+            # process pool ใช้งานไม่ได้ (แม้สร้าง pool ใหม่แล้ว) → ไม่ cache ผลลัพธ์นี้
+            print(f"Error parsing PDF: {str(e)}")
+            return dict(EMPTY_RESULT)
+        
+        self._cache_set(key, extracted_data)
+        return dict(extracted_data)
+    
+    def parse_content(self, pdf_content: bytes) -> Dict[str, str]:
+        """แกะข้อมูลจากเนื้อหาไฟล์ PDF ใน thread ปัจจุบัน (สำหรับ script/worker)"""
         try:
-            # อ่านไฟล์ PDF
-            pdf_content = await file.read()
-            
             # ลองใช้ pdfplumber ก่อน (ดีกว่าสำหรับการแกะข้อความ)
-            text = await self._extract_text_pdfplumber(pdf_content)
+            text, extracted_data = self._extract_pages(self._iter_pages_pdfplumber(pdf_content))
             
             # ถ้าไม่ได้ผล ลองใช้ PyPDF2
             if not text or len(text.strip()) < 50:
-                text = await self._extract_text_pypdf2(pdf_content)
+                text, extracted_data = self._extract_pages(self._iter_pages_pypdf2(pdf_content))
             
             if not text:
-                return {'name': '', 'id_card': '', 'address': ''}
-            
-            # แกะข้อมูลจากข้อความ
-            extracted_data = self._extract_data_from_text(text)
+                return dict(EMPTY_RESULT)
             
             return extracted_data
-            
+        
         except Exception as e:
             print(f"Error parsing PDF: {str(e)}")
-            return {'name': '', 'id_card': '', 'address': ''}
+            return dict(EMPTY_RESULT)
+    
+    # ---------- cache ----------
+    
+    def _cache_key(self, pdf_content: bytes) -> str:
+        return f"{hashlib.sha256(pdf_content).hexdigest()}:{self.max_pages}"
     
-    async def _extract_text_pdfplumber(self, pdf_content: bytes) -> str:
-        """ใช้ pdfplumber แกะข้อความจาก PDF"""
+    def _cache_get(self, key: str) -> Optional[Dict[str, str]]:
+        with self._cache_lock:
+            cached = self._cache.get(key)
+            if cached is None:
+                return None
+            self._cache.move_to_end(key)
+            return dict(cached)
+    
+    def _cache_set(self, key: str, extracted_data: Dict[str, str]) -> None:
+        with self._cache_lock:
+            self._cache[key] = dict(extracted_data)
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+    
+    # ---------- text extraction ----------
+    
+    def _extract_pages(self, pages) -> tuple:
+        """อ่านทีละหน้า แกะข้อมูลจากข้อความสะสม และหยุดเมื่อได้ข้อมูลครบ"""
+        text = ""
+        extracted_data = dict(EMPTY_RESULT)
+        for page_text in pages:
+            if not page_text:
+                continue
+            text += page_text + "\n"
+            extracted_data = self._extract_data_from_text(text)
+            if self._is_complete(extracted_data):
+                break
+        return text, extracted_data
+    
+    def _is_complete(self, extracted_data: Dict[str, str]) -> bool:
+        return bool(
+            extracted_data.get('name')
+            and extracted_data.get('id_card')
+            and extracted_data.get('address_valid')
+        )
+    
+    def _iter_pages_pdfplumber(self, pdf_content: bytes):
         try:
-            text = ""
             with pdfplumber.open(io.BytesIO(pdf_content)) as pdf:
-                for page in pdf.pages:
-                    page_text = page.extract_text()
-                    if page_text:
-                        text += page_text + "\n"
-            return text
+                for page in pdf.pages[:self.max_pages]:
+                    yield page.extract_text()
         except Exception as e:
             print(f"pdfplumber error: {str(e)}")
-            return ""
     
-    async def _extract_text_pypdf2(self, pdf_content: bytes) -> str:
-        """ใช้ PyPDF2 แกะข้อความจาก PDF"""
+    def _iter_pages_pypdf2(self, pdf_content: bytes):
         try:
-            text = ""
             pdf_reader = PyPDF2.PdfReader(io.BytesIO(pdf_content))
-            
-            for page in pdf_reader.pages:
-                page_text = page.extract_text()
-                if page_text:
-                    text += page_text + "\n"
-            
-            return text
+            for page in pdf_reader.pages[:self.max_pages]:
+                yield page.extract_text()
         except Exception as e:
             print(f"PyPDF2 error: {str(e)}")
-            return ""
+    
+    def _extract_text_pdfplumber(self, pdf_content: bytes) -> str:
+        """ใช้ pdfplumber แกะข้อความจาก PDF (ไม่เกิน max_pages หน้า)"""
+        return "".join(page_text + "\n" for page_text in self._iter_pages_pdfplumber(pdf_content) if page_text)
+    
+    def _extract_text_pypdf2(self, pdf_content: bytes) -> str:
+        """ใช้ PyPDF2 แกะข้อความจาก PDF (ไม่เกิน max_pages หน้า)"""
+        return "".join(page_text + "\n" for page_text in self._iter_pages_pypdf2(pdf_content) if page_text)
+    
+    # ---------- field extraction ----------
     
     def _extract_data_from_text(self, text: str) -> Dict[str, str]:
         """แกะข้อมูลจากข้อความที่ได้จาก PDF"""
@@ -134,52 +281,36 @@ class Thor14PDFParser:
     
     def _extract_name(self, text: str) -> str:
         """แกะชื่อ-นามสกุลเฉพาะ"""
-        # ลองหาตามรูปแบบ "ชื่อสกุล นายอภิสิทธิ์ ผ่องศรี เพศ ชาย"
-        # หรือ "ชื่อสกุล น.ส.ณิลธิรา เหตุเกษ เพศ หญิง"
-        pattern1 = r'ชื่อสกุล\s+(นาย|นาง|นางสาว|เด็กชาย|เด็กหญิง|น\.ส\.|นส\.|น\.ส|นาย|นาง)\s+([^\s]+(?:\s+[^\s]+)*?)\s+เพศ'
-        match = re.search(pattern1, text)
+        match = NAME_WITH_GENDER.search(text)
         if match:
             title = match.group(1)
             name = match.group(2).strip()
             # ตรวจสอบและแปลง น.ส. ให้เป็นรูปแบบมาตรฐาน
-            if title in ['น.ส.', 'นส.', 'น.ส']:
+            if title in MISS_TITLES:
                 title = 'น.ส.'
             return f"{title}{name}"
         
-        # ลองหาตามรูปแบบที่ไม่มีคำว่า "เพศ"
-        pattern2 = r'ชื่อสกุล\s+(นาย|นาง|นางสาว|เด็กชาย|เด็กหญิง|น\.ส\.|นส\.|น\.ส)\s+([^\n\r]+)'
-        match2 = re.search(pattern2, text)
-        if match2:
-            title = match2.group(1)
-            name = match2.group(2).strip()
+        match = NAME_LINE.search(text)
+        if match:
+            title = match.group(1)
+            name = match.group(2).strip()
             # ตัดข้อมูลที่ไม่เกี่ยวข้อง
-            name = re.sub(r'\s+เพศ.*$', '', name)
-            # ตรวจสอบและแปลง น.ส. ให้เป็นรูปแบบมาตรฐาน
-            if title in ['น.ส.', 'นส.', 'น.ส']:
+            name = NAME_GENDER_SUFFIX.sub('', name)
+            if title in MISS_TITLES:
                 title = 'น.ส.'
             return f"{title}{name}"
         
         # ลองหาตามรูปแบบอื่นๆ
-        patterns = [
-            r'ชื่อ-นามสกุล[:\s]*([^\n\r]+)',
-            r'ชื่อนามสกุล[:\s]*([^\n\r]+)',
-            r'ชื่อ[:\s]*([^\n\r]+)',
-            r'(นาย|นาง|นางสาว|เด็กชาย|เด็กหญิง|น\.ส\.|นส\.|น\.ส)\s+([^\s]+(?:\s+[^\s]+)*)',
-        ]
-        
-        for pattern in patterns:
-            matches = re.findall(pattern, text, re.IGNORECASE | re.MULTILINE)
-            if matches:
-                if isinstance(matches[0], tuple):
-                    # ถ้าเป็น tuple ให้รวมกัน
-                    name = ' '.join(matches[0]).strip()
-                else:
-                    name = matches[0].strip()
+        for pattern in NAME_FALLBACKS:
+            match = pattern.search(text)
+            if match:
+                # ถ้ามีหลาย group ให้รวมกัน
+                name = ' '.join(match.groups()).strip()
                 
                 # ทำความสะอาดชื่อ
-                name = re.sub(r'\s+เพศ.*$', '', name)  # ตัดคำว่า "เพศ" และคำอื่นๆ
-                name = re.sub(r'^-?ชื่อสกุล\s+', '', name)  # ตัดคำว่า "-ชื่อสกุล" ที่ต้นประโยค
-                name = re.sub(r'^สกุล\s+', '', name)   # ตัดคำว่า "สกุล" ที่ต้นประโยค
+                name = NAME_GENDER_SUFFIX.sub('', name)  # ตัดคำว่า "เพศ" และคำอื่นๆ
+                name = NAME_LABEL_PREFIX.sub('', name)  # ตัดคำว่า "-ชื่อสกุล" ที่ต้นประโยค
+                name = NAME_SURNAME_PREFIX.sub('', name)   # ตัดคำว่า "สกุล" ที่ต้นประโยค
                 if name and len(name) > 2:
                     return name
         
@@ -190,196 +321,57 @@ class Thor14PDFParser:
         # ลำดับความสำคัญ: หาเลขประจำตัวประชาชนก่อน แล้วค่อยหาเลขรหัสประจำบ้าน
         
         # 1. รูปแบบเลขประจำตัวประชาชน (13 หลัก) - ลำดับความสำคัญสูงสุด
-        id_card_patterns = [
-            # รูปแบบที่มีเครื่องหมายขีด 13 หลัก (เช่น 3-4302-00509-67-6)
-            r'เลขประจำตัวประชาชน[:\s]*(\d{1,2}-\d{4}-\d{5}-\d{2}-\d{1})',
-            r'เลขบัตรประชาชน[:\s]*(\d{1,2}-\d{4}-\d{5}-\d{2}-\d{1})',
-            # รูปแบบมาตรฐาน 13 หลัก
-            r'เลขประจำตัวประชาชน[:\s]*(\d{13})',
-            r'เลขบัตรประชาชน[:\s]*(\d{13})',
-            r'เลขประจำตัว[:\s]*(\d{13})',
-            # รูปแบบที่มีช่องว่างระหว่างตัวเลข
-            r'เลขประจำตัวประชาชน[:\s]*(\d{1,3}\s?\d{1,3}\s?\d{1,3}\s?\d{1,3}\s?\d{1,3})',
-            r'เลขบัตรประชาชน[:\s]*(\d{1,3}\s?\d{1,3}\s?\d{1,3}\s?\d{1,3}\s?\d{1,3})',
-            # รูปแบบทั่วไป - หาเลข 13 หลักที่อยู่ใกล้กับคำว่า "เลขประจำตัว"
-            r'(?:เลขประจำตัว|เลขบัตร|เลขประจำตัวประชาชน|เลขบัตรประชาชน)[^\d]*(\d{13})',
-            # รูปแบบทั่วไป - หาเลข 13 หลักที่อยู่ใกล้กับคำว่า "ประชาชน"
-            r'ประชาชน[^\d]*(\d{13})',
-        ]
-        
-        # หาเลขประจำตัวประชาชนก่อน
-        for pattern in id_card_patterns:
-            matches = re.findall(pattern, text, re.IGNORECASE | re.MULTILINE)
-            if matches:
-                id_card = matches[0] if isinstance(matches[0], str) else matches[0][0]
-                id_card_clean = re.sub(r'\D', '', id_card)  # ลบตัวอักษรที่ไม่ใช่ตัวเลข
+        for pattern in ID_CARD_PATTERNS:
+            match = pattern.search(text)
+            if match:
+                id_card_clean = NON_DIGIT.sub('', match.group(1))  # ลบตัวอักษรที่ไม่ใช่ตัวเลข
                 if len(id_card_clean) == 13:
                     return id_card_clean
         
         # 2. ถ้าไม่พบเลขประจำตัวประชาชน ให้ลองหาเลขรหัสประจำบ้าน (11 หลัก)
-        house_code_patterns = [
-            r'เลขรหัสประจำบ้าน\s+(\d{4}-\d{6}-\d{1})',
-            r'เลขรหัสประจำบ้าน\s+(\d{4}-\d{6}-\d{1}-\d{1}-\d{1})',
-        ]
-        
-        for pattern in house_code_patterns:
-            matches = re.findall(pattern, text, re.IGNORECASE | re.MULTILINE)
-            if matches:
-                house_code = matches[0] if isinstance(matches[0], str) else matches[0][0]
-                house_code_clean = re.sub(r'\D', '', house_code)  # ลบตัวอักษรที่ไม่ใช่ตัวเลข
+        for pattern in HOUSE_CODE_PATTERNS:
+            match = pattern.search(text)
+            if match:
+                house_code_clean = NON_DIGIT.sub('', match.group(1))
                 if len(house_code_clean) == 11:
                     # แปลงเป็นเลข 13 หลักโดยเพิ่ม 0 ต่อท้าย
                     return house_code_clean + '00'
         
         # 3. หาเลข 13 หลักในข้อความ (ลำดับความสำคัญต่ำสุด)
-        all_numbers = re.findall(r'\d+', text)
-        for number in all_numbers:
-            if len(number) == 13 and number.isdigit():
-                return number
+        for match in DIGIT_RUN.finditer(text):
+            if len(match.group()) == 13:
+                return match.group()
         
         return ''
     
+    def _format_address(self, match) -> str:
+        house_no, village_no, subdistrict, district, province = match.groups()
+        return f"บ้านเลขที่ {house_no} หมู่ที่ {village_no} ตรอก ซอย ถนน ตำบล {subdistrict} อำเภอ {district} จังหวัด {province}"
+    
     def _extract_address(self, text: str) -> str:
         """แกะที่อยู่เฉพาะ"""
         
         # ลำดับความสำคัญ: หารูปแบบที่สมบูรณ์ก่อน แล้วค่อยหารูปแบบอื่นๆ
-        
-        # 1. รูปแบบที่สมบูรณ์และตัดข้อมูลที่ไม่เกี่ยวข้องออก
-        pattern1 = r'บ้านเลขที่\s+(\d+(?:-\d+)*)\s+หมู่ที่\s+(\d+).*?ตรอก\s+ซอย\s+ถนน.*?ตำบล\s+([^\s]+)\s+อำเภอ\s+([^\s]+)\s+จังหวัด\s+([^\s]+)(?=\s+สถานภาพบุคคล|\s+พิมพ์จากฐานข้อมูล|$)'
-        match = re.search(pattern1, text, re.MULTILINE | re.DOTALL)
+        match = ADDRESS_FULL.search(text)
         if match:
-            house_no = match.group(1)
-            village_no = match.group(2)
-            subdistrict = match.group(3)
-            district = match.group(4)
-            province = match.group(5)
-            return f"บ้านเลขที่ {house_no} หมู่ที่ {village_no} ตรอก ซอย ถนน ตำบล {subdistrict} อำเภอ {district} จังหวัด {province}"
+            return self._format_address(match)
         
-        # 1.1 รูปแบบที่ตัดข้อมูลที่ไม่เกี่ยวข้องออก (ยืดหยุ่นกว่า)
-        pattern1_1 = r'บ้านเลขที่\s+(\d+(?:-\d+)*)\s+หมู่ที่\s+(\d+).*?ตรอก\s+ซอย\s+ถนน.*?ตำบล\s+([^\s]+)\s+อำเภอ\s+([^\s]+)\s+จังหวัด\s+([^\s]+)'
-        match1_1 = re.search(pattern1_1, text, re.MULTILINE | re.DOTALL)
-        if match1_1:
-            house_no = match1_1.group(1)
-            village_no = match1_1.group(2)
-            subdistrict = match1_1.group(3)
-            district = match1_1.group(4)
-            province = match1_1.group(5)
-            # ตัดข้อมูลที่ไม่เกี่ยวข้องออก
-            address = f"บ้านเลขที่ {house_no} หมู่ที่ {village_no} ตรอก ซอย ถนน ตำบล {subdistrict} อำเภอ {district} จังหวัด {province}"
-            # ทำความสะอาดที่อยู่ (ตัดข้อมูลที่ไม่เกี่ยวข้อง)
-            address = re.sub(r'\s+สถานภาพบุคคล.*$', '', address)
-            address = re.sub(r'\s+พิมพ์จากฐานข้อมูล.*$', '', address)
-            address = re.sub(r'\s+บุคคลนี้มีภูมิลำเนาอยู่ในบ้านนี้.*$', '', address)
-            address = re.sub(r'\s+วันที่ย้ายเข้า.*$', '', address)
-            address = re.sub(r'\s+', ' ', address.strip())
-            return address
-        
-        # 1.2 รูปแบบที่ตัดข้อมูลที่ไม่เกี่ยวข้องออก (ใช้ lookahead)
-        pattern1_2 = r'บ้านเลขที่\s+(\d+(?:-\d+)*)\s+หมู่ที่\s+(\d+).*?ตรอก\s+ซอย\s+ถนน.*?ตำบล\s+([^\s]+)\s+อำเภอ\s+([^\s]+)\s+จังหวัด\s+([^\s]+)(?=\s+สถานภาพบุคคล|\s+พิมพ์จากฐานข้อมูล|\s+บุคคลนี้มีภูมิลำเนาอยู่ในบ้านนี้|$)'
-        match1_2 = re.search(pattern1_2, text, re.MULTILINE | re.DOTALL)
-        if match1_2:
-            house_no = match1_2.group(1)
-            village_no = match1_2.group(2)
-            subdistrict = match1_2.group(3)
-            district = match1_2.group(4)
-            province = match1_2.group(5)
-            return f"บ้านเลขที่ {house_no} หมู่ที่ {village_no} ตรอก ซอย ถนน ตำบล {subdistrict} อำเภอ {district} จังหวัด {province}"
-        
-        # 1.3 รูปแบบที่ตัดข้อมูลที่ไม่เกี่ยวข้องออก (ใช้ lookahead - ยืดหยุ่นกว่า)
-        pattern1_3 = r'บ้านเลขที่\s+(\d+(?:-\d+)*)\s+หมู่ที่\s+(\d+).*?ตรอก\s+ซอย\s+ถนน.*?ตำบล\s+([^\s]+)\s+อำเภอ\s+([^\s]+)\s+จังหวัด\s+([^\s]+)(?=\s+สถานภาพบุคคล|$)'
-        match1_3 = re.search(pattern1_3, text, re.MULTILINE | re.DOTALL)
-        if match1_3:
-            house_no = match1_3.group(1)
-            village_no = match1_3.group(2)
-            subdistrict = match1_3.group(3)
-            district = match1_3.group(4)
-            province = match1_3.group(5)
-            return f"บ้านเลขที่ {house_no} หมู่ที่ {village_no} ตรอก ซอย ถนน ตำบล {subdistrict} อำเภอ {district} จังหวัด {province}"
-        
-        # 1.4 รูปแบบที่ตัดข้อมูลที่ไม่เกี่ยวข้องออก (ใช้ lookahead - ยืดหยุ่นมาก)
-        pattern1_4 = r'บ้านเลขที่\s+(\d+(?:-\d+)*)\s+หมู่ที่\s+(\d+).*?ตรอก\s+ซอย\s+ถนน.*?ตำบล\s+([^\s]+)\s+อำเภอ\s+([^\s]+)\s+จังหวัด\s+([^\s]+)'
-        match1_4 = re.search(pattern1_4, text, re.MULTILINE | re.DOTALL)
-        if match1_4:
-            house_no = match1_4.group(1)
-            village_no = match1_4.group(2)
-            subdistrict = match1_4.group(3)
-            district = match1_4.group(4)
-            province = match1_4.group(5)
-            # ตัดข้อมูลที่ไม่เกี่ยวข้องออก
-            address = f"บ้านเลขที่ {house_no} หมู่ที่ {village_no} ตรอก ซอย ถนน ตำบล {subdistrict} อำเภอ {district} จังหวัด {province}"
-            # ทำความสะอาดที่อยู่ (ตัดข้อมูลที่ไม่เกี่ยวข้อง)
-            address = re.sub(r'\s+สถานภาพบุคคล.*$', '', address)
-            address = re.sub(r'\s+พิมพ์จากฐานข้อมูล.*$', '', address)
-            address = re.sub(r'\s+บุคคลนี้มีภูมิลำเนาอยู่ในบ้านนี้.*$', '', address)
-            address = re.sub(r'\s+วันที่ย้ายเข้า.*$', '', address)
-            address = re.sub(r'\s+', ' ', address.strip())
-            return address
-        
-        # 2. รูปแบบที่แยกเป็นหลายบรรทัด (เช่น ไฟล์ ทร.14)
+        # รูปแบบที่แยกเป็นหลายบรรทัด (เช่น ไฟล์ ทร.14)
         # บ้านเลขที่ 44 หมู่ที่ 24
         # ตรอก ซอย ถนน
         # ตำบล วัดใหญ่ อำเภอ ปากเกร็ด จังหวัด นนทบุรี
-        pattern2 = r'บ้านเลขที่\s+(\d+(?:-\d+)*)\s+หมู่ที่\s+(\d+)\s*\n\s*ตรอก\s+ซอย\s+ถนน\s*\n\s*ตำบล\s+([^\s]+)\s+อำเภอ\s+([^\s]+)\s+จังหวัด\s+([^\s]+)'
-        match2 = re.search(pattern2, text, re.MULTILINE | re.DOTALL)
-        if match2:
-            house_no = match2.group(1)
-            village_no = match2.group(2)
-            subdistrict = match2.group(3)
-            district = match2.group(4)
-            province = match2.group(5)
-            return f"บ้านเลขที่ {house_no} หมู่ที่ {village_no} ตรอก ซอย ถนน ตำบล {subdistrict} อำเภอ {district} จังหวัด {province}"
-        
-        # 2.1 รูปแบบที่แยกเป็นหลายบรรทัด (ยืดหยุ่นกว่า)
-        # หา pattern ที่มีบ้านเลขที่ หมู่ที่ แล้วตามด้วยตรอก ซอย ถนน แล้วตามด้วยตำบล อำเภอ จังหวัด
-        pattern2_1 = r'บ้านเลขที่\s+(\d+(?:-\d+)*)\s+หมู่ที่\s+(\d+).*?ตรอก\s+ซอย\s+ถนน.*?ตำบล\s+([^\s]+)\s+อำเภอ\s+([^\s]+)\s+จังหวัด\s+([^\s]+)'
-        match2_1 = re.search(pattern2_1, text, re.MULTILINE | re.DOTALL)
-        if match2_1:
-            house_no = match2_1.group(1)
-            village_no = match2_1.group(2)
-            subdistrict = match2_1.group(3)
-            district = match2_1.group(4)
-            province = match2_1.group(5)
-            return f"บ้านเลขที่ {house_no} หมู่ที่ {village_no} ตรอก ซอย ถนน ตำบล {subdistrict} อำเภอ {district} จังหวัด {province}"
-        
-        # 3. รูปแบบที่มีข้อมูลเพิ่มเติม - ต้องตัดข้อมูลที่ไม่เกี่ยวข้องออก
-        pattern3 = r'บ้านเลขที่\s+(\d+(?:-\d+)*)\s+หมู่ที่\s+(\d+)\s+ตรอก\s+ซอย\s+ถนน\s+ตำบล\s+([^\s]+)\s+อำเภอ\s+([^\s]+)\s+จังหวัด\s+([^\s]+)(?:\s+สถานภาพบุคคล.*)?'
-        match3 = re.search(pattern3, text)
-        if match3:
-            house_no = match3.group(1)
-            village_no = match3.group(2)
-            subdistrict = match3.group(3)
-            district = match3.group(4)
-            province = match3.group(5)
-            return f"บ้านเลขที่ {house_no} หมู่ที่ {village_no} ตรอก ซอย ถนน ตำบล {subdistrict} อำเภอ {district} จังหวัด {province}"
-        
-        # 4. รูปแบบที่มีข้อมูลเพิ่มเติม - ใช้ regex ที่ยืดหยุ่นกว่า
-        pattern4 = r'บ้านเลขที่\s+(\d+(?:-\d+)*)\s+หมู่ที่\s+(\d+)\s+ตรอก\s+ซอย\s+ถนน\s+ตำบล\s+([^\s]+)\s+อำเภอ\s+([^\s]+)\s+จังหวัด\s+([^\s]+).*?(?=สถานภาพบุคคล|พิมพ์จากฐานข้อมูล|$)'
-        match4 = re.search(pattern4, text, re.DOTALL)
-        if match4:
-            house_no = match4.group(1)
-            village_no = match4.group(2)
-            subdistrict = match4.group(3)
-            district = match4.group(4)
-            province = match4.group(5)
-            return f"บ้านเลขที่ {house_no} หมู่ที่ {village_no} ตรอก ซอย ถนน ตำบล {subdistrict} อำเภอ {district} จังหวัด {province}"
-        
-        # 5. รูปแบบอื่นๆ - ต้องทำความสะอาดข้อมูล
-        patterns = [
-            r'ที่อยู่[:\s]*([^\n\r]+(?:\n\r?[^\n\r]+)*)',
-            r'อยู่ที่[:\s]*([^\n\r]+(?:\n\r?[^\n\r]+)*)',
-            r'บ้านเลขที่[:\s]*([^\n\r]+(?:\n\r?[^\n\r]+)*)',
-        ]
+        match = ADDRESS_FLEXIBLE.search(text)
+        if match:
+            return self._format_address(match)
         
-        for pattern in patterns:
-            matches = re.findall(pattern, text, re.IGNORECASE | re.MULTILINE)
-            if matches:
-                address = matches[0].strip()
+        for pattern in ADDRESS_FALLBACKS:
+            match = pattern.search(text)
+            if match:
+                address = match.group(1).strip()
                 # ทำความสะอาดที่อยู่ (ตัดข้อมูลที่ไม่เกี่ยวข้อง)
-                address = re.sub(r'สถานภาพบุคคล.*$', '', address)
-                address = re.sub(r'พิมพ์จากฐานข้อมูล.*$', '', address)
-                address = re.sub(r'บุคคลนี้มีภูมิลำเนาอยู่ในบ้านนี้.*$', '', address)
-                address = re.sub(r'วันที่ย้ายเข้า.*$', '', address)
-                address = re.sub(r'\s+', ' ', address.strip())
+                for trailer in ADDRESS_TRAILERS:
+                    address = trailer.sub('', address)
+                address = WHITESPACE.sub(' ', address.strip())
                 if address and len(address) > 10:
                     return address
         
@@ -390,34 +382,12 @@ class Thor14PDFParser:
         if not address:
             return False
         
-        # ตรวจสอบข้อมูลที่ไม่เกี่ยวข้อง
-        unwanted_indicators = [
-            'สถานภาพบุคคล',
-            'พิมพ์จากฐานข้อมูล',
-            'บุคคลนี้มีภูมิลำเนาอยู่ในบ้านนี้',
-            'วันที่ย้ายเข้า',
-            'หน่วยงานที่พิมพ์',
-            'ผู้พิมพ์รายงาน'
-        ]
-        
         # ถ้ามีข้อมูลที่ไม่เกี่ยวข้อง แสดงว่าไม่ถูกต้อง
-        if any(indicator in address for indicator in unwanted_indicators):
+        if any(indicator in address for indicator in ADDRESS_UNWANTED):
             return False
         
-        # ตรวจสอบข้อมูลที่ต้องการ
-        required_indicators = [
-            'บ้านเลขที่',
-            'หมู่ที่',
-            'ตรอก',
-            'ซอย',
-            'ถนน',
-            'ตำบล',
-            'อำเภอ',
-            'จังหวัด'
-        ]
-        
         # ต้องมีข้อมูลที่ต้องการครบถ้วน
-        if not all(indicator in address for indicator in required_indicators):
+        if not all(indicator in address for indicator in ADDRESS_REQUIRED):
             return False
         
         # ตรวจสอบความยาวที่อยู่ (ไม่ควรยาวเกินไป)
@@ -425,20 +395,11 @@ class Thor14PDFParser:
             return False
         
         return True
-    
-    def _extract_field(self, text: str, field_type: str) -> Optional[str]:
-        """แกะข้อมูลเฉพาะฟิลด์จากข้อความ"""
-        patterns = self.patterns.get(field_type, [])
-        
-        for pattern in patterns:
-            matches = re.findall(pattern, text, re.IGNORECASE | re.MULTILINE)
-            if matches:
-                # ใช้ผลลัพธ์แรกที่เจอ
-                result = matches[0] if isinstance(matches[0], str) else matches[0][0]
-                if result and result.strip():
-                    return result.strip()
-        
-        return None
+
+
+def parse_thor14_content(pdf_content: bytes, max_pages: Optional[int] = None) -> Dict[str, str]:
+    """แกะข้อมูลจากเนื้อหาไฟล์ ทร.14 (ระดับ module เพื่อให้ส่งไปรันใน process pool ได้)"""
+    return Thor14PDFParser(max_pages=max_pages).parse_content(pdf_content)
 
 
 # สร้าง instance ของ parser
@@ -0,0 +1,334 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Shared headless-Chromium pool for HTML → PDF rendering
+
+เปิด Chromium ค้างไว้ (warm) แทนการเปิด browser ใหม่ทุกครั้งที่สร้าง PDF
+- worker แต่ละตัวเป็น thread ที่ถือ Playwright/browser/context ของตัวเอง
+  (Playwright sync API ต้องใช้งานจาก thread ที่สร้างเท่านั้น)
+- page ถูกใช้ซ้ำได้ไม่เกิน PDF_PAGE_MAX_USES ครั้ง แล้วเปิดใหม่
+- ถ้า browser crash จะ launch ใหม่และลอง render ซ้ำ 1 ครั้ง
+- คิวมีขนาดจำกัด ถ้าเต็มจะ raise PDFRendererBusyError (backpressure)
+"""
+
+import os
+import queue
+import tempfile
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+from typing import Any, Dict, Optional
+
+from playwright.sync_api import sync_playwright
+
+from app.core.config import settings
+
+# รูปแบบ PDF เดิมของหมายเรียก (A4, margins สำหรับการปริ้น)
+DEFAULT_PDF_OPTIONS = {
+    "format": "A4",
+    "margin": {
+        "top": "15mm",
+        "right": "20mm",
+        "bottom": "15mm",
+        "left": "20mm"
+    },
+    "print_background": True,  # รวม background colors/images
+    "prefer_css_page_size": False  # ใช้ format='A4' แทน @page size
+}
+
+LATENCY_WINDOW = 500  # จำนวน render ล่าสุดที่ใช้คำนวณ percentile
+
+
+class PDFRendererBusyError(RuntimeError):
+    """Raised when the render queue is full"""
+
+
+def _remove_file(path: str) -> None:
+    try:
+        os.unlink(path)
+    except OSError:
+        pass
+
+
+class _RenderJob:
+    def __init__(self, html_content: str, output_path: str, pdf_options: Dict[str, Any]):
+        self.html_content = html_content
+        self.output_path = output_path
+        self.pdf_options = pdf_options
+        self.future: Future = Future()
+        self.enqueued_at = time.perf_counter()
+
+
+class _BrowserWorker(threading.Thread):
+    """Thread ที่ถือ browser 1 ตัวและ render งานจากคิวทีละงาน"""
+
+    def __init__(self, pool: "BrowserPool", index: int):
+        super().__init__(name=f"pdf-renderer-{index}", daemon=True)
+        self.pool = pool
+        self._playwright = None
+        self._browser = None
+        self._context = None
+        self._page = None
+        self._page_uses = 0
+
+    # ---------- browser lifecycle ----------
+
+    def _launch(self) -> None:
+        if self._playwright is None:
+            self._playwright = sync_playwright().start()
+        self._browser = self._playwright.chromium.launch(headless=True)
+        self._context = self._browser.new_context()
+        self._page = None
+        self._page_uses = 0
+
+    def _close_browser(self) -> None:
+        try:
+            if self._browser is not None:
+                self._browser.close()
+        except Exception:
+            pass
+        self._browser = None
+        self._context = None
+        self._page = None
+
+    def _get_page(self):
+        if self._browser is None or not self._browser.is_connected():
+            if self._browser is not None:
+                self.pool._record_restart()
+            self._close_browser()
+            self._launch()
+
+        if self._page is None or self._page.is_closed() or self._page_uses >= self.pool.page_max_uses:
+            if self._page is not None and not self._page.is_closed():
+                self._page.close()
+            self._page = self._context.new_page()
+            self._page_uses = 0
+
+        return self._page
+
+    # ---------- rendering ----------
+
+    def _render(self, job: _RenderJob) -> str:
+        page = self._get_page()
+        self._page_uses += 1
+        page.set_content(job.html_content, wait_until="networkidle")
+        page.pdf(path=job.output_path, **job.pdf_options)
+        return job.output_path
+
+    def run(self) -> None:
+        try:
+            while True:
+                job = self.pool._queue.get()
+                if job is None:
+                    break
+                if not job.future.set_running_or_notify_cancel():
+                    continue
+
+                started = time.perf_counter()
+                try:
+                    try:
+                        result = self._render(job)
+                    except Exception:
+                        # browser/page อาจ crash → เปิดใหม่แล้วลองอีกครั้ง
+                        self.pool._record_restart()
+                        self._close_browser()
+                        result = self._render(job)
+                    job.future.set_result(result)
+                    self.pool._record_render(time.perf_counter() - started, time.perf_counter() - job.enqueued_at)
+                except Exception as e:
+                    self.pool._record_failure()
+                    job.future.set_exception(e)
+        finally:
+            self._close_browser()
+            if self._playwright is not None:
+                try:
+                    self._playwright.stop()
+                except Exception:
+                    pass
+
+
+class BrowserPool:
+    """Pool ของ headless Chromium สำหรับแปลง HTML เป็น PDF"""
+
+    def __init__(
+        self,
+        size: Optional[int] = None,
+        max_queue: Optional[int] = None,
+        page_max_uses: Optional[int] = None,
+        render_timeout: Optional[float] = None
+    ):
+        self.size = size or settings.PDF_POOL_SIZE
+        self.max_queue = max_queue or settings.PDF_POOL_MAX_QUEUE
+        self.page_max_uses = page_max_uses or settings.PDF_PAGE_MAX_USES
+        self.render_timeout = render_timeout or settings.PDF_RENDER_TIMEOUT_SECONDS
+
+        self._queue: "queue.Queue[Optional[_RenderJob]]" = queue.Queue(maxsize=self.max_queue)
+        self._workers = []
+        self._lock = threading.Lock()
+        self._started = False
+
+        self._render_latencies = deque(maxlen=LATENCY_WINDOW)
+        self._total_latencies = deque(maxlen=LATENCY_WINDOW)
+        self._rendered = 0
+        self._failed = 0
+        self._rejected = 0
+        self._restarts = 0
+
+    def start(self) -> None:
+        """เริ่ม worker threads (เรียกอัตโนมัติเมื่อ render ครั้งแรก)"""
+        with self._lock:
+            if self._started:
+                return
+            for i in range(self.size):
+                worker = _BrowserWorker(self, i)
+                worker.start()
+                self._workers.append(worker)
+            self._started = True
+
+    def shutdown(self, timeout: float = 10) -> None:
+        """ปิด browser ทั้งหมด (รองานที่อยู่ในคิวให้เสร็จก่อน)"""
+        with self._lock:
+            if not self._started:
+                return
+            workers, self._workers = self._workers, []
+            self._started = False
+
+        # worker ต้องใช้ self._lock ตอนบันทึก metrics จึง join นอก lock
+        for _ in workers:
+            self._queue.put(None)
+        for worker in workers:
+            worker.join(timeout)
+
+    def render(
+        self,
+        html_content: str,
+        output_path: Optional[str] = None,
+        pdf_options: Optional[Dict[str, Any]] = None
+    ) -> str:
+        """
+        แปลง HTML เป็น PDF ผ่าน pool (block จนกว่าจะเสร็จ)
+
+        Args:
+            html_content: HTML content string
+            output_path: Path to save PDF (optional, creates temp file if not provided)
+            pdf_options: ตัวเลือกของ page.pdf() (ค่าเริ่มต้น A4 แบบหมายเรียก)
+
+        Returns:
+            Path to generated PDF file
+
+        Raises:
+            PDFRendererBusyError: คิวเต็ม
+            TimeoutError: render ไม่เสร็จภายใน render_timeout
+        """
+        self.start()
+
+        created_temp = not output_path
+        if not output_path:
+            # สร้างไฟล์ชั่วคราว
+            temp_file = tempfile.NamedTemporaryFile(
+                delete=False,
+                suffix='.pdf',
+                prefix='summons_'
+            )
+            output_path = temp_file.name
+            temp_file.close()
+
+        job = _RenderJob(html_content, output_path, pdf_options or DEFAULT_PDF_OPTIONS)
+        try:
+            self._queue.put_nowait(job)
+        except queue.Full:
+            with self._lock:
+                self._rejected += 1
+            if created_temp:
+                os.unlink(output_path)
+            raise PDFRendererBusyError("PDF renderer queue is full, please retry later")
+
+        try:
+            return job.future.result(timeout=self.render_timeout)
+        except FutureTimeoutError:
+            if created_temp:
+                # cancel() ไม่มีผลกับงานที่ worker กำลัง render อยู่ → ลบไฟล์ชั่วคราวเมื่องานจบ
+                # (งานที่ยังอยู่ในคิวถูก cancel และ callback ทำงานทันที)
+                job.future.add_done_callback(lambda _: _remove_file(output_path))
+            job.future.cancel()
+            raise TimeoutError(f"PDF rendering did not finish within {self.render_timeout} seconds")
+
+    # ---------- metrics ----------
+
+    def _record_render(self, render_seconds: float, total_seconds: float) -> None:
+        with self._lock:
+            self._rendered += 1
+            self._render_latencies.append(render_seconds)
+            self._total_latencies.append(total_seconds)
+
+    def _record_failure(self) -> None:
+        with self._lock:
+            self._failed += 1
+
+    def _record_restart(self) -> None:
+        with self._lock:
+            self._restarts += 1
+
+    @staticmethod
+    def _percentiles(samples) -> Dict[str, Optional[float]]:
+        if not samples:
+            return {"p50": None, "p95": None, "p99": None}
+        ordered = sorted(samples)
+        last = len(ordered) - 1
+        return {
+            f"p{p}": round(ordered[min(last, int(round(p / 100 * last)))] * 1000, 1)
+            for p in (50, 95, 99)
+        }
+
+    def metrics(self) -> Dict[str, Any]:
+        """สถิติของ pool (latency หน่วยเป็น ms จาก LATENCY_WINDOW งานล่าสุด)"""
+        with self._lock:
+            render_latencies = list(self._render_latencies)
+            total_latencies = list(self._total_latencies)
+            return {
+                "started": self._started,
+                "pool_size": self.size,
+                "workers_alive": sum(1 for w in self._workers if w.is_alive()),
+                "queue_depth": self._queue.qsize(),
+                "queue_capacity": self.max_queue,
+                "page_max_uses": self.page_max_uses,
+                "rendered": self._rendered,
+                "failed": self._failed,
+                "rejected": self._rejected,
+                "browser_restarts": self._restarts,
+                "render_latency_ms": self._percentiles(render_latencies),
+                "total_latency_ms": self._percentiles(total_latencies),
+            }
+
+
+_pool: Optional[BrowserPool] = None
+_pool_lock = threading.Lock()
+
+
+def get_browser_pool() -> BrowserPool:
+    """BrowserPool ของ process นี้ (สร้างครั้งแรกเมื่อเรียกใช้)"""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = BrowserPool()
+    return _pool
+
+
+def render_pdf(
+    html_content: str,
+    output_path: Optional[str] = None,
+    pdf_options: Optional[Dict[str, Any]] = None
+) -> str:
+    """แปลง HTML เป็น PDF ผ่าน BrowserPool กลาง (ใช้สำหรับทุกการ export PDF)"""
+    return get_browser_pool().render(html_content, output_path, pdf_options)
+
+
+def shutdown_browser_pool() -> None:
+    """ปิด BrowserPool กลาง (เรียกตอน application shutdown)"""
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown()
+            _pool = None
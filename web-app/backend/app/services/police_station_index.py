@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+In-memory jurisdiction index of police_stations_master
+
+โหลดสถานีตำรวจทั้งหมดครั้งเดียว แล้วสร้าง dict สำหรับค้นหา
+- (จังหวัด, ตำบล) → สถานีที่รับผิดชอบ  (จาก subdistricts_covered)
+- (จังหวัด, อำเภอ) → สถานีในอำเภอ
+- จังหวัด → สถานีในจังหวัด
+ชื่อพื้นที่ถูก normalize (ตัดคำนำหน้า จ./อ./ต./เขต/แขวง และช่องว่าง) ก่อนใช้เป็น key
+
+index ถูกสร้างใหม่เมื่อข้อมูลในตารางเปลี่ยน (ตรวจ count/max(id)/max(updated_at)
+ไม่เกิน 1 ครั้งต่อ POLICE_STATION_INDEX_CHECK_SECONDS) หรือเมื่อเรียก invalidate_jurisdiction_index()
+"""
+
+import re
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.signature_cache import SignatureCache, table_signature
+from app.models.police_station import PoliceStation
+from app.schemas.police_station import PoliceStationResponse
+
+# คำนำหน้าชื่อพื้นที่ (เรียงจากยาวไปสั้น)
+AREA_PREFIXES = ("จังหวัด", "อำเภอ", "ตำบล", "แขวง", "เขต", "จ.", "อ.", "ต.")
+
+PROVINCE_ALIASES = {
+    "กรุงเทพฯ": "กรุงเทพมหานคร",
+    "กรุงเทพ": "กรุงเทพมหานคร",
+    "กทม.": "กรุงเทพมหานคร",
+    "กทม": "กรุงเทพมหานคร",
+}
+
+DISTRICT_FALLBACK_LIMIT = 10
+PROVINCE_MATCH_LIMIT = 20
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_area(name: Optional[str]) -> str:
+    """normalize ชื่อจังหวัด/อำเภอ/ตำบล สำหรับใช้เป็น key"""
+    if not name:
+        return ""
+    name = _WHITESPACE.sub("", name)
+    for prefix in AREA_PREFIXES:
+        if name.startswith(prefix):
+            name = name[len(prefix):]
+            break
+    return PROVINCE_ALIASES.get(name, name)
+
+
+class JurisdictionIndex:
+    """ดัชนีเขตรับผิดชอบของสถานีตำรวจ (ไม่แก้ไขหลังสร้าง จึงใช้ร่วมกันข้ามหลาย thread ได้)"""
+
+    def __init__(self, stations: List[PoliceStationResponse]):
+        self.stations = stations
+        self._by_province: Dict[str, List[PoliceStationResponse]] = {}
+        self._by_district: Dict[Tuple[str, str], List[PoliceStationResponse]] = {}
+        self._by_subdistrict: Dict[Tuple[str, str], PoliceStationResponse] = {}
+        # ตำบลทั้งหมดของแต่ละจังหวัด สำหรับค้นหาแบบบางส่วนเมื่อไม่พบ key ตรง
+        self._covered_by_province: Dict[str, List[Tuple[str, PoliceStationResponse]]] = {}
+        # ผลค้นหาจังหวัดแบบบางส่วน เก็บเฉพาะชื่อที่พบ (ส่วนหนึ่งของชื่อจังหวัดมีจำนวนจำกัด)
+        self._province_lookups: Dict[str, List[str]] = {}
+
+        for station in stations:
+            province = normalize_area(station.province)
+            self._by_province.setdefault(province, []).append(station)
+
+            district = normalize_area(station.district)
+            if district:
+                self._by_district.setdefault((province, district), []).append(station)
+
+            for area in (station.subdistricts_covered or "").split(","):
+                area = normalize_area(area)
+                if not area:
+                    continue
+                # สถานีแรก (id น้อยสุด) ที่ครอบคลุมตำบลเป็นผู้รับผิดชอบ
+                self._by_subdistrict.setdefault((province, area), station)
+                self._covered_by_province.setdefault(province, []).append((area, station))
+
+        # ชื่อจังหวัดที่ normalize แล้ว ไม่ซ้ำ เรียงตามตัวอักษร (ไม่ใช่ค่าดิบในตาราง)
+        self.provinces = sorted(p for p in self._by_province if p)
+
+    @classmethod
+    def load(cls, db: Session) -> "JurisdictionIndex":
+        rows = db.query(PoliceStation).order_by(PoliceStation.id).all()
+        return cls([PoliceStationResponse.from_orm(row) for row in rows])
+
+    def _resolve_provinces(self, province: str) -> List[str]:
+        """
+        key ของจังหวัดที่ตรงกับชื่อที่ระบุ (ถ้าไม่ตรงทั้งหมด ใช้จังหวัดที่มีชื่อนี้เป็นส่วนหนึ่ง)
+
+        ชื่อว่างตรงกับทุกจังหวัด เหมือนการค้นหาเดิมด้วย ILIKE '%%'
+        """
+        key = normalize_area(province)
+        if not key:
+            return list(self._by_province)
+        if key in self._by_province:
+            return [key]
+        resolved = self._province_lookups.get(key)
+        if resolved is None:
+            resolved = [p for p in self.provinces if key in p]
+            # ไม่เก็บชื่อที่ไม่พบ - มาจากที่อยู่ที่ผู้ใช้พิมพ์ จะทำให้ dict โตไม่สิ้นสุด
+            if resolved:
+                self._province_lookups[key] = resolved
+        return resolved
+
+    def find_subdistrict(self, province: str, subdistrict: str) -> Optional[PoliceStationResponse]:
+        """สถานีที่รับผิดชอบตำบล"""
+        area = normalize_area(subdistrict)
+        if not area:
+            return None
+        provinces = self._resolve_provinces(province)
+        for key in provinces:
+            station = self._by_subdistrict.get((key, area))
+            if station is not None:
+                return station
+
+        # ไม่พบ key ตรง → เทียบชื่อบางส่วนเฉพาะตำบลในจังหวัดนั้น (เช่น "ในเมือง" กับ "ในเมือง(เทศบาล)")
+        for key in provinces:
+            for covered, station in self._covered_by_province.get(key, ()):
+                if area in covered or covered in area:
+                    return station
+        return None
+
+    def find_district(self, province: str, district: str) -> List[PoliceStationResponse]:
+        """สถานีในอำเภอ (ถ้าไม่พบ คืนสถานีในจังหวัดไม่เกิน DISTRICT_FALLBACK_LIMIT แห่ง)"""
+        provinces = self._resolve_provinces(province)
+        key = normalize_area(district)
+        matches = []
+        if key:
+            for province_key in provinces:
+                matches.extend(self._by_district.get((province_key, key), ()))
+            if not matches:
+                for province_key in provinces:
+                    matches.extend(
+                        station for station in self._by_province[province_key]
+                        if key in normalize_area(station.district)
+                    )
+        if not matches:
+            matches = self.find_province(province, limit=DISTRICT_FALLBACK_LIMIT)
+        return matches
+
+    def find_province(self, province: str, limit: Optional[int] = PROVINCE_MATCH_LIMIT) -> List[PoliceStationResponse]:
+        """สถานีในจังหวัด"""
+        matches = []
+        for key in self._resolve_provinces(province):
+            matches.extend(self._by_province[key])
+        return matches[:limit] if limit else matches
+
+
+_index_cache: SignatureCache[JurisdictionIndex] = SignatureCache(
+    JurisdictionIndex.load,
+    lambda db: table_signature(db, PoliceStation),
+    lambda: settings.POLICE_STATION_INDEX_CHECK_SECONDS,
+)
+
+
+def get_jurisdiction_index(db: Session) -> JurisdictionIndex:
+    """JurisdictionIndex ปัจจุบัน (โหลดครั้งแรก / โหลดใหม่เมื่อข้อมูลในตารางเปลี่ยน)"""
+    return _index_cache.get(db)
+
+
+def invalidate_jurisdiction_index() -> None:
+    """บังคับให้ตรวจ/โหลด index ใหม่ในการเรียกครั้งถัดไป (เรียกหลังแก้ไขข้อมูลสถานีตำรวจ)"""
+    _index_cache.invalidate()
@@ -7,9 +7,9 @@ Service for police station search and management
 import re
 from typing import List, Optional, Dict, Any
 from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_
 from app.models.police_station import PoliceStation
 from app.schemas.police_station import PoliceStationSearchResponse, PoliceStationResponse
+from app.services.police_station_index import JurisdictionIndex, get_jurisdiction_index
 
 class PoliceStationService:
     """Service for police station operations"""
@@ -61,6 +61,26 @@ class PoliceStationService:
         Returns:
             PoliceStationSearchResponse with matches
         """
+        return self._search(get_jurisdiction_index(self.db), address)
+    
+    def resolve_addresses(self, addresses: List[str]) -> List[PoliceStationSearchResponse]:
+        """
+        ค้นหาสถานีตำรวจให้หลายที่อยู่พร้อมกัน (ใช้ index ชุดเดียว, ที่อยู่ซ้ำค้นหาครั้งเดียว)
+        
+        Returns:
+            ผลลัพธ์เรียงตามลำดับของ addresses
+        """
+        index = get_jurisdiction_index(self.db)
+        resolved: Dict[str, PoliceStationSearchResponse] = {}
+        results = []
+        for address in addresses:
+            key = (address or "").strip()
+            if key not in resolved:
+                resolved[key] = self._search(index, key)
+            results.append(resolved[key])
+        return results
+    
+    def _search(self, index: JurisdictionIndex, address: str) -> PoliceStationSearchResponse:
         # Extract address components
         components = self.extract_address_components(address)
         province = components["province"]
@@ -74,9 +94,9 @@ class PoliceStationService:
         
         # 1. Search for exact subdistrict match
         if subdistrict:
-            exact_match = self._find_exact_subdistrict_match(province, subdistrict)
+            exact_match = index.find_subdistrict(province, subdistrict)
             if exact_match:
-                result.exact_match = PoliceStationResponse.from_orm(exact_match)
+                result.exact_match = exact_match
                 # Check if exact match has incomplete address
                 if self._has_incomplete_address(exact_match.address):
                     result.has_incomplete_address = True
@@ -85,16 +105,16 @@ class PoliceStationService:
         
         # 2. Search for district matches
         if district:
-            district_matches = self._find_district_matches(province, district)
-            result.district_matches = [PoliceStationResponse.from_orm(station) for station in district_matches]
+            district_matches = index.find_district(province, district)
+            result.district_matches = district_matches
             # Check if any district match has incomplete address
             if any(self._has_incomplete_address(station.address) for station in district_matches):
                 result.has_incomplete_address = True
                 result.warning_message = "ข้อมูลสถานีตำรวจไม่สมบูรณ์ กรุณาตรวจสอบโดยตรงกับสถานีตำรวจอีกครั้ง"
         
         # 3. Search for province matches (fallback)
-        province_matches = self._find_province_matches(province)
-        result.province_matches = [PoliceStationResponse.from_orm(station) for station in province_matches]
+        province_matches = index.find_province(province)
+        result.province_matches = province_matches
         # Check if any province match has incomplete address
         if any(self._has_incomplete_address(station.address) for station in province_matches):
             result.has_incomplete_address = True
@@ -129,70 +149,18 @@ class PoliceStationService:
         result.province_matches = [fallback_station]
         
         return result
-    
-    def _find_exact_subdistrict_match(self, province: str, subdistrict: str) -> Optional[PoliceStation]:
-        """Find police station that covers the exact subdistrict"""
-        
-        # Search for stations in the same province
-        stations = self.db.query(PoliceStation).filter(
-            PoliceStation.province.ilike(f"%{province}%")
-        ).all()
-        
-        for station in stations:
-            if station.subdistricts_covered:
-                # Check if subdistrict is in the covered areas
-                covered_areas = station.subdistricts_covered.split(',')
-                for area in covered_areas:
-                    area = area.strip()
-                    if subdistrict in area or area in subdistrict:
-                        return station
-        
-        return None
-    
-    def _find_district_matches(self, province: str, district: str) -> List[PoliceStation]:
-        """Find police stations in the same district"""
-        
-        # Search for stations in the same province and district
-        stations = self.db.query(PoliceStation).filter(
-            and_(
-                PoliceStation.province.ilike(f"%{province}%"),
-                PoliceStation.district.ilike(f"%{district}%")
-            )
-        ).all()
-        
-        # If no district match, search by province only
-        if not stations:
-            stations = self.db.query(PoliceStation).filter(
-                PoliceStation.province.ilike(f"%{province}%")
-            ).limit(10).all()
-            
-            return stations
-            
-    def _find_province_matches(self, province: str) -> List[PoliceStation]:
-        """Find police stations in the same province"""
-        
-        # Try exact match first
-        stations = self.db.query(PoliceStation).filter(
-            PoliceStation.province == province
-        ).limit(20).all()
-        
-        # If no exact match, try partial match
-        if not stations:
-            stations = self.db.query(PoliceStation).filter(
-                PoliceStation.province.ilike(f"%{province}%")
-            ).limit(20).all()
-                
-        return stations
             
     def get_all_stations(self, skip: int = 0, limit: int = 100) -> List[PoliceStation]:
         """Get all police stations with pagination"""
         return self.db.query(PoliceStation).offset(skip).limit(limit).all()
     
-    def get_stations_by_province(self, province: str) -> List[PoliceStation]:
-        """Get all police stations in a specific province"""
-        return self.db.query(PoliceStation).filter(
-            PoliceStation.province.ilike(f"%{province}%")
-        ).all()
+    def get_provinces(self) -> List[str]:
+        """Get all provinces with police stations (ชื่อที่ normalize แล้ว ดู normalize_area)"""
+        return get_jurisdiction_index(self.db).provinces
+    
+    def get_stations_by_province(self, province: str) -> List[PoliceStationResponse]:
+        """Get all police stations in a specific province (ชื่อจังหวัดว่าง = ทุกสถานี เหมือนเดิม)"""
+        return get_jurisdiction_index(self.db).find_province(province, limit=None)
     
     def get_station_by_id(self, station_id: int) -> Optional[PoliceStation]:
         """Get police station by ID"""
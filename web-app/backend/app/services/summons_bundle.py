@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Batch summons/envelope PDF rendering
+
+แปลง HTML หมายเรียก/ซองหลายฉบับเป็น PDF พร้อมกันผ่าน BrowserPool
+แล้วรวมเป็น PDF ไฟล์เดียว หรือทยอยส่งเป็น ZIP ตามลำดับที่ render เสร็จ
+"""
+
+import io
+import os
+import time
+import zipfile
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Iterator, List, Tuple
+
+import PyPDF2
+
+from app.services.pdf_renderer import PDFRendererBusyError, get_browser_pool
+from app.utils.zip_stream import ZipStreamBuffer
+
+# (ชื่อไฟล์ใน bundle, HTML)
+BundleDocument = Tuple[str, str]
+
+BUSY_RETRIES = 5  # คิวของ pool เต็ม (มีงานจาก request อื่น) → รอแล้วลองใหม่
+BUSY_RETRY_DELAY_SECONDS = 1.0
+
+
+def _render_to_bytes(html_content: str) -> bytes:
+    for attempt in range(BUSY_RETRIES + 1):
+        try:
+            pdf_path = get_browser_pool().render(html_content)
+            break
+        except PDFRendererBusyError:
+            if attempt == BUSY_RETRIES:
+                raise
+            time.sleep(BUSY_RETRY_DELAY_SECONDS)
+    try:
+        with open(pdf_path, "rb") as f:
+            return f.read()
+    finally:
+        try:
+            os.unlink(pdf_path)
+        except OSError:
+            pass
+
+
+def iter_rendered(documents: List[BundleDocument]) -> Iterator[Tuple[int, str, bytes]]:
+    """
+    render ทุกเอกสารพร้อมกัน แล้ว yield (ลำดับเดิม, ชื่อไฟล์, PDF bytes) ทันทีที่แต่ละฉบับเสร็จ
+
+    ส่งงานเข้า pool ไม่เกินจำนวน browser เพื่อไม่ให้ batch เดียวเต็มคิวของทั้งระบบ
+    """
+    if not documents:
+        return
+
+    workers = min(len(documents), get_browser_pool().size)
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="summons-batch") as executor:
+        futures = {
+            executor.submit(_render_to_bytes, html): (index, filename)
+            for index, (filename, html) in enumerate(documents)
+        }
+        try:
+            for future in as_completed(futures):
+                index, filename = futures[future]
+                yield index, filename, future.result()
+        finally:
+            # client ตัดการเชื่อมต่อ/เกิด error → ยกเลิกงานที่ยังไม่เริ่ม
+            for future in futures:
+                future.cancel()
+
+
+def render_merged_pdf(documents: List[BundleDocument]) -> bytes:
+    """render ทุกเอกสารแล้วรวมเป็น PDF ไฟล์เดียว (เรียงตามลำดับที่ส่งมา)"""
+    rendered = [None] * len(documents)
+    for index, _, pdf_bytes in iter_rendered(documents):
+        rendered[index] = pdf_bytes
+
+    writer = PyPDF2.PdfWriter()
+    for pdf_bytes in rendered:
+        writer.append(io.BytesIO(pdf_bytes))
+
+    output = io.BytesIO()
+    writer.write(output)
+    return output.getvalue()
+
+
+def stream_zip(documents: List[BundleDocument]) -> Iterator[bytes]:
+    """
+    ทยอยส่ง ZIP ของ PDF ทุกฉบับ โดยแต่ละไฟล์ถูกเขียนลง ZIP ทันทีที่ render เสร็จ
+
+    PDF ถูกบีบอัดอยู่แล้ว จึงเก็บใน ZIP แบบ ZIP_STORED
+    """
+    buffer = ZipStreamBuffer()
+    with zipfile.ZipFile(buffer, mode="w", compression=zipfile.ZIP_STORED) as archive:
+        for _, filename, pdf_bytes in iter_rendered(documents):
+            archive.writestr(filename, pdf_bytes)
+            yield buffer.drain()
+    yield buffer.drain()
@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Shared rendering engine for summons letters and envelopes
+
+- template ใน app/templates/summons ถูก compile ครั้งเดียวต่อ process (ไม่ตรวจไฟล์ซ้ำทุกครั้งที่ render)
+- CSS ที่ใช้ร่วมกัน (letter.css, envelope.css) ถูกอ่านครั้งเดียวต่อไฟล์ (load_stylesheet)
+- โลโก้ถูกอ่านและแปลงเป็น base64 ครั้งเดียวต่อ path (load_asset_base64)
+- HTML ที่ render แล้วถูก memoize ตาม (template, โลโก้, hash ของข้อมูล)
+  พิมพ์หมายเรียกเดิมซ้ำหรือเปิด preview ซ้ำจึงไม่ต้อง render ใหม่
+
+Generator แต่ละประเภทมีหน้าที่เตรียมข้อมูล (context) แล้วเรียก render_summons()
+"""
+
+import base64
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from datetime import datetime
+from functools import lru_cache
+from typing import Any, Dict, Optional, Tuple
+
+from jinja2 import Environment, FileSystemLoader, StrictUndefined
+
+from app.core.config import settings
+
+TEMPLATE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "templates", "summons")
+
+_environment = Environment(
+    loader=FileSystemLoader(TEMPLATE_DIR),
+    # ไม่ escape เหมือน f-string เดิม (ข้อมูลบางช่องเป็น HTML เช่น <br> ในตารางรายการโอน)
+    autoescape=False,
+    keep_trailing_newline=True,
+    auto_reload=False,
+    cache_size=-1,
+    undefined=StrictUndefined,
+)
+
+
+@lru_cache(maxsize=None)
+def load_stylesheet(name: str, indent: int = 0) -> str:
+    """อ่าน CSS ใน TEMPLATE_DIR ครั้งเดียว (เยื้องบรรทัดที่ 2 เป็นต้นไป indent ช่อง สำหรับวางใน <style>)"""
+    with open(os.path.join(TEMPLATE_DIR, name), encoding="utf-8") as css_file:
+        lines = css_file.read().strip().split("\n")
+    prefix = " " * indent
+    return "\n".join([lines[0]] + [prefix + line if line else line for line in lines[1:]])
+
+
+@lru_cache(maxsize=None)
+def load_asset_base64(path: str) -> str:
+    """อ่านไฟล์ (เช่น โลโก้ Crut.jpg) แล้วแปลงเป็น base64 ครั้งเดียวต่อ path"""
+    if os.path.exists(path):
+        try:
+            with open(path, "rb") as asset_file:
+                return base64.b64encode(asset_file.read()).decode()
+        except Exception as e:
+            print(f"ไม่สามารถโหลด logo: {e}")
+    return ""
+
+
+_environment.globals["now"] = datetime.now
+_environment.globals["stylesheet"] = load_stylesheet
+
+
+def context_digest(context: Dict[str, Any]) -> str:
+    """hash ของข้อมูลที่ใช้ render (ไม่ขึ้นกับลำดับ key)"""
+    payload = json.dumps(context, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class SummonsRenderCache:
+    """LRU cache ของ HTML ที่ render แล้ว (thread-safe)"""
+
+    def __init__(self, maxsize: int = 128):
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[Tuple, str]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Tuple) -> Optional[str]:
+        with self._lock:
+            html = self._entries.get(key)
+            if html is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return html
+
+    def set(self, key: Tuple, html: str) -> None:
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._entries[key] = html
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+
+_cache: Optional[SummonsRenderCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_render_cache() -> SummonsRenderCache:
+    """SummonsRenderCache ของ process นี้ (สร้างตาม settings ครั้งแรกที่เรียก)"""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = SummonsRenderCache(maxsize=settings.SUMMONS_RENDER_CACHE_SIZE)
+    return _cache
+
+
+def set_render_cache(cache: Optional[SummonsRenderCache]) -> None:
+    """เปลี่ยน SummonsRenderCache (ใช้ในการทดสอบ)"""
+    global _cache
+    _cache = cache
+
+
+def render_summons(template_name: str, context: Dict[str, Any], logo_path: Optional[str] = None) -> str:
+    """
+    Render template หมายเรียก/ซองหมายเรียก
+
+    Args:
+        template_name: ชื่อไฟล์ใน app/templates/summons
+        context: ข้อมูลที่ใช้ใน template (ต้องแปลงเป็น JSON ได้ ใช้คำนวณ hash)
+        logo_path: path ของโลโก้ (ส่งให้ template เป็นตัวแปร logo แบบ base64)
+    """
+    cache = get_render_cache()
+    key = (template_name, logo_path, context_digest(context))
+    html = cache.get(key)
+    if html is None:
+        template = _environment.get_template(template_name)
+        logo = load_asset_base64(logo_path) if logo_path else ""
+        html = template.render(context, logo=logo)
+        cache.set(key, html)
+    return html
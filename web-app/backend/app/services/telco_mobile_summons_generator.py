@@ -6,10 +6,13 @@ Service สำหรับสร้างหมายเรียกข้อม
 """
 
 import os
-import base64
 from datetime import datetime
 from typing import Dict, Optional
 
+from app.services.summons_templates import load_asset_base64, render_summons
+from app.utils.thai_date_utils import format_date_to_thai_buddhist_era
+
+
 class TelcoMobileSummonsGenerator:
     """Generator สำหรับสร้างหมายเรียกข้อมูลโทรศัพท์"""
     
@@ -18,14 +21,8 @@ class TelcoMobileSummonsGenerator:
         self.logo_base64 = self._load_logo()
     
     def _load_logo(self) -> str:
-        """โหลด logo แล้วแปลงเป็น base64"""
-        if os.path.exists(self.logo_path):
-            try:
-                with open(self.logo_path, "rb") as img_file:
-                    return base64.b64encode(img_file.read()).decode()
-            except Exception as e:
-                print(f"ไม่สามารถโหลด logo: {e}")
-        return ""
+        """โหลด logo แล้วแปลงเป็น base64 (อ่านไฟล์ครั้งเดียวต่อ path)"""
+        return load_asset_base64(self.logo_path)
     
     def _format_number(self, value) -> str:
         """จัดรูปแบบตัวเลข (ลบทศนิยม)"""
@@ -66,7 +63,6 @@ class TelcoMobileSummonsGenerator:
         # ดึงข้อมูลวันที่ (แปลงจาก document_date)
         date_thai = ''
         if telco_data.get('document_date'):
-            from app.utils.thai_date_utils import format_date_to_thai_buddhist_era
             date_thai = format_date_to_thai_buddhist_era(telco_data.get('document_date'))
         
         # ดึงข้อมูลจาก criminal_case
@@ -79,282 +75,18 @@ class TelcoMobileSummonsGenerator:
         # สร้าง title ตามที่ต้องการ
         html_title = f"หมายเรียกพยานเอกสาร{document_no} ลงวันที่ {date_thai}"
         
-        # สร้าง HTML (คัดลอกทั้งหมดจากระบบธนาคาร - รอปรับแต่งในรอบถัดไป)
-        html_content = f"""<!DOCTYPE html>
-<html lang="th">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>{html_title}</title>
-    <style>
-        @import url('https://fonts.googleapis.com/css2?family=Sarabun:wght@400;600;700&display=swap');
-
-        * {{
-            margin: 0;
-            padding: 0;
-            box-sizing: border-box;
-        }}
-
-        body {{
-            font-family: 'Sarabun', 'THSarabunNew', sans-serif;
-            font-size: 16px;
-            line-height: 1.4;
-            color: #000;
-            background: white;
-        }}
-
-        .page {{
-            width: 210mm;
-            min-height: 297mm;
-            margin: 0 auto;
-            padding: 8mm 20mm 10mm 20mm;
-            background: white;
-            box-shadow: 0 0 10px rgba(0,0,0,0.1);
-        }}
-
-        .header {{
-            position: relative;
-            margin-bottom: 20px;
-        }}
-
-        .urgent {{
-            position: absolute;
-            top: 0;
-            left: 0;
-            color: red;
-            font-weight: bold;
-            font-size: 18px;
-        }}
-
-        .document-number {{
-            position: absolute;
-            top: 25px;
-            left: 0;
-            font-size: 16px;
-        }}
-
-        .logo {{
-            position: absolute;
-            top: 0;
-            left: 50%;
-            transform: translateX(-50%);
-            width: 108px;
-            height: 108px;
-        }}
-
-        .agency {{
-            position: absolute;
-            top: 25px;
-            right: 0;
-            text-align: right;
-            font-size: 14px;
-            line-height: 1.2;
-        }}
-
-        .date {{
-            text-align: center;
-            margin-top: 140px;
-            font-size: 16px;
-        }}
-
-        .content {{
-            margin-top: 15px;
-        }}
-
-        .subject {{
-            margin-bottom: 10px;
-        }}
-
-        .subject-label {{
-            font-weight: bold;
-            display: inline;
-        }}
-
-        .to {{
-            margin-bottom: 10px;
-        }}
-
-        .to-label {{
-            font-weight: bold;
-            display: inline;
-        }}
-
-        .paragraph {{
-            margin-bottom: 12px;
-            text-align: justify;
-            text-indent: 2em;
-        }}
-
-        .bank-table {{
-            width: 100%;
-            border-collapse: collapse;
-            margin: 15px 0;
-        }}
-
-        .bank-table th,
-        .bank-table td {{
-            border: 1px solid #000;
-            padding: 8px;
-            text-align: center;
-            font-size: 14px;
-        }}
-
-        .bank-table th {{
-            font-weight: bold;
-            background-color: #f5f5f5;
-        }}
-
-        .authority {{
-            margin-top: 12px;
-            text-align: justify;
-            text-indent: 2em;
-        }}
-
-        .document-list {{
-            margin-top: 12px;
-        }}
-
-        .document-list ol {{
-            padding-left: 2em;
-        }}
-
-        .document-list li {{
-            margin-bottom: 8px;
-            text-align: justify;
-        }}
-
-        .signature {{
-            margin-top: 20px;
-            text-align: center;
-        }}
-
-        .signature-line {{
-            margin-bottom: 10px;
-        }}
-
-        .signature-title {{
-            margin-bottom: 10px;
-            text-align: left;
-            padding-left: 200px;
-        }}
-
-        @media print {{
-            body {{
-                font-size: 14px;
-            }}
-            .page {{
-                width: 210mm;
-                height: 297mm;
-                margin: 0;
-                padding: 15mm 20mm;
-                box-shadow: none;
-                page-break-after: always;
-            }}
-            .page:last-child {{
-                page-break-after: avoid;
-            }}
-            .header {{
-                margin-bottom: 15px;
-            }}
-            .date {{
-                margin-top: 130px;
-            }}
-        }}
-    </style>
-</head>
-<body>
-    <!-- หน้าที่ 1 -->
-    <div class="page">
-        <div class="header">
-            <div class="urgent">ด่วนที่สุด</div>
-            <div class="document-number">
-                ที่ {document_no}<br>
-                หมายเรียกพยานเอกสาร
-            </div>
-            {"<img src='data:image/jpeg;base64," + self.logo_base64 + "' class='logo' alt='Logo'>" if self.logo_base64 else ""}
-            <div class="agency">
-                กองกำกับการ 1 กองบังคับการตำรวจสืบสวน<br>
-                สอบสวนอาชญากรรมทางเทคโนโลยี 4
-            </div>
-        </div>
-
-        <div class="date">{date_thai}</div>
-
-        <div class="content">
-            <div class="subject">
-                <span class="subject-label">เรื่อง</span>
-                &nbsp;&nbsp;{subject_text}
-            </div>
-
-            <div class="to">
-                <span class="to-label">เรียน</span>
-                &nbsp;&nbsp;กรรมการผู้จัดการ{company_name}
-            </div>
-
-            <div class="paragraph">
-                ด้วยเหตุ {victim_name} (case id : {case_id}) ได้แจ้งความร้องทุกข์ต่อพนักงานสอบสวน ให้
-                ดำเนินคดีกับคนร้าย ซึ่งมีการใช้งานหมายเลขโทรศัพท์ {phone_number} ที่มีส่วนเกี่ยวข้องในกระทำความผิดอาญา 
-                จึงขอให้ท่านดำเนินการจัดส่งรายละเอียดผู้ลงทะเบียนและข้อมูลอื่น ๆ ดังนี้
-            </div>
-
-            <table class="bank-table">
-                <thead>
-                    <tr>
-                        <th>ผู้ให้บริการ</th>
-                        <th>หมายเลขโทรศัพท์</th>
-                        <th>ช่วงเวลาขอข้อมูล</th>
-                    </tr>
-                </thead>
-                <tbody>
-                    <tr>
-                        <td>{provider_name}</td>
-                        <td>{phone_number}</td>
-                        <td>{time_period if time_period else '-'}</td>
-                    </tr>
-                </tbody>
-            </table>
-
-            <div class="authority">
-                อาศัยอำนาจตามประมวลกฎหมายวิธีพิจารณาความอาญา พุทธศักราช 2477 มาตรา 52,131,132(3),(4) และ
-                133 ฉะนั้นให้ท่านมาพบพนักงานสอบสวนหรือนำส่งเอกสารตามรายละเอียดดังต่อไปนี้
-            </div>
-
-            <div class="document-list">
-                <ol>
-                    <li>หมายเลขโทรศัพท์ดังกล่าว ลงทะเบียนไว้ในชื่อบุคคลใด</li>
-
-                    <li>หมายเลขโทรศัพท์ดังกล่าว เปิดใช้ตั้งแต่เมื่อใด สถานที่ให้บริการจุดใด</li>
-
-                    <li>มีการขอให้จัดส่งใบแจ้งค่าบริการไปยังที่อยู่ใด</li>
-
-                    <li>พื้นที่การใช้ (BASE)  และขอทราบข้อมูลการใช้ (CELL SITE) ในห้วงเวลาข้างต้น และ ห้วงเวลาปัจจุบัน ย้อนหลังไป 3 เดือน</li>
-
-                    <li>รายละเอียดของการใช้งานไอพีแอดเดรส ของหมายเลข โทรศัพท์ดังกล่าว</li>
-                </ol>
-            </div>
-
-            <div class="paragraph">
-                ทั้งนี้ให้สำเนาข้อมูลดังกล่าวเป็นเอกสาร/แผ่นบันทึกข้อมูล (DVD Rom) ส่งมาที่ "พ.ต.ต.อำพล ทอง
-                อร่าม ที่อยู่ กองกำกับการ 1 กองบังคับการตำรวจสืบสวนสอบสวนอาชญากรรมทางเทคโนโลยี 4 เลขที่ 370 หมู่ 3
-                ตำบลดอนแก้ว อำเภอแม่ริม จังหวัดเชียงใหม่ 50180" และ อีเมล์ <strong style="color: #0066cc;">ampon.th@police.go.th</strong> ภายใน 7 วัน นับ
-                แต่ได้รับหมายเรียกนี้
-            </div>
-
-            <div class="signature">
-                <div class="signature-line">ขอแสดงความนับถือ</div>
-                <br>
-                <div class="signature-title">พันตำรวจตรี</div>
-                <div class="signature-line">( อำพล ทองอร่าม )</div>
-                <div class="signature-line">สารวัตร (สอบสวน)ฯ ปฏิบัติราชการแทน</div>
-                <div class="signature-line">ผู้กำกับการกองกำกับการ 1 กองบังคับการตำรวจสืบสวนสอบสวนอาชญากรรมทางเทคโนโลยี 4</div>
-            </div>
-        </div>
-    </div>
-
-</body>
-</html>
-"""
-        return html_content
+        return render_summons('telco_mobile_letter.html', {
+            'html_title': html_title,
+            'document_no': document_no,
+            'date_thai': date_thai,
+            'subject_text': subject_text,
+            'company_name': company_name,
+            'provider_name': provider_name,
+            'phone_number': phone_number,
+            'time_period': time_period,
+            'victim_name': victim_name,
+            'case_id': case_id,
+        }, logo_path=self.logo_path)
     
     def generate_telco_mobile_envelope_html(self, telco_data: Dict, telco_address: Optional[Dict] = None) -> str:
         """
@@ -435,141 +167,8 @@ class TelcoMobileSummonsGenerator:
             if line4_parts:
                 address_lines.append(' '.join(line4_parts))
         
-        # สร้าง HTML (รูปแบบเดียวกับซองธนาคาร)
-        html_content = f"""<!DOCTYPE html>
-<html lang="th">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>ซองหมายเรียก</title>
-    <style>
-        @import url('https://fonts.googleapis.com/css2?family=Sarabun:wght@400;700&display=swap');
-
-        @page {{
-            size: A4;
-            margin: 0.5cm 0.2cm 1.5cm 0.5cm;
-        }}
-
-        body {{
-            font-family: 'Sarabun', sans-serif;
-            font-size: 16px;
-            line-height: 1.5;
-            margin: 0;
-            padding: 0;
-            width: 210mm;
-            height: 297mm;
-            box-sizing: border-box;
-            position: relative;
-        }}
-
-        .absolute {{
-            position: absolute;
-        }}
-
-        #header-left {{
-            top: 0.5cm;
-            left: 0.5cm;
-            font-weight: bold;
-            max-width: 8cm;
-        }}
-
-        #postage-box {{
-            top: 0.5cm;
-            right: 0.2cm;
-            border: 1px solid black;
-            padding: 5px 10px;
-            text-align: center;
-            width: 5cm;
-        }}
-
-        #recipient-address {{
-            top: 2.5cm;
-            left: 9cm;
-        }}
-
-        #recipient-address .label {{
-            font-weight: bold;
-        }}
-
-        #recipient-address table {{
-            border-collapse: collapse;
-            margin-top: 5px;
-        }}
-
-        #recipient-address td {{
-            padding: 2px 0;
-            vertical-align: top;
-        }}
-
-        .fold-line {{
-            position: absolute;
-            left: 0;
-            right: 0;
-            height: 2px;
-            border-top: 2px dashed #333;
-            opacity: 0.8;
-        }}
-
-        .fold-line-1 {{
-            top: 9.9cm;
-        }}
-
-        .fold-line-2 {{
-            display: none;
-        }}
-
-        @media print {{
-            .fold-line {{
-                opacity: 0.3;
-            }}
-        }}
-    </style>
-</head>
-<body>
-
-    <div id="header-left" class="absolute">
-        <div style="display: flex; align-items: flex-start;">
-            <div style="margin-right: 8px;">
-                {"<img src='data:image/jpeg;base64," + self.logo_base64 + "' style='width: 67px; height: 67px;' alt='ตราครุฑ'>" if self.logo_base64 else "<div style='width: 67px; height: 67px; background: #ccc; border-radius: 50%; text-align: center; line-height: 67px; font-size: 14px;'>ตรา</div>"}
-            </div>
-            <div style="font-size: 12px; line-height: 1.2; font-weight: bold;">
-                ใช้ในราชการสำนักงานตำรวจแห่งชาติ<br>
-                กองกำกับการ 1 กองบังคับการตำรวจสืบสวน<br>
-                สอบสวนอาชญากรรมทางเทคโนโลยี 4<br>
-                เลขที่ 370 หมู่ 3 ตำบลดอนแก้ว อำเภอแม่ริม<br>
-                จังหวัดเชียงใหม่ 50180
-            </div>
-        </div>
-    </div>
-
-    <div id="postage-box" class="absolute">
-        <p style="margin: 0; padding: 0;">ชำระฝากส่งเป็นรายเดือน<br>ใบอนุญาตที่ ๑๙๙/๒๕๖๘<br>ไปรษณีย์ ศาลากลาง ชม.</p>
-    </div>
-
-    <div id="recipient-address" class="absolute">
-        <p class="label">กรุณาส่ง</p>
-        <table>
-            <tr>
-                <td>{provider_name}</td>
-            </tr>
-"""
-        
-        # เพิ่มแต่ละบรรทัดของที่อยู่
-        for address_line in address_lines:
-            html_content += f"""            <tr>
-                <td>{address_line}</td>
-            </tr>
-"""
-        
-        html_content += """        </table>
-    </div>
-
-    <!-- เส้นแบ่งส่วนสำหรับพับซอง -->
-    <div class="fold-line fold-line-1"></div>
-    <div class="fold-line fold-line-2"></div>
-
-</body>
-</html>
-"""
-        return html_content
+        return render_summons('envelope.html', {
+            'recipient_name': provider_name,
+            'address_lines': address_lines,
+        }, logo_path=self.logo_path)
 
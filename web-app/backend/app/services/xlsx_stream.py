@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Streaming XLSX writer
+
+เขียนไฟล์ .xlsx ทีละแถวและทยอยส่งออกทันที (หน่วยความจำคงที่ ไม่ขึ้นกับจำนวนแถว)
+- ข้อความเป็น inline string (ไม่มี shared strings table ที่โตตามข้อมูล)
+- worksheet ถูกบีบอัดลง ZIP แบบ streaming ระหว่างวนแถว (ไม่มีไฟล์ชั่วคราว)
+- workbook.xml / [Content_Types].xml เขียนท้ายไฟล์ เมื่อรู้ชื่อ sheet ครบแล้ว
+
+โครงสร้าง SpreadsheetML แบบเดียวกับ excel_writer.py ของ desktop app
+"""
+
+import math
+import re
+import zipfile
+from datetime import date, datetime, time, timedelta, timezone
+from decimal import Decimal
+from functools import lru_cache
+from typing import Any, Iterable, Iterator, List, Sequence, Tuple
+from xml.sax.saxutils import escape, quoteattr
+
+from app.utils.zip_stream import ZipStreamBuffer
+
+# (ชื่อ sheet, หัวคอลัมน์, แถวข้อมูล)
+Sheet = Tuple[str, Sequence[str], Iterable[Sequence[Any]]]
+
+FLUSH_ROWS = 500  # ส่งข้อมูลที่บีบอัดแล้วออกทุก ๆ กี่แถว
+
+# เวลาใน Excel ไม่มี timezone: แปลง timestamp ที่มี timezone เป็นเวลาไทยก่อน
+EXPORT_TIMEZONE = timezone(timedelta(hours=7))
+EXCEL_EPOCH = datetime(1899, 12, 30)
+
+STYLE_HEADER = 1
+STYLE_DATE = 2
+STYLE_DATETIME = 3
+
+_INVALID_XML_CHARS = re.compile(r"[\x00-\x08\x0b\x0c\x0e-\x1f\ufffe\uffff]")
+_INVALID_SHEET_CHARS = re.compile(r"[\[\]:*?/\\]")
+
+CONTENT_TYPES_HEAD = """<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">
+<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>
+<Default Extension="xml" ContentType="application/xml"/>
+<Override PartName="/xl/workbook.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>
+<Override PartName="/xl/styles.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.styles+xml"/>
+"""
+
+ROOT_RELS = """<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">
+<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" Target="xl/workbook.xml"/>
+</Relationships>"""
+
+STYLES = """<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<styleSheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">
+<numFmts count="2"><numFmt numFmtId="164" formatCode="yyyy-mm-dd"/><numFmt numFmtId="165" formatCode="yyyy-mm-dd hh:mm:ss"/></numFmts>
+<fonts count="2"><font><sz val="11"/><name val="Calibri"/></font><font><b/><sz val="11"/><name val="Calibri"/></font></fonts>
+<fills count="2"><fill><patternFill patternType="none"/></fill><fill><patternFill patternType="gray125"/></fill></fills>
+<borders count="1"><border><left/><right/><top/><bottom/><diagonal/></border></borders>
+<cellStyleXfs count="1"><xf numFmtId="0" fontId="0" fillId="0" borderId="0"/></cellStyleXfs>
+<cellXfs count="4">
+<xf numFmtId="0" fontId="0" fillId="0" borderId="0" xfId="0"/>
+<xf numFmtId="0" fontId="1" fillId="0" borderId="0" xfId="0" applyFont="1"/>
+<xf numFmtId="164" fontId="0" fillId="0" borderId="0" xfId="0" applyNumberFormat="1"/>
+<xf numFmtId="165" fontId="0" fillId="0" borderId="0" xfId="0" applyNumberFormat="1"/>
+</cellXfs>
+<cellStyles count="1"><cellStyle name="Normal" xfId="0" builtinId="0"/></cellStyles>
+</styleSheet>"""
+
+# แถวหัวตารางถูกตรึงไว้ด้านบน
+SHEET_HEAD = """<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">
+<sheetViews><sheetView workbookViewId="0"><pane ySplit="1" topLeftCell="A2" activePane="bottomLeft" state="frozen"/></sheetView></sheetViews>
+<sheetData>
+"""
+SHEET_TAIL = """</sheetData>
+</worksheet>"""
+
+
+@lru_cache(maxsize=None)
+def column_letter(index: int) -> str:
+    """ชื่อคอลัมน์แบบ Excel จากลำดับ (1 → A, 27 → AA)"""
+    letters = ""
+    while index > 0:
+        index, remainder = divmod(index - 1, 26)
+        letters = chr(65 + remainder) + letters
+    return letters
+
+
+def _excel_serial(value: datetime) -> float:
+    return (value - EXCEL_EPOCH) / timedelta(days=1)
+
+
+def _text_cell(ref: str, text: str, style: int = 0) -> str:
+    text = escape(_INVALID_XML_CHARS.sub("", text)) if not text.isalnum() else text
+    style_attr = f' s="{style}"' if style else ""
+    return f'<c r="{ref}" t="inlineStr"{style_attr}><is><t xml:space="preserve">{text}</t></is></c>'
+
+
+def _cell(ref: str, value: Any) -> str:
+    kind = type(value)
+    if kind is str:
+        return _text_cell(ref, value) if value else ""
+    if value is None:
+        return ""
+    if kind is int or kind is Decimal:
+        return f'<c r="{ref}"><v>{value}</v></c>'
+    if isinstance(value, bool):
+        return f'<c r="{ref}" t="b"><v>{int(value)}</v></c>'
+    if isinstance(value, (int, Decimal)):
+        return f'<c r="{ref}"><v>{value}</v></c>'
+    if isinstance(value, float):
+        if math.isfinite(value):
+            return f'<c r="{ref}"><v>{value!r}</v></c>'
+        return _text_cell(ref, str(value))
+    if isinstance(value, datetime):
+        if value.tzinfo is not None:
+            value = value.astimezone(EXPORT_TIMEZONE).replace(tzinfo=None)
+        return f'<c r="{ref}" s="{STYLE_DATETIME}"><v>{_excel_serial(value)}</v></c>'
+    if isinstance(value, date):
+        return f'<c r="{ref}" s="{STYLE_DATE}"><v>{(value - EXCEL_EPOCH.date()).days}</v></c>'
+    if isinstance(value, time):
+        return _text_cell(ref, value.isoformat())
+    return _text_cell(ref, str(value))
+
+
+def _row(number: int, values: Sequence[Any]) -> str:
+    cells = "".join([_cell(f"{column_letter(col)}{number}", value) for col, value in enumerate(values, 1)])
+    return f'<row r="{number}">{cells}</row>\n'
+
+
+def _header_row(headers: Sequence[str]) -> str:
+    cells = "".join(
+        _text_cell(f"{column_letter(col)}1", str(header), STYLE_HEADER) for col, header in enumerate(headers, 1)
+    )
+    return f'<row r="1">{cells}</row>\n'
+
+
+def _sheet_name(name: str, used: List[str]) -> str:
+    """ชื่อ sheet ที่ Excel ยอมรับ (ไม่เกิน 31 ตัวอักษร, ไม่มีอักขระต้องห้าม, ไม่ซ้ำ)"""
+    base = _INVALID_SHEET_CHARS.sub("_", name).strip("'")[:31] or "Sheet"
+    candidate, suffix = base, 2
+    while candidate.lower() in (n.lower() for n in used):
+        tag = f" ({suffix})"
+        candidate = base[:31 - len(tag)] + tag
+        suffix += 1
+    return candidate
+
+
+def _workbook_xml(names: List[str]) -> str:
+    sheets = "".join(
+        f'<sheet name={quoteattr(name)} sheetId="{i}" r:id="rId{i}"/>'
+        for i, name in enumerate(names, 1)
+    )
+    return (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+        '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+        'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+        f'<sheets>{sheets}</sheets></workbook>'
+    )
+
+
+def _workbook_rels(count: int) -> str:
+    relationships = "".join(
+        f'<Relationship Id="rId{i}" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet" '
+        f'Target="worksheets/sheet{i}.xml"/>'
+        for i in range(1, count + 1)
+    )
+    styles_id = count + 1
+    return (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+        f'{relationships}'
+        f'<Relationship Id="rId{styles_id}" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/styles" '
+        'Target="styles.xml"/></Relationships>'
+    )
+
+
+def _content_types(count: int) -> str:
+    overrides = "".join(
+        f'<Override PartName="/xl/worksheets/sheet{i}.xml" '
+        'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>\n'
+        for i in range(1, count + 1)
+    )
+    return CONTENT_TYPES_HEAD + overrides + "</Types>"
+
+
+def stream_xlsx(sheets: Iterable[Sheet], flush_rows: int = FLUSH_ROWS) -> Iterator[bytes]:
+    """
+    ทยอยสร้างไฟล์ .xlsx จาก sheets ที่ให้มา
+
+    rows ของแต่ละ sheet เป็น iterable ใดก็ได้ (เช่น ผลลัพธ์จาก Query.yield_per)
+    ถูกดึงทีละแถวเมื่อถึงคิว จึงไม่ต้องโหลดข้อมูลทั้งหมดไว้ในหน่วยความจำ
+    """
+    buffer = ZipStreamBuffer()
+    names: List[str] = []
+    with zipfile.ZipFile(buffer, mode="w", compression=zipfile.ZIP_DEFLATED) as archive:
+        for index, (name, headers, rows) in enumerate(sheets, start=1):
+            names.append(_sheet_name(name, names))
+            # force_zip64: ไม่รู้ขนาดของ sheet ล่วงหน้า (อาจเกิน 2 GB ก่อนบีบอัด)
+            with archive.open(f"xl/worksheets/sheet{index}.xml", mode="w", force_zip64=True) as sheet:
+                sheet.write((SHEET_HEAD + _header_row(headers)).encode("utf-8"))
+                pending = []
+                for number, values in enumerate(rows, start=2):
+                    pending.append(_row(number, values))
+                    if len(pending) >= flush_rows:
+                        sheet.write("".join(pending).encode("utf-8"))
+                        pending = []
+                        chunk = buffer.drain()
+                        if chunk:
+                            yield chunk
+                pending.append(SHEET_TAIL)
+                sheet.write("".join(pending).encode("utf-8"))
+            yield buffer.drain()
+
+        archive.writestr("xl/styles.xml", STYLES)
+        archive.writestr("xl/workbook.xml", _workbook_xml(names))
+        archive.writestr("xl/_rels/workbook.xml.rels", _workbook_rels(len(names)))
+        archive.writestr("_rels/.rels", ROOT_RELS)
+        archive.writestr("[Content_Types].xml", _content_types(len(names)))
+    yield buffer.drain()
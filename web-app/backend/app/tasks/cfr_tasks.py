@@ -0,0 +1,15 @@
+from typing import Optional
+from app.core.celery_app import celery_app
+from app.services.cfr_import import run_cfr_import_job
+
+
+@celery_app.task(name="cfr.import_file")
+def import_cfr_file_task(
+    job_id: str,
+    path: str,
+    criminal_case_id: int,
+    filename: str,
+    created_by: Optional[int] = None
+):
+    """นำเข้าไฟล์ CFR เบื้องหลัง (สถานะงานดูได้ที่ GET /cfr/jobs/{job_id})"""
+    run_cfr_import_job(job_id, path, criminal_case_id, filename, created_by)
@@ -6,8 +6,12 @@ Example: 1385/2568
 
 from datetime import datetime
 from sqlalchemy.orm import Session
-from sqlalchemy import func, extract, cast, Integer
+from sqlalchemy import func
 from app.models.criminal_case import CriminalCase
+from app.models.number_sequence import NumberSequence
+
+# number_sequences prefix of case numbers (see app.services.number_sequence)
+CASE_NUMBER_PREFIX = "CASE"
 
 
 def get_buddhist_year() -> int:
@@ -23,6 +27,10 @@ def generate_case_number(db: Session, custom_year: int = None) -> str:
     """
     Generate next case number in format: {number}/{year}
 
+    The number is reserved from the number_sequences counter
+    (app.services.number_sequence), so concurrent callers never get the same
+    number. It is released again if the caller's transaction rolls back.
+
     Args:
         db: Database session
         custom_year: Optional custom Buddhist year (default: current year)
@@ -34,29 +42,13 @@ def generate_case_number(db: Session, custom_year: int = None) -> str:
         >>> generate_case_number(db)
         "1385/2568"
     """
-    buddhist_year = custom_year or get_buddhist_year()
-    year_suffix = str(buddhist_year)
-
-    # Find the maximum number for this year
-    # Query pattern: {number}/{year}
-    max_number = db.query(
-        func.max(
-            cast(
-                func.split_part(CriminalCase.case_number, '/', 1),
-                Integer
-            )
-        )
-    ).filter(
-        CriminalCase.case_number.like(f'%/{year_suffix}')
-    ).scalar()
+    from app.services.number_sequence import next_number
 
-    # If no cases exist for this year, start from 1
-    next_number = (max_number or 0) + 1
+    buddhist_year = custom_year or get_buddhist_year()
+    number = next_number(db, CASE_NUMBER_PREFIX, buddhist_year)
 
     # Format: {number}/{year}
-    case_number = f"{next_number}/{buddhist_year}"
-
-    return case_number
+    return f"{number}/{buddhist_year}"
 
 
 def parse_case_number(case_number: str) -> dict:
@@ -127,17 +119,9 @@ def get_year_statistics(db: Session, year: int = None) -> dict:
         CriminalCase.case_number.like(f'%/{year_suffix}')
     ).scalar() or 0
 
-    # Get latest case number
-    latest_number = db.query(
-        func.max(
-            cast(
-                func.split_part(CriminalCase.case_number, '/', 1),
-                Integer
-            )
-        )
-    ).filter(
-        CriminalCase.case_number.like(f'%/{year_suffix}')
-    ).scalar() or 0
+    # Latest case number from the number_sequences counter
+    sequence = db.get(NumberSequence, (CASE_NUMBER_PREFIX, buddhist_year))
+    latest_number = sequence.last_value if sequence else 0
 
     return {
         "year": buddhist_year,
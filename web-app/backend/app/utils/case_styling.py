@@ -54,6 +54,15 @@ def is_case_over_6_months(complaint_date_str):
     
     return False
 
+def is_complaint_date_over_6_months(complaint_date):
+    """ตรวจสอบว่าคดีเก่ากว่า 6 เดือนหรือไม่ จาก date object (กติกาเดียวกับ is_case_over_6_months)"""
+    if not complaint_date:
+        return False
+
+    current_date = datetime.now()
+    months_diff = (current_date.year - complaint_date.year) * 12 + (current_date.month - complaint_date.month)
+    return months_diff >= 6
+
 def has_all_banks_replied(bank_accounts_count_str):
     """Check if all bank accounts have replied"""
     if not bank_accounts_count_str or '/' not in bank_accounts_count_str:
@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Normalize account numbers, phone numbers, PromptPay IDs and national ID cards
+for cross-case matching (ต้องตรงกับฟังก์ชัน normalize_identifier ใน migration 039)
+"""
+
+import re
+from typing import Dict, Optional
+
+IDENTIFIER_TYPES = ("account", "phone", "promptpay", "id_card")
+
+
+def normalize_identifier(identifier_type: str, value) -> Optional[str]:
+    """
+    แปลงค่าให้อยู่ในรูปแบบมาตรฐานสำหรับการเปรียบเทียบ
+
+    - account: ตัดช่องว่าง/ขีด/จุด, ตัวพิมพ์ใหญ่, รักษาเลข 0 หน้า
+    - phone/promptpay: ตัวเลขเท่านั้น, +66 → 0
+    - id_card: ตัวเลขเท่านั้น
+
+    Returns:
+        str หรือ None ถ้าไม่มีค่า
+    """
+    if value is None:
+        return None
+    value = str(value)
+
+    if identifier_type == "account":
+        normalized = re.sub(r"[^0-9A-Za-z]", "", value).upper()
+    else:
+        normalized = re.sub(r"[^0-9]", "", value)
+
+    if identifier_type in ("phone", "promptpay"):
+        if len(normalized) == 11 and normalized.startswith("66"):
+            normalized = "0" + normalized[2:]
+        elif identifier_type == "phone" and len(normalized) == 9 and not normalized.startswith("0"):
+            # เลข 0 หน้าหายจาก Excel
+            normalized = "0" + normalized
+
+    return normalized or None
+
+
+def normalize_all_types(value) -> Dict[str, str]:
+    """normalize ค่าเดียวกันในทุกประเภท (ใช้ค้นหาเมื่อไม่ระบุประเภท)"""
+    result = {}
+    for identifier_type in IDENTIFIER_TYPES:
+        normalized = normalize_identifier(identifier_type, value)
+        if normalized:
+            result[identifier_type] = normalized
+    return result
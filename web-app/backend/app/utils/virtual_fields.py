@@ -6,9 +6,24 @@ Utility functions for computing virtual fields
 """
 
 from datetime import date
-from typing import Optional
+from typing import Dict, Iterable, Optional
+from sqlalchemy import func
 from sqlalchemy.orm import Session
-from app.models import BankAccount, Suspect
+from app.models import (
+    BankAccount, Suspect, NonBankAccount, PaymentGatewayAccount,
+    TelcoMobileAccount, TelcoInternetAccount
+)
+
+# ตารางลูกของคดีที่ต้องแสดงผลในรูปแบบ "ทั้งหมด/ตอบกลับแล้ว"
+# key = ชื่อ virtual field ใน CriminalCaseResponse
+CASE_COUNT_MODELS = {
+    "bank_accounts_count": BankAccount,
+    "suspects_count": Suspect,
+    "non_bank_accounts_count": NonBankAccount,
+    "payment_gateway_accounts_count": PaymentGatewayAccount,
+    "telco_mobile_accounts_count": TelcoMobileAccount,
+    "telco_internet_accounts_count": TelcoInternetAccount,
+}
 
 def format_thai_date(date_obj: Optional[date]) -> Optional[str]:
     """
@@ -110,6 +125,75 @@ def get_suspects_count(db: Session, case_id: int) -> str:
     return f"{total}/{replied}"
 
 
+def get_case_counts_batch(db: Session, case_ids: Iterable[int]) -> Dict[int, Dict[str, str]]:
+    """
+    คำนวณจำนวนทั้งหมด/ตอบกลับแล้ว ของทุกตารางลูกสำหรับหลายคดีพร้อมกัน
+
+    ใช้ 1 query แบบ GROUP BY ต่อ 1 ตาราง ไม่ว่าจะมีกี่คดี
+    (แทนการเรียก COUNT 2 ครั้งต่อตารางต่อคดี)
+
+    Args:
+        db: Database session
+        case_ids: รายการ ID ของคดี
+
+    Returns:
+        dict: {case_id: {"bank_accounts_count": "10/5", "suspects_count": "8/3", ...}}
+              คดีที่ไม่มีข้อมูลลูกจะได้ค่า "0/0"
+    """
+    case_ids = list(dict.fromkeys(case_ids))
+    counts = {
+        case_id: {field: "0/0" for field in CASE_COUNT_MODELS}
+        for case_id in case_ids
+    }
+    if not case_ids:
+        return counts
+
+    for field, model in CASE_COUNT_MODELS.items():
+        rows = db.query(
+            model.criminal_case_id,
+            func.count(model.id),
+            func.count(model.id).filter(model.reply_status == True)
+        ).filter(
+            model.criminal_case_id.in_(case_ids)
+        ).group_by(model.criminal_case_id).all()
+
+        for case_id, total, replied in rows:
+            counts[case_id][field] = f"{total}/{replied}"
+
+    return counts
+
+
+def get_case_counts(db: Session, cases: Iterable) -> Dict[int, Dict[str, str]]:
+    """
+    อ่านจำนวนทั้งหมด/ตอบกลับแล้ว จากตาราง case_summary (CriminalCase.summary)
+
+    ควรโหลด CriminalCase.summary มาพร้อมคดี (joinedload) เพื่อให้ได้ใน query เดียว
+    คดีที่ยังไม่มีแถวสรุป (เช่น ยังไม่ได้ rebuild) จะคำนวณด้วย get_case_counts_batch() แทน
+
+    Returns:
+        dict: รูปแบบเดียวกับ get_case_counts_batch()
+    """
+    counts = {}
+    missing = []
+    for case in cases:
+        summary = case.summary
+        if summary is None:
+            missing.append(case.id)
+            continue
+        counts[case.id] = {
+            field: "{}/{}".format(
+                getattr(summary, field.replace("_count", "_total")),
+                getattr(summary, field.replace("_count", "_replied"))
+            )
+            for field in CASE_COUNT_MODELS
+        }
+
+    if missing:
+        counts.update(get_case_counts_batch(db, missing))
+
+    return counts
+
+
 def calculate_age_in_months(complaint_date: Optional[date]) -> Optional[int]:
     """
     คำนวณอายุคดีเป็นเดือน
@@ -0,0 +1,30 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Write-only buffer for streaming ZIP output
+"""
+
+from typing import List
+
+
+class ZipStreamBuffer:
+    """
+    Write-only buffer สำหรับ ZipFile แบบ streaming (ไม่รองรับ seek)
+
+    ZipFile เขียนข้อมูลลง buffer แล้วผู้เรียกดึงออกด้วย drain() เพื่อส่งต่อทันที
+    """
+
+    def __init__(self):
+        self._chunks: List[bytes] = []
+
+    def write(self, data: bytes) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self) -> None:
+        pass
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks = []
+        return data
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Backfill typed CFR columns (transfer_at, to_open_on, to_close_on, inserted_at)
+
+migration 042 แปลงข้อมูลเดิมระหว่างย้ายตารางแล้ว ใช้สคริปต์นี้เติมแถวที่ยังว่าง
+เช่น แถวที่นำเข้าด้วยโค้ดเวอร์ชันเก่าระหว่าง deploy หรือหลังปรับ cfr_parse_timestamp
+ทำทีละช่วง id และ commit ทุกช่วง (ไม่ล็อกตารางนาน หยุดแล้วรันต่อได้)
+    python backfill_cfr_typed_columns.py                 # ทั้งตาราง
+    python backfill_cfr_typed_columns.py 50000           # ช่วงละ 50,000 id
+    python backfill_cfr_typed_columns.py 50000 1200000   # เริ่มจาก id 1,200,000
+"""
+
+import sys
+import os
+import time
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from sqlalchemy import text
+from app.core.database import SessionLocal
+
+BATCH_SIZE = 20000
+
+def backfill_cfr_typed_columns(batch_size=BATCH_SIZE, start_id=None):
+    """Fill typed CFR columns in id ranges using backfill_cfr_typed_columns() from migration 042"""
+    print("=" * 80)
+    print("🔄 เติมคอลัมน์วันที่/เวลาแบบมีชนิดข้อมูลของตาราง cfr")
+    print("=" * 80)
+
+    db = SessionLocal()
+
+    try:
+        min_id, max_id = db.execute(text("SELECT MIN(id), MAX(id) FROM cfr")).one()
+        if max_id is None:
+            print("ℹ️  ตาราง cfr ไม่มีข้อมูล")
+            return True
+
+        from_id = max(start_id or min_id, min_id)
+        total = 0
+        started = time.perf_counter()
+        while from_id <= max_id:
+            to_id = from_id + batch_size
+            updated = db.execute(
+                text("SELECT backfill_cfr_typed_columns(:from_id, :to_id)"),
+                {"from_id": from_id, "to_id": to_id}
+            ).scalar()
+            db.commit()
+            total += updated
+            print(f"   id {from_id:,} - {to_id - 1:,}: อัพเดท {updated:,} แถว")
+            from_id = to_id
+
+        print(f"✅ อัพเดททั้งหมด {total:,} แถว ({time.perf_counter() - started:.1f} วินาที)")
+        return True
+
+    except Exception as e:
+        db.rollback()
+        print(f"❌ เกิดข้อผิดพลาด: {e}")
+        return False
+
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    args = [int(arg) for arg in sys.argv[1:3]]
+    success = backfill_cfr_typed_columns(*args)
+    sys.exit(0 if success else 1)
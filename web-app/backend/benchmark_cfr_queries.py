@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark CFR queries (EXPLAIN ANALYZE)
+
+วัดเวลา query หลักของตาราง cfr ด้วย query เดียวกับที่ API ใช้
+รันก่อนและหลัง migration 042 แล้วเทียบผล
+    python benchmark_cfr_queries.py                          # แสดงผล
+    python benchmark_cfr_queries.py after.json               # บันทึกผลเป็น JSON
+    python benchmark_cfr_queries.py after.json before.json   # บันทึก + เทียบกับผลก่อนหน้า
+"""
+
+import sys
+import os
+import json
+import statistics
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from datetime import timedelta
+from sqlalchemy import func, text
+from app.core.database import SessionLocal
+from app.models import CFR
+from app.services.case_search_service import encode_cursor
+from app.services.cfr_records import (
+    CURSOR_KEY, account_transfers_query, cfr_records_query, order_by_transfer
+)
+
+RUNS = 5
+PAGE_SIZE = 100
+
+def _explain(db, query, runs=RUNS):
+    """EXPLAIN (ANALYZE, BUFFERS) ของ query → เวลากลาง (ms), buffers, node บนสุดของแผน"""
+    statement = query.statement if hasattr(query, "statement") else query
+    sql = str(statement.compile(dialect=db.get_bind().dialect, compile_kwargs={"literal_binds": True}))
+    timings = []
+    for _ in range(runs):
+        plan = db.execute(text(f"EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) {sql}")).scalar()
+        plan = plan if isinstance(plan, list) else json.loads(plan)
+        timings.append(plan[0]["Execution Time"])
+    root = plan[0]["Plan"]
+    node = root
+    while node.get("Plans") and node["Node Type"] in ("Limit", "Aggregate", "Result", "Gather", "Gather Merge"):
+        node = node["Plans"][0]
+    return {
+        "ms": round(statistics.median(timings), 3),
+        "buffers": root.get("Shared Hit Blocks", 0) + root.get("Shared Read Blocks", 0),
+        "plan": node["Node Type"] + (f" ({node['Index Name']})" if node.get("Index Name") else ""),
+    }
+
+def _benchmark_queries(db):
+    """query ที่วัดผล (ชื่อ → query) โดยเลือกคดี/บัญชีที่มีข้อมูลมากที่สุด"""
+    case_id, case_rows = db.query(CFR.criminal_case_id, func.count(CFR.id)).group_by(
+        CFR.criminal_case_id
+    ).order_by(func.count(CFR.id).desc()).first()
+    account_no = db.query(CFR.to_account_no).filter(CFR.to_account_no.isnot(None)).group_by(
+        CFR.to_account_no
+    ).order_by(func.count(CFR.id).desc()).limit(1).scalar()
+    first_at, last_at = db.query(func.min(CFR.transfer_at), func.max(CFR.transfer_at)).one()
+    date_from = (first_at + (last_at - first_at) / 4).date()
+    date_to = date_from + timedelta(days=30)
+
+    records = cfr_records_query(db, case_id)
+    middle = case_rows // 2
+    deep_at, deep_id = order_by_transfer(records.with_entities(CFR.transfer_at, CFR.id)).offset(middle).first()
+    deep_cursor = encode_cursor(CURSOR_KEY, deep_at, deep_id)
+
+    print(f"คดี id={case_id} ({case_rows:,} แถว), บัญชี {account_no}, ช่วงวันที่ {date_from} - {date_to}")
+    return {
+        "records first page": order_by_transfer(records).limit(PAGE_SIZE),
+        "records deep page (OFFSET, old text order)": records.order_by(
+            CFR.transfer_date.desc(), CFR.transfer_time.desc()
+        ).offset(middle).limit(PAGE_SIZE),
+        "records deep page (keyset)": order_by_transfer(records, deep_cursor).limit(PAGE_SIZE),
+        "records count": records.with_entities(func.count(CFR.id)),
+        "case files": records.with_entities(
+            CFR.filename, func.count(CFR.id), func.max(CFR.upload_date)
+        ).group_by(CFR.filename),
+        "transfers into account in date range": order_by_transfer(
+            account_transfers_query(db, account_no, "in", date_from, date_to)
+        ).limit(PAGE_SIZE),
+        "transfers into account in date range (count)": account_transfers_query(
+            db, account_no, "in", date_from, date_to
+        ).with_entities(func.count(CFR.id)),
+        "all transfers in date range (count)": db.query(func.count(CFR.id)).filter(
+            CFR.transfer_at >= date_from, CFR.transfer_at < date_to
+        ),
+    }
+
+def benchmark_cfr_queries(output_path=None, baseline_path=None):
+    print("=" * 80)
+    print("⏱️  Benchmark query ของตาราง cfr")
+    print("=" * 80)
+
+    db = SessionLocal()
+
+    try:
+        total_rows = db.execute(text("SELECT COUNT(*) FROM cfr")).scalar()
+        partitioned = db.execute(text(
+            "SELECT EXISTS (SELECT 1 FROM pg_partitioned_table WHERE partrelid = 'cfr'::regclass)"
+        )).scalar()
+        print(f"จำนวนแถว {total_rows:,}, partitioned: {partitioned}")
+
+        results = {name: _explain(db, query) for name, query in _benchmark_queries(db).items()}
+
+        baseline = {}
+        if baseline_path:
+            with open(baseline_path, encoding="utf-8") as f:
+                baseline = json.load(f)["results"]
+
+        print()
+        for name, result in results.items():
+            line = f"{name:<48} {result['ms']:>10.3f} ms {result['buffers']:>8} buffers  {result['plan']}"
+            if name in baseline and result["ms"] > 0:
+                line += f"  (ก่อน {baseline[name]['ms']:.3f} ms, x{baseline[name]['ms'] / result['ms']:.1f})"
+            print(line)
+
+        if output_path:
+            with open(output_path, "w", encoding="utf-8") as f:
+                json.dump({"rows": total_rows, "partitioned": partitioned, "results": results}, f,
+                          ensure_ascii=False, indent=2)
+            print(f"\n💾 บันทึกผลที่ {output_path}")
+        return True
+
+    except Exception as e:
+        print(f"❌ เกิดข้อผิดพลาด: {e}")
+        return False
+
+    finally:
+        db.rollback()
+        db.close()
+
+if __name__ == "__main__":
+    success = benchmark_cfr_queries(*sys.argv[1:3])
+    sys.exit(0 if success else 1)
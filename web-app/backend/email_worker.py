@@ -0,0 +1,32 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Outbound email worker
+
+ดึงอีเมล์จากคิว email_logs มาสร้าง PDF และส่ง (retry แบบ exponential backoff)
+รันได้หลาย process พร้อมกัน
+    python email_worker.py          # รันต่อเนื่อง
+    python email_worker.py --once   # ส่ง 1 batch แล้วจบ
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app.services.email_queue import EmailQueueWorker
+from app.services.pdf_renderer import shutdown_browser_pool
+
+if __name__ == "__main__":
+    worker = EmailQueueWorker()
+    try:
+        if "--once" in sys.argv[1:]:
+            claimed = worker.run_once()
+            print(f"✅ ส่งอีเมล์จากคิว {claimed} รายการ")
+        else:
+            print("📧 Email worker started")
+            worker.run_forever()
+    except KeyboardInterrupt:
+        print("🛑 Email worker stopped")
+    finally:
+        worker.smtp_session.close()
+        shutdown_browser_pool()
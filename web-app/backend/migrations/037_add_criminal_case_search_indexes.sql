@@ -0,0 +1,17 @@
+-- 037_add_criminal_case_search_indexes.sql
+-- เพิ่ม indexes สำหรับการค้นหาคดีฝั่ง server (GET /criminal-cases/search)
+
+-- Keyset pagination: (คอลัมน์ที่เรียง, id)
+CREATE INDEX IF NOT EXISTS idx_criminal_cases_complaint_date_id ON criminal_cases(complaint_date DESC NULLS LAST, id DESC);
+CREATE INDEX IF NOT EXISTS idx_criminal_cases_owner_complaint_date_id ON criminal_cases(owner_id, complaint_date DESC NULLS LAST, id DESC);
+CREATE INDEX IF NOT EXISTS idx_criminal_cases_status_complaint_date ON criminal_cases(status, complaint_date DESC NULLS LAST);
+CREATE INDEX IF NOT EXISTS idx_criminal_cases_case_type ON criminal_cases(case_type);
+CREATE INDEX IF NOT EXISTS idx_criminal_cases_created_at_id ON criminal_cases(created_at DESC, id DESC);
+
+-- ค้นหาข้อความบางส่วน (ILIKE '%...%') ด้วย trigram
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+CREATE INDEX IF NOT EXISTS idx_criminal_cases_complainant_trgm ON criminal_cases USING gin (complainant gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_criminal_cases_case_id_trgm ON criminal_cases USING gin (case_id gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_criminal_cases_case_number_trgm ON criminal_cases USING gin (case_number gin_trgm_ops);
+
+SELECT 'Criminal case search indexes created successfully!' as status;
@@ -0,0 +1,192 @@
+-- 038_create_case_summary_table.sql
+-- สร้างตาราง case_summary เก็บจำนวนข้อมูลลูกของแต่ละคดี (ทั้งหมด/ตอบกลับแล้ว)
+-- อัพเดทอัตโนมัติด้วย trigger เมื่อมีการ INSERT/UPDATE/DELETE ในตารางลูก
+-- Backfill: SELECT rebuild_case_summary(); หรือ python rebuild_case_summary.py
+
+-- ========================================
+-- ตาราง case_summary
+-- ========================================
+
+CREATE TABLE IF NOT EXISTS case_summary (
+    criminal_case_id INTEGER PRIMARY KEY REFERENCES criminal_cases(id) ON DELETE CASCADE,
+    bank_accounts_total INTEGER NOT NULL DEFAULT 0,
+    bank_accounts_replied INTEGER NOT NULL DEFAULT 0,
+    non_bank_accounts_total INTEGER NOT NULL DEFAULT 0,
+    non_bank_accounts_replied INTEGER NOT NULL DEFAULT 0,
+    payment_gateway_accounts_total INTEGER NOT NULL DEFAULT 0,
+    payment_gateway_accounts_replied INTEGER NOT NULL DEFAULT 0,
+    telco_mobile_accounts_total INTEGER NOT NULL DEFAULT 0,
+    telco_mobile_accounts_replied INTEGER NOT NULL DEFAULT 0,
+    telco_internet_accounts_total INTEGER NOT NULL DEFAULT 0,
+    telco_internet_accounts_replied INTEGER NOT NULL DEFAULT 0,
+    suspects_total INTEGER NOT NULL DEFAULT 0,
+    suspects_replied INTEGER NOT NULL DEFAULT 0,
+    updated_at TIMESTAMPTZ DEFAULT NOW()
+);
+
+-- ========================================
+-- คำนวณสรุปใหม่สำหรับคดีที่ระบุ (ใช้ index criminal_case_id ของแต่ละตาราง)
+-- ========================================
+
+CREATE OR REPLACE FUNCTION refresh_case_summary(p_case_ids INTEGER[]) RETURNS VOID AS $$
+BEGIN
+    IF p_case_ids IS NULL OR array_length(p_case_ids, 1) IS NULL THEN
+        RETURN;
+    END IF;
+
+    INSERT INTO case_summary (
+        criminal_case_id,
+        bank_accounts_total,
+        bank_accounts_replied,
+        non_bank_accounts_total,
+        non_bank_accounts_replied,
+        payment_gateway_accounts_total,
+        payment_gateway_accounts_replied,
+        telco_mobile_accounts_total,
+        telco_mobile_accounts_replied,
+        telco_internet_accounts_total,
+        telco_internet_accounts_replied,
+        suspects_total,
+        suspects_replied,
+        updated_at
+    )
+    SELECT
+        c.id,
+        (SELECT COUNT(*) FROM bank_accounts x WHERE x.criminal_case_id = c.id),
+        (SELECT COUNT(*) FROM bank_accounts x WHERE x.criminal_case_id = c.id AND x.reply_status),
+        (SELECT COUNT(*) FROM non_bank_accounts x WHERE x.criminal_case_id = c.id),
+        (SELECT COUNT(*) FROM non_bank_accounts x WHERE x.criminal_case_id = c.id AND x.reply_status),
+        (SELECT COUNT(*) FROM payment_gateway_accounts x WHERE x.criminal_case_id = c.id),
+        (SELECT COUNT(*) FROM payment_gateway_accounts x WHERE x.criminal_case_id = c.id AND x.reply_status),
+        (SELECT COUNT(*) FROM telco_mobile_accounts x WHERE x.criminal_case_id = c.id),
+        (SELECT COUNT(*) FROM telco_mobile_accounts x WHERE x.criminal_case_id = c.id AND x.reply_status),
+        (SELECT COUNT(*) FROM telco_internet_accounts x WHERE x.criminal_case_id = c.id),
+        (SELECT COUNT(*) FROM telco_internet_accounts x WHERE x.criminal_case_id = c.id AND x.reply_status),
+        (SELECT COUNT(*) FROM suspects x WHERE x.criminal_case_id = c.id),
+        (SELECT COUNT(*) FROM suspects x WHERE x.criminal_case_id = c.id AND x.reply_status),
+        NOW()
+    FROM criminal_cases c
+    WHERE c.id = ANY(p_case_ids)
+    ON CONFLICT (criminal_case_id) DO UPDATE SET
+        bank_accounts_total = EXCLUDED.bank_accounts_total,
+        bank_accounts_replied = EXCLUDED.bank_accounts_replied,
+        non_bank_accounts_total = EXCLUDED.non_bank_accounts_total,
+        non_bank_accounts_replied = EXCLUDED.non_bank_accounts_replied,
+        payment_gateway_accounts_total = EXCLUDED.payment_gateway_accounts_total,
+        payment_gateway_accounts_replied = EXCLUDED.payment_gateway_accounts_replied,
+        telco_mobile_accounts_total = EXCLUDED.telco_mobile_accounts_total,
+        telco_mobile_accounts_replied = EXCLUDED.telco_mobile_accounts_replied,
+        telco_internet_accounts_total = EXCLUDED.telco_internet_accounts_total,
+        telco_internet_accounts_replied = EXCLUDED.telco_internet_accounts_replied,
+        suspects_total = EXCLUDED.suspects_total,
+        suspects_replied = EXCLUDED.suspects_replied,
+        updated_at = EXCLUDED.updated_at;
+END;
+$$ LANGUAGE plpgsql;
+
+-- ========================================
+-- สร้างสรุปใหม่ทั้งหมด (backfill)
+-- ========================================
+
+CREATE OR REPLACE FUNCTION rebuild_case_summary() RETURNS INTEGER AS $$
+DECLARE
+    v_count INTEGER;
+BEGIN
+    DELETE FROM case_summary s
+    WHERE NOT EXISTS (SELECT 1 FROM criminal_cases c WHERE c.id = s.criminal_case_id);
+
+    PERFORM refresh_case_summary(ARRAY(SELECT id FROM criminal_cases));
+
+    SELECT COUNT(*) INTO v_count FROM case_summary;
+    RETURN v_count;
+END;
+$$ LANGUAGE plpgsql;
+
+-- ========================================
+-- Trigger functions (statement-level + transition tables
+-- เพื่อให้การ insert/delete หลายแถวในคำสั่งเดียวคำนวณใหม่ครั้งเดียวต่อคดี)
+-- ========================================
+
+CREATE OR REPLACE FUNCTION trg_case_summary_after_insert() RETURNS TRIGGER AS $$
+BEGIN
+    PERFORM refresh_case_summary(ARRAY(SELECT DISTINCT criminal_case_id FROM new_rows));
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION trg_case_summary_after_update() RETURNS TRIGGER AS $$
+BEGIN
+    PERFORM refresh_case_summary(ARRAY(
+        SELECT criminal_case_id FROM new_rows
+        UNION
+        SELECT criminal_case_id FROM old_rows
+    ));
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION trg_case_summary_after_delete() RETURNS TRIGGER AS $$
+BEGIN
+    PERFORM refresh_case_summary(ARRAY(SELECT DISTINCT criminal_case_id FROM old_rows));
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+-- สร้างแถวสรุปว่างเมื่อมีคดีใหม่
+CREATE OR REPLACE FUNCTION trg_case_summary_new_case() RETURNS TRIGGER AS $$
+BEGIN
+    INSERT INTO case_summary (criminal_case_id)
+    SELECT id FROM new_rows
+    ON CONFLICT (criminal_case_id) DO NOTHING;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS case_summary_new_case ON criminal_cases;
+CREATE TRIGGER case_summary_new_case
+    AFTER INSERT ON criminal_cases
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION trg_case_summary_new_case();
+
+DO $$
+DECLARE
+    t TEXT;
+BEGIN
+    FOREACH t IN ARRAY ARRAY[
+        'bank_accounts',
+        'non_bank_accounts',
+        'payment_gateway_accounts',
+        'telco_mobile_accounts',
+        'telco_internet_accounts',
+        'suspects'
+    ] LOOP
+        EXECUTE format('DROP TRIGGER IF EXISTS case_summary_insert ON %I', t);
+        EXECUTE format('DROP TRIGGER IF EXISTS case_summary_update ON %I', t);
+        EXECUTE format('DROP TRIGGER IF EXISTS case_summary_delete ON %I', t);
+
+        EXECUTE format('CREATE TRIGGER case_summary_insert AFTER INSERT ON %I '
+                       'REFERENCING NEW TABLE AS new_rows '
+                       'FOR EACH STATEMENT EXECUTE FUNCTION trg_case_summary_after_insert()', t);
+        EXECUTE format('CREATE TRIGGER case_summary_update AFTER UPDATE ON %I '
+                       'REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows '
+                       'FOR EACH STATEMENT EXECUTE FUNCTION trg_case_summary_after_update()', t);
+        EXECUTE format('CREATE TRIGGER case_summary_delete AFTER DELETE ON %I '
+                       'REFERENCING OLD TABLE AS old_rows '
+                       'FOR EACH STATEMENT EXECUTE FUNCTION trg_case_summary_after_delete()', t);
+    END LOOP;
+END;
+$$;
+
+-- ========================================
+-- Backfill ข้อมูลเดิม
+-- ========================================
+
+SELECT rebuild_case_summary();
+
+COMMENT ON TABLE case_summary IS 'สรุปจำนวนข้อมูลลูกของแต่ละคดี (อัพเดทด้วย trigger)';
+COMMENT ON COLUMN case_summary.bank_accounts_total IS 'จำนวนบัญชีธนาคารทั้งหมด';
+COMMENT ON COLUMN case_summary.bank_accounts_replied IS 'จำนวนบัญชีธนาคารที่ตอบกลับแล้ว';
+COMMENT ON COLUMN case_summary.suspects_total IS 'จำนวนผู้ต้องหาทั้งหมด';
+COMMENT ON COLUMN case_summary.suspects_replied IS 'จำนวนผู้ต้องหาที่มาตามนัดแล้ว';
+
+SELECT 'case_summary table created successfully!' as status;
@@ -0,0 +1,213 @@
+-- 039_create_identifier_links_table.sql
+-- สร้างตาราง identifier_links สำหรับค้นหาบัญชี/เบอร์โทร/PromptPay/เลขบัตรประชาชน
+-- ที่ปรากฏในหลายคดี (cross-case linkage)
+-- อัพเดทอัตโนมัติด้วย trigger, Backfill: SELECT rebuild_identifier_links();
+
+-- ========================================
+-- ตาราง identifier_links
+-- ========================================
+
+CREATE TABLE IF NOT EXISTS identifier_links (
+    identifier_type VARCHAR(20) NOT NULL,   -- account, phone, promptpay, id_card
+    identifier VARCHAR(100) NOT NULL,       -- ค่าที่ normalize แล้ว (รักษาเลข 0 หน้า)
+    criminal_case_id INTEGER NOT NULL REFERENCES criminal_cases(id) ON DELETE CASCADE,
+    source VARCHAR(50) NOT NULL,            -- ตารางต้นทาง เช่น bank_accounts, cfr
+    occurrences INTEGER NOT NULL DEFAULT 0, -- จำนวนแถวในตารางต้นทาง
+    PRIMARY KEY (identifier_type, identifier, criminal_case_id, source)
+);
+
+CREATE INDEX IF NOT EXISTS idx_identifier_links_identifier ON identifier_links(identifier);
+CREATE INDEX IF NOT EXISTS idx_identifier_links_case ON identifier_links(criminal_case_id, source);
+
+-- ========================================
+-- Normalize (ต้องตรงกับ app/utils/identifier_utils.py)
+-- ========================================
+
+CREATE OR REPLACE FUNCTION normalize_identifier(p_type TEXT, p_value TEXT) RETURNS TEXT AS $$
+DECLARE
+    v TEXT;
+BEGIN
+    IF p_value IS NULL THEN
+        RETURN NULL;
+    END IF;
+
+    IF p_type = 'account' THEN
+        v := upper(regexp_replace(p_value, '[^0-9A-Za-z]', '', 'g'));
+    ELSE
+        v := regexp_replace(p_value, '[^0-9]', '', 'g');
+    END IF;
+
+    IF p_type IN ('phone', 'promptpay') THEN
+        -- +66 8x-xxx-xxxx → 08xxxxxxxx
+        IF length(v) = 11 AND left(v, 2) = '66' THEN
+            v := '0' || substr(v, 3);
+        -- เลข 0 หน้าหายจาก Excel
+        ELSIF p_type = 'phone' AND length(v) = 9 AND left(v, 1) <> '0' THEN
+            v := '0' || v;
+        END IF;
+    END IF;
+
+    IF v = '' THEN
+        RETURN NULL;
+    END IF;
+    RETURN v;
+END;
+$$ LANGUAGE plpgsql IMMUTABLE;
+
+-- ========================================
+-- SELECT (identifier_type, identifier, criminal_case_id) จากตารางต้นทาง
+-- p_relation = ชื่อตาราง/transition table หรือ subquery
+-- ========================================
+
+CREATE OR REPLACE FUNCTION identifier_link_select(p_source TEXT, p_relation TEXT) RETURNS TEXT AS $$
+BEGIN
+    IF p_source IN ('bank_accounts', 'non_bank_accounts', 'payment_gateway_accounts') THEN
+        RETURN format($q$
+            SELECT 'account'::text AS identifier_type, normalize_identifier('account', account_number) AS identifier, criminal_case_id FROM %1$s
+        $q$, p_relation);
+    ELSIF p_source = 'telco_mobile_accounts' THEN
+        RETURN format($q$
+            SELECT 'phone'::text AS identifier_type, normalize_identifier('phone', phone_number) AS identifier, criminal_case_id FROM %1$s
+        $q$, p_relation);
+    ELSIF p_source = 'suspects' THEN
+        RETURN format($q$
+            SELECT 'id_card'::text AS identifier_type, normalize_identifier('id_card', suspect_id_card) AS identifier, criminal_case_id FROM %1$s
+        $q$, p_relation);
+    ELSIF p_source = 'cfr' THEN
+        RETURN format($q$
+            SELECT 'account'::text AS identifier_type, normalize_identifier('account', from_account_no) AS identifier, criminal_case_id FROM %1$s
+            UNION ALL
+            SELECT 'account', normalize_identifier('account', to_account_no), criminal_case_id FROM %1$s
+            UNION ALL
+            SELECT 'phone', normalize_identifier('phone', phone_number), criminal_case_id FROM %1$s
+            UNION ALL
+            SELECT 'promptpay', normalize_identifier('promptpay', promptpay_id), criminal_case_id FROM %1$s
+            UNION ALL
+            SELECT 'id_card', normalize_identifier('id_card', to_id), criminal_case_id FROM %1$s
+            WHERE length(normalize_identifier('id_card', to_id)) = 13
+        $q$, p_relation);
+    END IF;
+    RAISE EXCEPTION 'Unknown identifier source: %', p_source;
+END;
+$$ LANGUAGE plpgsql IMMUTABLE;
+
+-- SQL สำหรับเพิ่มจำนวนจากแถวใหม่ (ใช้ตอน INSERT)
+-- หมายเหตุ: transition table (new_rows) มองเห็นได้เฉพาะใน trigger function เอง
+-- จึงคืนค่าเป็น SQL ให้ trigger เรียก EXECUTE เอง
+CREATE OR REPLACE FUNCTION add_identifier_links_sql(p_source TEXT, p_relation TEXT) RETURNS TEXT AS $$
+BEGIN
+    RETURN format($q$
+        INSERT INTO identifier_links (identifier_type, identifier, criminal_case_id, source, occurrences)
+        SELECT identifier_type, identifier, criminal_case_id, %1$L, COUNT(*)
+        FROM (%2$s) d
+        WHERE identifier IS NOT NULL
+        GROUP BY identifier_type, identifier, criminal_case_id
+        ON CONFLICT (identifier_type, identifier, criminal_case_id, source)
+        DO UPDATE SET occurrences = identifier_links.occurrences + EXCLUDED.occurrences
+    $q$, p_source, identifier_link_select(p_source, p_relation));
+END;
+$$ LANGUAGE plpgsql IMMUTABLE;
+
+-- คำนวณใหม่ทั้งหมดสำหรับคดีที่ระบุ (ใช้ตอน UPDATE/DELETE)
+CREATE OR REPLACE FUNCTION refresh_identifier_links(p_source TEXT, p_case_ids INTEGER[]) RETURNS VOID AS $$
+BEGIN
+    IF p_case_ids IS NULL OR array_length(p_case_ids, 1) IS NULL THEN
+        RETURN;
+    END IF;
+
+    DELETE FROM identifier_links
+    WHERE source = p_source AND criminal_case_id = ANY(p_case_ids);
+
+    EXECUTE add_identifier_links_sql(
+        p_source,
+        format('(SELECT * FROM %I WHERE criminal_case_id = ANY(%L::integer[])) src', p_source, p_case_ids)
+    );
+END;
+$$ LANGUAGE plpgsql;
+
+-- สร้างใหม่ทั้งหมด (backfill)
+CREATE OR REPLACE FUNCTION rebuild_identifier_links() RETURNS INTEGER AS $$
+DECLARE
+    t TEXT;
+    v_count INTEGER;
+BEGIN
+    TRUNCATE identifier_links;
+    FOREACH t IN ARRAY ARRAY[
+        'bank_accounts', 'non_bank_accounts', 'payment_gateway_accounts',
+        'telco_mobile_accounts', 'suspects', 'cfr'
+    ] LOOP
+        EXECUTE add_identifier_links_sql(t, quote_ident(t));
+    END LOOP;
+
+    SELECT COUNT(*) INTO v_count FROM identifier_links;
+    RETURN v_count;
+END;
+$$ LANGUAGE plpgsql;
+
+-- ========================================
+-- Trigger functions (statement-level + transition tables)
+-- ========================================
+
+CREATE OR REPLACE FUNCTION trg_identifier_links_after_insert() RETURNS TRIGGER AS $$
+BEGIN
+    EXECUTE add_identifier_links_sql(TG_TABLE_NAME, 'new_rows');
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION trg_identifier_links_after_update() RETURNS TRIGGER AS $$
+BEGIN
+    PERFORM refresh_identifier_links(TG_TABLE_NAME, ARRAY(
+        SELECT criminal_case_id FROM new_rows
+        UNION
+        SELECT criminal_case_id FROM old_rows
+    ));
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION trg_identifier_links_after_delete() RETURNS TRIGGER AS $$
+BEGIN
+    PERFORM refresh_identifier_links(TG_TABLE_NAME, ARRAY(SELECT DISTINCT criminal_case_id FROM old_rows));
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DO $$
+DECLARE
+    t TEXT;
+BEGIN
+    FOREACH t IN ARRAY ARRAY[
+        'bank_accounts', 'non_bank_accounts', 'payment_gateway_accounts',
+        'telco_mobile_accounts', 'suspects', 'cfr'
+    ] LOOP
+        EXECUTE format('DROP TRIGGER IF EXISTS identifier_links_insert ON %I', t);
+        EXECUTE format('DROP TRIGGER IF EXISTS identifier_links_update ON %I', t);
+        EXECUTE format('DROP TRIGGER IF EXISTS identifier_links_delete ON %I', t);
+
+        EXECUTE format('CREATE TRIGGER identifier_links_insert AFTER INSERT ON %I '
+                       'REFERENCING NEW TABLE AS new_rows '
+                       'FOR EACH STATEMENT EXECUTE FUNCTION trg_identifier_links_after_insert()', t);
+        EXECUTE format('CREATE TRIGGER identifier_links_update AFTER UPDATE ON %I '
+                       'REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows '
+                       'FOR EACH STATEMENT EXECUTE FUNCTION trg_identifier_links_after_update()', t);
+        EXECUTE format('CREATE TRIGGER identifier_links_delete AFTER DELETE ON %I '
+                       'REFERENCING OLD TABLE AS old_rows '
+                       'FOR EACH STATEMENT EXECUTE FUNCTION trg_identifier_links_after_delete()', t);
+    END LOOP;
+END;
+$$;
+
+-- ========================================
+-- Backfill ข้อมูลเดิม
+-- ========================================
+
+SELECT rebuild_identifier_links();
+
+COMMENT ON TABLE identifier_links IS 'ดัชนีบัญชี/เบอร์โทร/PromptPay/เลขบัตรประชาชน ที่ปรากฏในแต่ละคดี (อัพเดทด้วย trigger)';
+COMMENT ON COLUMN identifier_links.identifier_type IS 'ประเภท: account, phone, promptpay, id_card';
+COMMENT ON COLUMN identifier_links.identifier IS 'ค่าที่ normalize แล้ว (ตัดช่องว่าง/ขีด, รักษาเลข 0 หน้า)';
+COMMENT ON COLUMN identifier_links.source IS 'ตารางต้นทาง';
+COMMENT ON COLUMN identifier_links.occurrences IS 'จำนวนแถวในตารางต้นทางที่มีค่านี้';
+
+SELECT 'identifier_links table created successfully!' as status;
@@ -0,0 +1,35 @@
+-- 040_add_email_queue_columns.sql
+-- ใช้ตาราง email_logs เป็นคิวส่งอีเมล์ (email_worker.py ดึงงานไปส่งพร้อม retry)
+-- สถานะ: pending (รอส่ง/รอ retry) → sending → sent | failed
+
+-- ========================================
+-- คอลัมน์สำหรับคิว
+-- ========================================
+
+ALTER TABLE email_logs ADD COLUMN IF NOT EXISTS payload JSONB;
+ALTER TABLE email_logs ADD COLUMN IF NOT EXISTS next_attempt_at TIMESTAMPTZ;
+ALTER TABLE email_logs ADD COLUMN IF NOT EXISTS locked_at TIMESTAMPTZ;
+
+-- ฐานข้อมูลที่รัน migration นี้ก่อนหน้า (คอลัมน์เป็น TIMESTAMP) → แปลงให้ตรงกับ model (DateTime(timezone=True))
+-- ค่าเดิมถูกตีความตาม timezone ของ session
+ALTER TABLE email_logs ALTER COLUMN next_attempt_at TYPE TIMESTAMPTZ;
+ALTER TABLE email_logs ALTER COLUMN locked_at TYPE TIMESTAMPTZ;
+
+-- ========================================
+-- Index สำหรับดึงงานที่ถึงกำหนดส่ง (FOR UPDATE SKIP LOCKED)
+-- ========================================
+
+CREATE INDEX IF NOT EXISTS idx_email_logs_queue
+    ON email_logs (next_attempt_at NULLS FIRST, id)
+    WHERE status = 'pending' AND payload IS NOT NULL;
+
+CREATE INDEX IF NOT EXISTS idx_email_logs_sending
+    ON email_logs (locked_at)
+    WHERE status = 'sending';
+
+COMMENT ON COLUMN email_logs.status IS 'สถานะการส่ง: pending, sending, sent, failed, bounced';
+COMMENT ON COLUMN email_logs.payload IS 'ข้อมูลสำหรับสร้างอีเมล์ (HTML หมายเรียก, ผู้ส่ง) - ลบทิ้งเมื่อส่งสำเร็จ';
+COMMENT ON COLUMN email_logs.next_attempt_at IS 'เวลาที่จะส่ง/ส่งซ้ำครั้งถัดไป (NULL = ส่งทันที)';
+COMMENT ON COLUMN email_logs.locked_at IS 'เวลาที่ worker ดึงงานไป (ใช้คืนงานที่ค้างเมื่อ worker หยุดทำงาน)';
+
+SELECT 'email_logs queue columns added successfully!' as status;
@@ -0,0 +1,63 @@
+-- 041_add_cfr_transfer_at.sql
+-- วันเวลาโอนแบบมีชนิดข้อมูล (transfer_date + transfer_time เดิมเป็นข้อความ)
+-- ใช้เรียงลำดับและแบ่งหน้าแบบ keyset ของ GET /cfr/{criminal_case_id}/records ผ่าน index
+
+-- ========================================
+-- ฟังก์ชันแปลงข้อความวันที่/เวลาของ CFR เป็น TIMESTAMP
+-- รองรับ YYYY-MM-DD และ DD/MM/YYYY (ปี พ.ศ. แปลงเป็น ค.ศ.), เวลา HH:MM[:SS]
+-- ถ้าไม่มี time_text จะใช้เวลาที่ต่อท้ายวันที่ (เช่น '2024-01-15 10:30:00')
+-- ค่าที่แปลงไม่ได้คืน NULL (ตรงกับ parse_cfr_datetime ใน cfr_import.py)
+-- ========================================
+
+CREATE OR REPLACE FUNCTION cfr_parse_timestamp(date_text TEXT, time_text TEXT DEFAULT NULL)
+RETURNS TIMESTAMP AS $$
+DECLARE
+    d TEXT[];
+    t TEXT[];
+    y INTEGER;
+BEGIN
+    date_text := btrim(date_text);
+    d := regexp_match(date_text, '^(\d{4})-(\d{1,2})-(\d{1,2})');
+    IF d IS NULL THEN
+        d := regexp_match(date_text, '^(\d{1,2})/(\d{1,2})/(\d{4})');
+        IF d IS NULL THEN
+            RETURN NULL;
+        END IF;
+        d := ARRAY[d[3], d[2], d[1]];
+    END IF;
+
+    y := d[1]::INTEGER;
+    IF y >= 2400 THEN
+        y := y - 543;
+    END IF;
+
+    t := regexp_match(COALESCE(time_text, substring(date_text FROM 11)), '(\d{1,2}):(\d{2})(?::(\d{2}))?');
+    RETURN make_timestamp(
+        y, d[2]::INTEGER, d[3]::INTEGER,
+        COALESCE(t[1]::INTEGER, 0), COALESCE(t[2]::INTEGER, 0), COALESCE(t[3]::DOUBLE PRECISION, 0)
+    );
+EXCEPTION WHEN OTHERS THEN
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql IMMUTABLE;
+
+-- ========================================
+-- คอลัมน์ + ข้อมูลเดิม
+-- ========================================
+
+ALTER TABLE cfr ADD COLUMN IF NOT EXISTS transfer_at TIMESTAMP;
+
+UPDATE cfr
+SET transfer_at = cfr_parse_timestamp(transfer_date, transfer_time)
+WHERE transfer_at IS NULL AND transfer_date IS NOT NULL;
+
+-- ========================================
+-- Keyset pagination: (คดี, วันเวลาโอน, id)
+-- ========================================
+
+CREATE INDEX IF NOT EXISTS idx_cfr_case_transfer_at_id
+    ON cfr (criminal_case_id, transfer_at DESC NULLS LAST, id DESC);
+
+COMMENT ON COLUMN cfr.transfer_at IS 'วันเวลาโอน (ค.ศ.) จาก transfer_date + transfer_time - NULL ถ้าแปลงไม่ได้';
+
+SELECT 'cfr.transfer_at added successfully!' as status;
@@ -0,0 +1,135 @@
+-- 042_partition_cfr_table.sql
+-- ตาราง cfr แบบมีชนิดข้อมูล + แบ่ง partition ตามคดี
+--
+-- 1) คอลัมน์วันที่/เวลาแบบมีชนิดข้อมูล (คอลัมน์ข้อความเดิมยังเก็บไว้ตามไฟล์ต้นฉบับ)
+--    transfer_at (041), to_open_on, to_close_on, inserted_at
+-- 2) แบ่ง partition แบบ HASH (criminal_case_id) 16 ส่วน
+--    ทุกหน้าจอ/การนำเข้า/การลบไฟล์ทำงานทีละคดี จึงเหลือ partition เดียวต่อ query
+--    และไม่ต้องสร้าง partition ใหม่ตามเวลา (ข้อมูลไม่มีวันที่หรือวันที่ผิดไม่มีปัญหา)
+-- 3) indexes สำหรับ "รายการโอนเข้า/ออกจากบัญชี X ในช่วงวันที่" (ข้ามคดี)
+--
+-- ย้ายข้อมูลเดิมทั้งหมดใน transaction เดียว (ล็อกตาราง cfr ระหว่างรัน)
+-- หลังรันให้ใช้ backfill_cfr_typed_columns.py เติมค่าที่ยังว่าง (เช่น แถวที่นำเข้าด้วยโค้ดเวอร์ชันเก่า)
+-- วัดผลก่อน/หลังด้วย benchmark_cfr_queries.py
+
+BEGIN;
+
+-- ========================================
+-- คอลัมน์แบบมีชนิดข้อมูล
+-- ========================================
+
+ALTER TABLE cfr ADD COLUMN IF NOT EXISTS to_open_on DATE;
+ALTER TABLE cfr ADD COLUMN IF NOT EXISTS to_close_on DATE;
+ALTER TABLE cfr ADD COLUMN IF NOT EXISTS inserted_at TIMESTAMP;
+
+-- เติมคอลัมน์แบบมีชนิดข้อมูลของแถวในช่วง id [p_from_id, p_to_id) ที่ยังไม่มีค่า
+CREATE OR REPLACE FUNCTION backfill_cfr_typed_columns(p_from_id INTEGER, p_to_id INTEGER) RETURNS INTEGER AS $$
+DECLARE
+    v_count INTEGER;
+BEGIN
+    UPDATE cfr SET
+        transfer_at = cfr_parse_timestamp(transfer_date, transfer_time),
+        to_open_on = cfr_parse_timestamp(to_open_date)::DATE,
+        to_close_on = cfr_parse_timestamp(to_close_date)::DATE,
+        inserted_at = cfr_parse_timestamp(timestamp_insert)
+    WHERE id >= p_from_id AND id < p_to_id
+      AND ((transfer_at IS NULL AND transfer_date IS NOT NULL)
+        OR (to_open_on IS NULL AND to_open_date IS NOT NULL)
+        OR (to_close_on IS NULL AND to_close_date IS NOT NULL)
+        OR (inserted_at IS NULL AND timestamp_insert IS NOT NULL));
+
+    GET DIAGNOSTICS v_count = ROW_COUNT;
+    RETURN v_count;
+END;
+$$ LANGUAGE plpgsql;
+
+-- ========================================
+-- ย้ายไปตารางแบบ partition (ข้ามถ้าทำไปแล้ว)
+-- ========================================
+
+DO $$
+DECLARE
+    v_columns TEXT;
+    i INTEGER;
+BEGIN
+    IF EXISTS (SELECT 1 FROM pg_partitioned_table WHERE partrelid = 'cfr'::regclass) THEN
+        RAISE NOTICE 'cfr is already partitioned';
+        RETURN;
+    END IF;
+
+    ALTER TABLE cfr RENAME TO cfr_unpartitioned;
+    ALTER INDEX cfr_pkey RENAME TO cfr_unpartitioned_pkey;
+
+    -- primary key ของตาราง partition ต้องมีคอลัมน์ที่ใช้แบ่ง (id ยังไม่ซ้ำเพราะมาจาก sequence เดียว)
+    CREATE TABLE cfr (
+        LIKE cfr_unpartitioned INCLUDING DEFAULTS INCLUDING COMMENTS,
+        PRIMARY KEY (criminal_case_id, id)
+    ) PARTITION BY HASH (criminal_case_id);
+
+    FOR i IN 0..15 LOOP
+        EXECUTE format('CREATE TABLE cfr_p%s PARTITION OF cfr FOR VALUES WITH (MODULUS 16, REMAINDER %s)', i, i);
+    END LOOP;
+
+    ALTER TABLE cfr ADD CONSTRAINT cfr_criminal_case_id_fkey
+        FOREIGN KEY (criminal_case_id) REFERENCES criminal_cases(id) ON DELETE CASCADE;
+
+    -- คัดลอกข้อมูลพร้อมแปลงคอลัมน์แบบมีชนิดข้อมูลในรอบเดียว
+    -- (ยังไม่มี trigger ของ identifier_links บนตารางใหม่ ข้อมูลใน identifier_links เดิมถูกต้องอยู่แล้ว)
+    SELECT string_agg(quote_ident(attname), ', ' ORDER BY attnum) INTO v_columns
+    FROM pg_attribute
+    WHERE attrelid = 'cfr_unpartitioned'::regclass AND attnum > 0 AND NOT attisdropped
+      AND attname NOT IN ('transfer_at', 'to_open_on', 'to_close_on', 'inserted_at');
+
+    EXECUTE format($q$
+        INSERT INTO cfr (%1$s, transfer_at, to_open_on, to_close_on, inserted_at)
+        SELECT %1$s,
+               cfr_parse_timestamp(transfer_date, transfer_time),
+               cfr_parse_timestamp(to_open_date)::DATE,
+               cfr_parse_timestamp(to_close_date)::DATE,
+               cfr_parse_timestamp(timestamp_insert)
+        FROM cfr_unpartitioned
+    $q$, v_columns);
+
+    ALTER SEQUENCE cfr_id_seq OWNED BY cfr.id;
+    DROP TABLE cfr_unpartitioned;
+
+    -- trigger ของ identifier_links (migration 039) ถูกลบไปพร้อมตารางเดิม
+    CREATE TRIGGER identifier_links_insert AFTER INSERT ON cfr
+        REFERENCING NEW TABLE AS new_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION trg_identifier_links_after_insert();
+    CREATE TRIGGER identifier_links_update AFTER UPDATE ON cfr
+        REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION trg_identifier_links_after_update();
+    CREATE TRIGGER identifier_links_delete AFTER DELETE ON cfr
+        REFERENCING OLD TABLE AS old_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION trg_identifier_links_after_delete();
+END;
+$$;
+
+-- ========================================
+-- Indexes (สร้างบนตารางหลัก ถูกสร้างให้ทุก partition อัตโนมัติ)
+-- ========================================
+
+-- ภายในคดี: รายการไฟล์ (index-only scan) / ลบไฟล์, แบ่งหน้าแบบ keyset (GET /cfr/{id}/records)
+CREATE INDEX IF NOT EXISTS idx_cfr_case_filename ON cfr (criminal_case_id, filename) INCLUDE (upload_date, id);
+CREATE INDEX IF NOT EXISTS idx_cfr_case_transfer_at_id ON cfr (criminal_case_id, transfer_at DESC NULLS LAST, id DESC);
+CREATE INDEX IF NOT EXISTS idx_cfr_bank_case_id ON cfr (bank_case_id);
+
+-- รายการโอนเข้า/ออกจากบัญชี X ในช่วงวันที่ (ข้ามคดี)
+CREATE INDEX IF NOT EXISTS idx_cfr_to_account_transfer_at ON cfr (to_account_no, transfer_at DESC NULLS LAST, id DESC);
+CREATE INDEX IF NOT EXISTS idx_cfr_from_account_transfer_at ON cfr (from_account_no, transfer_at DESC NULLS LAST, id DESC);
+
+-- ช่วงวันที่อย่างเดียว: ไฟล์ CFR ถูกนำเข้าเป็นก้อนต่อเนื่องที่ครอบคลุมช่วงเวลาจำกัด
+-- BRIN จึงตัด block ที่ไม่เกี่ยวข้องได้ในขนาด index เพียงไม่กี่ KB
+CREATE INDEX IF NOT EXISTS idx_cfr_transfer_at_brin ON cfr USING brin (transfer_at) WITH (pages_per_range = 32);
+
+COMMENT ON COLUMN cfr.to_open_on IS 'วันที่เปิดบัญชีปลายทาง (ค.ศ.) จาก to_open_date';
+COMMENT ON COLUMN cfr.to_close_on IS 'วันที่ปิดบัญชีปลายทาง (ค.ศ.) จาก to_close_date';
+COMMENT ON COLUMN cfr.inserted_at IS 'เวลาบันทึกในระบบ CFR จาก timestamp_insert';
+
+COMMIT;
+
+-- สถิติ + visibility map ของ partition ใหม่ (ให้ใช้ index-only scan ได้ทันที)
+VACUUM ANALYZE cfr;
+
+SELECT 'cfr typed columns and partitions created successfully!' as status;
@@ -0,0 +1,13 @@
+-- 043_add_line_notification_retry_columns.sql
+-- การส่งการแจ้งเตือน LINE ผ่านคิว (app/services/line_dispatcher.py) พร้อม retry
+-- สถานะ: pending (รอส่ง/รอ retry) → sent | failed
+
+ALTER TABLE line_notification_logs ADD COLUMN IF NOT EXISTS retry_count INTEGER DEFAULT 0;
+ALTER TABLE line_notification_logs ADD COLUMN IF NOT EXISTS last_retry_at TIMESTAMPTZ;
+
+COMMENT ON COLUMN line_notification_logs.status IS 'สถานะ: pending (รอส่ง/รอ retry), sent, failed';
+COMMENT ON COLUMN line_notification_logs.error_message IS 'ข้อความ error ล่าสุด (ถ้ามี)';
+COMMENT ON COLUMN line_notification_logs.retry_count IS 'จำนวนครั้งที่ส่งซ้ำ (HTTP 429/5xx หรือเชื่อมต่อไม่ได้)';
+COMMENT ON COLUMN line_notification_logs.last_retry_at IS 'เวลาที่ส่งซ้ำครั้งล่าสุด';
+
+SELECT 'line_notification_logs retry columns added successfully!' as status;
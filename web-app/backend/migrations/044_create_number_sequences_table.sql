@@ -0,0 +1,51 @@
+-- 044_create_number_sequences_table.sql
+-- ตัวนับเลขรันต่อ (prefix, ปี พ.ศ.) สำหรับเลขคดีและเลขที่หนังสือ (app/services/number_sequence.py)
+--
+-- เดิมคำนวณจาก MAX(split_part(case_number, '/', 1)) / COUNT(*) + 1 ทุกครั้งที่สร้าง
+-- (scan ทั้งตาราง และได้เลขซ้ำเมื่อสร้างพร้อมกัน)
+-- ตอนนี้เพิ่มค่าในแถวเดียวด้วย INSERT ... ON CONFLICT DO UPDATE ... RETURNING
+-- แถวถูกล็อกจนจบ transaction ของผู้สร้าง → ไม่ซ้ำ และ rollback แล้วเลขไม่หาย
+--
+-- prefix: CASE (เลขคดี 1385/2568), SUS (SUS-2568-0001), BA (BA-2568-0001), AR (AR-2568-0001)
+
+CREATE TABLE IF NOT EXISTS number_sequences (
+    prefix VARCHAR(20) NOT NULL,
+    year INTEGER NOT NULL,
+    last_value INTEGER NOT NULL DEFAULT 0,
+    updated_at TIMESTAMP DEFAULT NOW(),
+    PRIMARY KEY (prefix, year)
+);
+
+COMMENT ON TABLE number_sequences IS 'เลขรันล่าสุดต่อ (prefix, ปี พ.ศ.)';
+COMMENT ON COLUMN number_sequences.prefix IS 'ประเภทเลข: CASE, SUS, BA, AR';
+COMMENT ON COLUMN number_sequences.year IS 'ปี พ.ศ.';
+COMMENT ON COLUMN number_sequences.last_value IS 'เลขล่าสุดที่ถูกใช้ไปแล้ว';
+
+-- ========================================
+-- เริ่มต้นจากข้อมูลเดิม (รันซ้ำได้: ใช้ค่าที่มากกว่า)
+-- ========================================
+
+-- เลขคดี {number}/{year}
+INSERT INTO number_sequences (prefix, year, last_value)
+SELECT 'CASE', split_part(case_number, '/', 2)::INTEGER, MAX(split_part(case_number, '/', 1)::INTEGER)
+FROM criminal_cases
+WHERE case_number ~ '^[0-9]{1,9}/[0-9]{4}$'
+GROUP BY 2
+ON CONFLICT (prefix, year) DO UPDATE SET last_value = GREATEST(number_sequences.last_value, EXCLUDED.last_value);
+
+-- เลขที่หนังสือ {prefix}-{year}-{number}
+INSERT INTO number_sequences (prefix, year, last_value)
+SELECT 'SUS', split_part(document_number, '-', 2)::INTEGER, MAX(split_part(document_number, '-', 3)::INTEGER)
+FROM suspects
+WHERE document_number ~ '^SUS-[0-9]{4}-[0-9]{1,9}$'
+GROUP BY 2
+ON CONFLICT (prefix, year) DO UPDATE SET last_value = GREATEST(number_sequences.last_value, EXCLUDED.last_value);
+
+INSERT INTO number_sequences (prefix, year, last_value)
+SELECT 'BA', split_part(document_number, '-', 2)::INTEGER, MAX(split_part(document_number, '-', 3)::INTEGER)
+FROM bank_accounts
+WHERE document_number ~ '^BA-[0-9]{4}-[0-9]{1,9}$'
+GROUP BY 2
+ON CONFLICT (prefix, year) DO UPDATE SET last_value = GREATEST(number_sequences.last_value, EXCLUDED.last_value);
+
+SELECT 'number_sequences table created successfully!' as status;
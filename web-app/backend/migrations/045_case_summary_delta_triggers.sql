@@ -0,0 +1,97 @@
+-- 045_case_summary_delta_triggers.sql
+-- เปลี่ยน trigger ของ case_summary (038) จากการนับใหม่ทั้งคดี เป็นการบวก/ลบส่วนต่าง
+--
+-- เดิม: แต่ละคำสั่งนับจำนวนใหม่ทั้งคดีแล้ว upsert ยอดรวม
+-- ภายใต้ READ COMMITTED transaction ที่เขียนคดีเดียวกันพร้อมกันจะมองไม่เห็นแถวที่อีกฝ่ายยังไม่ commit
+-- upsert ที่มาทีหลังจึงเขียนทับยอดของอีกฝ่าย → จำนวนหายถาวร
+--
+-- ใหม่: คำนวณส่วนต่างต่อคดีจาก transition table แล้ว UPDATE x = x + n
+-- การ UPDATE ล็อกแถวสรุปของคดีจน commit และบวกบนค่าล่าสุดที่ commit แล้ว จึงไม่มี update หาย
+-- (refresh_case_summary / rebuild_case_summary ยังใช้สำหรับ backfill และซ่อมข้อมูล)
+
+-- ========================================
+-- Trigger function เดียวสำหรับ INSERT/UPDATE/DELETE ของทุกตารางลูก
+-- ชื่อคอลัมน์ใน case_summary = <ชื่อตาราง>_total / <ชื่อตาราง>_replied
+-- ========================================
+
+CREATE OR REPLACE FUNCTION trg_case_summary_delta() RETURNS TRIGGER AS $$
+DECLARE
+    v_total TEXT := TG_TABLE_NAME || '_total';
+    v_replied TEXT := TG_TABLE_NAME || '_replied';
+    v_rows TEXT;
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        v_rows := 'SELECT criminal_case_id, 1 AS sign, reply_status FROM new_rows';
+    ELSIF TG_OP = 'DELETE' THEN
+        v_rows := 'SELECT criminal_case_id, -1 AS sign, reply_status FROM old_rows';
+    ELSE
+        v_rows := 'SELECT criminal_case_id, 1 AS sign, reply_status FROM new_rows '
+                  'UNION ALL '
+                  'SELECT criminal_case_id, -1 AS sign, reply_status FROM old_rows';
+    END IF;
+
+    -- เรียงตาม criminal_case_id เพื่อให้คำสั่งที่แตะหลายคดีล็อกแถวในลำดับเดียวกัน (กัน deadlock)
+    -- ข้ามคดีที่ส่วนต่างเป็น 0 (เช่น UPDATE คอลัมน์อื่น) และคดีที่ถูกลบไปแล้ว (cascade)
+    EXECUTE format(
+        'INSERT INTO case_summary AS s (criminal_case_id, %1$I, %2$I, updated_at) '
+        'SELECT d.criminal_case_id, d.total, d.replied, NOW() FROM ( '
+        '    SELECT criminal_case_id, '
+        '           SUM(sign) AS total, '
+        '           SUM(CASE WHEN reply_status THEN sign ELSE 0 END) AS replied '
+        '    FROM (%3$s) r '
+        '    WHERE criminal_case_id IS NOT NULL '
+        '    GROUP BY criminal_case_id '
+        ') d '
+        'WHERE (d.total <> 0 OR d.replied <> 0) '
+        '  AND EXISTS (SELECT 1 FROM criminal_cases c WHERE c.id = d.criminal_case_id) '
+        'ORDER BY d.criminal_case_id '
+        'ON CONFLICT (criminal_case_id) DO UPDATE SET '
+        '    %1$I = s.%1$I + EXCLUDED.%1$I, '
+        '    %2$I = s.%2$I + EXCLUDED.%2$I, '
+        '    updated_at = EXCLUDED.updated_at',
+        v_total, v_replied, v_rows
+    );
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DO $$
+DECLARE
+    t TEXT;
+BEGIN
+    FOREACH t IN ARRAY ARRAY[
+        'bank_accounts',
+        'non_bank_accounts',
+        'payment_gateway_accounts',
+        'telco_mobile_accounts',
+        'telco_internet_accounts',
+        'suspects'
+    ] LOOP
+        EXECUTE format('DROP TRIGGER IF EXISTS case_summary_insert ON %I', t);
+        EXECUTE format('DROP TRIGGER IF EXISTS case_summary_update ON %I', t);
+        EXECUTE format('DROP TRIGGER IF EXISTS case_summary_delete ON %I', t);
+
+        EXECUTE format('CREATE TRIGGER case_summary_insert AFTER INSERT ON %I '
+                       'REFERENCING NEW TABLE AS new_rows '
+                       'FOR EACH STATEMENT EXECUTE FUNCTION trg_case_summary_delta()', t);
+        EXECUTE format('CREATE TRIGGER case_summary_update AFTER UPDATE ON %I '
+                       'REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows '
+                       'FOR EACH STATEMENT EXECUTE FUNCTION trg_case_summary_delta()', t);
+        EXECUTE format('CREATE TRIGGER case_summary_delete AFTER DELETE ON %I '
+                       'REFERENCING OLD TABLE AS old_rows '
+                       'FOR EACH STATEMENT EXECUTE FUNCTION trg_case_summary_delta()', t);
+    END LOOP;
+END;
+$$;
+
+DROP FUNCTION IF EXISTS trg_case_summary_after_insert();
+DROP FUNCTION IF EXISTS trg_case_summary_after_update();
+DROP FUNCTION IF EXISTS trg_case_summary_after_delete();
+
+-- ========================================
+-- ซ่อมยอดที่อาจคลาดเคลื่อนจาก trigger เดิม
+-- ========================================
+
+SELECT rebuild_case_summary();
+
+SELECT 'case_summary delta triggers installed successfully!' as status;
@@ -0,0 +1,100 @@
+-- 046_identifier_links_delta_triggers.sql
+-- เปลี่ยน trigger UPDATE/DELETE ของ identifier_links (039) จากการลบแล้วนับใหม่ทั้งคดี เป็นการบวก/ลบส่วนต่าง
+--
+-- เดิม: ลบ identifier_links ของคดี/ตารางต้นทางนั้น แล้วนับใหม่จากตารางต้นทางทั้งคดี
+-- - transaction ที่แก้ไขคดีเดียวกันพร้อมกัน: DELETE ของฝ่ายหลังมองไม่เห็นแถวที่ฝ่ายแรกเพิ่งนับใหม่
+--   แล้ว upsert (occurrences + EXCLUDED.occurrences) บวกซ้ำทับ → occurrences เกินจริง
+-- - แก้ไขแถวเดียวก็อ่านตารางต้นทางทั้งคดีใหม่ (เช่น cfr หลายหมื่นแถว)
+--
+-- ใหม่: เหมือน trg_case_summary_delta (045) - ส่วนต่างจาก transition table (old_rows -1, new_rows +1)
+-- upsert ครั้งเดียวเรียงตาม key แล้วลบแถวที่ occurrences <= 0
+-- (rebuild_identifier_links ยังใช้สำหรับ backfill และซ่อมข้อมูล)
+
+-- ========================================
+-- Trigger function เดียวสำหรับ INSERT/UPDATE/DELETE ของทุกตารางต้นทาง
+-- ========================================
+
+CREATE OR REPLACE FUNCTION trg_identifier_links_delta() RETURNS TRIGGER AS $$
+DECLARE
+    v_rows TEXT;
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        v_rows := format('SELECT r.*, 1 AS sign FROM (%s) r', identifier_link_select(TG_TABLE_NAME, 'new_rows'));
+    ELSIF TG_OP = 'DELETE' THEN
+        v_rows := format('SELECT r.*, -1 AS sign FROM (%s) r', identifier_link_select(TG_TABLE_NAME, 'old_rows'));
+    ELSE
+        v_rows := format(
+            'SELECT r.*, 1 AS sign FROM (%s) r UNION ALL SELECT r.*, -1 AS sign FROM (%s) r',
+            identifier_link_select(TG_TABLE_NAME, 'new_rows'),
+            identifier_link_select(TG_TABLE_NAME, 'old_rows')
+        );
+    END IF;
+
+    -- เรียงตาม key เพื่อให้คำสั่งที่แตะหลายค่าล็อกแถวในลำดับเดียวกัน (กัน deadlock)
+    -- ข้ามค่าที่ส่วนต่างเป็น 0 (เช่น UPDATE คอลัมน์อื่น) และคดีที่ถูกลบไปแล้ว (cascade)
+    EXECUTE format(
+        'INSERT INTO identifier_links AS l (identifier_type, identifier, criminal_case_id, source, occurrences) '
+        'SELECT d.identifier_type, d.identifier, d.criminal_case_id, %1$L, d.delta FROM ( '
+        '    SELECT identifier_type, identifier, criminal_case_id, SUM(sign) AS delta '
+        '    FROM (%2$s) r '
+        '    WHERE identifier IS NOT NULL AND criminal_case_id IS NOT NULL '
+        '    GROUP BY identifier_type, identifier, criminal_case_id '
+        ') d '
+        'WHERE d.delta <> 0 '
+        '  AND EXISTS (SELECT 1 FROM criminal_cases c WHERE c.id = d.criminal_case_id) '
+        'ORDER BY d.identifier_type, d.identifier, d.criminal_case_id '
+        'ON CONFLICT (identifier_type, identifier, criminal_case_id, source) DO UPDATE SET '
+        '    occurrences = l.occurrences + EXCLUDED.occurrences',
+        TG_TABLE_NAME, v_rows
+    );
+
+    IF TG_OP <> 'INSERT' THEN
+        -- ค่าที่ไม่เหลือในตารางต้นทางแล้ว (ใช้ index (criminal_case_id, source))
+        EXECUTE format(
+            'DELETE FROM identifier_links '
+            'WHERE source = %1$L AND occurrences <= 0 '
+            '  AND criminal_case_id IN (SELECT criminal_case_id FROM old_rows)',
+            TG_TABLE_NAME
+        );
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DO $$
+DECLARE
+    t TEXT;
+BEGIN
+    FOREACH t IN ARRAY ARRAY[
+        'bank_accounts', 'non_bank_accounts', 'payment_gateway_accounts',
+        'telco_mobile_accounts', 'suspects', 'cfr'
+    ] LOOP
+        EXECUTE format('DROP TRIGGER IF EXISTS identifier_links_insert ON %I', t);
+        EXECUTE format('DROP TRIGGER IF EXISTS identifier_links_update ON %I', t);
+        EXECUTE format('DROP TRIGGER IF EXISTS identifier_links_delete ON %I', t);
+
+        EXECUTE format('CREATE TRIGGER identifier_links_insert AFTER INSERT ON %I '
+                       'REFERENCING NEW TABLE AS new_rows '
+                       'FOR EACH STATEMENT EXECUTE FUNCTION trg_identifier_links_delta()', t);
+        EXECUTE format('CREATE TRIGGER identifier_links_update AFTER UPDATE ON %I '
+                       'REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows '
+                       'FOR EACH STATEMENT EXECUTE FUNCTION trg_identifier_links_delta()', t);
+        EXECUTE format('CREATE TRIGGER identifier_links_delete AFTER DELETE ON %I '
+                       'REFERENCING OLD TABLE AS old_rows '
+                       'FOR EACH STATEMENT EXECUTE FUNCTION trg_identifier_links_delta()', t);
+    END LOOP;
+END;
+$$;
+
+DROP FUNCTION IF EXISTS trg_identifier_links_after_insert();
+DROP FUNCTION IF EXISTS trg_identifier_links_after_update();
+DROP FUNCTION IF EXISTS trg_identifier_links_after_delete();
+DROP FUNCTION IF EXISTS refresh_identifier_links(TEXT, INTEGER[]);
+
+-- ========================================
+-- ซ่อมจำนวนที่อาจคลาดเคลื่อนจาก trigger เดิม
+-- ========================================
+
+SELECT rebuild_identifier_links();
+
+SELECT 'identifier_links delta triggers installed successfully!' as status;
@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Rebuild the case_summary table (backfill)
+
+ใช้หลังรัน migration 038 ครั้งแรก หรือเมื่อสงสัยว่าข้อมูลสรุปไม่ตรงกับข้อมูลจริง
+    python rebuild_case_summary.py            # สร้างใหม่ทุกคดี
+    python rebuild_case_summary.py 12 15 20   # สร้างใหม่เฉพาะคดีที่ระบุ
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from sqlalchemy import text
+from app.core.database import SessionLocal
+
+def rebuild_case_summary(case_ids=None):
+    """Rebuild case_summary rows using the database functions from migration 038"""
+    print("=" * 80)
+    print("🔄 สร้างตารางสรุปคดี (case_summary) ใหม่")
+    print("=" * 80)
+
+    db = SessionLocal()
+
+    try:
+        if case_ids:
+            db.execute(text("SELECT refresh_case_summary(:case_ids)"), {"case_ids": case_ids})
+            db.commit()
+            print(f"✅ อัพเดทสรุป {len(case_ids)} คดีเรียบร้อย")
+        else:
+            count = db.execute(text("SELECT rebuild_case_summary()")).scalar()
+            db.commit()
+            print(f"✅ สร้างสรุปใหม่ทั้งหมด {count} คดีเรียบร้อย")
+        return True
+
+    except Exception as e:
+        db.rollback()
+        print(f"❌ เกิดข้อผิดพลาด: {e}")
+        return False
+
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    ids = [int(arg) for arg in sys.argv[1:]]
+    success = rebuild_case_summary(ids or None)
+    sys.exit(0 if success else 1)
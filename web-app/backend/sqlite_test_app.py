@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Shared fixtures for test scripts: SQLite in-memory แทน PostgreSQL
+
+    Session = make_session_factory([Bank.__table__], rows=[Bank(...)])
+    client, Session = make_client([Bank.__table__], [(banks.router, "/banks")], rows=[...])
+
+ทุก connection ใช้ฐานข้อมูลเดียวกัน (StaticPool) จึงใช้ข้าม thread ได้ (TestClient / worker)
+"""
+
+from typing import Any, Iterable, Optional, Sequence, Tuple
+
+from fastapi import APIRouter, FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import Table, create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.core import get_db
+from app.core.database import Base
+
+
+def make_session_factory(tables: Sequence[Table], rows: Iterable[Any] = ()) -> sessionmaker:
+    """สร้างฐานข้อมูลใหม่ที่มีเฉพาะ tables แล้วเพิ่ม rows (ORM objects)"""
+    engine = create_engine(
+        "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    Base.metadata.create_all(engine, tables=list(tables))
+    Session = sessionmaker(bind=engine)
+    rows = list(rows)
+    if rows:
+        db = Session()
+        db.add_all(rows)
+        db.commit()
+        db.close()
+    return Session
+
+
+def make_client(
+    tables: Sequence[Table],
+    routers: Sequence[Tuple[APIRouter, str]],
+    rows: Iterable[Any] = (),
+    user: Optional[Any] = None
+) -> Tuple[TestClient, sessionmaker]:
+    """
+    FastAPI app ที่ include routers (router, prefix) และใช้ฐานข้อมูลจาก make_session_factory
+
+    user: ถ้าระบุ ใช้แทน get_current_user (ข้ามการตรวจ token)
+    """
+    Session = make_session_factory(tables, rows)
+
+    def override_get_db():
+        session = Session()
+        try:
+            yield session
+        finally:
+            session.close()
+
+    app = FastAPI()
+    for router, prefix in routers:
+        app.include_router(router, prefix=prefix)
+    app.dependency_overrides[get_db] = override_get_db
+    if user is not None:
+        from app.api.v1.auth import get_current_user
+        app.dependency_overrides[get_current_user] = lambda: user
+    return TestClient(app), Session
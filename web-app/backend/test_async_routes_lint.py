@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Lint: async route ต้องไม่เรียก SQLAlchemy Session แบบ sync บน event loop
+
+ตรวจทุก `async def` ที่มี @router.* ใน app/api แล้วหา
+- การเรียก method ของ Session (db.query(), db.commit(), ...) โดยตรง
+- การส่ง Session ไปให้ฟังก์ชันอื่นโดยไม่ await (เช่น Service(db), helper(db))
+
+การเรียกผ่าน executor (await run_in_io(func, db) / await helper_ที่_offload(db)) ผ่านได้
+- การอ่าน attribute ของ ORM instance (x = await run_in_io(load, db)) หลัง await อื่นที่ส่ง Session
+  (อาจ commit → instance ถูก expire → การอ่าน attribute เป็น lazy SELECT บน event loop)
+route ที่ทำงานกับฐานข้อมูลอย่างเดียวควรเป็น sync def (FastAPI รันใน threadpool)
+
+ใช้แค่ standard library: python test_async_routes_lint.py หรือ pytest
+"""
+
+import ast
+import os
+import sys
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+API_DIR = os.path.join(BASE_DIR, "app", "api")
+
+SESSION_METHODS = {
+    "query", "execute", "scalar", "scalars", "get", "add", "add_all", "delete",
+    "commit", "rollback", "flush", "refresh", "merge", "bulk_save_objects",
+    "bulk_insert_mappings", "bulk_update_mappings",
+}
+
+
+def _is_router_decorator(node: ast.expr) -> bool:
+    target = node.func if isinstance(node, ast.Call) else node
+    return (
+        isinstance(target, ast.Attribute)
+        and isinstance(target.value, ast.Name)
+        and target.value.id == "router"
+    )
+
+
+def _session_params(func: ast.AsyncFunctionDef) -> set:
+    names = set()
+    args = func.args.posonlyargs + func.args.args + func.args.kwonlyargs
+    for arg in args:
+        annotation = arg.annotation
+        if annotation is None:
+            continue
+        text = ast.unparse(annotation)
+        if text == "Session" or text.endswith(".Session"):
+            names.add(arg.arg)
+    return names
+
+
+class _RouteVisitor(ast.NodeVisitor):
+    """เดินเฉพาะ body ของ route (ไม่เข้า nested def/lambda ซึ่งอาจถูกส่งไปรันใน executor)"""
+
+    def __init__(self, session_names: set):
+        self.session_names = session_names
+        self.awaited = set()
+        self.violations = []
+
+    def visit_FunctionDef(self, node):
+        pass
+
+    visit_AsyncFunctionDef = visit_FunctionDef
+    visit_Lambda = visit_FunctionDef
+
+    def visit_Await(self, node):
+        if isinstance(node.value, ast.Call):
+            self.awaited.add(id(node.value))
+        self.generic_visit(node)
+
+    def _uses_session(self, node: ast.expr) -> bool:
+        return isinstance(node, ast.Name) and node.id in self.session_names
+
+    def visit_Call(self, node):
+        func = node.func
+        if (
+            isinstance(func, ast.Attribute)
+            and self._uses_session(func.value)
+            and func.attr in SESSION_METHODS
+        ):
+            self.violations.append((node.lineno, f"{func.value.id}.{func.attr}()"))
+        elif id(node) not in self.awaited:
+            passed = list(node.args) + [kw.value for kw in node.keywords]
+            if any(self._uses_session(arg) for arg in passed):
+                self.violations.append((node.lineno, f"{ast.unparse(func)}(..., db) without await"))
+        self.generic_visit(node)
+
+
+class _ExpiredInstanceVisitor(_RouteVisitor):
+    """เก็บตำแหน่งของ: instance ที่โหลดผ่าน Session, await ที่ส่ง Session, และการอ่าน attribute"""
+
+    def __init__(self, session_names: set):
+        super().__init__(session_names)
+        self.loaded = []          # (name, lineno)
+        self.session_awaits = []  # end_lineno
+        self.reads = []           # (name, attr, lineno)
+
+    def _passes_session(self, call: ast.Call) -> bool:
+        return any(self._uses_session(arg) for arg in list(call.args) + [kw.value for kw in call.keywords])
+
+    def visit_Assign(self, node):
+        value = node.value
+        if isinstance(value, ast.Await) and isinstance(value.value, ast.Call) and self._passes_session(value.value):
+            for target in node.targets:
+                if isinstance(target, ast.Name):
+                    self.loaded.append((target.id, node.lineno))
+        self.generic_visit(node)
+
+    def visit_Await(self, node):
+        if isinstance(node.value, ast.Call) and self._passes_session(node.value):
+            self.session_awaits.append(node.end_lineno)
+        self.generic_visit(node)
+
+    def visit_Attribute(self, node):
+        if isinstance(node.value, ast.Name) and isinstance(node.ctx, ast.Load):
+            self.reads.append((node.value.id, node.attr, node.lineno))
+        self.generic_visit(node)
+
+    def visit_Call(self, node):
+        self.generic_visit(node)
+
+    def expired_reads(self):
+        found = []
+        for name, attr, lineno in self.reads:
+            loads = [line for n, line in self.loaded if n == name and line <= lineno]
+            if not loads:
+                continue
+            loaded_at = max(loads)
+            if any(loaded_at < line < lineno for line in self.session_awaits):
+                found.append((lineno, f"{name}.{attr} read after an awaited Session call (instance may be expired)"))
+        return found
+
+
+def find_violations(source: str, filename: str = "<source>"):
+    """คืนรายการ (filename, lineno, route, message)"""
+    tree = ast.parse(source, filename=filename)
+    found = []
+    for node in ast.walk(tree):
+        if not isinstance(node, ast.AsyncFunctionDef):
+            continue
+        if not any(_is_router_decorator(d) for d in node.decorator_list):
+            continue
+        session_names = _session_params(node)
+        if not session_names:
+            continue
+        visitor = _RouteVisitor(session_names)
+        for statement in node.body:
+            visitor.visit(statement)
+        expired = _ExpiredInstanceVisitor(session_names)
+        for statement in node.body:
+            expired.visit(statement)
+        for lineno, message in visitor.violations + expired.expired_reads():
+            found.append((filename, lineno, node.name, message))
+    return found
+
+
+def scan_api():
+    found = []
+    for root, _, files in os.walk(API_DIR):
+        for name in sorted(files):
+            if not name.endswith(".py"):
+                continue
+            path = os.path.join(root, name)
+            with open(path, encoding="utf-8") as f:
+                found.extend(find_violations(f.read(), os.path.relpath(path, BASE_DIR)))
+    return found
+
+
+def test_lint_detects_sync_session_use():
+    """ตัว lint ต้องจับกรณีที่ผิดได้ และไม่จับกรณีที่ใช้ executor"""
+    bad = '''
+@router.get("/x")
+async def bad(db: Session = Depends(get_db)):
+    item = db.query(Item).first()
+    service = ItemService(db)
+    return item
+'''
+    good = '''
+@router.get("/x")
+async def good(db: Session = Depends(get_db)):
+    def load():
+        return db.query(Item).first()
+    item = await run_in_io(load)
+    await save_item(db, item)
+    return item
+
+@router.get("/y")
+def sync_route(db: Session = Depends(get_db)):
+    return db.query(Item).all()
+'''
+    expired = '''
+@router.post("/login")
+async def login(db: Session = Depends(get_db)):
+    user = await run_in_io(load_user, db)
+    ok = await check(user.hashed_password)
+    await run_in_io(record_attempt, db, user, ok)
+    return {"sub": user.username}
+'''
+    fresh = '''
+@router.post("/login")
+async def login(db: Session = Depends(get_db)):
+    user = await run_in_io(load_user, db)
+    ok = await check(user.hashed_password)
+    username = user.username
+    await run_in_io(record_attempt, db, user, ok)
+    return {"sub": username}
+'''
+    assert len(find_violations(bad)) == 2
+    assert find_violations(good) == []
+    assert [v[1] for v in find_violations(expired)] == [7]
+    assert find_violations(fresh) == []
+    print('Lint self-check: OK')
+
+
+def test_async_routes_do_not_block_on_db():
+    violations = scan_api()
+    for filename, lineno, route, message in violations:
+        print(f"  {filename}:{lineno} {route}: {message}")
+    assert not violations, f"{len(violations)} blocking DB call(s) in async routes"
+    print('Async routes: OK')
+
+
+if __name__ == "__main__":
+    test_lint_detects_sync_session_use()
+    try:
+        test_async_routes_do_not_block_on_db()
+    except AssertionError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+    print('✅ Async route lint passed')
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Test script for bulk create (POST /bank-accounts/bulk, /suspects/bulk/paste, ...)
+"""
+
+import sys
+import os
+from types import SimpleNamespace
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from sqlalchemy import event
+
+from sqlite_test_app import make_client
+from app.api.v1 import bank_accounts, suspects, telco_mobile_accounts
+from app.models import (
+    Bank, BankAccount, CriminalCase, NumberSequence, Suspect, TelcoMobile, TelcoMobileAccount
+)
+from app.services import master_data_cache
+from app.utils.case_number_generator import get_buddhist_year
+
+
+def _client():
+    client, Session = make_client(
+        [
+            CriminalCase.__table__, Bank.__table__, BankAccount.__table__, Suspect.__table__,
+            TelcoMobile.__table__, TelcoMobileAccount.__table__, NumberSequence.__table__,
+        ],
+        [
+            (bank_accounts.router, "/bank-accounts"),
+            (suspects.router, "/suspects"),
+            (telco_mobile_accounts.router, "/telco-mobile-accounts"),
+        ],
+        rows=[
+            CriminalCase(id=1, case_number="1/2568"),
+            Bank(id=1, bank_name="กสิกรไทย", bank_short_name="KBANK", bank_code="004"),
+            Bank(id=2, bank_name="ไทยพาณิชย์", bank_short_name="SCB", bank_code="014"),
+            TelcoMobile(id=1, company_name="บริษัท แอดวานซ์ ไวร์เลส เน็ทเวอร์ค จำกัด", company_name_short="AIS"),
+        ],
+        user=SimpleNamespace(id=7),
+    )
+    statements = []
+    event.listen(Session.kw["bind"], "before_cursor_execute", lambda *args: statements.append(args[2]))
+    master_data_cache.invalidate_master_data()
+    return client, Session, statements
+
+
+def test_bulk_bank_accounts():
+    """50 บัญชีใน transaction เดียว, จับคู่ชื่อธนาคารจากดัชนีชื่อ"""
+    client, Session, statements = _client()
+    names = ["ธนาคารกสิกรไทย", "SCB", "ธนาคารไม่มีในระบบ"]
+    rows = [
+        {"bank_name": names[i % 3], "account_number": f"123-4-{i:05d}", "account_name": f"นาย ก {i}",
+         "document_date": "15/01/2568"}
+        for i in range(50)
+    ]
+    statements.clear()
+    response = client.post("/bank-accounts/bulk", json={"criminal_case_id": 1, "rows": rows})
+    assert response.status_code == 201, response.text
+    body = response.json()
+    assert body["created"] == 50 and body["failed"] == 0
+    assert [r["row"] for r in body["results"]] == list(range(1, 51))
+    assert body["results"][0]["data"]["bank_id"] == 1
+    assert body["results"][1]["data"]["bank_id"] == 2
+    assert body["results"][2]["data"]["bank_id"] is None and body["results"][2]["warnings"]
+    # PostgreSQL ส่งเป็น INSERT เดียว; SQLite ต้องเรียง id ตามลำดับแถวจึงส่งทีละแถว
+    inserts = [s for s in statements if s.lstrip().upper().startswith("INSERT INTO BANK_ACCOUNTS")]
+    assert 1 <= len(inserts) <= 50
+
+    db = Session()
+    accounts = db.query(BankAccount).order_by(BankAccount.id).all()
+    assert [a.id for a in accounts] == [r["id"] for r in body["results"]]
+    assert accounts[0].created_by == 7 and str(accounts[0].document_date) == "2025-01-15"
+    db.close()
+    print("Bulk bank accounts: OK")
+
+
+def test_bulk_rejects_invalid_rows():
+    """แถวผิดแถวเดียว → ไม่บันทึกเลย และบอกข้อผิดพลาดรายแถว"""
+    client, Session, _ = _client()
+    rows = [
+        {"bank_name": "กสิกรไทย", "account_number": "1", "account_name": "ก"},
+        {"bank_name": "กสิกรไทย", "account_name": "ข"},
+        {"bank_name": "กสิกรไทย", "account_number": "3", "account_name": "ค", "criminal_case_id": 99},
+    ]
+    response = client.post("/bank-accounts/bulk", json={"criminal_case_id": 1, "rows": rows})
+    assert response.status_code == 422
+    body = response.json()
+    assert body["created"] == 0 and body["failed"] == 2
+    assert not body["results"][0]["errors"]
+    assert body["results"][1]["errors"][0].startswith("account_number")
+    assert "99" in body["results"][2]["errors"][0]
+
+    dry_run = client.post("/bank-accounts/bulk", json={"criminal_case_id": 1, "rows": rows[:1], "dry_run": True})
+    assert dry_run.status_code == 200 and dry_run.json()["results"][0]["id"] is None
+
+    db = Session()
+    assert db.query(BankAccount).count() == 0
+    db.close()
+    print("Validation: OK")
+
+
+def test_paste_suspects_and_telco():
+    """ข้อความจาก Excel (หัวคอลัมน์ภาษาไทย) และเลขที่หนังสือที่จองครั้งเดียว"""
+    client, Session, _ = _client()
+    text = "ชื่อผู้ต้องหา\tเลขบัตรประชาชน\tเลขที่หนังสือ\tคอลัมน์อื่น\r\n" \
+           "นาย ก\t1100000000001\t\tx\r\n" \
+           "นาย ข\t1100000000002\tตช 0001/1\tx\r\n" \
+           "นาย ค\t\t\t\r\n"
+    response = client.post("/suspects/bulk/paste", json={"criminal_case_id": 1, "text": text})
+    assert response.status_code == 201, response.text
+    body = response.json()
+    year = get_buddhist_year()
+    assert body["ignored_columns"] == ["คอลัมน์อื่น"]
+    assert [r["document_number"] for r in body["results"]] == [f"SUS-{year}-0001", "ตช 0001/1", f"SUS-{year}-0002"]
+
+    text = "ผู้ให้บริการ\tหมายเลขโทรศัพท์\nAIS\t0812345678\nแอดวานซ์ ไวร์เลส\t0898765432\n"
+    response = client.post("/telco-mobile-accounts/bulk/paste", json={"criminal_case_id": 1, "text": text})
+    assert response.status_code == 201, response.text
+    assert [r["data"]["telco_mobile_id"] for r in response.json()["results"]] == [1, 1]
+
+    assert client.post("/suspects/bulk/paste", json={"criminal_case_id": 1, "text": "ไม่รู้จัก\nx"}).status_code == 400
+    print("Paste from Excel: OK")
+
+
+if __name__ == "__main__":
+    test_bulk_bank_accounts()
+    test_bulk_rejects_invalid_rows()
+    test_paste_suspects_and_telco()
+    print('✅ All bulk create tests passed')
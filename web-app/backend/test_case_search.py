@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Test script for GET /criminal-cases/search keyset pagination (app/services/case_search_service.py)
+cursor ใช้ได้เฉพาะกับ sort_by/sort_order เดียวกับหน้าที่สร้าง cursor
+"""
+
+import sys
+import os
+from datetime import date
+from types import SimpleNamespace
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from sqlite_test_app import make_client
+from app.api.v1 import criminal_cases
+from app.models import CaseSummary, CriminalCase, PoliceRank, User
+from app.services.case_search_service import InvalidCursorError, decode_cursor, encode_cursor
+from app.utils.virtual_fields import CASE_COUNT_MODELS
+
+ADMIN = SimpleNamespace(id=1, role=SimpleNamespace(role_name="admin"))
+
+
+def _cases():
+    # วันที่ซ้ำกันและมีค่า NULL เพื่อให้ต้องใช้ id ต่อท้ายในการเรียง
+    days = [3, 1, 2, None, 1, 3, None, 2]
+    return [
+        CriminalCase(id=i, case_number=f"{i}/2568", complaint_date=date(2025, 1, day) if day else None)
+        for i, day in enumerate(days, start=1)
+    ]
+
+
+def _pages(client, **params):
+    ids, cursor = [], None
+    while True:
+        body = client.get("/criminal-cases/search", params={**params, "limit": 3, "cursor": cursor}).json()
+        ids += [case["id"] for case in body["cases"]]
+        cursor = body["next_cursor"]
+        if not cursor:
+            return ids
+
+
+def test_cursor_pagination():
+    """ทุกหน้าต่อกันครบ ไม่ซ้ำ, cursor จากการเรียงแบบอื่น → 400"""
+    client, _ = make_client(
+        [PoliceRank.__table__, User.__table__, CriminalCase.__table__, CaseSummary.__table__]
+        + [model.__table__ for model in CASE_COUNT_MODELS.values()],
+        [(criminal_cases.router, "/criminal-cases")],
+        rows=_cases(),
+        user=ADMIN,
+    )
+
+    assert _pages(client, sort_by="complaint_date", sort_order="desc") == [6, 1, 8, 3, 5, 2, 7, 4]
+    assert _pages(client, sort_by="complaint_date", sort_order="asc") == [2, 5, 3, 8, 1, 6, 4, 7]
+    assert _pages(client, sort_by="id", sort_order="asc") == [1, 2, 3, 4, 5, 6, 7, 8]
+
+    first = client.get("/criminal-cases/search", params={"sort_by": "complaint_date", "sort_order": "desc", "limit": 3})
+    cursor = first.json()["next_cursor"]
+    for sort_by, sort_order in (("complaint_date", "asc"), ("id", "desc")):
+        response = client.get("/criminal-cases/search", params={"sort_by": sort_by, "sort_order": sort_order,
+                                                                 "cursor": cursor})
+        assert response.status_code == 400, (sort_by, sort_order)
+    assert client.get("/criminal-cases/search", params={"cursor": "not-a-cursor"}).status_code == 400
+
+    # ถอดรหัสโดยตรง: sort_order ต่างจากตอนสร้าง → InvalidCursorError
+    assert decode_cursor(encode_cursor("id", 5, 5, "asc"), "id", "asc") == (5, 5)
+    try:
+        decode_cursor(encode_cursor("id", 5, 5, "asc"), "id", "desc")
+        assert False, "expected InvalidCursorError"
+    except InvalidCursorError:
+        pass
+    print("Cursor pagination: OK")
+
+
+if __name__ == "__main__":
+    test_cursor_pagination()
+    print('✅ All case search tests passed')
@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Test script for the money-flow graph (app/services/cfr_graph.py, /cfr/{id}/graph)
+"""
+
+import sys
+import os
+from datetime import datetime
+from decimal import Decimal
+from types import SimpleNamespace
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from sqlite_test_app import make_client
+from app.api.v1 import cfr_graph
+from app.api.v1.auth import get_current_user
+from app.models import CFR, CriminalCase
+from app.services.cfr_graph import MoneyFlowGraph, get_money_flow_graph, invalidate_money_flow_graph
+
+
+def _transfer(case_id, src, dst, amount, transfer_at, **extra):
+    return CFR(
+        criminal_case_id=case_id, filename="cfr.xlsx",
+        from_account_no=src, from_bank_short_name="KBANK", from_account_name=f"ชื่อ {src}",
+        to_account_no=dst, to_bank_short_name="SCB", to_account_name=f"ชื่อ {dst}",
+        transfer_amount=Decimal(amount), transfer_at=transfer_at,
+        transfer_date=transfer_at.strftime("%d/%m/%Y") if transfer_at else None,
+        **extra
+    )
+
+
+OWNER = SimpleNamespace(id=1, role=SimpleNamespace(role_name="user"))
+OTHER = SimpleNamespace(id=2, role=SimpleNamespace(role_name="user"))
+
+# ผู้เสียหาย V → ม้า M1 → M2, M1 → M3, A → M2, M2 → B (วันที่ DD/MM/YYYY เรียงแบบข้อความไม่ได้)
+TRANSFERS = [
+    ("V", "M1", "1000.50", datetime(2025, 1, 31, 9, 0)),
+    ("V", "M1", "2000.00", datetime(2025, 12, 1, 10, 0)),
+    ("V", "M1", "500.00", datetime(2025, 2, 15, 11, 0)),
+    ("M1", "M2", "3000.00", datetime(2025, 2, 16, 8, 0)),
+    ("M1", "M3", "400.00", None),
+    ("A", "M2", "100.00", datetime(2025, 3, 1, 8, 0)),
+    ("M2", "B", "2500.00", datetime(2025, 3, 2, 8, 0)),
+    ("M2", "C", "500.00", datetime(2025, 3, 2, 9, 0)),
+]
+
+
+def _client():
+    return make_client(
+        [CriminalCase.__table__, CFR.__table__],
+        [(cfr_graph.router, "/cfr")],
+        rows=[
+            CriminalCase(id=1, case_number="1/2568", owner_id=OWNER.id),
+            CriminalCase(id=2, case_number="2/2568", owner_id=OWNER.id),
+            CriminalCase(id=3, case_number="3/2568", owner_id=OTHER.id),
+        ]
+        + [_transfer(1, *t) for t in TRANSFERS]
+        + [_transfer(3, "M2", "X", "100.00", None), _transfer(3, "Y", "M2", "100.00", None)],
+        user=OWNER,
+    )
+
+
+def test_edges_amounts_and_dates():
+    """รายการโอนซ้ำรวมเป็นเส้นเดียว พร้อมยอดรวม จำนวนครั้ง และวันที่โอนครั้งแรก/ล่าสุด"""
+    graph = MoneyFlowGraph((src, None, None, dst, None, None, float(amount), at) for src, dst, amount, at in TRANSFERS)
+    assert graph.summary() == {"accounts": 7, "edges": 6, "total_amount": 10000.5}
+
+    edges = {(e["from_account_no"], e["to_account_no"]): e for e in graph.edges()}
+    assert edges[("V", "M1")] == {
+        "from_account_no": "V", "to_account_no": "M1",
+        "total_amount": 3500.5, "transfer_count": 3,
+        "first_transfer_date": "2025-01-31T09:00:00",
+        "last_transfer_date": "2025-12-01T10:00:00",
+    }
+    assert edges[("M1", "M3")]["first_transfer_date"] is None
+    assert [e["total_amount"] for e in graph.edges(min_amount=1000)] == [3500.5, 3000.0, 2500.0]
+    print("Edges: OK")
+
+
+def test_trace_mules_and_path():
+    """ไล่เส้นทาง k-hop ทั้งสองทิศ, บัญชีม้า (fan-in/fan-out) และเส้นทางที่สั้นที่สุด"""
+    graph = MoneyFlowGraph((src, None, None, dst, None, None, float(amount), at) for src, dst, amount, at in TRANSFERS)
+
+    trace = graph.trace("V", max_hops=2)
+    assert [(n["account_no"], n["hop"]) for n in trace["nodes"]] == [("V", 0), ("M1", 1), ("M2", 2), ("M3", 2)]
+    assert {n["account_no"] for n in graph.trace("B", max_hops=5, direction="in")["nodes"]} == {"B", "M2", "M1", "A", "V"}
+    assert graph.trace("ไม่มี") is None
+
+    assert [m["account_no"] for m in graph.mule_candidates()] == ["M2"]
+    assert graph.mule_candidates()[0]["pass_through_amount"] == 3000.0
+
+    path = graph.shortest_path("V", "B")
+    assert [a["account_no"] for a in path["accounts"]] == ["V", "M1", "M2", "B"]
+    assert path["hops"] == 3 and path["bottleneck_amount"] == 2500.0
+    assert graph.shortest_path("B", "V") is None
+    print("Trace / mules / path: OK")
+
+
+def test_graph_api_and_cache():
+    """API อ่านจากตาราง cfr, cache สร้างใหม่เมื่อมีข้อมูลเพิ่มหรือถูก invalidate"""
+    client, Session = _client()
+    body = client.get("/cfr/1/graph").json()
+    assert body["edges"][0]["from_account_no"] == "V"
+    assert body["edges"][0]["first_transfer_date"] == "2025-01-31T09:00:00"
+    assert body["edges"][0]["last_transfer_date"] == "2025-12-01T10:00:00"
+
+    db = Session()
+    first = get_money_flow_graph(db, [1])
+    assert get_money_flow_graph(db, [1]) is first
+    db.add(_transfer(1, "B", "D", "100.00", datetime(2025, 4, 1)))
+    db.commit()
+    second = get_money_flow_graph(db, [1])
+    assert second is not first
+    invalidate_money_flow_graph(1)
+    assert get_money_flow_graph(db, [1]) is not second
+    db.close()
+
+    assert client.get("/cfr/1/graph/path", params={"source": "V", "target": "D"}).json()["hops"] == 4
+    assert client.get("/cfr/1/graph/trace", params={"account": "X"}).status_code == 404
+    assert client.get("/cfr/2/graph").json()["edges"] == []
+    assert client.get("/cfr/graph/mules", params={"case_ids": "1,2"}).json()["mule_candidates"][0]["account_no"] == "M2"
+    print("API / cache: OK")
+
+
+def test_cross_case_mules_visibility():
+    """ตรวจบัญชีม้าข้ามคดีได้เฉพาะคดีที่ผู้ใช้เห็น (คดีของผู้อื่นถูกตัดออก / ไม่เหลือ → 404)"""
+    client, _ = _client()
+    body = client.get("/cfr/graph/mules", params={"case_ids": "1,3"}).json()
+    assert body["accounts"] == 7 and body["mule_candidates"][0]["fan_in"] == 2
+
+    assert client.get("/cfr/graph/mules", params={"case_ids": "3"}).status_code == 404
+    assert client.get("/cfr/graph/mules", params={"case_ids": "99"}).status_code == 404
+    assert client.get("/cfr/graph/mules", params={"case_ids": "a"}).status_code == 400
+
+    client.app.dependency_overrides[get_current_user] = lambda: OTHER
+    body = client.get("/cfr/graph/mules", params={"case_ids": "1,2,3", "min_in": 1, "min_out": 1}).json()
+    assert body["accounts"] == 3 and [m["account_no"] for m in body["mule_candidates"]] == ["M2"]
+    print("Cross-case visibility: OK")
+
+
+if __name__ == "__main__":
+    test_edges_amounts_and_dates()
+    test_trace_mules_and_path()
+    test_graph_api_and_cache()
+    test_cross_case_mules_visibility()
+    print('✅ All money-flow graph tests passed')
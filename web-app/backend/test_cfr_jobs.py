@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Test script for CFR upload jobs (POST /cfr/upload → worker → GET /cfr/jobs/{id} → cancel)
+ใช้ fakeredis แทน Redis และรันงานใน process เดียวกัน (ไม่ต้องมี Celery worker)
+"""
+
+import sys
+import os
+import io
+import tempfile
+from types import SimpleNamespace
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import fakeredis
+from openpyxl import Workbook
+
+from sqlite_test_app import make_client
+from app.api.v1 import cfr_upload
+from app.api.v1.auth import get_current_user
+from app.core.config import settings
+from app.models import CFR, CriminalCase
+from app.services import job_store
+from app.services.cfr_import import CFR_FILE_COLUMNS, run_cfr_import_job
+from app.services.job_store import JobStore
+
+OWNER = SimpleNamespace(id=1, role=SimpleNamespace(role_name="user"))
+OTHER = SimpleNamespace(id=2, role=SimpleNamespace(role_name="user"))
+ADMIN = SimpleNamespace(id=3, role=SimpleNamespace(role_name="admin"))
+
+
+def _cfr_file(rows: int) -> bytes:
+    workbook = Workbook()
+    sheet = workbook.active
+    sheet.append(CFR_FILE_COLUMNS)
+    for i in range(rows):
+        values = {
+            "from_account_no": f"111{i}", "to_account_no": f"222{i}",
+            "transfer_amount": 100 + i, "transfer_date": "31/01/2025", "transfer_time": "10:15:00",
+        }
+        sheet.append([values.get(column) for column in CFR_FILE_COLUMNS])
+    buffer = io.BytesIO()
+    workbook.save(buffer)
+    return buffer.getvalue()
+
+
+class _Harness:
+    """FastAPI app + fakeredis JobStore + คิวงานในหน่วยความจำแทน Celery"""
+
+    def __init__(self, store: JobStore = None):
+        self.client, self.Session = make_client(
+            [CriminalCase.__table__, CFR.__table__], [(cfr_upload.router, "/cfr")],
+            rows=[CriminalCase(id=1, case_number="1/2568", owner_id=OWNER.id)], user=OWNER,
+        )
+        self.store = store or JobStore(fakeredis.FakeRedis(decode_responses=True))
+        self.queued = []
+        self._upload_dir = settings.UPLOAD_DIR
+        self._task = cfr_upload.import_cfr_file_task
+        settings.UPLOAD_DIR = tempfile.mkdtemp()
+        job_store.set_job_store(self.store)
+        cfr_upload.import_cfr_file_task = SimpleNamespace(delay=lambda *args: self.queued.append(args))
+
+    def as_user(self, user):
+        self.client.app.dependency_overrides[get_current_user] = lambda: user
+
+    def upload(self, rows: int) -> str:
+        files = {"file": ("cfr.xlsx", _cfr_file(rows), "application/octet-stream")}
+        response = self.client.post("/cfr/upload/1", files=files)
+        assert response.status_code == 202, response.text
+        return response.json()["job_id"]
+
+    def run_next(self):
+        """worker หยิบงานถัดไปจากคิว"""
+        run_cfr_import_job(*self.queued.pop(0), store=self.store, session_factory=self.Session)
+
+    def close(self):
+        settings.UPLOAD_DIR = self._upload_dir
+        cfr_upload.import_cfr_file_task = self._task
+        job_store.set_job_store(None)
+
+
+def test_upload_run_and_poll():
+    """อัพโหลด → queued, worker รัน → completed พร้อมจำนวนแถว"""
+    harness = _Harness()
+    try:
+        job_id = harness.upload(rows=3)
+        job = harness.client.get(f"/cfr/jobs/{job_id}").json()
+        assert job["status"] == "queued" and job["created_by"] == OWNER.id
+
+        harness.run_next()
+        job = harness.client.get(f"/cfr/jobs/{job_id}").json()
+        assert job["status"] == "completed", job
+        assert job["rows_parsed"] == job["rows_inserted"] == 3
+        assert job["result"]["records_inserted"] == 3
+
+        db = harness.Session()
+        assert db.query(CFR).filter_by(criminal_case_id=1).count() == 3
+        db.close()
+
+        # งานจบแล้ว → ยกเลิกไม่ได้
+        assert harness.client.post(f"/cfr/jobs/{job_id}/cancel").status_code == 400
+        assert not os.listdir(os.path.join(settings.UPLOAD_DIR, "cfr_jobs"))
+        print("Upload / run / poll: OK")
+    finally:
+        harness.close()
+
+
+def test_cancel_queued_and_running():
+    """ยกเลิกก่อนเริ่ม → ไม่รัน, ยกเลิกระหว่างรัน → rollback ทั้งหมด"""
+    harness = _Harness()
+    try:
+        job_id = harness.upload(rows=2)
+        assert harness.client.post(f"/cfr/jobs/{job_id}/cancel").status_code == 200
+        harness.run_next()
+        assert harness.client.get(f"/cfr/jobs/{job_id}").json()["status"] == "cancelled"
+
+        # ขอยกเลิกเมื่อ worker รายงานความคืบหน้าครั้งแรก
+        store = harness.store
+        update = store.update
+
+        def update_and_cancel(job_id, **fields):
+            update(job_id, **fields)
+            if fields.get("rows_parsed"):
+                store.request_cancel(job_id)
+
+        store.update = update_and_cancel
+        job_id = harness.upload(rows=5)
+        harness.run_next()
+        job = harness.client.get(f"/cfr/jobs/{job_id}").json()
+        assert job["status"] == "cancelled" and job["rows_inserted"] == 0
+
+        db = harness.Session()
+        assert db.query(CFR).count() == 0
+        db.close()
+        print("Cancel: OK")
+    finally:
+        harness.close()
+
+
+def test_jobs_are_private_to_their_owner():
+    """ผู้ใช้อื่นดู/ยกเลิกงานไม่ได้ (404), admin ทำได้"""
+    harness = _Harness()
+    try:
+        job_id = harness.upload(rows=1)
+
+        harness.as_user(OTHER)
+        assert harness.client.get(f"/cfr/jobs/{job_id}").status_code == 404
+        assert harness.client.post(f"/cfr/jobs/{job_id}/cancel").status_code == 404
+        assert harness.store.is_cancel_requested(job_id) is False
+
+        harness.as_user(ADMIN)
+        assert harness.client.get(f"/cfr/jobs/{job_id}").json()["status"] == "queued"
+        assert harness.client.post(f"/cfr/jobs/{job_id}/cancel").status_code == 200
+        assert harness.client.get("/cfr/jobs/missing").status_code == 404
+        print("Ownership: OK")
+    finally:
+        harness.close()
+
+
+if __name__ == "__main__":
+    test_upload_run_and_poll()
+    test_cancel_queued_and_running()
+    test_jobs_are_private_to_their_owner()
+    print('✅ All CFR job tests passed')
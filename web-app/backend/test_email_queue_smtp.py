@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Test script for SMTP connection reuse and domain rate limiting
+ใช้ SMTP stub ในเครื่อง (ต้องติดตั้ง: pip install aiosmtpd)
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from aiosmtpd.controller import Controller
+
+from app.services.email_service import EmailService
+from app.services.email_queue import DomainRateLimiter
+
+
+class RecordingHandler:
+    def __init__(self):
+        self.messages = []
+        self.sessions = set()
+
+    async def handle_DATA(self, server, session, envelope):
+        self.messages.append(envelope)
+        self.sessions.add(id(session))
+        return '250 OK'
+
+
+def test_smtp_session_reuse():
+    """ส่งหลายฉบับผ่าน session เดียว ต้องใช้ connection เดียว"""
+    handler = RecordingHandler()
+    controller = Controller(handler, hostname='127.0.0.1', port=8025)
+    controller.start()
+    try:
+        service = EmailService(
+            smtp_host='127.0.0.1',
+            smtp_port=8025,
+            smtp_username='',
+            smtp_password='',
+            from_email='noreply@example.com',
+            smtp_use_tls=False
+        )
+        with service.open_session(max_messages=100) as session:
+            for i in range(5):
+                result = service.send_email(
+                    to_email=f'user{i}@example.org',
+                    subject=f'ทดสอบ {i}',
+                    body_text='ทดสอบการส่งอีเมล์',
+                    smtp_session=session
+                )
+                assert result['status'] == 'sent', result
+
+        print(f'ส่งแล้ว: {len(handler.messages)} ฉบับ, SMTP connections: {len(handler.sessions)}')
+        assert len(handler.messages) == 5
+        assert len(handler.sessions) == 1
+    finally:
+        controller.stop()
+
+
+def test_domain_rate_limiter():
+    """จำกัดต่อโดเมน และเติม token ตามเวลา"""
+    now = [0.0]
+    limiter = DomainRateLimiter(per_minute=2, clock=lambda: now[0])
+    assert limiter.try_acquire('example.org')
+    assert limiter.try_acquire('example.org')
+    assert not limiter.try_acquire('example.org')
+    assert limiter.try_acquire('other.org')  # โดเมนอื่นไม่ถูกจำกัด
+    assert round(limiter.retry_after('example.org')) == 30
+
+    now[0] = 30.0
+    assert limiter.try_acquire('example.org')
+    print('Rate limiter: OK')
+
+
+if __name__ == "__main__":
+    test_domain_rate_limiter()
+    test_smtp_session_reuse()
+    print('✅ All email queue tests passed')
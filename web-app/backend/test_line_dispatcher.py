@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Test script for the LINE notification dispatcher
+ใช้ HTTP stub ในเครื่องแทน LINE Messaging API และฐานข้อมูลจาก sqlite_test_app
+"""
+
+import sys
+import os
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from sqlite_test_app import make_session_factory
+from app.models.line_account import LineAccount
+from app.models.line_notification_log import LineNotificationLog
+from app.services import line_dispatcher
+from app.services.line_dispatcher import LineNotificationDispatcher
+
+
+class LineStub:
+    """HTTP stub ของ push API: บันทึก request และตอบตาม status ที่กำหนดไว้ล่วงหน้า"""
+
+    def __init__(self):
+        self.requests = []
+        self.statuses = []  # status ของ request ถัดไป (ว่าง = 200)
+        self.delay = 0.0
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_POST(self):
+                body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+                stub.requests.append({"body": body, "authorization": self.headers.get("Authorization")})
+                time.sleep(stub.delay)
+                status = stub.statuses.pop(0) if stub.statuses else 200
+                payload = b"{}"
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}/v2/bot/message/push"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+def _session_factory():
+    return make_session_factory([LineAccount.__table__, LineNotificationLog.__table__], rows=[
+        LineAccount(id=1, user_id=10, line_user_id="U10", access_token="x", notify_summons_sent=True),
+        LineAccount(id=2, user_id=20, line_user_id="U20", access_token="x", notify_summons_sent=False),
+    ])
+
+
+def _dispatcher(stub, Session, **kwargs):
+    options = {"workers": 2, "batch_window": 0.2, "max_retries": 2, "access_token": "token"}
+    options.update(kwargs)
+    return LineNotificationDispatcher(session_factory=Session, push_url=stub.url, **options)
+
+
+def test_batches_messages_to_same_recipient():
+    """ข้อความถึงผู้รับเดียวกันภายในช่วงรวมข้อความ ส่งใน push เดียว และ submit ไม่รอ LINE"""
+    stub = LineStub()
+    stub.delay = 0.5
+    Session = _session_factory()
+    dispatcher = _dispatcher(stub, Session)
+    try:
+        started = time.perf_counter()
+        futures = [
+            dispatcher.submit(10, "summons_sent", f"หัวข้อ {i}", f"ข้อความ {i}", criminal_case_id=None)
+            for i in range(7)
+        ]
+        assert time.perf_counter() - started < 0.2
+        assert all(future.result(timeout=10) for future in futures)
+
+        # 7 ข้อความ → 2 push (5 + 2) ตามลำดับที่เข้าคิว
+        assert [len(r["body"]["messages"]) for r in stub.requests] == [5, 2]
+        texts = [m["text"] for r in stub.requests for m in r["body"]["messages"]]
+        assert texts == [f"หัวข้อ {i}\n\nข้อความ {i}" for i in range(7)]
+        assert stub.requests[0]["body"]["to"] == "U10"
+        assert stub.requests[0]["authorization"] == "Bearer token"
+
+        db = Session()
+        logs = db.query(LineNotificationLog).all()
+        assert len(logs) == 7
+        assert {log.status for log in logs} == {"sent"}
+        assert db.get(LineAccount, 1).last_used_at is not None
+        db.close()
+        print(f"Batching: OK {dispatcher.stats()}")
+    finally:
+        dispatcher.shutdown()
+        stub.close()
+
+
+def test_retries_transient_errors():
+    """HTTP 5xx ส่งซ้ำพร้อมบันทึก retry_count, HTTP 400 ไม่ส่งซ้ำ"""
+    original = line_dispatcher.compute_retry_delay
+    line_dispatcher.compute_retry_delay = lambda retry_count: 0.05
+    stub = LineStub()
+    Session = _session_factory()
+    dispatcher = _dispatcher(stub, Session, batch_window=0)
+    try:
+        stub.statuses = [503, 500]
+        assert dispatcher.submit(10, "summons_sent", "ส่งซ้ำ", "ข้อความ").result(timeout=10) is True
+        assert len(stub.requests) == 3
+
+        stub.statuses = [400]
+        assert dispatcher.submit(10, "summons_sent", "ผิดพลาด", "ข้อความ").result(timeout=10) is False
+        assert len(stub.requests) == 4
+
+        db = Session()
+        retried = db.query(LineNotificationLog).filter_by(title="ส่งซ้ำ").one()
+        assert retried.status == "sent" and retried.retry_count == 2 and retried.last_retry_at is not None
+        failed = db.query(LineNotificationLog).filter_by(title="ผิดพลาด").one()
+        assert failed.status == "failed" and failed.retry_count == 0
+        assert failed.error_message.startswith("HTTP 400")
+        db.close()
+        print(f"Retry: OK {dispatcher.stats()}")
+    finally:
+        line_dispatcher.compute_retry_delay = original
+        dispatcher.shutdown()
+        stub.close()
+
+
+def test_failure_mid_batch_keeps_queue_count():
+    """push ชุดแรกสำเร็จแล้วชุดถัดไปล้ม: ไม่นับซ้ำ และคิวกลับเป็น 0"""
+    stub = LineStub()
+    Session = _session_factory()
+    dispatcher = _dispatcher(stub, Session, max_queue=10)
+    record_sent = dispatcher._record_sent
+    calls = []
+
+    def failing_record_sent(account_id, log_ids):
+        calls.append(log_ids)
+        if len(calls) == 2:
+            raise RuntimeError("database unavailable")
+        record_sent(account_id, log_ids)
+
+    dispatcher._record_sent = failing_record_sent
+    try:
+        futures = [dispatcher.submit(10, "summons_sent", f"หัวข้อ {i}", "ข้อความ") for i in range(7)]
+        assert [future.result(timeout=10) for future in futures] == [True] * 5 + [False] * 2
+        stats = dispatcher.stats()
+        assert (stats["queued"], stats["sent"], stats["not_sent"]) == (0, 5, 2), stats
+
+        # คิวยังจำกัดที่ max_queue ตามเดิม (ไม่ติดลบจนรับได้เกิน)
+        dispatcher.batch_window = 30
+        futures = [dispatcher.submit(10, "summons_sent", f"ล้น {i}", "ข้อความ") for i in range(12)]
+        assert dispatcher.stats()["rejected"] == 2
+        dispatcher.shutdown()
+        assert all(future.result(timeout=0) for future in futures[:10])
+        assert dispatcher.stats()["queued"] == 0
+        print(f"Mid-batch failure: OK {dispatcher.stats()}")
+    finally:
+        dispatcher.shutdown()
+        stub.close()
+
+
+def test_skips_unlinked_and_disabled():
+    """ผู้ใช้ที่ไม่ได้เชื่อม LINE หรือปิดรับการแจ้งเตือนประเภทนั้น ไม่ถูกส่งและไม่มี log"""
+    stub = LineStub()
+    Session = _session_factory()
+    dispatcher = _dispatcher(stub, Session, batch_window=0)
+    try:
+        assert dispatcher.submit(99, "summons_sent", "ไม่มีบัญชี", "ข้อความ").result(timeout=10) is False
+        assert dispatcher.submit(20, "summons_sent", "ปิดรับ", "ข้อความ").result(timeout=10) is False
+        assert dispatcher.submit(20, "connection_test", "ทดสอบ", "ข้อความ").result(timeout=10) is True
+        assert len(stub.requests) == 1
+
+        db = Session()
+        assert [log.title for log in db.query(LineNotificationLog).all()] == ["ทดสอบ"]
+        db.close()
+        print("Preferences: OK")
+    finally:
+        dispatcher.shutdown()
+        stub.close()
+
+
+def test_shutdown_flushes_pending():
+    """shutdown ส่งข้อความที่ยังรอรวมอยู่ทันที"""
+    stub = LineStub()
+    Session = _session_factory()
+    dispatcher = _dispatcher(stub, Session, batch_window=30)
+    future = dispatcher.submit(10, "summons_sent", "ก่อนปิด", "ข้อความ")
+    started = time.perf_counter()
+    dispatcher.shutdown()
+    stub.close()
+    assert future.result(timeout=0) is True
+    assert time.perf_counter() - started < 5
+    print("Shutdown: OK")
+
+
+if __name__ == "__main__":
+    test_batches_messages_to_same_recipient()
+    test_retries_transient_errors()
+    test_failure_mid_batch_keeps_queue_count()
+    test_skips_unlinked_and_disabled()
+    test_shutdown_flushes_pending()
+    print('✅ All LINE dispatcher tests passed')
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Test script for the master-data cache (bank name index, ETag / If-None-Match, invalidation)
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from sqlite_test_app import make_client
+from app.models.bank import Bank
+from app.models.court import Court
+from app.api.v1 import courts
+from app.api.v1.endpoints import banks
+from app.services import master_data_cache
+from app.services.master_data_cache import BANK_ALIASES, NameIndex, normalize_name, resolve_bank_id
+
+
+def _client():
+    client, Session = make_client(
+        [Bank.__table__, Court.__table__],
+        [(banks.router, "/banks"), (courts.router, "/courts")],
+        rows=[
+            Bank(bank_name="กสิกรไทย", bank_short_name="KBANK", bank_code="004"),
+            Bank(bank_name="ไทยพาณิชย์", bank_short_name="SCB", bank_code="014"),
+            Bank(bank_name="กรุงศรีอยุธยา", bank_code="025"),
+            Court(court_name="ศาลอาญา", court_type="ศาลชั้นต้น", province="กรุงเทพมหานคร"),
+            Court(court_name="ศาลจังหวัดเชียงใหม่", court_type="ศาลชั้นต้น", province="เชียงใหม่"),
+        ],
+    )
+    master_data_cache.invalidate_master_data()
+    return client, Session
+
+
+def test_normalize_name():
+    """ตัดคำนำหน้า/ต่อท้ายและช่องว่าง"""
+    assert normalize_name("ธนาคารกสิกรไทย จำกัด (มหาชน)") == "กสิกรไทย"
+    assert normalize_name(" ธนาคาร ไทยพาณิชย์ ") == "ไทยพาณิชย์"
+    assert normalize_name("ธ.กรุงศรีอยุธยา") == "กรุงศรีอยุธยา"
+    assert normalize_name("ธนาคาร") == "ธนาคาร"
+    assert normalize_name(None) == ""
+    print("normalize_name: OK")
+
+
+def test_bank_name_index():
+    """ชื่อเต็ม ชื่อย่อ รหัส ชื่อเรียกทั่วไป และชื่อบางส่วน"""
+    index = NameIndex([
+        {"id": 1, "bank_name": "กสิกรไทย", "bank_short_name": "KBANK", "bank_code": "004"},
+        {"id": 2, "bank_name": "กรุงศรีอยุธยา", "bank_short_name": None, "bank_code": "025"},
+    ], ("bank_name", "bank_short_name", "bank_code"), BANK_ALIASES)
+    assert index.find("ธนาคารกสิกรไทย จำกัด (มหาชน)")["id"] == 1
+    assert index.find("kbank")["id"] == 1
+    assert index.find("กสิกร")["id"] == 1
+    assert index.find("004")["id"] == 1
+    assert index.find("ธนาคารกรุงศรี")["id"] == 2
+    assert index.find("อยุธยา")["id"] == 2
+    assert index.find("ออมสิน") is None
+    assert index.find("") is None
+    print("NameIndex: OK")
+
+
+def test_etag_and_invalidation():
+    """ETag คงที่จนกว่าข้อมูลเปลี่ยน, If-None-Match ที่ตรงกันได้ 304"""
+    client, Session = _client()
+
+    response = client.get("/banks/")
+    assert response.status_code == 200
+    assert [b["bank_name"] for b in response.json()] == ["กรุงศรีอยุธยา", "กสิกรไทย", "ไทยพาณิชย์"]
+    etag = response.headers["etag"]
+
+    cached = client.get("/banks/", headers={"If-None-Match": etag})
+    assert cached.status_code == 304 and cached.headers["etag"] == etag
+    assert client.get("/banks/", headers={"If-None-Match": f'"other", W/{etag}'}).status_code == 304
+
+    # query string ต่างกัน → ETag ต่างกัน
+    page = client.get("/banks/?limit=1", headers={"If-None-Match": etag})
+    assert page.status_code == 200 and len(page.json()) == 1
+
+    # แก้ไขผ่าน API → invalidate → ETag ใหม่
+    bank_id = response.json()[0]["id"]
+    db = Session()
+    db.get(Bank, bank_id).bank_short_name = "BAY"
+    db.commit()
+    db.close()
+    master_data_cache.invalidate_master_data("banks")
+    changed = client.get("/banks/", headers={"If-None-Match": etag})
+    assert changed.status_code == 200 and changed.headers["etag"] != etag
+
+    db = Session()
+    assert resolve_bank_id(db, "ธนาคาร BAY") == bank_id
+    assert resolve_bank_id(db, "SCB") is not None
+    db.close()
+    print("ETag / invalidation: OK")
+
+
+def test_court_filters():
+    """ตัวกรองของ /courts ทำงานบนข้อมูลใน cache"""
+    client, _ = _client()
+    assert [c["court_name"] for c in client.get("/courts/?province=เชียงใหม่").json()] == ["ศาลจังหวัดเชียงใหม่"]
+    assert [c["court_name"] for c in client.get("/courts/?search=อาญา").json()] == ["ศาลอาญา"]
+    assert len(client.get("/courts/?court_type=ศาลชั้นต้น").json()) == 2
+    print("Court filters: OK")
+
+
+if __name__ == "__main__":
+    test_normalize_name()
+    test_bank_name_index()
+    test_etag_and_invalidation()
+    test_court_filters()
+    print('✅ All master-data cache tests passed')
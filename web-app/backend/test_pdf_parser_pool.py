@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Test script for parsing ทร.14 in the process pool (Thor14PDFParser.parse_bytes, app/core/executors.py)
+ใช้ไฟล์ตัวอย่างใน web-app/pdf ทร.14 ทดสอบ
+"""
+
+import sys
+import os
+import asyncio
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app.core import executors
+from app.core.executors import PROCESS, get_executor, shutdown_executors
+from app.services import pdf_parser as pdf_parser_module
+from app.services.pdf_parser import Thor14PDFParser
+
+SAMPLE_PDF = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "..", "pdf ทร.14 ทดสอบ", "นายอภิสิทธิ์ ผ่องศรี.pdf"
+)
+EXPECTED = {"name": "นายอภิสิทธิ์ ผ่องศรี", "id_card": "1190200063054"}
+
+
+def _sample() -> bytes:
+    with open(SAMPLE_PDF, "rb") as f:
+        return f.read()
+
+
+def _break_process_pool():
+    """ทำให้ process ใน pool ตาย (เหมือน OOM/segfault ระหว่างแกะ PDF)"""
+    executor = get_executor(PROCESS)
+    try:
+        executor.submit(os._exit, 1).result(timeout=60)
+    except Exception:
+        pass
+    return executor
+
+
+def test_parse_in_pool_and_cache():
+    """แกะไฟล์ใน process pool ได้ข้อมูลครบ และไฟล์เดิมใช้ผลจาก cache (ไม่ส่งเข้า pool ซ้ำ)"""
+    calls = []
+    run_in_process = pdf_parser_module.run_in_process
+
+    async def counting_run_in_process(func, *args):
+        calls.append(func.__name__)
+        return await run_in_process(func, *args)
+
+    pdf_parser_module.run_in_process = counting_run_in_process
+    try:
+        parser = Thor14PDFParser(max_pages=3, cache_size=2)
+        content = _sample()
+
+        first = asyncio.run(parser.parse_bytes(content))
+        assert {k: first[k] for k in EXPECTED} == EXPECTED, first
+        assert "จังหวัด กาญจนบุรี" in first["address"]
+
+        second = asyncio.run(parser.parse_bytes(content))
+        assert second == first and calls == ["parse_thor14_content"]
+
+        # ผลลัพธ์ที่คืนเป็นสำเนา แก้ไขแล้วไม่กระทบ cache
+        second["name"] = "x"
+        assert asyncio.run(parser.parse_bytes(content))["name"] == EXPECTED["name"]
+        assert len(calls) == 1
+        print("Parse in pool / cache: OK")
+    finally:
+        pdf_parser_module.run_in_process = run_in_process
+        shutdown_executors()
+
+
+def test_broken_pool_is_replaced():
+    """process ใน pool ตาย → สร้าง pool ใหม่แล้วลองอีกครั้ง แทนที่จะคืนผลว่างไปตลอด"""
+    try:
+        broken = _break_process_pool()
+        result = asyncio.run(Thor14PDFParser(max_pages=3).parse_bytes(_sample()))
+        assert {k: result[k] for k in EXPECTED} == EXPECTED, result
+        assert executors._executors[PROCESS] is not broken
+
+        # pool ใหม่ใช้ต่อได้
+        replacement = executors._executors[PROCESS]
+        result = asyncio.run(executors.run_in_process(pdf_parser_module.parse_thor14_content, _sample(), 3))
+        assert result["id_card"] == EXPECTED["id_card"]
+        assert executors._executors[PROCESS] is replacement
+        print("Broken pool: OK")
+    finally:
+        shutdown_executors()
+
+
+if __name__ == "__main__":
+    test_parse_in_pool_and_cache()
+    test_broken_pool_is_replaced()
+    print('✅ All PDF parser pool tests passed')
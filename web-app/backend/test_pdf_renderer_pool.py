@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Test script for BrowserPool timeout / backpressure (app/services/pdf_renderer.py)
+ใช้ render ปลอม (ไม่เปิด Chromium) เพื่อทดสอบเฉพาะคิวและการจัดการไฟล์ชั่วคราว
+"""
+
+import sys
+import os
+import tempfile
+import threading
+import time
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app.services import pdf_renderer
+from app.services.pdf_renderer import BrowserPool, PDFRendererBusyError
+
+created = []
+release = threading.Event()
+
+
+def _fake_render(self, job):
+    created.append(job.output_path)
+    release.wait(10)
+    with open(job.output_path, "wb") as f:
+        f.write(b"%PDF-1.4")
+    return job.output_path
+
+
+def _pool(**kwargs):
+    created.clear()
+    release.clear()
+    return BrowserPool(size=1, render_timeout=0.2, **kwargs)
+
+
+def _temp_pdfs():
+    return {name for name in os.listdir(tempfile.gettempdir()) if name.startswith("summons_")}
+
+
+def _wait_until(condition, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return condition()
+
+
+def test_timeout_removes_temp_file():
+    """หมดเวลา → ไฟล์ชั่วคราวถูกลบ ทั้งงานที่กำลัง render และงานที่ยังรอในคิว"""
+    original = pdf_renderer._BrowserWorker._render
+    pdf_renderer._BrowserWorker._render = _fake_render
+    pool = _pool(max_queue=1)
+    before = _temp_pdfs()
+    try:
+        results = {}
+
+        def render(name):
+            try:
+                results[name] = pool.render("<p>x</p>")
+            except Exception as e:
+                results[name] = e
+
+        running = threading.Thread(target=render, args=("running",))
+        running.start()
+        assert _wait_until(lambda: created)
+        running_path = created[0]
+
+        # worker ยังติดงานแรก → งานที่สองรอในคิวจนหมดเวลา
+        queued = threading.Thread(target=render, args=("queued",))
+        queued.start()
+        queued.join()
+        running.join()
+        assert isinstance(results["running"], TimeoutError) and isinstance(results["queued"], TimeoutError)
+        assert len(created) == 1
+
+        # งานแรกยัง render อยู่ ไฟล์จึงยังอยู่จนกว่างานจะจบ
+        assert os.path.exists(running_path)
+        release.set()
+        assert _wait_until(lambda: not os.path.exists(running_path))
+        assert _temp_pdfs() == before
+
+        # worker ข้ามงานที่ถูก cancel แล้ว และยังใช้งานต่อได้
+        path = pool.render("<p>x</p>")
+        assert os.path.exists(path) and len(created) == 2
+        os.unlink(path)
+        print("Timeout cleanup: OK")
+    finally:
+        release.set()
+        pool.shutdown()
+        pdf_renderer._BrowserWorker._render = original
+
+
+def test_queue_full_rejects():
+    """คิวเต็ม → PDFRendererBusyError และไม่ทิ้งไฟล์ชั่วคราวไว้"""
+    original = pdf_renderer._BrowserWorker._render
+    pdf_renderer._BrowserWorker._render = _fake_render
+    pool = _pool(max_queue=1)
+    try:
+        threading.Thread(target=lambda: _ignore_timeout(pool), daemon=True).start()
+        assert _wait_until(lambda: created)
+        pool._queue.put_nowait(None)  # ให้คิวเต็ม
+
+        before = _temp_pdfs()
+        try:
+            pool.render("<p>x</p>")
+            assert False, "expected PDFRendererBusyError"
+        except PDFRendererBusyError:
+            pass
+        assert _temp_pdfs() == before
+        assert pool.metrics()["rejected"] == 1
+        print("Queue full: OK")
+    finally:
+        release.set()
+        pool.shutdown()
+        pdf_renderer._BrowserWorker._render = original
+
+
+def _ignore_timeout(pool):
+    try:
+        pool.render("<p>x</p>")
+    except TimeoutError:
+        pass
+
+
+if __name__ == "__main__":
+    test_timeout_removes_temp_file()
+    test_queue_full_rejects()
+    print('✅ All PDF renderer pool tests passed')
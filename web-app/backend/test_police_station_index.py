@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Test script for the police station jurisdiction index (app/services/police_station_index.py)
+และ POST /police-stations/resolve-batch
+"""
+
+import sys
+import os
+from types import SimpleNamespace
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from sqlite_test_app import make_client, make_session_factory
+from app.api.v1 import police_stations
+from app.api.v1.auth import get_current_user
+from app.models import CriminalCase, PoliceStation, Suspect
+from app.services.police_station_index import (
+    DISTRICT_FALLBACK_LIMIT, get_jurisdiction_index, invalidate_jurisdiction_index, normalize_area,
+)
+from app.services.police_station_service import PoliceStationService
+
+OWNER = SimpleNamespace(id=1, role=SimpleNamespace(role_name="user"))
+OTHER = SimpleNamespace(id=2, role=SimpleNamespace(role_name="user"))
+ADMIN = SimpleNamespace(id=3, role=SimpleNamespace(role_name="admin"))
+
+
+def _stations():
+    return [
+        PoliceStation(id=1, station_name="สภ.เมืองกาญจนบุรี", province="กาญจนบุรี", district="เมืองกาญจนบุรี",
+                      address="1 ถ.แสงชูโต", subdistricts_covered="บ้านเหนือ, บ้านใต้, ปากแพรก"),
+        PoliceStation(id=2, station_name="สภ.ท่าม่วง", province="จ.กาญจนบุรี", district="อ.ท่าม่วง",
+                      address="ถ.แสงชูโต", subdistricts_covered="ท่าม่วง,วังขนาย,ในเมือง(เทศบาล)"),
+        PoliceStation(id=3, station_name="สภ.ปากแพรก", province="กาญจนบุรี", district="เมืองกาญจนบุรี",
+                      address="3 ถ.ปากแพรก", subdistricts_covered="ปากแพรก"),
+        PoliceStation(id=4, station_name="สน.ลุมพินี", province="กรุงเทพมหานคร", district="เขตปทุมวัน",
+                      address="4 ถ.พระราม 4", subdistricts_covered="แขวงลุมพินี"),
+        PoliceStation(id=5, station_name="สภ.เมืองเลย", province="เลย", district="เมืองเลย",
+                      address="5 ถ.เจริญรัฐ", subdistricts_covered="กุดป่อง"),
+    ]
+
+
+def _index():
+    invalidate_jurisdiction_index()
+    Session = make_session_factory([PoliceStation.__table__], rows=_stations())
+    db = Session()
+    return db, get_jurisdiction_index(db)
+
+
+def test_lookup():
+    """ค้นหาตำบล/อำเภอ/จังหวัดด้วยชื่อที่ normalize แล้ว (คำนำหน้า, ช่องว่าง, ชื่อย่อกรุงเทพฯ)"""
+    db, index = _index()
+    try:
+        assert normalize_area(" จ. กาญจนบุรี ") == "กาญจนบุรี"
+        assert normalize_area("กทม.") == "กรุงเทพมหานคร"
+        assert index.provinces == ["กรุงเทพมหานคร", "กาญจนบุรี", "เลย"]
+        assert PoliceStationService(db).get_provinces() == index.provinces
+
+        # สถานีแรก (id น้อยสุด) ที่ครอบคลุมตำบลเป็นผู้รับผิดชอบ
+        assert index.find_subdistrict("จังหวัดกาญจนบุรี", "ต.ปากแพรก").id == 1
+        assert index.find_subdistrict("กาญจนบุรี", "วังขนาย").id == 2
+        assert index.find_subdistrict("กทม", "ลุมพินี").id == 4
+        assert index.find_subdistrict("เลย", "ปากแพรก") is None
+
+        assert [s.id for s in index.find_district("กาญจนบุรี", "อำเภอท่าม่วง")] == [2]
+        assert [s.id for s in index.find_district("กาญจนบุรี", "เมือง")] == [1, 3]
+        assert [s.id for s in index.find_province("กาญจน")] == [1, 2, 3]
+
+        # เก็บเฉพาะชื่อจังหวัดบางส่วนที่พบ ชื่อที่ไม่พบไม่ทำให้ cache โต
+        for i in range(100):
+            assert index.find_province(f"ไม่มีจังหวัด{i}") == []
+        assert index.find_province("กาญจน") and index._province_lookups == {"กาญจน": ["กาญจนบุรี"]}
+        print("Lookup: OK")
+    finally:
+        db.close()
+
+
+def test_fallback():
+    """ชื่อไม่ตรง → ค้นหาบางส่วน / ย้อนไปใช้สถานีในจังหวัด / สถานีสมมติเมื่อไม่พบจังหวัด"""
+    db, index = _index()
+    try:
+        assert index.find_subdistrict("กาญจนบุรี", "ในเมือง").id == 2
+        district_fallback = index.find_district("กาญจนบุรี", "ไม่มีอำเภอนี้")
+        assert [s.id for s in district_fallback] == [1, 2, 3]
+        assert len(district_fallback) <= DISTRICT_FALLBACK_LIMIT
+
+        # ชื่อจังหวัดว่างตรงกับทุกจังหวัด (เหมือน ILIKE '%%' เดิม)
+        assert len(PoliceStationService(db).get_stations_by_province("")) == 5
+
+        service = PoliceStationService(db)
+        result = service.search_police_stations("10 ม.1 ต.บ้านเหนือ อ.เมืองกาญจนบุรี จ.กาญจนบุรี")
+        assert result.exact_match.id == 1 and not result.has_incomplete_address
+
+        result = service.search_police_stations("ต.ไม่มี อ.ท่าม่วง จ.กาญจนบุรี")
+        assert result.exact_match is None and [s.id for s in result.district_matches] == [2]
+        assert result.has_incomplete_address  # สถานี 2 ไม่มีเลขที่
+
+        result = service.search_police_stations("ต.หนึ่ง อ.สอง จ.ไม่มีในระบบ")
+        assert [s.id for s in result.province_matches] == [999999]
+        assert service.search_police_stations("ไม่มีจังหวัด").province_matches == []
+        print("Fallback: OK")
+    finally:
+        db.close()
+
+
+def test_resolve_batch():
+    """ค้นหาหลายที่อยู่ / ผู้ต้องหาทั้งคดี (เฉพาะคดีของตนเอง ยกเว้น admin)"""
+    invalidate_jurisdiction_index()
+    client, _ = make_client(
+        [PoliceStation.__table__, CriminalCase.__table__, Suspect.__table__],
+        [(police_stations.router, "/police-stations")],
+        rows=_stations() + [
+            CriminalCase(id=1, case_number="1/2568", owner_id=OWNER.id),
+            Suspect(id=10, criminal_case_id=1, suspect_name="ก", suspect_address="ต.กุดป่อง อ.เมืองเลย จ.เลย"),
+            Suspect(id=11, criminal_case_id=1, suspect_name="ข", suspect_address=None),
+        ],
+        user=OWNER,
+    )
+
+    body = client.post("/police-stations/resolve-batch", json={
+        "addresses": ["ต.วังขนาย จ.กาญจนบุรี", "ต.วังขนาย จ.กาญจนบุรี"], "criminal_case_id": 1,
+    }).json()
+    results = body["results"]
+    assert [r["suspect_id"] for r in results] == [None, None, 10, 11]
+    assert [(r["exact_match"] or {}).get("id") for r in results] == [2, 2, 5, None]
+    assert results[3]["address"] == "" and results[3]["province_matches"] == []
+
+    assert client.post("/police-stations/resolve-batch", json={"addresses": []}).status_code == 400
+    too_many = {"addresses": ["จ.เลย"] * (police_stations.MAX_BATCH_ADDRESSES + 1)}
+    assert client.post("/police-stations/resolve-batch", json=too_many).status_code == 400
+
+    # คดีของผู้อื่น / ไม่มีคดีนี้ → 404
+    client.app.dependency_overrides[get_current_user] = lambda: OTHER
+    assert client.post("/police-stations/resolve-batch", json={"criminal_case_id": 1}).status_code == 404
+    client.app.dependency_overrides[get_current_user] = lambda: ADMIN
+    assert len(client.post("/police-stations/resolve-batch", json={"criminal_case_id": 1}).json()["results"]) == 2
+    assert client.post("/police-stations/resolve-batch", json={"criminal_case_id": 99}).status_code == 404
+    print("Resolve batch: OK")
+
+
+if __name__ == "__main__":
+    test_lookup()
+    test_fallback()
+    test_resolve_batch()
+    print('✅ All police station index tests passed')
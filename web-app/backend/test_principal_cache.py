@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Test script for the authenticated-principal cache (app/core/principal_cache.py)
+ผู้ใช้ที่ถูกปิดใช้งาน/ปฏิเสธ หรือหน่วยงานถูกปิดสิทธิ์ ต้องใช้ token เดิมไม่ได้ตั้งแต่ request ถัดไป
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import fakeredis
+from sqlalchemy.orm import joinedload
+
+from sqlite_test_app import make_client
+from app.api.v1 import admin_users, auth
+from app.api.v1.endpoints import organizations
+from app.core import create_access_token
+from app.core.principal_cache import (
+    EPOCH_CHECK_SECONDS, PRINCIPAL_RELATIONSHIPS, PrincipalCache,
+    restore_principal, set_principal_cache, snapshot_principal,
+)
+from app.models import (
+    Bureau, CriminalCase, Division, LineAccount, PoliceRank, Supervision, User, UserRole, UserRoleMapping,
+)
+
+TABLES = [model.__table__ for model in (
+    PoliceRank, UserRole, Bureau, Division, Supervision, User, UserRoleMapping, LineAccount, CriminalCase,
+)]
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def _user(id, username, role_id, is_approved=True):
+    return User(
+        id=id, username=username, email=f"{username}@example.com", hashed_password=f"hash-{username}",
+        full_name=username, bureau_id=1, division_id=1, supervision_id=1, role_id=role_id,
+        is_active=True, is_approved=is_approved
+    )
+
+
+def _rows():
+    return [
+        UserRole(id=1, role_name="admin", role_display="admin"),
+        UserRole(id=2, role_name="user", role_display="user"),
+        Bureau(id=1, name_full="bureau", name_short="b", is_active=True),
+        Division(id=1, bureau_id=1, name_full="division", name_short="d", is_active=True),
+        Supervision(id=1, division_id=1, name_full="supervision", name_short="s", is_active=True),
+        _user(1, "admin", 1),
+        _user(2, "officer", 2),
+        _user(3, "applicant", 2, is_approved=False),
+    ]
+
+
+def _client():
+    client, Session = make_client(TABLES, [
+        (auth.router, "/auth"), (admin_users.router, "/admin"), (organizations.router, "/organizations"),
+    ], rows=_rows())
+    return client, Session
+
+
+def _headers(username):
+    return {"Authorization": f"Bearer {create_access_token(data={'sub': username})}"}
+
+
+def _me(client, username):
+    return client.get("/auth/me", headers=_headers(username)).status_code
+
+
+def test_user_changes_lock_out_existing_token():
+    """ปิดใช้งาน/ปฏิเสธผู้ใช้ → token เดิมใช้ไม่ได้ทันที แม้ principal อยู่ใน cache"""
+    cache = PrincipalCache(ttl=3600)
+    set_principal_cache(cache)
+    try:
+        client, _ = _client()
+        admin = _headers("admin")
+
+        assert _me(client, "officer") == 200 and _me(client, "officer") == 200
+        assert cache.stats()["hits"] >= 1
+
+        assert client.post("/admin/deactivate-user/2", headers=admin).status_code == 200
+        assert _me(client, "officer") == 403
+        assert client.post("/admin/activate-user/2", headers=admin).status_code == 200
+        assert _me(client, "officer") == 200
+
+        # ผู้สมัครที่ยังไม่อนุมัติถูก cache ไว้ (403) แล้วถูกปฏิเสธ (ลบบัญชี) → 401
+        assert _me(client, "applicant") == 403
+        assert client.post("/admin/reject-user/3", headers=admin).status_code == 200
+        assert _me(client, "applicant") == 401
+        print("Deactivate / reject: OK")
+    finally:
+        set_principal_cache(None)
+
+
+def test_organization_toggle_invalidates_all():
+    """ปิดสิทธิ์ bureau/division/supervision → ผู้ใช้ในหน่วยงานใช้ token เดิมไม่ได้ (ยกเว้น admin)"""
+    set_principal_cache(PrincipalCache(ttl=3600))
+    try:
+        client, _ = _client()
+        admin = _headers("admin")
+
+        for path in ("/organizations/bureaus/1", "/organizations/divisions/1", "/organizations/supervisions/1"):
+            assert _me(client, "officer") == 200
+            assert client.put(path, json={"is_active": False}, headers=admin).status_code == 200
+            assert _me(client, "officer") == 403, path
+            assert _me(client, "admin") == 200
+            assert client.put(path, json={"is_active": True}, headers=admin).status_code == 200
+        print("Organization toggles: OK")
+    finally:
+        set_principal_cache(None)
+
+
+def test_shared_epoch_and_ttl():
+    """epoch ใน Redis ทำให้ process อื่นโหลดใหม่ภายใน EPOCH_CHECK_SECONDS, รายการหมดอายุตาม TTL"""
+    redis_client = fakeredis.FakeRedis()
+    clock = FakeClock()
+    here = PrincipalCache(ttl=30, shared=redis_client, clock=clock)
+    other = PrincipalCache(ttl=30, shared=redis_client, clock=clock)  # process อื่น
+    snapshot = {"user": {"username": "officer"}}
+
+    other.set("officer", snapshot, other.epoch())
+    assert other.get("officer") == snapshot
+    assert here.get("officer") == snapshot  # อ่านผ่าน Redis
+
+    here.invalidate("officer")
+    assert here.get("officer") is None
+    # process อื่นยังใช้ค่าในหน่วยความจำได้จนกว่าจะตรวจ epoch รอบถัดไป
+    assert other.get("officer") == snapshot
+    clock.now += EPOCH_CHECK_SECONDS
+    assert other.get("officer") is None
+
+    # ข้อมูลที่ query ก่อนถูก invalidate ไม่ถูกเก็บ
+    loaded_epoch = other.epoch()
+    here.invalidate_all()
+    clock.now += EPOCH_CHECK_SECONDS
+    other.set("officer", snapshot, loaded_epoch)
+    assert other.get("officer") is None
+
+    other.set("officer", snapshot, other.epoch())
+    assert redis_client.exists("principal:officer")
+    here.invalidate_all()
+    assert not redis_client.exists("principal:officer") and redis_client.exists("principal:epoch")
+
+    # TTL
+    local = PrincipalCache(ttl=30, clock=clock)
+    local.set("officer", snapshot)
+    clock.now += 29
+    assert local.get("officer") == snapshot
+    clock.now += 1
+    assert local.get("officer") is None and local.stats()["size"] == 0
+    print("Shared epoch / TTL: OK")
+
+
+def test_restore_principal():
+    """snapshot ไม่มี password hash; User ที่ restore โหลด hashed_password จากฐานข้อมูลเมื่อถูกใช้"""
+    _, Session = _client()
+    db = Session()
+    try:
+        user = db.query(User).options(*[
+            joinedload(getattr(User, name)) for name in PRINCIPAL_RELATIONSHIPS
+        ]).filter(User.username == "officer").one()
+        snapshot = snapshot_principal(user)
+        assert "hashed_password" not in snapshot["user"]
+        assert snapshot["role"]["role_name"] == "user" and snapshot["rank"] is None
+        db.close()
+
+        db = Session()
+        restored = restore_principal(db, snapshot)
+        assert restored in db and restored.role.role_name == "user" and restored.bureau.is_active
+        assert restored.hashed_password == "hash-officer"
+
+        restored.position = "inspector"
+        db.commit()
+        assert db.query(User.position).filter(User.id == 2).scalar() == "inspector"
+        print("Restore principal: OK")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    test_user_changes_lock_out_existing_token()
+    test_organization_toggle_invalidates_all()
+    test_shared_epoch_and_ttl()
+    test_restore_principal()
+    print('✅ All principal cache tests passed')
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Test script for POST /documents/summons-batch
+ออกหมายเรียกได้เฉพาะบัญชีในคดีที่ผู้ใช้เห็นได้ (สิทธิ์เดียวกับหน้าค้นหาคดี)
+"""
+
+import sys
+import os
+from types import SimpleNamespace
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from fastapi.responses import HTMLResponse
+
+from sqlite_test_app import make_client
+from app.api.v1 import documents
+from app.api.v1.auth import get_current_user
+from app.models import (
+    BankAccount, CriminalCase, NonBankAccount, PaymentGatewayAccount, TelcoInternetAccount, TelcoMobileAccount,
+)
+
+OWNER = SimpleNamespace(id=1, role=SimpleNamespace(role_name="user"))
+OTHER = SimpleNamespace(id=2, role=SimpleNamespace(role_name="user"))
+ADMIN = SimpleNamespace(id=3, role=SimpleNamespace(role_name="admin"))
+
+
+def _fake_generator(kind):
+    def generate(account_id, *args):
+        return HTMLResponse(f"{kind} {account_id}")
+    return generate
+
+
+def _fake_stream_zip(documents_):
+    yield "\n".join(name for name, _ in documents_).encode("utf-8")
+
+
+def _client():
+    return make_client(
+        [CriminalCase.__table__, BankAccount.__table__, NonBankAccount.__table__, PaymentGatewayAccount.__table__,
+         TelcoMobileAccount.__table__, TelcoInternetAccount.__table__],
+        [(documents.router, "/documents")],
+        rows=[
+            CriminalCase(id=1, case_number="1/2568", owner_id=OWNER.id),
+            CriminalCase(id=2, case_number="2/2568", owner_id=OTHER.id),
+            BankAccount(id=10, criminal_case_id=1, bank_name="b", account_number="1", account_name="a"),
+            BankAccount(id=11, criminal_case_id=2, bank_name="b", account_number="2", account_name="a"),
+            TelcoMobileAccount(id=20, criminal_case_id=1, provider_name="p", phone_number="0800000000"),
+            TelcoMobileAccount(id=21, criminal_case_id=2, provider_name="p", phone_number="0800000001"),
+        ],
+        user=OWNER,
+    )
+
+
+def _names(response):
+    assert response.status_code == 200, response.text
+    return response.content.decode("utf-8").split("\n")
+
+
+def test_summons_batch_visibility():
+    """คดี/บัญชีของผู้อื่นถูกตัดออก ถ้าไม่เหลือเลย → 404"""
+    original_types, original_stream_zip = dict(documents.BATCH_SUMMONS_TYPES), documents.stream_zip
+    for account_type, (model, _, _) in original_types.items():
+        documents.BATCH_SUMMONS_TYPES[account_type] = (
+            model, _fake_generator(f"summons {account_type}"), _fake_generator(f"envelope {account_type}")
+        )
+    documents.stream_zip = _fake_stream_zip
+    try:
+        client, _ = _client()
+        post = lambda body: client.post("/documents/summons-batch", json=body)
+
+        assert _names(post({"criminal_case_id": 1, "include_envelopes": False})) == [
+            "001_bank_10_summons.pdf", "002_telco_mobile_20_summons.pdf",
+        ]
+        assert post({"criminal_case_id": 2}).status_code == 404
+        assert post({"criminal_case_id": 99}).status_code == 404
+
+        accounts = [
+            {"account_type": "bank", "account_id": 11},
+            {"account_type": "telco_mobile", "account_id": 20},
+            {"account_type": "bank", "account_id": 10},
+            {"account_type": "bank", "account_id": 10},
+            {"account_type": "bank", "account_id": 99},
+        ]
+        assert _names(post({"accounts": accounts, "include_envelopes": False})) == [
+            "001_telco_mobile_20_summons.pdf", "002_bank_10_summons.pdf",
+        ]
+        assert post({"accounts": accounts[:1]}).status_code == 404
+        assert post({"accounts": [{"account_type": "x", "account_id": 10}]}).status_code == 400
+
+        client.app.dependency_overrides[get_current_user] = lambda: OTHER
+        assert _names(post({"accounts": accounts, "include_envelopes": False})) == ["001_bank_11_summons.pdf"]
+        client.app.dependency_overrides[get_current_user] = lambda: ADMIN
+        assert len(_names(post({"accounts": accounts}))) == 6
+        print("Summons batch visibility: OK")
+    finally:
+        documents.BATCH_SUMMONS_TYPES.update(original_types)
+        documents.stream_zip = original_stream_zip
+
+
+if __name__ == "__main__":
+    test_summons_batch_visibility()
+    print('✅ All summons batch tests passed')
@@ -0,0 +1,155 @@
+import { useEffect, useState } from 'react'
+import { Modal, Input, Table, Tag, Alert, Button, Space, message } from 'antd'
+import type { ColumnsType } from 'antd/es/table'
+import api from '../services/api'
+
+const { TextArea } = Input
+
+interface BulkRowResult {
+  row: number
+  id?: number | null
+  document_number?: string | null
+  data: Record<string, any>
+  errors: string[]
+  warnings: string[]
+}
+
+interface BulkCreateResponse {
+  created: number
+  failed: number
+  dry_run: boolean
+  ignored_columns: string[]
+  results: BulkRowResult[]
+}
+
+interface BulkPasteModalProps {
+  visible: boolean
+  criminalCaseId: number
+  endpoint: string            // เช่น '/bank-accounts', '/suspects'
+  title: string
+  previewFields: { key: string; label: string }[]
+  onClose: (success?: boolean) => void
+}
+
+// นำเข้าหลายรายการโดยวางข้อมูลจาก Excel (คัดลอกทั้งตารางรวมแถวหัวคอลัมน์)
+export default function BulkPasteModal({
+  visible,
+  criminalCaseId,
+  endpoint,
+  title,
+  previewFields,
+  onClose,
+}: BulkPasteModalProps) {
+  const [text, setText] = useState('')
+  const [preview, setPreview] = useState<BulkCreateResponse | null>(null)
+  const [loading, setLoading] = useState(false)
+
+  useEffect(() => {
+    if (visible) {
+      setText('')
+      setPreview(null)
+    }
+  }, [visible])
+
+  const submit = async (dryRun: boolean) => {
+    if (!text.trim()) {
+      message.warning('กรุณาวางข้อมูลจาก Excel')
+      return
+    }
+    try {
+      setLoading(true)
+      const response = await api.post(`${endpoint}/bulk/paste`, {
+        text,
+        criminal_case_id: criminalCaseId,
+        dry_run: dryRun,
+      })
+      if (dryRun) {
+        setPreview(response.data)
+      } else {
+        message.success(`บันทึกเรียบร้อยแล้ว ${response.data.created} รายการ`)
+        onClose(true)
+      }
+    } catch (error: any) {
+      // 422 = มีแถวที่ไม่ผ่านการตรวจสอบ (ไม่มีรายการใดถูกบันทึก)
+      if (error.response?.status === 422 && error.response.data?.results) {
+        setPreview(error.response.data)
+        message.error(`ข้อมูลไม่ถูกต้อง ${error.response.data.failed} แถว`)
+      } else {
+        message.error(error.response?.data?.detail || 'ไม่สามารถนำเข้าข้อมูลได้')
+      }
+    } finally {
+      setLoading(false)
+    }
+  }
+
+  const columns: ColumnsType<BulkRowResult> = [
+    { title: 'แถว', dataIndex: 'row', key: 'row', width: 60 },
+    ...previewFields.map((field) => ({
+      title: field.label,
+      key: field.key,
+      render: (_: any, record: BulkRowResult) => record.data?.[field.key] ?? '-',
+    })),
+    {
+      title: 'ผลการตรวจสอบ',
+      key: 'status',
+      render: (_: any, record: BulkRowResult) => (
+        <Space direction="vertical" size={0}>
+          {record.errors.length === 0 && <Tag color="green">ถูกต้อง</Tag>}
+          {record.errors.map((e, i) => <Tag key={`e${i}`} color="red">{e}</Tag>)}
+          {record.warnings.map((w, i) => <Tag key={`w${i}`} color="orange">{w}</Tag>)}
+        </Space>
+      ),
+    },
+  ]
+
+  const canSave = !!preview && preview.failed === 0
+
+  return (
+    <Modal
+      title={title}
+      open={visible}
+      onCancel={() => onClose()}
+      width={1000}
+      footer={[
+        <Button key="cancel" onClick={() => onClose()}>
+          ยกเลิก
+        </Button>,
+        <Button key="check" onClick={() => submit(true)} loading={loading}>
+          ตรวจสอบข้อมูล
+        </Button>,
+        <Button key="save" type="primary" onClick={() => submit(false)} loading={loading} disabled={!canSave}>
+          บันทึก {preview ? `(${preview.results.length} รายการ)` : ''}
+        </Button>,
+      ]}
+    >
+      <TextArea
+        rows={8}
+        value={text}
+        onChange={(e) => {
+          setText(e.target.value)
+          setPreview(null)
+        }}
+        placeholder="คัดลอกตารางจาก Excel (รวมแถวหัวคอลัมน์) แล้ววางที่นี่"
+      />
+      {preview && preview.ignored_columns.length > 0 && (
+        <Alert
+          style={{ marginTop: 12 }}
+          type="warning"
+          showIcon
+          message={`ไม่รู้จักคอลัมน์: ${preview.ignored_columns.join(', ')}`}
+        />
+      )}
+      {preview && (
+        <Table
+          style={{ marginTop: 12 }}
+          columns={columns}
+          dataSource={preview.results}
+          rowKey="row"
+          size="small"
+          pagination={{ pageSize: 20 }}
+          scroll={{ x: 800 }}
+        />
+      )}
+    </Modal>
+  )
+}
@@ -52,7 +52,7 @@ interface EmailLog {
   recipient_email: string;
   subject: string;
   document_type: string;
-  status: 'sent' | 'failed' | 'pending';
+  status: 'sent' | 'failed' | 'pending' | 'sending';
   sent_at: string | null;
   error_message: string | null;
   retry_count: number;
@@ -25,6 +25,7 @@ import type { ColumnsType } from 'antd/es/table'
 import api from '../services/api'
 import BankAccountFormModal from '../components/BankAccountFormModal'
 import SuspectFormModal from '../components/SuspectFormModal'
+import BulkPasteModal from '../components/BulkPasteModal'
 import { CriminalCase, BankAccount, Suspect } from '../types'
 
 const { TabPane } = Tabs
@@ -38,6 +39,8 @@ const CriminalCaseDetailPage = () => {
   const [loading, setLoading] = useState(true)
   const [bankModalVisible, setBankModalVisible] = useState(false)
   const [suspectModalVisible, setSuspectModalVisible] = useState(false)
+  const [bulkBankModalVisible, setBulkBankModalVisible] = useState(false)
+  const [bulkSuspectModalVisible, setBulkSuspectModalVisible] = useState(false)
   const [editingBankAccount, setEditingBankAccount] = useState<BankAccount | null>(null)
   const [editingSuspect, setEditingSuspect] = useState<Suspect | null>(null)
 
@@ -108,6 +111,14 @@ const CriminalCaseDetailPage = () => {
     }
   }
 
+  const handleBulkBankModalClose = (success?: boolean) => {
+    setBulkBankModalVisible(false)
+    if (success) {
+      fetchBankAccounts()
+      fetchCriminalCase() // Refresh counts
+    }
+  }
+
   const handleAddSuspect = () => {
     setEditingSuspect(null)
     setSuspectModalVisible(true)
@@ -138,6 +149,14 @@ const CriminalCaseDetailPage = () => {
     }
   }
 
+  const handleBulkSuspectModalClose = (success?: boolean) => {
+    setBulkSuspectModalVisible(false)
+    if (success) {
+      fetchSuspects()
+      fetchCriminalCase() // Refresh counts
+    }
+  }
+
   // Print Suspect Summons
   const handlePrintSuspectSummons = async (suspectId: number) => {
     try {
@@ -489,9 +508,14 @@ const CriminalCaseDetailPage = () => {
             key="bank-accounts"
           >
             <div style={{ marginBottom: '16px' }}>
-              <Button type="primary" onClick={handleAddBankAccount}>
-                เพิ่มบัญชีธนาคาร
-              </Button>
+              <Space>
+                <Button type="primary" onClick={handleAddBankAccount}>
+                  เพิ่มบัญชีธนาคาร
+                </Button>
+                <Button onClick={() => setBulkBankModalVisible(true)}>
+                  นำเข้าจาก Excel
+                </Button>
+              </Space>
             </div>
             <Table
               columns={bankColumns}
@@ -511,9 +535,14 @@ const CriminalCaseDetailPage = () => {
             key="suspects"
           >
             <div style={{ marginBottom: '16px' }}>
-              <Button type="primary" onClick={handleAddSuspect}>
-                เพิ่มผู้ต้องหา
-              </Button>
+              <Space>
+                <Button type="primary" onClick={handleAddSuspect}>
+                  เพิ่มผู้ต้องหา
+                </Button>
+                <Button onClick={() => setBulkSuspectModalVisible(true)}>
+                  นำเข้าจาก Excel
+                </Button>
+              </Space>
             </div>
             <Table
               columns={suspectColumns}
@@ -539,6 +568,32 @@ const CriminalCaseDetailPage = () => {
         criminalCaseId={Number(id)}
         suspect={editingSuspect}
       />
+
+      <BulkPasteModal
+        visible={bulkBankModalVisible}
+        onClose={handleBulkBankModalClose}
+        criminalCaseId={Number(id)}
+        endpoint="/bank-accounts"
+        title="นำเข้าบัญชีธนาคารจาก Excel"
+        previewFields={[
+          { key: 'bank_name', label: 'ธนาคาร' },
+          { key: 'account_number', label: 'เลขที่บัญชี' },
+          { key: 'account_name', label: 'ชื่อบัญชี' },
+        ]}
+      />
+
+      <BulkPasteModal
+        visible={bulkSuspectModalVisible}
+        onClose={handleBulkSuspectModalClose}
+        criminalCaseId={Number(id)}
+        endpoint="/suspects"
+        title="นำเข้าผู้ต้องหาจาก Excel"
+        previewFields={[
+          { key: 'suspect_name', label: 'ชื่อผู้ต้องหา' },
+          { key: 'suspect_id_card', label: 'เลขบัตรประชาชน' },
+          { key: 'document_number', label: 'เลขที่หนังสือ' },
+        ]}
+      />
     </div>
   )
 }
@@ -645,7 +645,22 @@ export default function DashboardPage() {
           'Content-Type': 'multipart/form-data'
         }
       })
-      message.success(`${response.data.message} (เพิ่ม ${response.data.records_inserted} รายการ)`)
+
+      // รอให้งานนำเข้าข้อมูลเบื้องหลังเสร็จ
+      const jobId = response.data.job_id
+      let job = response.data
+      while (!['completed', 'failed', 'cancelled'].includes(job.status)) {
+        await new Promise(resolve => setTimeout(resolve, 1000))
+        job = (await api.get(`/cfr/jobs/${jobId}`)).data
+      }
+
+      if (job.status === 'completed') {
+        message.success(`อัพโหลดไฟล์ CFR สำเร็จ (เพิ่ม ${job.result?.records_inserted ?? 0} รายการ)`)
+      } else if (job.status === 'cancelled') {
+        message.warning('ยกเลิกการนำเข้าไฟล์ CFR แล้ว')
+      } else {
+        message.error(job.error || 'ไม่สามารถนำเข้าไฟล์ CFR ได้')
+      }
       fetchCfrFiles(selected.id)
       fetchCfrRecords(selected.id)
     } catch (error: any) {
@@ -1046,8 +1061,8 @@ export default function DashboardPage() {
         freeze_account: freezeAccount
       })
 
-      if (response.data.status === 'sent') {
-        message.success('ส่งหมายเรียกทางอีเมล์สำเร็จ!')
+      if (response.data.status === 'pending' || response.data.status === 'sent') {
+        message.success('ส่งหมายเรียกเข้าคิวอีเมล์แล้ว ระบบจะส่งให้อัตโนมัติ')
         setEmailModalVisible(false)
 
         // Refresh case details